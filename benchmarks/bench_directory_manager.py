@@ -0,0 +1,119 @@
+"""
+Benchmark das operações em lote do DirectoryManager
+(src/managers/directory_manager.py).
+
+Compara, em um diretório com muitos arquivos, a busca por palavra-chave
+com glob a cada consulta e com o índice em memória, e a remoção de todos
+os arquivos um a um (glob, isfile e remove), em lotes paralelos e em
+segundo plano (tempo até o retorno ao chamador).
+
+Uso:
+    python -m benchmarks.bench_directory_manager
+    python -m benchmarks.bench_directory_manager --files 100000 --output dir.json
+"""
+import argparse
+import glob
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.common import environment, write_json
+from src.managers.directory_manager import DirectoryManager
+
+
+def create_files(directory: str, count: int):
+    """
+    Cria arquivos vazios no diretório, com o nome das faturas.
+
+    Args:
+        directory (str): Diretório de destino.
+        count (int): Quantidade de arquivos.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for index in range(count):
+        with open(os.path.join(directory, f'{100000 + index}.png'), 'wb'):
+            pass
+    # Data de modificação antiga, fora do intervalo em que o índice do
+    # DirectoryManager não é reaproveitado.
+    old = time.time() - 60
+    os.utime(directory, (old, old))
+
+
+def glob_search(directory: str, keyword: str) -> list:
+    """Busca por palavra-chave com glob, como na versão anterior."""
+    return [
+        os.path.basename(path)
+        for path in glob.glob(os.path.join(directory, f'*{keyword}*'))
+    ]
+
+
+def sequential_delete(directory: str):
+    """Remoção um a um, como na versão anterior."""
+    for path in glob.glob(os.path.join(directory, '*')):
+        if os.path.isfile(path):
+            os.remove(path)
+
+
+def timed(function) -> float:
+    """Executa uma função e retorna o tempo em segundos."""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--files', type=int, default=20000,
+                        help='Quantidade de arquivos no diretório.')
+    parser.add_argument('--lookups', type=int, default=50,
+                        help='Quantidade de buscas por palavra-chave.')
+    parser.add_argument('--output', help='Arquivo JSON com o resultado.')
+    arguments = parser.parse_args()
+
+    base = tempfile.mkdtemp()
+    directory = os.path.join(base, 'IMGS')
+    keywords = [str(100000 + index * 7) for index in range(arguments.lookups)]
+    results = {}
+    try:
+        create_files(directory, arguments.files)
+        manager = DirectoryManager(directory)
+        results['search_glob'] = timed(
+            lambda: [glob_search(directory, key) for key in keywords]
+        )
+        results['search_index'] = timed(
+            lambda: [manager.search_files(key) for key in keywords]
+        )
+
+        results['delete_sequential'] = timed(
+            lambda: sequential_delete(directory)
+        )
+        create_files(directory, arguments.files)
+        results['delete_parallel'] = timed(manager.delete_files)
+        create_files(directory, arguments.files)
+        threads = []
+        results['delete_background'] = timed(
+            lambda: threads.append(manager.delete_files(background=True))
+        )
+        threads[0].join()
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+    print(f'{arguments.files} arquivo(s), {arguments.lookups} busca(s)')
+    for name, seconds in results.items():
+        print(f'{name:>18} {seconds:>9.4f}s')
+    print(f'Busca: {results["search_glob"] / results["search_index"]:.1f}x, '
+          f'remoção em lotes: '
+          f'{results["delete_sequential"] / results["delete_parallel"]:.1f}x')
+
+    if arguments.output:
+        write_json(arguments.output, {
+            'environment': environment(),
+            'files': arguments.files,
+            'lookups': arguments.lookups,
+            'seconds': results,
+        })
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""
+Benchmark de ponta a ponta do fluxo do main.py contra o site local.
+
+Para cada tamanho de tabela, inicia o site local
+(benchmarks/standin_site.py), executa um ciclo completo da automação
+(`main.run_process`) com o Chrome em modo headless e os arquivos gravados
+em um diretório temporário, e informa linhas/s, páginas/s e o tempo total
+do ciclo. O OCR é desabilitado por padrão, para medir apenas a coleta e
+o download das faturas. Também são informados o pico de memória do
+navegador e os reinícios da política de reciclagem (`--recycle-pages`),
+que mantêm o pico estável em tabelas com milhares de páginas. Com
+`--network-capture`, as imagens baixadas pelo navegador são reaproveitadas
+pelo RequestManager; o total de bytes baixados inclui os do navegador,
+que também são informados à parte.
+
+Requer o Chrome (ou o Chromium) e o chromedriver instalados.
+
+Uso:
+    python -m benchmarks.bench_e2e
+    python -m benchmarks.bench_e2e --rows 10 1000 --page-size 50 --output e2e.json
+    python -m benchmarks.bench_e2e --rows 100000 --recycle-pages 1000
+    python -m benchmarks.bench_e2e --rows 1000 --network-capture
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.common import environment, write_json
+from benchmarks.standin_site import StandinSite
+import config
+import main as automation
+from src.managers.metrics import REGISTRY
+from src.managers.web_driver_controller import WebDriverController
+from src.managers.web_driver_options import WebDriverOptions
+
+
+def redirect_directories(directory: str):
+    """
+    Aponta os diretórios e arquivos da configuração para `directory`,
+    para que o benchmark não altere os resultados do projeto.
+
+    Args:
+        directory (str): Diretório base temporário.
+    """
+    base = config.BASE_DIRECTORY
+    for name in dir(config):
+        value = getattr(config, name)
+        if (name.startswith(('DIRECTORY_', 'FILE_'))
+                and isinstance(value, str) and value.startswith(base)):
+            setattr(config, name, directory + value[len(base):])
+    config.BASE_DIRECTORY = directory
+    config.refresh_execution()
+
+
+def run_scenario(rows: int, arguments: argparse.Namespace) -> dict:
+    """
+    Executa um ciclo completo da automação contra uma tabela de `rows`
+    linhas.
+
+    Args:
+        rows (int): Quantidade de linhas da tabela.
+        arguments (argparse.Namespace): Argumentos da linha de comando.
+
+    Returns:
+        dict: Linhas lidas, páginas, faturas baixadas, tempo total e
+        vazão do ciclo.
+    """
+    site = StandinSite(
+        rows, arguments.page_size, arguments.future_share,
+        arguments.latency, arguments.error_rate
+    )
+    with site, tempfile.TemporaryDirectory() as directory:
+        original = {name: getattr(config, name) for name in dir(config)
+                    if name.isupper()}
+        try:
+            redirect_directories(directory)
+            config.URL_SITE = site.url
+            config.OCR_ENABLED = arguments.ocr
+            config.INCREMENTAL_MODE = False
+            if arguments.recycle_pages is not None:
+                config.BROWSER_RECYCLE_PAGES = arguments.recycle_pages or None
+            config.BROWSER_NETWORK_CAPTURE = arguments.network_capture
+            start = time.perf_counter()
+            success = automation.run_process(close_browser=False)
+            seconds = time.perf_counter() - start
+        finally:
+            WebDriverController.close_driver()
+            for name, value in original.items():
+                setattr(config, name, value)
+
+    rows_scanned = REGISTRY.total('rows_scanned_total')
+    pages = REGISTRY.value('state_seconds', state='PROCESS')
+    return {
+        'rows': rows,
+        'success': success,
+        'rows_scanned': rows_scanned,
+        'rows_eligible': len(site.eligible_rows()),
+        'pages': pages,
+        'invoices': site.requests['invoice'],
+        'seconds': seconds,
+        'rows_per_second': rows_scanned / seconds,
+        'pages_per_second': pages / seconds,
+        'browser_rss_peak_mb': (
+            REGISTRY.value('browser_rss_peak_bytes') / 1024 / 1024
+        ),
+        'browser_restarts': REGISTRY.total('browser_restarts_total'),
+        'downloaded_mb': REGISTRY.total('download_bytes_total') / 1024 / 1024,
+        'browser_mb': (
+            REGISTRY.value('download_bytes_total', source='browser')
+            / 1024 / 1024
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, nargs='+',
+                        default=[10, 1000, 100000],
+                        help='Tamanhos da tabela.')
+    parser.add_argument('--page-size', type=int, default=10,
+                        help='Quantidade de linhas por página.')
+    parser.add_argument('--future-share', type=float, default=0.2,
+                        help='Parcela de linhas com data futura.')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Espera em segundos antes de cada imagem.')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Parcela das imagens que retornam erro 500.')
+    parser.add_argument('--ocr', action='store_true',
+                        help='Executa também o OCR das faturas.')
+    parser.add_argument('--recycle-pages', type=int,
+                        help='Páginas entre os reinícios do navegador '
+                             '(0 desabilita o critério).')
+    parser.add_argument('--network-capture', action='store_true',
+                        help='Reaproveita as imagens baixadas pelo '
+                             'navegador (BROWSER_NETWORK_CAPTURE).')
+    parser.add_argument('--output', help='Arquivo JSON com o resultado.')
+    arguments = parser.parse_args()
+
+    options = WebDriverOptions()
+    options.add_argument('--headless=new')
+    if hasattr(os, 'geteuid') and os.geteuid() == 0:
+        options.add_argument('--no-sandbox')
+
+    results = []
+    print(f'{"linhas":>8} {"páginas":>8} {"faturas":>8} {"tempo (s)":>10} '
+          f'{"linhas/s":>10} {"páginas/s":>10} {"pico (MB)":>10} '
+          f'{"reinícios":>10} {"baixado (MB)":>13} {"navegador (MB)":>15}')
+    for rows in arguments.rows:
+        result = run_scenario(rows, arguments)
+        results.append(result)
+        print(f'{result["rows_scanned"]:>8.0f} {result["pages"]:>8.0f} '
+              f'{result["invoices"]:>8} {result["seconds"]:>10.2f} '
+              f'{result["rows_per_second"]:>10.1f} '
+              f'{result["pages_per_second"]:>10.2f} '
+              f'{result["browser_rss_peak_mb"]:>10.1f} '
+              f'{result["browser_restarts"]:>10.0f} '
+              f'{result["downloaded_mb"]:>13.2f} '
+              f'{result["browser_mb"]:>15.2f}'
+              + ('' if result['success'] else '  (falhou)'))
+
+    if arguments.output:
+        write_json(arguments.output, {
+            'environment': environment(),
+            'page_size': arguments.page_size,
+            'future_share': arguments.future_share,
+            'latency': arguments.latency,
+            'error_rate': arguments.error_rate,
+            'ocr': arguments.ocr,
+            'recycle_pages': arguments.recycle_pages,
+            'network_capture': arguments.network_capture,
+            'results': results,
+        })
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+"""
+Benchmark do decodificador de PNG (src/managers/image_loader.py).
+
+Compara o tempo de decodificação e o pico de memória do PngDecoder com
+um decodificador ingênuo em Python puro, nas imagens de faturas em IMGS/.
+O site entrega as faturas em JPEG (apesar da extensão .png); nesse caso
+são geradas imagens PNG sintéticas de fatura com as mesmas dimensões,
+lidas do cabeçalho JPEG, para que o benchmark reflita o tamanho real.
+
+Uso:
+    python -m benchmarks.bench_image_loader
+    python -m benchmarks.bench_image_loader --repeat 5 --output png.json
+"""
+import argparse
+import os
+import statistics
+import struct
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+
+import numpy as np
+
+from benchmarks.common import (
+    environment, find_invoice_images, jpeg_dimensions, synthesize_invoice,
+    write_json
+)
+from src.managers.image_loader import PNG_SIGNATURE, PngDecoder, encode_png
+
+
+def naive_decode(data: bytes) -> list:
+    """
+    Decodificador de PNG em Python puro, byte a byte, usado como
+    referência. Suporta apenas imagens RGB e RGBA de 8 bits.
+
+    Args:
+        data (bytes): O conteúdo da imagem.
+
+    Returns:
+        list: Linhas da imagem em tons de cinza.
+    """
+    position = 8
+    idat = b''
+    while position < len(data):
+        (length,) = struct.unpack('>I', data[position:position + 4])
+        kind = data[position + 4:position + 8]
+        if kind == b'IHDR':
+            width, height, _, color_type = struct.unpack(
+                '>IIBB', data[position + 8:position + 18]
+            )
+        elif kind == b'IDAT':
+            idat += data[position + 8:position + 8 + length]
+        position += 12 + length
+
+    bpp = 4 if color_type == 6 else 3
+    stride = width * bpp
+    raw = zlib.decompress(idat)
+    prior = [0] * stride
+    image = []
+    for y in range(height):
+        start = y * (stride + 1)
+        kind = raw[start]
+        line = list(raw[start + 1:start + 1 + stride])
+        for x in range(stride):
+            left = line[x - bpp] if x >= bpp else 0
+            up = prior[x]
+            up_left = prior[x - bpp] if x >= bpp else 0
+            if kind == 1:
+                predictor = left
+            elif kind == 2:
+                predictor = up
+            elif kind == 3:
+                predictor = (left + up) // 2
+            elif kind == 4:
+                estimate = left + up - up_left
+                distances = [
+                    abs(estimate - left), abs(estimate - up),
+                    abs(estimate - up_left)
+                ]
+                predictor = [left, up, up_left][
+                    distances.index(min(distances))
+                ]
+            else:
+                predictor = 0
+            line[x] = (line[x] + predictor) % 256
+        prior = line
+        gray = []
+        for x in range(0, stride, bpp):
+            value = (line[x] * 77 + line[x + 1] * 150 + line[x + 2] * 29
+                     + 128) >> 8
+            gray.append(value)
+        image.append(gray)
+    return image
+
+
+def prepare_images(directory: str) -> list:
+    """
+    Prepara as imagens PNG do benchmark a partir das faturas em IMGS/.
+
+    Args:
+        directory (str): Diretório onde as imagens sintéticas são salvas.
+
+    Returns:
+        list: Caminhos das imagens PNG.
+    """
+    paths = []
+    for index, path in enumerate(find_invoice_images()):
+        with open(path, 'rb') as file:
+            is_png = file.read(8) == PNG_SIGNATURE
+        if is_png:
+            paths.append(path)
+            continue
+        dimensions = jpeg_dimensions(path)
+        if dimensions is None:
+            continue
+        pixels = synthesize_invoice(*dimensions, seed=index)
+        target = os.path.join(directory, os.path.basename(path))
+        with open(target, 'wb') as file:
+            file.write(encode_png(pixels))
+        paths.append(target)
+    return paths
+
+
+def measure(decode, images: list, repeat: int) -> dict:
+    """
+    Mede o tempo de um decodificador e o pico de memória na
+    decodificação da primeira imagem.
+
+    Args:
+        decode (Callable): Função que recebe os bytes de uma imagem.
+        images (list): Conteúdo das imagens.
+        repeat (int): Quantidade de repetições da medição de tempo.
+
+    Returns:
+        dict: Mediana do tempo por imagem em milissegundos e pico de
+        memória em MiB.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for data in images:
+            decode(data)
+        timings.append((time.perf_counter() - start) / len(images))
+
+    tracemalloc.start()
+    decode(images[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'ms_per_image': statistics.median(timings) * 1000,
+        'peak_mib': peak / 2 ** 20,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Quantidade de repetições de cada medição.')
+    parser.add_argument('--output', help='Arquivo JSON com o resultado.')
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = prepare_images(directory)
+        if not paths:
+            sys.exit('Nenhuma imagem de fatura encontrada em IMGS/.')
+        images = []
+        for path in paths:
+            with open(path, 'rb') as file:
+                images.append(file.read())
+
+        decoder = PngDecoder()
+        reference = np.array(naive_decode(images[0]), dtype=np.uint8)
+        if not np.array_equal(decoder.decode(images[0], True), reference):
+            sys.exit('O PngDecoder divergiu do decodificador ingênuo.')
+
+        results = {
+            'naive': measure(naive_decode, images, 1),
+            'numpy': measure(
+                lambda data: decoder.decode(data, grayscale=True),
+                images, arguments.repeat
+            ),
+        }
+        batch_file = os.path.join(directory, 'lote.npy')
+        start = time.perf_counter()
+        PngDecoder().decode_batch(paths, memmap_file=batch_file)
+        results['numpy_memmap_batch'] = {
+            'ms_per_image': (time.perf_counter() - start) * 1000 / len(paths),
+        }
+
+    speedup = (
+        results['naive']['ms_per_image'] / results['numpy']['ms_per_image']
+    )
+    print(f'{len(paths)} imagem(ns) PNG')
+    print(f'{"decodificador":>20} {"ms/imagem":>10} {"pico MiB":>9}')
+    for name, result in results.items():
+        peak = result.get('peak_mib')
+        peak_text = f'{peak:>9.1f}' if peak is not None else f'{"-":>9}'
+        print(f'{name:>20} {result["ms_per_image"]:>10.1f} {peak_text}')
+    print(f'Speedup do PngDecoder: {speedup:.1f}x')
+
+    if arguments.output:
+        write_json(arguments.output, {
+            'environment': environment(),
+            'images': len(paths),
+            'results': results,
+            'speedup': speedup,
+        })
+
+
+if __name__ == '__main__':
+    main()
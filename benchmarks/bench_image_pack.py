@@ -0,0 +1,161 @@
+"""
+Benchmark do armazenamento das faturas em pacote (src/managers/image_pack.py).
+
+Compara o pacote de imagens com o armazenamento em arquivos individuais
+(um PNG por fatura em IMGS/<execução>) em três operações: gravação de todas
+as imagens de uma execução, listagem das faturas armazenadas (incluindo a
+abertura do pacote e a leitura do índice) e leitura de faturas individuais
+em ordem aleatória. O conteúdo das imagens é o das faturas de IMGS/,
+repetido até a quantidade de imagens desejada.
+
+Uso:
+    python -m benchmarks.bench_image_pack
+    python -m benchmarks.bench_image_pack --images 100000 --output pack.json
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks.common import environment, find_invoice_images, write_json
+from src.managers.image_pack import ImagePack
+
+
+def load_contents() -> list:
+    """
+    Lê o conteúdo das faturas de IMGS/.
+
+    Returns:
+        list: O conteúdo de cada imagem.
+    """
+    contents = []
+    for path in find_invoice_images():
+        with open(path, 'rb') as file:
+            contents.append(file.read())
+    return contents
+
+
+def bench_files(directory: str, keys: list, contents: list,
+                reads: list) -> dict:
+    """
+    Mede o armazenamento em arquivos individuais.
+
+    Returns:
+        dict: Tempo em segundos de cada operação.
+    """
+    start = time.perf_counter()
+    for index, key in enumerate(keys):
+        path = os.path.join(directory, f'{key}.png')
+        with open(path, 'wb') as file:
+            file.write(contents[index % len(contents)])
+    write = time.perf_counter() - start
+
+    start = time.perf_counter()
+    listed = [
+        entry.name[:-4] for entry in os.scandir(directory)
+        if entry.name.endswith('.png')
+    ]
+    listing = time.perf_counter() - start
+
+    start = time.perf_counter()
+    size = 0
+    for key in reads:
+        with open(os.path.join(directory, f'{key}.png'), 'rb') as file:
+            size += len(file.read())
+    read = time.perf_counter() - start
+    return {
+        'write': write, 'list': listing, 'read': read,
+        'listed': len(listed), 'bytes_read': size,
+    }
+
+
+def bench_pack(file: str, keys: list, contents: list, reads: list) -> dict:
+    """
+    Mede o armazenamento em pacote.
+
+    Returns:
+        dict: Tempo em segundos de cada operação.
+    """
+    start = time.perf_counter()
+    image_pack = ImagePack(file)
+    for index, key in enumerate(keys):
+        image_pack.put(key, contents[index % len(contents)])
+    image_pack.close()
+    write = time.perf_counter() - start
+
+    start = time.perf_counter()
+    image_pack = ImagePack(file, readonly=True)
+    listed = image_pack.keys()
+    listing = time.perf_counter() - start
+
+    start = time.perf_counter()
+    size = 0
+    for key in reads:
+        size += len(image_pack.get(key))
+    read = time.perf_counter() - start
+    image_pack.close()
+    return {
+        'write': write, 'list': listing, 'read': read,
+        'listed': len(listed), 'bytes_read': size,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--images', type=int, default=20000,
+                        help='Quantidade de imagens gravadas.')
+    parser.add_argument('--reads', type=int, default=2000,
+                        help='Quantidade de leituras individuais.')
+    parser.add_argument('--directory', default=None,
+                        help='Diretório temporário das medições.')
+    parser.add_argument('--output', help='Arquivo JSON com o resultado.')
+    arguments = parser.parse_args()
+
+    contents = load_contents()
+    if not contents:
+        sys.exit('Nenhuma imagem de fatura encontrada em IMGS/.')
+    keys = [str(100000 + index) for index in range(arguments.images)]
+    reads = random.Random(0).choices(keys, k=arguments.reads)
+
+    directory = tempfile.mkdtemp(dir=arguments.directory)
+    try:
+        directory_files = os.path.join(directory, 'files')
+        os.makedirs(directory_files)
+        results = {
+            'files': bench_files(directory_files, keys, contents, reads),
+            'pack': bench_pack(
+                os.path.join(directory, 'run.pack'), keys, contents, reads
+            ),
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    if results['files']['bytes_read'] != results['pack']['bytes_read']:
+        sys.exit('O pacote divergiu do armazenamento em arquivos.')
+
+    print(f'{arguments.images} imagem(ns), {arguments.reads} leitura(s)')
+    print(f'{"operação":>10} {"arquivos (s)":>13} {"pacote (s)":>11} '
+          f'{"speedup":>8}')
+    speedups = {}
+    for operation in ('write', 'list', 'read'):
+        files = results['files'][operation]
+        pack = results['pack'][operation]
+        speedups[operation] = files / pack if pack else float('inf')
+        print(f'{operation:>10} {files:>13.4f} {pack:>11.4f} '
+              f'{speedups[operation]:>7.1f}x')
+
+    if arguments.output:
+        write_json(arguments.output, {
+            'environment': environment(),
+            'images': arguments.images,
+            'reads': arguments.reads,
+            'results': results,
+            'speedup': speedups,
+        })
+
+
+if __name__ == '__main__':
+    main()
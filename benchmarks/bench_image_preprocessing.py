@@ -0,0 +1,128 @@
+"""
+Benchmark das funções de pré-processamento de imagens PNG para o OCR
+(src/managers/image_preprocessing.py), que não são aplicadas às faturas
+JPEG do site no fluxo do main.py.
+
+Mede o tempo por imagem de cada etapa (binarização, remoção de ruído,
+estimativa da inclinação e segmentação das regiões) e do pré-processamento
+completo, imagem a imagem e em lote, nas faturas em IMGS/. As faturas são
+lidas com o Pillow, quando instalado; caso contrário, são geradas faturas
+sintéticas, levemente inclinadas, com as dimensões das imagens de IMGS/.
+
+Uso:
+    python -m benchmarks.bench_image_preprocessing
+    python -m benchmarks.bench_image_preprocessing --repeat 5 --output pre.json
+"""
+import argparse
+import statistics
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.common import (
+    environment, find_invoice_images, jpeg_dimensions, synthesize_invoice,
+    write_json
+)
+from src.managers.image_loader import to_grayscale
+from src.managers.image_preprocessing import (
+    adaptive_threshold, deskew, estimate_skew, find_regions, preprocess,
+    preprocess_batch, remove_noise
+)
+
+
+def load_images() -> tuple:
+    """
+    Carrega as faturas de IMGS/ em tons de cinza.
+
+    Returns:
+        tuple: As imagens e a origem ('pillow' ou 'sintética').
+    """
+    paths = find_invoice_images()
+    try:
+        from PIL import Image
+    except ImportError:
+        images = []
+        for index, path in enumerate(paths):
+            dimensions = jpeg_dimensions(path)
+            if dimensions is None:
+                continue
+            gray = to_grayscale(synthesize_invoice(*dimensions, seed=index))
+            images.append(deskew(gray, (index % 5) - 2.0))
+        return images, 'sintética'
+    images = [np.asarray(Image.open(path).convert('L')) for path in paths]
+    return images, 'pillow'
+
+
+def timed(function, repeat: int) -> tuple:
+    """
+    Executa uma função várias vezes e mede a mediana do tempo.
+
+    Returns:
+        tuple: O resultado da última execução e a mediana em segundos.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - start)
+    return result, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Quantidade de repetições de cada medição.')
+    parser.add_argument('--output', help='Arquivo JSON com o resultado.')
+    arguments = parser.parse_args()
+
+    images, source = load_images()
+    if not images:
+        sys.exit('Nenhuma imagem de fatura encontrada em IMGS/.')
+    repeat = arguments.repeat
+
+    stages = {}
+    for image in images:
+        binary, seconds = timed(lambda: adaptive_threshold(image), repeat)
+        stages.setdefault('threshold', []).append(seconds)
+        binary, seconds = timed(lambda: remove_noise(binary), repeat)
+        stages.setdefault('noise_removal', []).append(seconds)
+        angle, seconds = timed(lambda: estimate_skew(binary), repeat)
+        stages.setdefault('skew_estimate', []).append(seconds)
+        _, seconds = timed(lambda: find_regions(binary), repeat)
+        stages.setdefault('regions', []).append(seconds)
+        _, seconds = timed(lambda: preprocess(image), repeat)
+        stages.setdefault('full_single', []).append(seconds)
+
+    shapes = [image.shape for image in images]
+    height = max(shape[0] for shape in shapes)
+    width = max(shape[1] for shape in shapes)
+    batch = np.full((len(images), height, width), 255, dtype=np.uint8)
+    for index, image in enumerate(images):
+        batch[index, :image.shape[0], :image.shape[1]] = image
+    results, seconds = timed(lambda: preprocess_batch(batch, shapes), repeat)
+
+    summary = {
+        name: statistics.mean(values) * 1000 for name, values in stages.items()
+    }
+    summary['full_batch'] = seconds * 1000 / len(images)
+
+    print(f'{len(images)} imagem(ns) ({source}), {height}x{width}')
+    print(f'{"etapa":>15} {"ms/imagem":>10}')
+    for name, milliseconds in summary.items():
+        print(f'{name:>15} {milliseconds:>10.1f}')
+    angles = ', '.join(f'{result["angle"]:+.1f}' for result in results)
+    print(f'Inclinações corrigidas: {angles}')
+
+    if arguments.output:
+        write_json(arguments.output, {
+            'environment': environment(),
+            'images': len(images),
+            'source': source,
+            'ms_per_image': summary,
+            'angles': [result['angle'] for result in results],
+        })
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark do custo por chamada do Logger (src/managers/logger.py).
+
+Mede, em um laço que simula as mensagens por fatura do estado PROCESS, o
+tempo gasto pela thread que registra cada mensagem: com a gravação
+síncrona no arquivo, com a fila e a thread em segundo plano, com a fila e
+a saída em JSON Lines e com a fila e a amostragem das mensagens por
+fatura. O tempo até a gravação de todas as mensagens enfileiradas também
+é registrado.
+
+Uso:
+    python -m benchmarks.bench_logger
+    python -m benchmarks.bench_logger --messages 200000 --output logger.json
+"""
+import argparse
+import shutil
+import tempfile
+import time
+
+from benchmarks.common import environment, write_json
+from src.managers.logger import Logger
+
+
+SCENARIOS = {
+    'sync': {},
+    'queue': {'asynchronous': True},
+    'queue_json': {'asynchronous': True, 'json_lines': True},
+    'queue_sample_10': {'asynchronous': True, 'sample_every': 10},
+}
+
+
+def run_scenario(directory: str, name: str, options: dict,
+                 messages: int) -> dict:
+    """
+    Registra as mensagens com um Logger configurado pelo cenário.
+
+    Args:
+        directory (str): Diretório dos logs.
+        name (str): Nome do cenário (e do logger).
+        options (dict): Opções do Logger.
+        messages (int): Quantidade de mensagens.
+
+    Returns:
+        dict: Nanossegundos por chamada na thread que registra as
+        mensagens e segundos até a gravação de todas as mensagens.
+    """
+    logger = Logger(directory, name=f'Bench-{name}', **options)
+    start = time.perf_counter()
+    for index in range(messages):
+        logger.info(
+            'Linha da fatura %s adicionada com sucesso no arquivo CSV.',
+            index, row=True, fatura=index
+        )
+    elapsed = time.perf_counter() - start
+    logger.shutdown()
+    logger.flush()
+    total = time.perf_counter() - start
+    return {
+        'ns_per_call': elapsed / messages * 1e9,
+        'seconds_total': total,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--messages', type=int, default=50000,
+                        help='Quantidade de mensagens por cenário.')
+    parser.add_argument('--output', help='Arquivo JSON com o resultado.')
+    arguments = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    results = {}
+    try:
+        for name, options in SCENARIOS.items():
+            results[name] = run_scenario(
+                directory, name, options, arguments.messages
+            )
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(f'{arguments.messages} mensagem(ns) por cenário')
+    for name, result in results.items():
+        print(f'{name:>16} {result["ns_per_call"]:>9.0f} ns/chamada '
+              f'{result["seconds_total"]:>8.3f}s total')
+    print(f'Fila: {results["sync"]["ns_per_call"] / results["queue"]["ns_per_call"]:.1f}x '
+          f'menos tempo por chamada na thread de processamento')
+
+    if arguments.output:
+        write_json(arguments.output, {
+            'environment': environment(),
+            'messages': arguments.messages,
+            'results': results,
+        })
+
+
+if __name__ == '__main__':
+    main()
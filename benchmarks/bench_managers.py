@@ -0,0 +1,419 @@
+"""
+Micro-benchmarks de escalabilidade do CsvManager, DirectoryManager e utils.
+
+Cada operação é executada sobre tamanhos de entrada em progressão
+geométrica (linhas do CSV, arquivos no diretório ou datas), medindo o
+menor tempo entre as repetições e o pico de memória alocada (tracemalloc).
+A complexidade empírica é estimada pelo expoente da curva tempo x tamanho
+(regressão em escala log-log nos maiores tamanhos). Nas operações por
+linha (add_data, consultas e move_file), o tamanho é o da estrutura já
+existente e são medidas CALLS chamadas: O(n) por chamada significa O(n²)
+para processar n faturas. O resultado é comparado com o baseline salvo em
+benchmarks/baselines/managers.json: uma complexidade maior ou um tempo no
+maior tamanho acima da tolerância é sinalizado como regressão, com código
+de saída 1.
+
+Uso:
+    python -m benchmarks.bench_managers
+    python -m benchmarks.bench_managers --only csv. --sizes 100 1000 10000
+    python -m benchmarks.bench_managers --save-baseline
+"""
+import argparse
+import gc
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import pandas as pd
+
+from benchmarks.common import (
+    DIRECTORY_BASELINES, environment, read_json, write_json
+)
+from src.managers.csv_manager import CsvManager
+from src.managers.directory_manager import DirectoryManager
+from src.managers.utils import check_date_before_or_today, format_date
+
+
+FILE_BASELINE = os.path.join(DIRECTORY_BASELINES, 'managers.json')
+
+# Expoente de cada modelo de complexidade (tempo proporcional a n^k).
+MODELS = {'O(1)': 0, 'O(n)': 1, 'O(n²)': 2, 'O(n³)': 3}
+
+# Quantidade de chamadas por medição das operações medidas por chamada.
+CALLS = 20
+
+COLUMNS = ['NUMERO_DA_FATURA', 'DATA_DA_FATURA', 'URL_DA_FATURA']
+
+
+def invoice_rows(count: int) -> list:
+    """
+    Gera linhas com o formato das faturas do CSV.
+
+    Args:
+        count (int): Quantidade de linhas.
+
+    Returns:
+        list: Dicionários com as colunas do CSV.
+    """
+    start = date(2024, 1, 1)
+    return [
+        {
+            'NUMERO_DA_FATURA': str(100000 + index),
+            'DATA_DA_FATURA': (start + timedelta(days=index % 730))
+            .strftime('%d-%m-%Y'),
+            'URL_DA_FATURA': f'https://site/invoices/{index}.jpg',
+        }
+        for index in range(count)
+    ]
+
+
+def csv_manager(directory: str, count: int) -> CsvManager:
+    """
+    Cria um arquivo CSV com `count` linhas e retorna o seu CsvManager.
+
+    Args:
+        directory (str): Diretório do arquivo.
+        count (int): Quantidade de linhas.
+
+    Returns:
+        CsvManager: O gerenciador do arquivo.
+    """
+    file = os.path.join(directory, 'FATURAS.csv')
+    pd.DataFrame(invoice_rows(count), columns=COLUMNS).to_csv(
+        file, index=False
+    )
+    manager = CsvManager(file)
+    manager._convert_columns_to_str()
+    return manager
+
+
+def files_directory(directory: str, count: int) -> DirectoryManager:
+    """
+    Cria um diretório com `count` imagens vazias e retorna o seu
+    DirectoryManager.
+
+    Args:
+        directory (str): Diretório base.
+        count (int): Quantidade de arquivos.
+
+    Returns:
+        DirectoryManager: O gerenciador do diretório de imagens.
+    """
+    images = os.path.join(directory, 'IMGS')
+    os.makedirs(images)
+    for index in range(count):
+        with open(os.path.join(images, f'{100000 + index}.png'), 'wb'):
+            pass
+    # Data de modificação antiga, fora do intervalo em que o índice do
+    # DirectoryManager não é reaproveitado.
+    old = time.time() - 60
+    os.utime(images, (old, old))
+    return DirectoryManager(images)
+
+
+def setup_csv(directory: str, count: int):
+    return (
+        csv_manager(directory, count), count,
+        invoice_rows(count + CALLS)[count:]
+    )
+
+
+def run_add_data(state):
+    manager, _, rows = state
+    for row in rows:
+        manager.add_data(row)
+
+
+def run_add_data_save_file(state):
+    manager, _, rows = state
+    for row in rows:
+        manager.add_data(row)
+        manager.save_file()
+
+
+def run_save_file(state):
+    manager, _, _ = state
+    manager.save_file()
+
+
+def run_row_exists(state):
+    manager, count, _ = state
+    for index in range(CALLS):
+        manager.row_exists(
+            'NUMERO_DA_FATURA', str(100000 + index * count // CALLS)
+        )
+
+
+def run_update_cell_by_query(state):
+    manager, count, _ = state
+    for index in range(CALLS):
+        manager.update_cell_by_query(
+            'NUMERO_DA_FATURA', str(100000 + index * count // CALLS),
+            'URL_DA_FATURA', 'processada'
+        )
+
+
+def setup_directory(directory: str, count: int):
+    return files_directory(directory, count), count, directory
+
+
+def run_search_files(state):
+    manager, count, _ = state
+    for index in range(CALLS):
+        manager.search_files(str(100000 + index * count // CALLS))
+
+
+def run_delete_files(state):
+    manager, _, _ = state
+    manager.delete_files()
+
+
+def run_move_file(state):
+    manager, count, directory = state
+    destination = os.path.join(directory, 'MOVIDOS')
+    for index in range(CALLS):
+        manager.move_file(
+            os.path.join(
+                manager.directory, f'{100000 + index * count // CALLS}.png'
+            ),
+            destination
+        )
+
+
+def setup_dates(directory: str, count: int):
+    return [row['DATA_DA_FATURA'] for row in invoice_rows(count)]
+
+
+def run_check_date_before_or_today(dates):
+    for value in dates:
+        check_date_before_or_today(value)
+
+
+def run_format_date(dates):
+    for value in dates:
+        format_date(value)
+
+
+# Operações medidas: nome, preparação (não medida), execução e se o
+# tamanho é o do lote processado ('lote') ou o da estrutura sobre a qual
+# são feitas CALLS chamadas ('chamada'). Nas operações por chamada, uma
+# complexidade O(n) significa O(n²) para processar n faturas, como na
+# gravação do CSV inteiro a cada linha adicionada.
+OPERATIONS = [
+    ('csv.add_data', setup_csv, run_add_data, 'chamada'),
+    ('csv.add_data+save_file', setup_csv, run_add_data_save_file,
+     'chamada'),
+    ('csv.save_file', setup_csv, run_save_file, 'lote'),
+    ('csv.row_exists', setup_csv, run_row_exists, 'chamada'),
+    ('csv.update_cell_by_query', setup_csv, run_update_cell_by_query,
+     'chamada'),
+    ('directory.search_files', setup_directory, run_search_files,
+     'chamada'),
+    ('directory.delete_files', setup_directory, run_delete_files, 'lote'),
+    ('directory.move_file', setup_directory, run_move_file, 'chamada'),
+    ('utils.check_date_before_or_today', setup_dates,
+     run_check_date_before_or_today, 'lote'),
+    ('utils.format_date', setup_dates, run_format_date, 'lote'),
+]
+
+
+def measure(setup, run, size: int, repeat: int) -> dict:
+    """
+    Mede uma operação em um tamanho de entrada.
+
+    A preparação é refeita antes de cada repetição, em um diretório
+    temporário novo. O tempo é o menor entre as repetições, sem o
+    tracemalloc; o pico de memória é medido em uma execução a parte.
+
+    Args:
+        setup (Callable): Prepara o estado da operação.
+        run (Callable): Executa a operação sobre o estado.
+        size (int): Tamanho da entrada.
+        repeat (int): Quantidade de repetições do tempo.
+
+    Returns:
+        dict: Tamanho, tempo em segundos e pico de memória em bytes.
+    """
+    times = []
+    for attempt in range(repeat + 1):
+        directory = tempfile.mkdtemp()
+        try:
+            state = setup(directory, size)
+            gc.collect()
+            if attempt < repeat:
+                start = time.perf_counter()
+                run(state)
+                times.append(time.perf_counter() - start)
+            else:
+                tracemalloc.start()
+                run(state)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+    return {'size': size, 'seconds': min(times), 'peak_bytes': peak}
+
+
+def fit_complexity(points: list) -> dict:
+    """
+    Estima a complexidade empírica de uma curva tempo x tamanho.
+
+    O expoente é a inclinação da regressão linear de log(tempo) sobre
+    log(tamanho) na metade superior dos tamanhos, onde o custo fixo por
+    chamada deixa de dominar o tempo. O modelo é o de MODELS com o
+    expoente mais próximo.
+
+    Args:
+        points (list): Medições com 'size' e 'seconds'.
+
+    Returns:
+        dict: Expoente e modelo de complexidade.
+    """
+    upper = points[-max(2, (len(points) + 1) // 2):]
+    logs_n = [math.log(point['size']) for point in upper]
+    logs_t = [math.log(max(point['seconds'], 1e-9)) for point in upper]
+    mean_n = sum(logs_n) / len(logs_n)
+    mean_t = sum(logs_t) / len(logs_t)
+    variance = sum((value - mean_n) ** 2 for value in logs_n)
+    exponent = sum(
+        (x - mean_n) * (y - mean_t) for x, y in zip(logs_n, logs_t)
+    ) / variance if variance else 0.0
+    model = min(MODELS, key=lambda name: abs(MODELS[name] - exponent))
+    return {'exponent': exponent, 'model': model}
+
+
+def run_benchmarks(sizes: list, repeat: int, only: str = None) -> dict:
+    """
+    Executa as operações sobre os tamanhos informados.
+
+    Args:
+        sizes (list): Tamanhos das entradas.
+        repeat (int): Quantidade de repetições do tempo.
+        only (str, opcional): Prefixo do nome das operações executadas.
+
+    Returns:
+        dict: Medições e complexidade por operação.
+    """
+    operations = {}
+    for name, setup, run, unit in OPERATIONS:
+        if only and not name.startswith(only):
+            continue
+        points = [measure(setup, run, size, repeat) for size in sizes]
+        operations[name] = {
+            'unit': unit, 'points': points, **fit_complexity(points)
+        }
+        print_operation(name, operations[name])
+    return operations
+
+
+def print_operation(name: str, operation: dict):
+    """Exibe as medições e a complexidade de uma operação."""
+    curve = '  '.join(
+        f'{point["size"]}: {point["seconds"] * 1000:.2f}ms/'
+        f'{point["peak_bytes"] / 2 ** 20:.1f}MiB'
+        for point in operation['points']
+    )
+    print(f'{name:<34} {operation["model"]:<6} por {operation["unit"]:<8} '
+          f'(expoente {operation["exponent"]:.2f})  {curve}')
+
+
+def compare(result: dict, baseline: dict, exponent_tolerance: float,
+            time_tolerance: float) -> list:
+    """
+    Compara o resultado com o baseline.
+
+    Args:
+        result (dict): Resultado atual.
+        baseline (dict): Resultado salvo como baseline.
+        exponent_tolerance (float): Aumento máximo aceito no expoente.
+        time_tolerance (float): Aumento relativo máximo aceito no tempo
+        do maior tamanho medido nos dois resultados.
+
+    Returns:
+        list: Descrição das regressões encontradas.
+    """
+    regressions = []
+    for name, operation in result['operations'].items():
+        expected = baseline['operations'].get(name)
+        if expected is None:
+            continue
+        if operation['exponent'] > expected['exponent'] + exponent_tolerance:
+            regressions.append(
+                f'{name}: complexidade {operation["model"]} (expoente '
+                f'{operation["exponent"]:.2f}), baseline {expected["model"]} '
+                f'(expoente {expected["exponent"]:.2f}).'
+            )
+        times = {point['size']: point['seconds']
+                 for point in expected['points']}
+        common = [point for point in operation['points']
+                  if point['size'] in times]
+        if common:
+            point = common[-1]
+            limit = times[point['size']] * (1 + time_tolerance)
+            if point['seconds'] > limit:
+                regressions.append(
+                    f'{name}: {point["seconds"] * 1000:.2f}ms com tamanho '
+                    f'{point["size"]}, acima do limite de {limit * 1000:.2f}ms '
+                    f'(baseline {times[point["size"]] * 1000:.2f}ms).'
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[100, 316, 1000, 3162, 10000, 31623],
+                        help='Tamanhos das entradas.')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Repetições por tamanho (é usado o menor tempo).')
+    parser.add_argument('--only',
+                        help='Executa só as operações com esse prefixo.')
+    parser.add_argument('--baseline', default=FILE_BASELINE,
+                        help='Arquivo JSON do baseline.')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Salva o resultado como o novo baseline.')
+    parser.add_argument('--exponent-tolerance', type=float, default=0.3,
+                        help='Aumento aceito no expoente da complexidade.')
+    parser.add_argument('--time-tolerance', type=float, default=1.0,
+                        help='Aumento relativo de tempo aceito (padrão 100%%).')
+    parser.add_argument('--output', help='Arquivo JSON com o resultado.')
+    arguments = parser.parse_args()
+
+    result = {
+        'environment': environment(),
+        'calls': CALLS,
+        'repeat': arguments.repeat,
+        'operations': run_benchmarks(
+            arguments.sizes, arguments.repeat, arguments.only
+        ),
+    }
+
+    if arguments.output:
+        write_json(arguments.output, result)
+    if arguments.save_baseline:
+        write_json(arguments.baseline, result)
+        print(f'Baseline salvo em {arguments.baseline}')
+        return
+
+    baseline = read_json(arguments.baseline)
+    if baseline is None:
+        print('Nenhum baseline encontrado para comparação.')
+        return
+    regressions = compare(
+        result, baseline,
+        arguments.exponent_tolerance, arguments.time_tolerance
+    )
+    for regression in regressions:
+        print(f'REGRESSÃO: {regression}')
+    if regressions:
+        sys.exit(1)
+    print('Nenhuma regressão em relação ao baseline.')
+
+
+if __name__ == '__main__':
+    main()
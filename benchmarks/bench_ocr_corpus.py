@@ -0,0 +1,312 @@
+"""
+Benchmark de acurácia e vazão do OCR sobre um corpus fixo de faturas.
+
+O corpus é formado pelas faturas de IMGS/ anotadas manualmente em
+benchmarks/ocr_corpus/annotations.json. O benchmark executa a etapa de OCR
+(o mesmo OcrManager e TesseractEngine do robô, sem o cache) e mede a vazão
+em imagens por segundo, a latência p50/p95 por imagem, o pico de memória
+residente (RSS) e a acurácia por campo. O resultado é comparado com o
+baseline salvo em benchmarks/baselines/ocr_corpus.json: uma queda de vazão
+ou de acurácia além das tolerâncias é sinalizada como regressão, com código
+de saída 1.
+
+Uso:
+    python -m benchmarks.bench_ocr_corpus
+    python -m benchmarks.bench_ocr_corpus --repeat 3 --output corpus.json
+    python -m benchmarks.bench_ocr_corpus --save-baseline
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+
+import config
+from benchmarks.common import (
+    BASE_DIRECTORY, DIRECTORY_BASELINES, environment, read_json, write_json
+)
+from src.managers.ocr_manager import OcrManager, TesseractEngine
+
+
+FILE_ANNOTATIONS = os.path.join(
+    BASE_DIRECTORY, 'benchmarks', 'ocr_corpus', 'annotations.json'
+)
+FILE_BASELINE = os.path.join(DIRECTORY_BASELINES, 'ocr_corpus.json')
+
+
+def load_corpus(file: str = FILE_ANNOTATIONS) -> list:
+    """
+    Carrega as anotações do corpus, resolvendo o caminho das imagens a
+    partir da raiz do projeto.
+
+    Args:
+        file (str): Arquivo JSON com as anotações.
+
+    Returns:
+        list: Itens com o caminho da imagem e os campos esperados.
+    """
+    corpus = read_json(file) or []
+    for item in corpus:
+        item['path'] = os.path.join(BASE_DIRECTORY, item['image'])
+    return [item for item in corpus if os.path.exists(item['path'])]
+
+
+def normalize(field: str, value: str) -> str:
+    """
+    Normaliza o valor de um campo antes da comparação, ignorando
+    diferenças de espaços, maiúsculas e separadores de milhar.
+
+    Args:
+        field (str): Nome do campo.
+        value (str): Valor do campo.
+
+    Returns:
+        str: Valor normalizado.
+    """
+    value = ' '.join(str(value or '').split())
+    if field == 'VALOR_TOTAL':
+        return value.replace(',', '')
+    return value.casefold()
+
+
+def percentile(values: list, fraction: float) -> float:
+    """
+    Calcula um percentil com interpolação linear.
+
+    Args:
+        values (list): Valores medidos.
+        fraction (float): Percentil entre 0 e 1.
+
+    Returns:
+        float: O percentil, ou 0.0 se não houver valores.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (
+        position - lower
+    )
+
+
+def peak_rss_mib() -> dict:
+    """
+    Retorna o pico de memória residente do processo e dos processos
+    filhos já finalizados (pool de OCR e Tesseract).
+
+    Returns:
+        dict: Pico de RSS em MiB do processo ('self') e do maior
+        processo filho ('children').
+    """
+    # No Linux ru_maxrss é informado em KiB; no macOS, em bytes.
+    unit = 1 if sys.platform == 'darwin' else 1024
+    return {
+        'self': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        * unit / 2 ** 20,
+        'children': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        * unit / 2 ** 20,
+    }
+
+
+def evaluate(corpus: list, results: dict, repeat: int) -> dict:
+    """
+    Compara os campos extraídos com as anotações do corpus.
+
+    Args:
+        corpus (list): Itens do corpus.
+        results (dict): Campos extraídos por chave '<índice>:<repetição>'.
+        repeat (int): Quantidade de repetições do corpus.
+
+    Returns:
+        dict: Acurácia geral, por campo e por imagem e a lista de campos
+        divergentes.
+    """
+    correct = {}
+    total = {}
+    images_correct = 0
+    mismatches = []
+    for index, item in enumerate(corpus):
+        for attempt in range(repeat):
+            extracted = results.get(f'{index}:{attempt}', {})
+            image_ok = True
+            for field, expected in item['fields'].items():
+                value = extracted.get(field, '')
+                ok = normalize(field, value) == normalize(field, expected)
+                total[field] = total.get(field, 0) + 1
+                correct[field] = correct.get(field, 0) + ok
+                if not ok:
+                    image_ok = False
+                    if attempt == 0:
+                        mismatches.append({
+                            'image': item['image'],
+                            'field': field,
+                            'expected': expected,
+                            'extracted': value,
+                        })
+            images_correct += image_ok
+
+    fields_total = sum(total.values())
+    return {
+        'overall': sum(correct.values()) / fields_total if fields_total else 0.0,
+        'images': images_correct / (len(corpus) * repeat) if corpus else 0.0,
+        'fields': {field: correct[field] / total[field] for field in total},
+        'mismatches': mismatches,
+    }
+
+
+def run_corpus(corpus: list, engine: TesseractEngine, workers: int,
+               repeat: int) -> dict:
+    """
+    Executa o OCR do corpus e mede vazão, latência, memória e acurácia.
+
+    Args:
+        corpus (list): Itens do corpus.
+        engine (TesseractEngine): Motor de OCR.
+        workers (int): Quantidade de processos do pool.
+        repeat (int): Quantidade de vezes que o corpus é processado.
+
+    Returns:
+        dict: O resultado do benchmark.
+    """
+    ocr = OcrManager(engine, workers)
+    start = time.perf_counter()
+    for attempt in range(repeat):
+        for index, item in enumerate(corpus):
+            ocr.submit(f'{index}:{attempt}', item['path'])
+    ocr.collect(wait=True)
+    seconds = time.perf_counter() - start
+    ocr.shutdown()
+
+    images = len(corpus) * repeat
+    latencies = list(ocr.timings.values())
+    return {
+        'environment': environment(),
+        'engine': engine.version(),
+        'workers': ocr.workers,
+        'images': images,
+        'errors': len(ocr.errors),
+        'seconds': seconds,
+        'images_per_second': images / seconds if seconds else 0.0,
+        'latency_seconds': {
+            'p50': percentile(latencies, 0.50),
+            'p95': percentile(latencies, 0.95),
+            'mean': sum(latencies) / len(latencies) if latencies else 0.0,
+        },
+        'peak_rss_mib': peak_rss_mib(),
+        'accuracy': evaluate(corpus, ocr.results, repeat),
+    }
+
+
+def compare(result: dict, baseline: dict, throughput_tolerance: float,
+            accuracy_tolerance: float) -> list:
+    """
+    Compara o resultado com o baseline.
+
+    Args:
+        result (dict): Resultado atual.
+        baseline (dict): Resultado salvo como baseline.
+        throughput_tolerance (float): Queda relativa máxima aceita na
+        vazão (0.10 = 10%).
+        accuracy_tolerance (float): Queda absoluta máxima aceita na
+        acurácia de cada campo e na geral.
+
+    Returns:
+        list: Mensagens das regressões encontradas.
+    """
+    regressions = []
+    minimum = baseline['images_per_second'] * (1 - throughput_tolerance)
+    if result['images_per_second'] < minimum:
+        regressions.append(
+            f'Vazão de {result["images_per_second"]:.2f} imagens/s abaixo do '
+            f'mínimo de {minimum:.2f} (baseline '
+            f'{baseline["images_per_second"]:.2f}).'
+        )
+
+    accuracies = {'geral': result['accuracy']['overall']}
+    accuracies.update(result['accuracy']['fields'])
+    expected = {'geral': baseline['accuracy']['overall']}
+    expected.update(baseline['accuracy']['fields'])
+    for name, value in accuracies.items():
+        if name in expected and value < expected[name] - accuracy_tolerance:
+            regressions.append(
+                f'Acurácia {name} de {value:.1%} abaixo do baseline '
+                f'({expected[name]:.1%}).'
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Quantas vezes o corpus é processado.')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Quantidade de processos do pool de OCR.')
+    parser.add_argument('--preprocess', action=argparse.BooleanOptionalAction,
+                        default=config.OCR_PREPROCESSING,
+                        help='Pré-processa as imagens antes do OCR.')
+    parser.add_argument('--baseline', default=FILE_BASELINE,
+                        help='Arquivo JSON do baseline.')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Salva o resultado como o novo baseline.')
+    parser.add_argument('--throughput-tolerance', type=float, default=0.10,
+                        help='Queda relativa de vazão aceita (padrão 10%%).')
+    parser.add_argument('--accuracy-tolerance', type=float, default=0.0,
+                        help='Queda absoluta de acurácia aceita.')
+    parser.add_argument('--output', help='Arquivo JSON com o resultado.')
+    arguments = parser.parse_args()
+
+    engine = TesseractEngine(
+        language=config.OCR_LANGUAGE, preprocess=arguments.preprocess
+    )
+    if not engine.is_available():
+        sys.exit('Tesseract não encontrado, benchmark de OCR cancelado.')
+    corpus = load_corpus()
+    if not corpus:
+        sys.exit('Nenhuma imagem do corpus encontrada.')
+
+    result = run_corpus(corpus, engine, arguments.workers, arguments.repeat)
+    accuracy = result['accuracy']
+    latency = result['latency_seconds']
+    print(f'{result["images"]} imagem(ns), {result["workers"]} processo(s), '
+          f'{result["errors"]} erro(s)')
+    print(f'Vazão: {result["images_per_second"]:.2f} imagens/s')
+    print(f'Latência: p50 {latency["p50"]:.3f}s, p95 {latency["p95"]:.3f}s')
+    print(f'Pico de RSS: {result["peak_rss_mib"]["self"]:.1f} MiB '
+          f'(filhos {result["peak_rss_mib"]["children"]:.1f} MiB)')
+    print(f'Acurácia: {accuracy["overall"]:.1%} dos campos, '
+          f'{accuracy["images"]:.1%} das imagens')
+    for field, value in accuracy['fields'].items():
+        print(f'  {field}: {value:.1%}')
+    for mismatch in accuracy['mismatches']:
+        print(f'  Divergência em {mismatch["image"]} ({mismatch["field"]}): '
+              f'esperado "{mismatch["expected"]}", '
+              f'extraído "{mismatch["extracted"]}"')
+
+    if arguments.output:
+        write_json(arguments.output, result)
+    if arguments.save_baseline:
+        write_json(arguments.baseline, result)
+        print(f'Baseline salvo em {arguments.baseline}')
+        return
+
+    baseline = read_json(arguments.baseline)
+    if baseline is None:
+        print('Nenhum baseline encontrado para comparação.')
+        return
+    if baseline.get('engine') != result['engine']:
+        print(f'Atenção: baseline gerado com outro motor ({baseline["engine"]}).')
+    regressions = compare(
+        result, baseline,
+        arguments.throughput_tolerance, arguments.accuracy_tolerance
+    )
+    for regression in regressions:
+        print(f'REGRESSÃO: {regression}')
+    if regressions:
+        sys.exit(1)
+    print('Nenhuma regressão em relação ao baseline.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark de escalabilidade da etapa de OCR.
+
+Executa o OCR das imagens de faturas em IMGS/ com pools de 1 até N
+processos (N = núcleos disponíveis) e informa, para cada tamanho de
+pool, a vazão em imagens por segundo, o speedup e a eficiência em
+relação a um único processo. O tempo medido inclui a criação do pool.
+
+Uso:
+    python -m benchmarks.bench_ocr_scaling
+    python -m benchmarks.bench_ocr_scaling --repeat 8 --output ocr.json
+"""
+import argparse
+import sys
+import time
+
+from benchmarks.common import environment, find_invoice_images, write_json
+from src.managers.ocr_manager import (
+    OcrManager, TesseractEngine, available_cores
+)
+
+
+def worker_counts(cores: int) -> list:
+    """
+    Gera os tamanhos de pool avaliados: potências de 2 até a quantidade
+    de núcleos, incluindo a própria quantidade de núcleos.
+
+    Args:
+        cores (int): Quantidade de núcleos disponíveis.
+
+    Returns:
+        list: Tamanhos de pool em ordem crescente.
+    """
+    counts = []
+    workers = 1
+    while workers < cores:
+        counts.append(workers)
+        workers *= 2
+    counts.append(cores)
+    return counts
+
+
+def run(images: list, workers: int, engine: TesseractEngine) -> dict:
+    """
+    Executa o OCR de todas as imagens com um pool de tamanho fixo.
+
+    Args:
+        images (list): Caminhos das imagens.
+        workers (int): Quantidade de processos do pool.
+        engine (TesseractEngine): Motor de OCR.
+
+    Returns:
+        dict: Vazão da execução.
+    """
+    ocr = OcrManager(engine, workers)
+    start = time.perf_counter()
+    for index, path in enumerate(images):
+        ocr.submit(str(index), path)
+    ocr.collect(wait=True)
+    seconds = time.perf_counter() - start
+    ocr.shutdown()
+    return {
+        'workers': workers,
+        'images': len(images),
+        'errors': len(ocr.errors),
+        'seconds': seconds,
+        'images_per_second': len(images) / seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=4,
+                        help='Quantas vezes cada imagem é processada.')
+    parser.add_argument('--max-workers', type=int, default=None,
+                        help='Maior tamanho de pool avaliado.')
+    parser.add_argument('--output', help='Arquivo JSON com o resultado.')
+    arguments = parser.parse_args()
+
+    engine = TesseractEngine()
+    if not engine.is_available():
+        sys.exit('Tesseract não encontrado, benchmark de OCR cancelado.')
+
+    images = find_invoice_images() * arguments.repeat
+    if not images:
+        sys.exit('Nenhuma imagem de fatura encontrada em IMGS/.')
+
+    cores = arguments.max_workers or available_cores()
+    results = []
+    for workers in worker_counts(cores):
+        result = run(images, workers, engine)
+        results.append(result)
+
+    base = results[0]['images_per_second']
+    print(f'{"processos":>9} {"imagens/s":>10} {"speedup":>8} {"eficiência":>10}')
+    for result in results:
+        result['speedup'] = result['images_per_second'] / base
+        result['efficiency'] = result['speedup'] / result['workers']
+        print(
+            f'{result["workers"]:>9} {result["images_per_second"]:>10.2f} '
+            f'{result["speedup"]:>8.2f} {result["efficiency"]:>10.0%}'
+        )
+
+    if arguments.output:
+        write_json(arguments.output, {
+            'environment': environment(),
+            'results': results,
+        })
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""
+Benchmark do fluxo do main.py reproduzindo uma gravação, sem rede.
+
+Executa um ciclo completo da automação (`main.run_process`) no modo de
+reprodução: as páginas da tabela e as imagens das faturas vêm de uma
+gravação feita com `python main.py --record` (CAPTURES/<execução>.zip),
+com os arquivos gravados em um diretório temporário. Por padrão a
+gravação é reproduzida sem espera (velocidade 0), medindo apenas o custo
+do próprio robô (leitura das linhas, downloads, OCR e gravação dos
+arquivos); com `--speed 1`, as durações gravadas do site são reproduzidas.
+Sem uma gravação, `--synthetic` gera uma com as linhas e as imagens do
+site local (benchmarks/standin_site.py).
+
+Uso:
+    python -m benchmarks.bench_replay CAPTURES/17.01.2025_17.54.28.zip
+    python -m benchmarks.bench_replay --synthetic 1000 --repeat 3
+    python -m benchmarks.bench_replay ARQUIVO --speed 1 --ocr --output replay.json
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_e2e import redirect_directories
+from benchmarks.common import environment, synthesize_invoice, write_json
+from benchmarks.standin_site import build_rows
+import config
+import main as automation
+from src.managers.capture import CaptureRecorder
+from src.managers.image_loader import encode_png
+from src.managers.metrics import REGISTRY
+
+
+def synthetic_capture(file: str, rows: int, page_size: int = 10) -> str:
+    """
+    Gera uma gravação com as linhas elegíveis de uma tabela do site local
+    e imagens sintéticas das faturas, com durações nulas.
+
+    Args:
+        file (str): Caminho do arquivo ZIP.
+        rows (int): Quantidade de linhas da tabela.
+        page_size (int): Quantidade de linhas por página.
+
+    Returns:
+        str: O caminho do arquivo gravado.
+    """
+    url = 'http://127.0.0.1/'
+    eligible = [
+        {
+            'NUMERO_DA_FATURA': invoice_id,
+            'DATA_DA_FATURA': due_date,
+            'URL_DA_FATURA': f'{url}invoices/{invoice_id}.png',
+        }
+        for _, invoice_id, due_date in build_rows(rows, future_share=0.0)
+    ]
+    images = [encode_png(synthesize_invoice(240, 480, seed))
+              for seed in range(8)]
+    pages = [eligible[start:start + page_size]
+             for start in range(0, len(eligible), page_size)] or [[]]
+
+    recorder = CaptureRecorder()
+    recorder.start(file, url=url, synthetic=True)
+    recorder.record('open_site', 0.0, url=url)
+    recorder.record('date_filter', 0.0, max_date=None,
+                    total_rows=len(eligible))
+    for number, page in enumerate(pages, start=1):
+        recorder.record('rows', 0.0, page=number, rows=page)
+        for row_data in page:
+            recorder.record_response(
+                row_data['URL_DA_FATURA'], 200,
+                images[int(row_data['NUMERO_DA_FATURA']) % len(images)],
+                0.0, 'image/png'
+            )
+        last = number == len(pages)
+        recorder.record('next_disabled', 0.0, page=number,
+                        disabled=True if last else None)
+        if not last:
+            recorder.record('next_page', 0.0, page=number)
+    return recorder.stop()
+
+
+def run_replay(file: str, arguments: argparse.Namespace) -> dict:
+    """
+    Executa um ciclo completo da automação reproduzindo a gravação.
+
+    Args:
+        file (str): Caminho da gravação.
+        arguments (argparse.Namespace): Argumentos da linha de comando.
+
+    Returns:
+        dict: Linhas lidas, páginas, faturas baixadas, tempo total e
+        vazão do ciclo.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        original = {name: getattr(config, name) for name in dir(config)
+                    if name.isupper()}
+        try:
+            redirect_directories(directory)
+            config.REPLAY_FILE = file
+            config.REPLAY_SPEED = arguments.speed
+            config.OCR_ENABLED = arguments.ocr
+            config.INCREMENTAL_MODE = False
+            start = time.perf_counter()
+            success = automation.run_process()
+            seconds = time.perf_counter() - start
+        finally:
+            for name, value in original.items():
+                setattr(config, name, value)
+
+    rows_scanned = REGISTRY.total('rows_scanned_total')
+    pages = REGISTRY.value('state_seconds', state='PROCESS')
+    return {
+        'success': success,
+        'rows_scanned': rows_scanned,
+        'pages': pages,
+        'invoices': REGISTRY.total('invoices_downloaded_total'),
+        'seconds': seconds,
+        'rows_per_second': rows_scanned / seconds,
+        'pages_per_second': pages / seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('archive', nargs='?',
+                        help='Gravação feita com main.py --record.')
+    parser.add_argument('--synthetic', type=int, metavar='LINHAS',
+                        help='Gera uma gravação sintética com LINHAS linhas.')
+    parser.add_argument('--page-size', type=int, default=10,
+                        help='Linhas por página da gravação sintética.')
+    parser.add_argument('--speed', type=float, default=0.0,
+                        help='Velocidade da reprodução (1 tempos gravados, '
+                             '0 sem espera).')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='Quantidade de ciclos executados.')
+    parser.add_argument('--ocr', action='store_true',
+                        help='Executa também o OCR das faturas.')
+    parser.add_argument('--output', help='Arquivo JSON com o resultado.')
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        file = arguments.archive
+        if arguments.synthetic is not None:
+            file = synthetic_capture(
+                os.path.join(directory, 'synthetic.zip'),
+                arguments.synthetic, arguments.page_size
+            )
+        if not file:
+            sys.exit('Informe uma gravação ou utilize --synthetic.')
+
+        results = []
+        print(f'{"linhas":>8} {"páginas":>8} {"faturas":>8} '
+              f'{"tempo (s)":>10} {"linhas/s":>10} {"páginas/s":>10}')
+        for _ in range(arguments.repeat):
+            result = run_replay(file, arguments)
+            results.append(result)
+            print(f'{result["rows_scanned"]:>8.0f} {result["pages"]:>8.0f} '
+                  f'{result["invoices"]:>8.0f} {result["seconds"]:>10.2f} '
+                  f'{result["rows_per_second"]:>10.1f} '
+                  f'{result["pages_per_second"]:>10.2f}'
+                  + ('' if result['success'] else '  (falhou)'))
+
+    if arguments.output:
+        write_json(arguments.output, {
+            'environment': environment(),
+            'archive': arguments.archive,
+            'synthetic': arguments.synthetic,
+            'speed': arguments.speed,
+            'ocr': arguments.ocr,
+            'results': results,
+        })
+
+
+if __name__ == '__main__':
+    main()
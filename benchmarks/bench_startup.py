@@ -0,0 +1,249 @@
+"""
+Benchmark do tempo de inicialização do processo do main.py.
+
+Cada medida é feita em um novo interpretador, como em uma execução real:
+o tempo desde o início do processo até o fim da importação do main.py e
+até a primeira ação da automação (logger criado e máquina de estados
+montada, imediatamente antes do estado INITIALIZATION), comparado com um
+interpretador que não importa nada. O custo de importação de cada módulo
+é medido com `python -X importtime`.
+
+Os tempos são comparados com o orçamento (BUDGET_MS e MODULE_BUDGET_MS)
+e as dependências pesadas (LAZY_DEPENDENCIES) não podem ser importadas
+antes da primeira ação: um tempo acima do orçamento ou uma dessas
+dependências importada termina com código de saída 1.
+
+Uso:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --repeat 20 --top 20 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import environment, write_json
+
+
+DIRECTORY_PROJECT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Orçamento, em milissegundos, de cada etapa da inicialização (mediana das
+# repetições, desde o início do processo).
+BUDGET_MS = {'import main': 150.0, 'first action': 200.0}
+
+# Orçamento, em milissegundos, do tempo cumulativo de importação de cada
+# módulo importado diretamente pelo main.py (DEFAULT para os não listados).
+MODULE_BUDGET_MS = {'DEFAULT': 20.0}
+
+# Dependências importadas apenas quando utilizadas, nunca na inicialização.
+LAZY_DEPENDENCIES = ('pandas', 'numpy', 'selenium', 'requests', 'http.server')
+
+CHILD = '''
+import json
+import sys
+import time
+
+import main
+
+imported = time.time()
+main.config.refresh_execution()
+machine = main.build_state_machine(main.create_logger())
+ready = time.time()
+print(json.dumps({
+    'imported': imported,
+    'ready': ready,
+    'lazy_loaded': [name for name in %r if name in sys.modules],
+}))
+''' % (LAZY_DEPENDENCIES,)
+
+
+def run_child(code: str, directory: str, *options: str) -> tuple:
+    """
+    Executa o código em um novo interpretador, a partir do diretório
+    informado e com o projeto no PYTHONPATH.
+
+    Args:
+        code (str): Código executado.
+        directory (str): Diretório de trabalho do processo.
+        *options (str): Opções do interpretador (por exemplo, '-X',
+        'importtime').
+
+    Returns:
+        tuple: O horário (epoch) do início do processo e o resultado do
+        subprocess.
+    """
+    environ = dict(os.environ, PYTHONPATH=DIRECTORY_PROJECT)
+    start = time.time()
+    process = subprocess.run(
+        [sys.executable, *options, '-c', code], cwd=directory, env=environ,
+        capture_output=True, text=True, check=True
+    )
+    return start, process
+
+
+def measure_startup(repeat: int, directory: str) -> dict:
+    """
+    Mede o tempo até o fim das importações e até a primeira ação.
+
+    Args:
+        repeat (int): Quantidade de processos executados.
+        directory (str): Diretório de trabalho dos processos.
+
+    Returns:
+        dict: A mediana e o menor tempo de cada etapa, em milissegundos,
+        e as dependências pesadas importadas antes da primeira ação.
+    """
+    samples = {'python': [], 'import main': [], 'first action': []}
+    lazy_loaded = set()
+    for _ in range(repeat):
+        start, process = run_child(
+            'import time; print(time.time())', directory
+        )
+        samples['python'].append((float(process.stdout) - start) * 1000)
+        start, process = run_child(CHILD, directory)
+        data = json.loads(process.stdout.strip().splitlines()[-1])
+        samples['import main'].append((data['imported'] - start) * 1000)
+        samples['first action'].append((data['ready'] - start) * 1000)
+        lazy_loaded.update(data['lazy_loaded'])
+    return {
+        'stages': {
+            stage: {'median_ms': statistics.median(values),
+                    'min_ms': min(values)}
+            for stage, values in samples.items()
+        },
+        'lazy_loaded': sorted(lazy_loaded),
+    }
+
+
+def parse_importtime(output: str) -> list:
+    """
+    Interpreta a saída de `python -X importtime`.
+
+    Args:
+        output (str): Saída de erro do interpretador.
+
+    Returns:
+        list: Um dicionário por módulo, com o nome, a profundidade na
+        árvore de importações e os tempos próprio e cumulativo em
+        milissegundos.
+    """
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line.split(':', 1)[1].split('|')
+        modules.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000,
+        })
+    return modules
+
+
+def measure_imports(directory: str) -> list:
+    """
+    Mede o custo de importação dos módulos importados diretamente pelo
+    main.py.
+
+    Args:
+        directory (str): Diretório de trabalho do processo.
+
+    Returns:
+        list: Os módulos importados pelo main.py, do mais custoso para o
+        menos custoso.
+    """
+    _, process = run_child('import main', directory, '-X', 'importtime')
+    modules = parse_importtime(process.stderr)
+    index = next(index for index, module in enumerate(modules)
+                 if module['module'] == 'main' and module['depth'] == 0)
+    children = []
+    for module in reversed(modules[:index]):
+        if module['depth'] == 0:
+            break
+        if module['depth'] == 1:
+            children.append(module)
+    children.append(modules[index])
+    return sorted(children, key=lambda module: -module['cumulative_ms'])
+
+
+def check_budget(result: dict) -> list:
+    """
+    Compara o resultado com o orçamento.
+
+    Args:
+        result (dict): Resultado do benchmark.
+
+    Returns:
+        list: A descrição de cada violação do orçamento.
+    """
+    violations = []
+    for stage, budget in BUDGET_MS.items():
+        median = result['stages'][stage]['median_ms']
+        if median > budget:
+            violations.append(
+                f'{stage}: {median:.1f} ms (orçamento {budget:.0f} ms)'
+            )
+    for module in result['imports']:
+        if module['module'] == 'main':
+            continue
+        budget = MODULE_BUDGET_MS.get(
+            module['module'], MODULE_BUDGET_MS['DEFAULT']
+        )
+        if module['cumulative_ms'] > budget:
+            violations.append(
+                f'importação de {module["module"]}: '
+                f'{module["cumulative_ms"]:.1f} ms (orçamento {budget:.0f} ms)'
+            )
+    for name in result['lazy_loaded']:
+        violations.append(f'{name} importado antes da primeira ação')
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=10,
+                        help='Quantidade de processos por medida.')
+    parser.add_argument('--top', type=int, default=10,
+                        help='Quantidade de módulos exibidos.')
+    parser.add_argument('--output', help='Arquivo JSON com o resultado.')
+    arguments = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        result = measure_startup(arguments.repeat, directory)
+        result['imports'] = measure_imports(directory)
+
+    print(f'{"etapa":<14} {"mediana (ms)":>13} {"mínimo (ms)":>12}')
+    for stage, timing in result['stages'].items():
+        print(f'{stage:<14} {timing["median_ms"]:>13.1f} '
+              f'{timing["min_ms"]:>12.1f}')
+    print()
+    print(f'{"módulo":<40} {"próprio (ms)":>13} {"cumulativo (ms)":>16}')
+    for module in result['imports'][:arguments.top]:
+        print(f'{module["module"]:<40} {module["self_ms"]:>13.1f} '
+              f'{module["cumulative_ms"]:>16.1f}')
+    print()
+
+    if arguments.output:
+        write_json(arguments.output, {
+            'environment': environment(),
+            'repeat': arguments.repeat,
+            'budget_ms': BUDGET_MS,
+            'module_budget_ms': MODULE_BUDGET_MS,
+            **result,
+        })
+
+    violations = check_budget(result)
+    for violation in violations:
+        print(f'ACIMA DO ORÇAMENTO: {violation}')
+    if violations:
+        sys.exit(1)
+    print('Inicialização dentro do orçamento.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark do custo dos intervalos do rastreamento (src/managers/tracer.py).
+
+Mede o tempo por intervalo ('with TRACER.span(...)') com os mesmos dados
+das faturas do estado PROCESS, com o rastreamento desabilitado (padrão) e
+habilitado, comparado a um bloco sem rastreamento.
+
+Uso:
+    python -m benchmarks.bench_tracer
+    python -m benchmarks.bench_tracer --spans 1000000 --output tracer.json
+"""
+import argparse
+import time
+
+from benchmarks.common import environment, write_json
+from src.managers.tracer import Tracer
+
+
+def baseline(tracer: Tracer, count: int):
+    """Laço sem rastreamento."""
+    for index in range(count):
+        pass
+
+
+def spans(tracer: Tracer, count: int):
+    """Laço com um intervalo por iteração."""
+    for index in range(count):
+        with tracer.span('download_invoice', 'download',
+                         fatura=index, page=1):
+            pass
+
+
+def measure(function, tracer: Tracer, count: int) -> float:
+    """
+    Executa o laço e retorna o tempo por iteração em nanossegundos.
+    """
+    start = time.perf_counter_ns()
+    function(tracer, count)
+    return (time.perf_counter_ns() - start) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--spans', type=int, default=200000,
+                        help='Quantidade de intervalos por cenário.')
+    parser.add_argument('--output', help='Arquivo JSON com o resultado.')
+    arguments = parser.parse_args()
+
+    tracer = Tracer()
+    results = {
+        'baseline': measure(baseline, tracer, arguments.spans),
+        'disabled': measure(spans, tracer, arguments.spans),
+    }
+    tracer.start()
+    results['enabled'] = measure(spans, tracer, arguments.spans)
+    tracer.stop()
+
+    print(f'{arguments.spans} intervalo(s) por cenário')
+    for name, nanoseconds in results.items():
+        print(f'{name:>10} {nanoseconds:>8.0f} ns/intervalo')
+    print(f'Custo desabilitado: '
+          f'{results["disabled"] - results["baseline"]:.0f} ns/intervalo')
+
+    if arguments.output:
+        write_json(arguments.output, {
+            'environment': environment(),
+            'spans': arguments.spans,
+            'ns_per_span': results,
+        })
+
+
+if __name__ == '__main__':
+    main()
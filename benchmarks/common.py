@@ -0,0 +1,138 @@
+import glob
+import json
+import os
+import platform
+import struct
+from typing import List
+
+import numpy as np
+
+
+BASE_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIRECTORY_IMGS = os.path.join(BASE_DIRECTORY, 'IMGS')
+DIRECTORY_BASELINES = os.path.join(
+    BASE_DIRECTORY, 'benchmarks', 'baselines'
+)
+
+
+def find_invoice_images(directory: str = DIRECTORY_IMGS) -> List[str]:
+    """
+    Procura as imagens de faturas baixadas em execuções anteriores.
+
+    Percorre os diretórios de execução dentro de IMGS, ignorando o
+    diretório de imagens de erro.
+
+    Args:
+        directory (str): Diretório base das imagens.
+
+    Returns:
+        List[str]: Caminhos das imagens encontradas, ordenados.
+    """
+    paths = glob.glob(os.path.join(directory, '**', '*.png'), recursive=True)
+    return sorted(
+        path for path in paths
+        if os.sep + 'ERRORS' + os.sep not in path
+    )
+
+
+def jpeg_dimensions(path: str) -> tuple | None:
+    """
+    Lê a altura e a largura de uma imagem JPEG a partir do marcador SOF.
+
+    Args:
+        path (str): Caminho da imagem.
+
+    Returns:
+        tuple | None: Altura e largura, ou None se não for um JPEG.
+    """
+    with open(path, 'rb') as file:
+        data = file.read()
+    if data[:2] != b'\xff\xd8':
+        return None
+    position = 2
+    while position + 9 < len(data):
+        if data[position] != 0xFF:
+            position += 1
+            continue
+        marker = data[position + 1]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            position += 2
+            continue
+        (length,) = struct.unpack('>H', data[position + 2:position + 4])
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(
+                '>HH', data[position + 5:position + 9]
+            )
+            return height, width
+        position += 2 + length
+    return None
+
+
+def synthesize_invoice(height: int, width: int, seed: int) -> np.ndarray:
+    """
+    Gera uma imagem RGB parecida com uma fatura: fundo branco, blocos
+    escuros simulando linhas de texto, uma faixa de tabela e ruído leve
+    de compressão.
+
+    Args:
+        height (int): Altura da imagem.
+        width (int): Largura da imagem.
+        seed (int): Semente do gerador aleatório.
+
+    Returns:
+        np.ndarray: Pixels (altura, largura, 3).
+    """
+    generator = np.random.default_rng(seed)
+    pixels = np.full((height, width, 3), 255, dtype=np.uint8)
+    pixels[height // 3:height // 3 + 20] = (220, 220, 230)
+    for top in range(20, height - 20, 28):
+        left = 20
+        while left < width - 40:
+            word = int(generator.integers(15, 70))
+            pixels[top:top + 12, left:left + word] = generator.integers(0, 60)
+            left += word + int(generator.integers(6, 14))
+    noise = generator.integers(-3, 4, size=pixels.shape)
+    return np.clip(pixels.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+def environment() -> dict:
+    """
+    Retorna informações do ambiente onde o benchmark foi executado.
+
+    Returns:
+        dict: Versão do Python, sistema e quantidade de núcleos.
+    """
+    return {
+        'python': platform.python_version(),
+        'system': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def write_json(path: str, data: dict):
+    """
+    Salva o resultado de um benchmark em um arquivo JSON.
+
+    Args:
+        path (str): Caminho do arquivo.
+        data (dict): Resultado do benchmark.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False, indent=2)
+
+
+def read_json(path: str) -> dict | None:
+    """
+    Lê o resultado de um benchmark salvo em um arquivo JSON.
+
+    Args:
+        path (str): Caminho do arquivo.
+
+    Returns:
+        dict | None: O resultado salvo ou None se o arquivo não existir.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)
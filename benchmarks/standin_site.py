@@ -0,0 +1,413 @@
+"""
+Site local que reproduz a página do desafio (RPA Challenge OCR), para os
+testes e benchmarks sem acesso à internet.
+
+A página contém a tabela 'tableSandbox' com as colunas #, ID, Due Date e
+Invoice, paginada no navegador, e o botão Next ('tableSandbox_next'), que
+recebe a classe 'disabled' na última página. Em vez do jQuery e do
+DataTables, um script local (shim) implementa a parte da API utilizada
+pelo robô: `$.fn.dataTable.ext.search`, `DataTable().draw()`,
+`DataTable().page(n)`, `DataTable().page.info()` e
+`DataTable().rows({search: 'applied'}).data()`. As faturas são
+servidas como PNG em /invoices/<id>.png, com latência e erros
+configuráveis.
+
+Uso:
+    python -m benchmarks.standin_site --rows 1000 --page-size 10 --port 8000
+"""
+import argparse
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import random
+import threading
+import time
+from typing import List
+
+from benchmarks.common import synthesize_invoice
+from src.managers.image_loader import encode_png
+
+
+# Quantidade de imagens distintas servidas nas faturas.
+INVOICE_VARIANTS = 8
+
+SHIM = """
+(function () {
+    var rows = JSON.parse(document.getElementById('tableData').textContent);
+    var pageSize = %(page_size)d;
+    var table = document.getElementById('tableSandbox');
+    var body = table.tBodies[0];
+    var next = document.getElementById('tableSandbox_next');
+    var info = document.getElementById('tableSandbox_info');
+    var settings = {nTable: table};
+    var searchData = rows.map(function (row) {
+        return [String(row[0]), row[1], row[2], ''];
+    });
+    var search = [];
+    var display = rows;
+    var current = 0;
+
+    function isLastPage() {
+        return (current + 1) * pageSize >= display.length;
+    }
+
+    function render() {
+        var start = current * pageSize;
+        var slice = display.slice(start, start + pageSize);
+        var html = [];
+        if (!slice.length) {
+            html.push('<tr class="odd"><td valign="top" colspan="4" ' +
+                'class="dataTables_empty">No data available in table</td></tr>');
+        }
+        for (var i = 0; i < slice.length; i++) {
+            var row = slice[i];
+            html.push('<tr class="' + (i %% 2 ? 'even' : 'odd') + '">' +
+                '<td>' + row[0] + '</td><td>' + row[1] + '</td>' +
+                '<td>' + row[2] + '</td><td><a href="/invoices/' + row[1] +
+                '.png" target="_blank">download</a></td></tr>');
+        }
+        body.innerHTML = html.join('');
+        next.className = 'paginate_button next' +
+            (isLastPage() ? ' disabled' : '');
+        info.textContent = 'Showing ' + (slice.length ? start + 1 : 0) +
+            ' to ' + (start + slice.length) + ' of ' + display.length +
+            ' entries';
+    }
+
+    var api = {
+        draw: function (paging) {
+            if (paging !== 'page') {
+                display = rows.filter(function (row, index) {
+                    return search.every(function (filter) {
+                        return filter(settings, searchData[index], index);
+                    });
+                });
+                current = 0;
+            }
+            render();
+            return api;
+        },
+        page: function (number) {
+            var pages = Math.ceil(display.length / pageSize);
+            current = Math.max(0, Math.min(number, pages - 1));
+            return api;
+        }
+    };
+    api.rows = function () {
+        return {
+            data: function () {
+                return {
+                    toArray: function () {
+                        return display.map(function (row) {
+                            return [String(row[0]), row[1], row[2],
+                                '<a href="/invoices/' + row[1] +
+                                '.png" target="_blank">download</a>'];
+                        });
+                    }
+                };
+            }
+        };
+    };
+    api.page.info = function () {
+        return {
+            page: current,
+            pages: Math.ceil(display.length / pageSize),
+            length: pageSize,
+            recordsTotal: rows.length,
+            recordsDisplay: display.length
+        };
+    };
+
+    var $ = function () {
+        return {DataTable: function () { return api; }};
+    };
+    $.fn = {dataTable: {ext: {search: search}}};
+    window.jQuery = window.$ = $;
+
+    next.addEventListener('click', function (event) {
+        event.preventDefault();
+        if (!isLastPage()) {
+            current++;
+            render();
+        }
+    });
+    render();
+})();
+"""
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>RPA Challenge OCR</title></head>
+<body>
+<h1>RPA Challenge OCR</h1>
+<table id="tableSandbox" class="table dataTable">
+<thead><tr><th>#</th><th>ID</th><th>Due Date</th><th>Invoice</th></tr></thead>
+<tbody></tbody>
+</table>
+<div id="tableSandbox_info"></div>
+<div class="dataTables_paginate">
+<a id="tableSandbox_previous" class="paginate_button previous" href="#">Previous</a>
+<a id="tableSandbox_next" class="paginate_button next" href="#">Next</a>
+</div>
+<script id="tableData" type="application/json">%(rows)s</script>
+<script>%(shim)s</script>
+</body>
+</html>
+"""
+
+
+def build_rows(
+        count: int, future_share: float = 0.2, seed: int = 0,
+        today: date = None
+    ) -> List[list]:
+    """
+    Gera as linhas da tabela: número, ID e data de vencimento
+    (DD-MM-AAAA), com a parcela informada de datas futuras.
+
+    Args:
+        count (int): Quantidade de linhas.
+        future_share (float): Parcela de linhas com data futura (0 a 1).
+        seed (int): Semente do gerador aleatório.
+        today (date, opcional): Data de referência. Por padrão, hoje.
+
+    Returns:
+        List[list]: As linhas [número, ID, data].
+    """
+    generator = random.Random(seed)
+    today = today or date.today()
+    rows = []
+    for index in range(count):
+        days = generator.randint(1, 365)
+        if generator.random() < future_share:
+            due_date = today + timedelta(days=days)
+        else:
+            due_date = today - timedelta(days=days)
+        rows.append(
+            [index + 1, str(100000 + index), due_date.strftime('%d-%m-%Y')]
+        )
+    return rows
+
+
+
+class StandinSite:
+    """
+    Servidor HTTP local com a página do desafio e as imagens das
+    faturas.
+
+    Attributes:
+        rows (List[list]): Linhas da tabela (número, ID e data).
+        page_size (int): Quantidade de linhas por página da tabela.
+        latency (float): Espera em segundos antes de cada imagem.
+        error_rate (float): Parcela das requisições de imagens que
+        retornam erro 500.
+        requests (dict): Quantidade de requisições por tipo ('page',
+        'invoice', 'error' e 'not_found').
+        url (str): Endereço da página, disponível após `start`.
+    """
+
+    def __init__(
+            self,
+            rows: int = 100,
+            page_size: int = 10,
+            future_share: float = 0.2,
+            latency: float = 0.0,
+            error_rate: float = 0.0,
+            seed: int = 0,
+            host: str = '127.0.0.1',
+            port: int = 0
+        ):
+        """
+        Cria o site, sem iniciar o servidor.
+
+        Args:
+            rows (int): Quantidade de linhas da tabela.
+            page_size (int): Quantidade de linhas por página.
+            future_share (float): Parcela de linhas com data futura.
+            latency (float): Espera em segundos antes de cada imagem.
+            error_rate (float): Parcela das requisições de imagens que
+            retornam erro 500.
+            seed (int): Semente das datas e dos erros.
+            host (str): Endereço do servidor.
+            port (int): Porta do servidor (0 escolhe uma porta livre).
+        """
+        self.rows = build_rows(rows, future_share, seed)
+        self.page_size = page_size
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = {'page': 0, 'invoice': 0, 'error': 0, 'not_found': 0}
+        self._ids = {row[1] for row in self.rows}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._page = (PAGE % {
+            'rows': json.dumps(self.rows, separators=(',', ':')),
+            'shim': SHIM % {'page_size': page_size},
+        }).encode('utf-8')
+        self._images = [
+            encode_png(synthesize_invoice(240, 480, variant))
+            for variant in range(INVOICE_VARIANTS)
+        ]
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address[:2]
+        self.url = f'http://{self.host}:{self.port}/'
+        self._thread = None
+
+
+    def _count(self, kind: str):
+        """Incrementa a quantidade de requisições de um tipo."""
+        with self._lock:
+            self.requests[kind] += 1
+
+
+    def _fails(self) -> bool:
+        """Sorteia se a requisição de imagem atual deve falhar."""
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+
+    def invoice(self, invoice_id: str) -> bytes:
+        """
+        Retorna a imagem PNG de uma fatura.
+
+        Args:
+            invoice_id (str): ID da fatura.
+
+        Returns:
+            bytes: O conteúdo da imagem.
+        """
+        return self._images[int(invoice_id) % INVOICE_VARIANTS]
+
+
+    def eligible_rows(self, today: date = None) -> List[list]:
+        """
+        Retorna as linhas com data menor ou igual a data de referência,
+        que são as processadas pelo robô.
+
+        Args:
+            today (date, opcional): Data de referência. Por padrão, hoje.
+
+        Returns:
+            List[list]: As linhas elegíveis.
+        """
+        limit = (today or date.today()).strftime('%Y%m%d')
+        return [
+            row for row in self.rows
+            if ''.join(reversed(row[2].split('-'))) <= limit
+        ]
+
+
+    def _handler(self) -> type:
+        """
+        Cria a classe que responde às requisições do servidor.
+
+        Returns:
+            type: Subclasse de BaseHTTPRequestHandler.
+        """
+        site = self
+
+        class StandinHandler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _send(self, status: int, body: bytes, content_type: str):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                if path in ('/', '/index.html'):
+                    site._count('page')
+                    self._send(200, site._page, 'text/html; charset=utf-8')
+                    return
+                invoice_id = None
+                if path.startswith('/invoices/') and path.endswith('.png'):
+                    invoice_id = path[len('/invoices/'):-len('.png')]
+                if invoice_id not in site._ids:
+                    site._count('not_found')
+                    self._send(404, b'Not Found', 'text/plain')
+                    return
+                if site.latency:
+                    time.sleep(site.latency)
+                if site._fails():
+                    site._count('error')
+                    self._send(500, b'Internal Server Error', 'text/plain')
+                    return
+                site._count('invoice')
+                self._send(200, site.invoice(invoice_id), 'image/png')
+
+            def log_message(self, *args):
+                pass
+
+        return StandinHandler
+
+
+    def start(self) -> 'StandinSite':
+        """
+        Inicia o servidor em uma thread em segundo plano.
+
+        Returns:
+            StandinSite: O próprio site.
+        """
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name='StandinSite',
+            daemon=True
+        )
+        self._thread.start()
+        return self
+
+
+    def stop(self):
+        """
+        Encerra o servidor e libera a porta.
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+
+    def __enter__(self):
+        return self.start()
+
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=100,
+                        help='Quantidade de linhas da tabela.')
+    parser.add_argument('--page-size', type=int, default=10,
+                        help='Quantidade de linhas por página.')
+    parser.add_argument('--future-share', type=float, default=0.2,
+                        help='Parcela de linhas com data futura.')
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Espera em segundos antes de cada imagem.')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Parcela das imagens que retornam erro 500.')
+    parser.add_argument('--port', type=int, default=8000,
+                        help='Porta do servidor.')
+    arguments = parser.parse_args()
+
+    site = StandinSite(
+        arguments.rows, arguments.page_size, arguments.future_share,
+        arguments.latency, arguments.error_rate, port=arguments.port
+    )
+    print(f'Site disponível em {site.url} ({arguments.rows} linha(s)). '
+          f'Ctrl+C para encerrar.')
+    try:
+        site._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        site._server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -2,20 +2,181 @@ from datetime import datetime
 import os
 
 
-TIME_EXECUTION = datetime.now().strftime('%d.%m.%Y_%H.%M.%S')
-
 # URL do site que será acessado durante a automação.
 URL_SITE  = 'https://rpachallengeocr.azurewebsites.net/'
 
 # Constantes de diretórios, definindo caminhos para armazenamento de arquivos.
 BASE_DIRECTORY = os.getcwd()
 DIRECTORY_CSVS = os.path.join(BASE_DIRECTORY, 'RESULTS')
-DIRECTORY_IMGS = os.path.join(BASE_DIRECTORY, 'IMGS', TIME_EXECUTION)
 DIRECTORY_IMGS_ERRORS = os.path.join(BASE_DIRECTORY, 'IMGS', 'ERRORS')
+DIRECTORY_STATE = os.path.join(BASE_DIRECTORY, 'STATE')
+FILE_FINGERPRINTS = os.path.join(DIRECTORY_STATE, 'fingerprints.json')
+FILE_DAEMON_LOCK = os.path.join(DIRECTORY_STATE, 'daemon.lock')
+FILE_DEAD_LETTER_QUEUE = os.path.join(DIRECTORY_STATE, 'dead_letter.json')
+FILE_OCR_CACHE = os.path.join(DIRECTORY_STATE, 'ocr_cache.sqlite3')
+DIRECTORY_IMAGE_STORE = os.path.join(BASE_DIRECTORY, 'IMGS', 'STORE')
+DIRECTORY_METRICS = os.path.join(BASE_DIRECTORY, 'METRICS')
+DIRECTORY_TRACES = os.path.join(BASE_DIRECTORY, 'TRACES')
+DIRECTORY_LOGS = os.path.join(BASE_DIRECTORY, 'LOGS')
+DIRECTORY_CAPTURES = os.path.join(BASE_DIRECTORY, 'CAPTURES')
 
 COLUMNS_CSV_FILE = ['NUMERO_DA_FATURA', 'DATA_DA_FATURA', 'URL_DA_FATURA']
 
-# Variáveis de controle do fluxo do programa
-loop = 'ON'  # Controle para manter o loop ativo
-state = 'INITIALIZATION'  # Estado inicial do sistema
-first_execution = True  # Flag para indicar a primeira execução
+# Aplica o filtro de data na própria tabela do site (API do DataTables),
+# fazendo com que o robô visite apenas páginas com faturas elegíveis.
+FILTER_DATES_IN_TABLE = True
+
+# Modo incremental: reaproveita páginas e faturas que não mudaram desde a
+# execução anterior e gera um CSV apenas com as faturas novas ou alteradas.
+INCREMENTAL_MODE = True
+
+# Etapa de OCR local (Tesseract) das faturas baixadas. OCR_WORKERS define
+# a quantidade de processos do pool (None utiliza todos os núcleos).
+OCR_ENABLED = True
+OCR_WORKERS = None
+OCR_LANGUAGE = 'eng'
+# Pré-processamento (binarização, remoção de ruído, correção da inclinação e
+# recorte) de imagens PNG antes do OCR. Não tem efeito nas faturas do site, que
+# são JPEG: elas são enviadas ao Tesseract sem alteração, com um alerta no log.
+# Por isso a opção fica desabilitada por padrão.
+OCR_PREPROCESSING = False
+COLUMNS_OCR = ['NUMERO_NOTA', 'EMPRESA', 'VALOR_TOTAL']
+
+# Cache dos resultados de OCR, indexado pelo conteúdo da imagem e pela versão
+# do motor, com a quantidade máxima de entradas mantidas no arquivo.
+OCR_CACHE_ENABLED = True
+OCR_CACHE_MAX_ENTRIES = 50000
+
+# Armazenamento das imagens das faturas: 'files' grava um arquivo PNG por
+# fatura em IMGS/<execução>; 'pack' acrescenta as imagens em um único pacote
+# por execução (IMGS/PACKS/<execução>.pack), com um índice por fatura;
+# 'store' grava cada imagem distinta uma única vez em IMGS/STORE, indexada
+# pelo hash do conteúdo, com hardlinks em IMGS/<execução>.
+IMAGE_STORAGE = 'files'
+# Quantidade de execuções mantidas no armazenamento 'store'. As execuções
+# mais antigas e as imagens sem referências são removidas ao final de cada
+# execução (None mantém todas).
+IMAGE_STORE_KEEP_RUNS = None
+
+# Logs: LOG_ASYNC grava as mensagens em uma thread em segundo plano, através
+# de uma fila; LOG_JSON grava também LOGS/<data>.jsonl, em JSON Lines. As
+# mensagens por fatura podem ser amostradas (uma a cada N) ou limitadas por
+# segundo (None não limita).
+LOG_ASYNC = True
+LOG_JSON = False
+LOG_ROW_SAMPLE_EVERY = 1
+LOG_ROW_MAX_PER_SECOND = None
+
+# Inicialização: INIT_PARALLEL executa as etapas independentes do estado
+# INITIALIZATION em paralelo (navegador e site, diretórios, CSVs e conexão com
+# o servidor das imagens); INIT_WARM_UP abre a conexão com o servidor das
+# imagens antes do primeiro download.
+INIT_PARALLEL = True
+INIT_WARM_UP = True
+
+# Reciclagem do navegador em execuções longas: o Chrome é reiniciado após
+# BROWSER_RECYCLE_PAGES páginas, com a memória (RSS) do navegador acima de
+# BROWSER_RECYCLE_RSS_MB ou com a latência de leitura das linhas
+# BROWSER_RECYCLE_LATENCY_FACTOR vezes maior que a das primeiras páginas
+# (None desabilita cada critério). A página atual da tabela é restaurada.
+BROWSER_RECYCLE_PAGES = 500
+BROWSER_RECYCLE_RSS_MB = 1536
+BROWSER_RECYCLE_LATENCY_FACTOR = 3.0
+
+# Respostas do navegador: com BROWSER_NETWORK_CAPTURE, as imagens das faturas
+# já recebidas pelo Chrome são lidas pelo DevTools (log de desempenho), sem um
+# novo download, aguardando até BROWSER_NETWORK_TIMEOUT segundos por uma
+# resposta em andamento; as demais são baixadas com o requests.
+# BROWSER_NETWORK_PREFETCH inicia no navegador o download das faturas que cada
+# página vai baixar (após as verificações do modo incremental) e
+# BROWSER_SYNC_COOKIES copia os cookies do navegador para a sessão do requests.
+BROWSER_NETWORK_CAPTURE = False
+BROWSER_NETWORK_TIMEOUT = 10.0
+BROWSER_NETWORK_PREFETCH = True
+BROWSER_SYNC_COOKIES = True
+
+# Quantidade de novas tentativas de cada estado após uma falha. No estado
+# PROCESS, a nova tentativa é feita a partir da página atual da tabela.
+MAX_RETRIES = {'INITIALIZATION': 0, 'PROCESS': 3, 'END': 0}
+
+# Fila de faturas com falha (dead-letter queue): quantidade máxima de
+# tentativas por fatura, espera inicial e máxima entre as tentativas e tempo
+# máximo, em segundos, aguardando a fila ser esvaziada antes do END.
+DLQ_MAX_ATTEMPTS = 5
+DLQ_BACKOFF_BASE = 2
+DLQ_BACKOFF_MAX = 60
+DLQ_DRAIN_TIMEOUT = 120
+
+# Métricas da execução (vazão, latências e contadores), gravadas ao final de
+# cada execução em METRICS/<execução>.prom (formato do Prometheus) e
+# METRICS/<execução>.json. Com METRICS_PORT definido, o modo serviço também
+# as expõe em http://127.0.0.1:<porta>/metrics (e /metrics.json).
+METRICS_ENABLED = True
+METRICS_PORT = None
+
+# Rastreamento das operações de cada execução (estados, navegador, downloads,
+# gravação das imagens e dos CSVs), gravado em TRACES/<execução>.trace.json no
+# formato de eventos do Chrome (chrome://tracing ou ui.perfetto.dev).
+TRACE_ENABLED = False
+
+# Profiling dos estados listados em PROFILE_STAGES (por exemplo, ['PROCESS']),
+# com os arquivos gravados em LOGS/ e os pontos mais custosos no log do END.
+# PROFILE_MODE 'cprofile' grava LOGS/<execução>_<estado>.pstats; 'sampling'
+# amostra a pilha a cada PROFILE_SAMPLE_INTERVAL segundos, com custo baixo o
+# suficiente para execuções reais. PROFILE_MEMORY registra snapshots do
+# tracemalloc a cada execução dos estados (no PROCESS, a cada página).
+PROFILE_STAGES = []
+PROFILE_MODE = 'cprofile'
+PROFILE_SAMPLE_INTERVAL = 0.005
+PROFILE_MEMORY = False
+PROFILE_TOP = 10
+
+# Gravação do que a automação recebe do site (as linhas de cada página da
+# tabela e as imagens das faturas, com a duração de cada operação) em
+# CAPTURES/<execução>.zip. Com REPLAY_FILE definido, a execução reproduz a
+# gravação no lugar do site e do navegador, sem rede; REPLAY_SPEED 1 reproduz
+# as durações gravadas, 2 na metade do tempo, e 0 sem nenhuma espera.
+CAPTURE_ENABLED = False
+REPLAY_FILE = None
+REPLAY_SPEED = 1.0
+
+# Intervalo padrão, em segundos, entre os ciclos do modo serviço.
+DAEMON_INTERVAL = 3600
+
+
+def refresh_execution():
+    """
+    Reinicia os dados que identificam uma execução: o horário da
+    execução e o diretório (ou o pacote) onde as faturas serão salvas.
+
+    É chamada no início de cada ciclo, permitindo que o modo serviço
+    execute vários ciclos no mesmo processo com diretórios separados.
+    """
+    global TIME_EXECUTION, DIRECTORY_IMGS, FILE_IMAGE_PACK
+    TIME_EXECUTION = datetime.now().strftime('%d.%m.%Y_%H.%M.%S')
+    DIRECTORY_IMGS = os.path.join(BASE_DIRECTORY, 'IMGS', TIME_EXECUTION)
+    FILE_IMAGE_PACK = os.path.join(
+        BASE_DIRECTORY, 'IMGS', 'PACKS', f'{TIME_EXECUTION}.pack'
+    )
+
+
+# Dados da execução, calculados por `refresh_execution` no primeiro acesso,
+# e não na importação do módulo.
+_EXECUTION_ATTRIBUTES = ('TIME_EXECUTION', 'DIRECTORY_IMGS', 'FILE_IMAGE_PACK')
+
+
+def __getattr__(name: str):
+    """
+    Calcula os dados da execução no primeiro acesso a um deles, caso
+    `refresh_execution` ainda não tenha sido chamada.
+
+    Args:
+        name (str): Nome da constante acessada.
+
+    Raises:
+        AttributeError: Se a constante não existir.
+    """
+    if name in _EXECUTION_ATTRIBUTES:
+        refresh_execution()
+        return globals()[name]
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
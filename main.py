@@ -1,11 +1,34 @@
-from config import *
+import argparse
+import os
+import time
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, List
+
+import config
 from src.managers import utils
+from src.managers.browser_recycler import BrowserRecycler
+from src.managers.capture import CAPTURE, CaptureArchive
 from src.managers.csv_manager import CsvManager
+from src.managers.dead_letter_queue import DeadLetterQueue, RetryWorker
 from src.managers.directory_manager import DirectoryManager
+from src.managers.fingerprint_manager import FingerprintManager
+from src.managers.image_store import ImageStore
 from src.managers.logger import Logger
-from src.managers.requests_manager import RequestManager
-from src.managers.web_driver_options import WebDriverOptions
-from src.pom.pages.page_main import PageMain
+from src.managers.metrics import REGISTRY, MetricsServer
+from src.managers.profiler import Profiler
+from src.managers.requests_manager import RequestManager, ReplayRequestManager
+from src.managers.scheduler import Scheduler
+from src.managers.state_machine import StateMachine
+from src.managers.task_graph import TaskGraph
+from src.managers.tracer import TRACER
+from src.pom.pages.replay_page_main import ReplayPageMain
+
+# O Selenium, o numpy (pacote de imagens e OCR) e o pandas são importados
+# apenas quando utilizados, reduzindo o tempo de inicialização do processo.
+if TYPE_CHECKING:
+    from src.managers.image_pack import ImagePack
+    from src.managers.ocr_manager import OcrManager
+    from src.pom.pages.page_main import PageMain
 
 
 """
@@ -15,214 +38,1595 @@ para um melhor entendimento.
 
 
 
-while loop == 'ON':
-    
-    match state:
-
-        case 'INITIALIZATION':
-            """
-            Este estado inicia o processo de configuração da aplicação.
-            A aplicação configura o ambiente de execução,
-            incluindo a inicialização do logger, a configuração do WebDriver
-            e a realização do login no site.
-
-            - Verifica se é a primeira execução e registra a inicialização.
-            - Instancia gerenciadores para logs, requisições e diretórios de
-            imagens e CSV.
-            - Cria um arquivo CSV com as colunas especificadas e
-            gerencia seu conteúdo.
-            - Configura opções do WebDriver para maximizar a janela
-            e desabilitar notificações.
-            - Se tudo ocorrer sem erros, o estado é alterado para 'PROCESS'.
-            - Em caso de erro, registra a exceção e altera
-            o estado para 'END'.
-
-            Attributes:
-                logger (Logger): Instância do logger para registrar 
-                informações.
-                request (RequestManager): Classe para gerenciar
-                requisições HTTP.
-                directory_csv (DirectoryManager): Classe para gerenciar
-                o diretório onde estarão os arquivos CSV.
-                directory_imgs (DirectoryManager): Classe para gerenciar
-                o diretório onde estarão os arquivos PNG.
-                csv_manager (CsvManager): Classe para manipulação de
-                arquivos CSV.
-                options (WebDriverOptions): Configurações do WebDriver.
-                main_page (PageMain): Classe responsável pelas interações na
-                página principal.      
-            """
-            try:
-                if first_execution:
+def create_logger() -> Logger:
+    """
+    Cria o logger da aplicação conforme as configurações de log
+    (gravação em segundo plano, JSON Lines e amostragem das mensagens
+    por fatura).
 
-                    success = False
+    Returns:
+        Logger: O logger da aplicação.
+    """
+    return Logger(
+        directory_log=config.BASE_DIRECTORY,
+        asynchronous=config.LOG_ASYNC,
+        json_lines=config.LOG_JSON,
+        sample_every=config.LOG_ROW_SAMPLE_EVERY,
+        max_rows_per_second=config.LOG_ROW_MAX_PER_SECOND
+    )
 
-                    logger = Logger()
-                    logger.info('Iniciando o Processo.')
 
-                    request = RequestManager()
+def initialization(context: SimpleNamespace) -> str:
+    """
+    Este estado inicia o processo de configuração da aplicação.
+    A aplicação configura o ambiente de execução,
+    incluindo a inicialização do logger, a configuração do WebDriver
+    e a realização do login no site.
 
-                    directory_imgs = DirectoryManager(DIRECTORY_IMGS)
+    As etapas são executadas como um grafo de dependências (TaskGraph),
+    com as etapas independentes em paralelo: a abertura do navegador e do
+    site, a criação e limpeza dos diretórios, a criação dos arquivos CSV
+    e a abertura antecipada da conexão com o servidor das imagens. Com
+    `INIT_PARALLEL` desabilitado, as etapas são executadas em sequência.
+    Ao final, o tempo de cada etapa e o caminho crítico são registrados
+    no log.
 
-                    directory_imgs_errors = DirectoryManager(
-                        DIRECTORY_IMGS_ERRORS
-                    )
+    - Verifica se é a primeira execução e registra a inicialização.
+    - Instancia gerenciadores para logs, requisições e diretórios de
+    imagens e CSV.
+    - Cria um arquivo CSV com as colunas especificadas e
+    gerencia seu conteúdo.
+    - Configura opções do WebDriver para maximizar a janela
+    e desabilitar notificações.
+    - Abre o site; uma falha nessa etapa é repetida no estado PROCESS.
+    - Se tudo ocorrer sem erros, o estado é alterado para 'PROCESS'.
+    - Em caso de erro, a máquina de estados registra a exceção e altera
+    o estado para 'END'.
 
-                    directory_csv = DirectoryManager(DIRECTORY_CSVS)
+    Attributes:
+        request (RequestManager): Classe para gerenciar
+        requisições HTTP.
+        directory_csv (DirectoryManager): Classe para gerenciar
+        o diretório onde estarão os arquivos CSV.
+        directory_imgs (DirectoryManager): Classe para gerenciar
+        o diretório onde estarão os arquivos PNG.
+        image_storage (ImagePack | ImageStore | None): Armazenamento das
+        imagens da execução, quando `IMAGE_STORAGE` é 'pack' ou 'store'.
+        csv_manager (CsvManager): Classe para manipulação de
+        arquivos CSV.
+        options (WebDriverOptions): Configurações do WebDriver.
+        main_page (PageMain): Classe responsável pelas interações na
+        página principal.
 
-                    name_csv = utils.get_file_csv_name(DIRECTORY_CSVS)
-                    file_csv = utils.create_csv_file(
-                        name_csv, COLUMNS_CSV_FILE
-                    )
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
 
-                    csv_manager = CsvManager(file_csv)
-                    csv_manager.view_df()
-                    csv_manager.save_file()
+    Returns:
+        str: O próximo estado.
+    """
+    logger = context.logger
+    logger.info('Iniciando o Processo.')
 
-                    directory_imgs.delete_files()
+    graph = build_initialization_graph()
+    try:
+        graph.run(context)
+    finally:
+        for task, timing in graph.timings.items():
+            REGISTRY.observe(
+                'init_task_seconds', timing['end'] - timing['start'],
+                task=task
+            )
+        logger.info('Tempo das etapas da inicialização:')
+        for line in graph.report():
+            logger.info(line)
 
-                    logger.info('Diretórios e arquivo CSV criados...')
+    return 'PROCESS'
 
-                    options = WebDriverOptions()
-                    options.add_argument('--start-maximized')
-                    options.add_argument('--disable-notifications')
-                    page_main = PageMain()
 
-                state = 'PROCESS'
-                continue
+def build_initialization_graph() -> TaskGraph:
+    """
+    Cria o grafo das etapas do estado INITIALIZATION. Cada etapa recebe
+    o contexto e preenche os seus atributos; as dependências garantem
+    que uma etapa só inicia quando os atributos que ela utiliza já
+    existem.
 
-            except Exception as error:
-                logger.error('Erro durante a inicialização do processo:')
-                logger.error(f'{error}')
-                state = 'END'
-                continue
+    Returns:
+        TaskGraph: O grafo das etapas.
+    """
+    graph = TaskGraph(max_workers=8 if config.INIT_PARALLEL else 1)
+    graph.add('request', init_request)
+    graph.add('image_storage', init_image_storage)
+    graph.add('directories', init_directories)
+    graph.add('cleanup', init_cleanup, requires=['directories'])
+    graph.add('ocr', init_ocr)
+    graph.add('csv', init_csv, requires=['directories', 'ocr'])
+    graph.add('state', init_state)
+    graph.add(
+        'retry_worker', init_retry_worker,
+        requires=['request', 'image_storage', 'state']
+    )
+    graph.add('browser', init_browser)
+    graph.add('site', init_site, requires=['browser'])
+    graph.add('browser_session', init_browser_session,
+              requires=['site', 'request'])
+    return graph
 
 
-        case 'PROCESS':
-            """
-            Estado para processamento de faturas.
+def init_request(context: SimpleNamespace):
+    """
+    Cria o gerenciador das requisições e, com `INIT_WARM_UP`, abre
+    antecipadamente a conexão com o servidor das imagens das faturas.
 
-            Neste estado, a aplicação coleta e processa faturas a partir do
-            site, utilizando o item capturado anteriormente. A lógica de
-            processamento é projetada para operar de maneira sequencial,
-            garantindo que cada fatura seja tratada adequadamente
-            antes de passar para a próxima.
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+    """
+    context.request = build_request_manager(context.replay)
+    if config.INIT_WARM_UP:
+        context.request.warm_up(config.URL_SITE)
 
-            Este estado também combina o
-            uso de Selenium para automação de navegador e Requests para
-            manipulação de requisições HTTP.
 
-            A comunicação entre as classes `PageMain`, `RequestManager`
-            e `CsvManager` é crucial, permitindo que a aplicação mantenha
-            o controle do estado dos dados enquanto interage com a interface
-            do usuário. Os logs são utilizados para registrar informações
-            importantes sobre o fluxo e facilitar a depuração
-            em caso de falhas.
-            """
-            try:
-                if first_execution:
-
-                    page_main.open_site(URL_SITE)
-
-                    logger.info(f'Inicializou o site: {URL_SITE}')
-
-                    table_exists = page_main.check_table()
-                    if not table_exists:
-                        logger.error(
-                            'Erro: Tabela não foi encontrada ao inicializar o site.'
-                        )
-                        state = 'END'
-                        continue
-
-                    first_execution = False
-
-                for row_data in page_main.get_rows():
-
-                    date = row_data['DATA_DA_FATURA']
-                    date_is_valid = utils.check_date_before_or_today(date)
-
-                    if date_is_valid:
-                        logger.info(
-                            f'Data: {date} é menor ou igual a data de hoje.'
-                        )
-                        row_data['DATA_DA_FATURA'] = utils.format_date(date)
-                        id_fatura = row_data['NUMERO_DA_FATURA']
-
-                        response = request.get(row_data['URL_DA_FATURA'])
-                        path_img = request.convert_response_to_file_img(
-                            response, DIRECTORY_IMGS, f'{id_fatura}.png'
-                        )
-                        logger.info(
-                            f'Dowload da Fatura com sucesso, disponível em: {path_img}'
-                        )
-
-                        csv_manager.add_data(row_data)
-                        csv_manager.save_file()
-                        logger.info(
-                            f'Linha da fatura {id_fatura} adicionada com sucesso no arquivo CSV.'
-                        )
-
-                button_is_disabled = page_main.check_button_next_disabled()
-                if button_is_disabled:
-                    logger.info(
-                        'Botão Next desabilitado, robô fez toda a paginação.'
-                    )
-                    success = True
-                    state = 'END'
-                    continue
-                page_main.click_next_button()
-                logger.info('Indo para a próxima página.')
+def init_image_storage(context: SimpleNamespace):
+    """
+    Cria o armazenamento das imagens da execução.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+    """
+    context.image_storage = build_image_storage()
+
+
+def init_directories(context: SimpleNamespace):
+    """
+    Cria os diretórios das imagens, das imagens de erro e dos CSVs.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+    """
+    context.directory_imgs = None
+    if config.IMAGE_STORAGE == 'files':
+        context.directory_imgs = DirectoryManager(config.DIRECTORY_IMGS)
+    DirectoryManager(config.DIRECTORY_IMGS_ERRORS)
+    DirectoryManager(config.DIRECTORY_CSVS)
+
+
+def init_cleanup(context: SimpleNamespace):
+    """
+    Inicia, em segundo plano, a limpeza do diretório das imagens.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+    """
+    if context.directory_imgs:
+        context.directory_imgs.delete_files(background=True)
+
+
+def init_ocr(context: SimpleNamespace):
+    """
+    Cria o gerenciador da etapa de OCR.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+    """
+    context.ocr = build_ocr_manager(context.logger)
+
+
+def init_csv(context: SimpleNamespace):
+    """
+    Cria os arquivos CSV da execução e do delta, com as colunas do OCR
+    quando a etapa está habilitada. Os DataFrames são montados em
+    memória e cada arquivo é gravado uma única vez.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+    """
+    context.file_csv = utils.get_file_csv_name(config.DIRECTORY_CSVS)
+    context.csv_manager = CsvManager.create(
+        context.file_csv, config.COLUMNS_CSV_FILE
+    )
+    if context.ocr:
+        context.csv_manager.add_columns(config.COLUMNS_OCR)
+    context.csv_manager.view_df()
+    context.csv_manager.save_file()
+
+    context.file_delta_csv = utils.get_file_csv_name(
+        config.DIRECTORY_CSVS, 'FATURAS_DELTA'
+    )
+    context.delta_csv_manager = CsvManager.create(
+        context.file_delta_csv, config.COLUMNS_CSV_FILE
+    )
+    if context.ocr:
+        context.delta_csv_manager.add_columns(config.COLUMNS_OCR)
+    context.delta_csv_manager.save_file()
+
+    context.logger.info('Diretórios e arquivo CSV criados...')
+
+
+def init_state(context: SimpleNamespace):
+    """
+    Carrega as impressões digitais da execução anterior e a fila de
+    falhas.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+    """
+    context.fingerprints = FingerprintManager(config.FILE_FINGERPRINTS)
+    context.dead_letter_queue = DeadLetterQueue(config.FILE_DEAD_LETTER_QUEUE)
+
+
+def init_retry_worker(context: SimpleNamespace):
+    """
+    Cria e inicia a thread de novas tentativas da fila de falhas.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+    """
+    context.retry_worker = build_retry_worker(
+        context.dead_letter_queue,
+        config.TIME_EXECUTION,
+        context.image_storage,
+        context.replay
+    )
+    context.retry_worker.start()
+
+
+def init_browser(context: SimpleNamespace):
+    """
+    Configura o WebDriver e abre o navegador na página principal.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+    """
+    from src.managers.web_driver_options import WebDriverOptions
+
+    options = WebDriverOptions()
+    options.add_argument('--start-maximized')
+    options.add_argument('--disable-notifications')
+    if config.BROWSER_NETWORK_CAPTURE:
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    context.page_main = build_page_main(context.replay)
+
+
+def init_site(context: SimpleNamespace):
+    """
+    Abre o site no navegador, em paralelo com as demais etapas. Uma
+    falha não interrompe a inicialização: o site é aberto novamente no
+    estado PROCESS, com as suas novas tentativas.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+    """
+    try:
+        context.site_opened = open_site(context)
+    except Exception as error:
+        context.site_opened = None
+        context.logger.alert(
+            f'Falha ao abrir o site na inicialização, nova tentativa no '
+            f'processamento: {error}'
+        )
+
+
+def init_browser_session(context: SimpleNamespace):
+    """
+    Compartilha a sessão do navegador com o gerenciador das requisições:
+    as respostas já recebidas pelo navegador passam a ser reaproveitadas
+    e, com `BROWSER_SYNC_COOKIES`, os cookies do site são copiados para a
+    sessão HTTP, utilizada nos downloads que o navegador não fez. Não se
+    aplica à reprodução de uma gravação.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+    """
+    if context.replay is not None:
+        return
+    context.request.browser_network = getattr(
+        context.page_main, 'network', None
+    )
+    if not (config.BROWSER_SYNC_COOKIES and context.site_opened):
+        return
+    try:
+        cookies = context.page_main.driver.get_cookies()
+    except Exception as error:
+        context.logger.alert(
+            f'Falha ao copiar os cookies do navegador: {error}'
+        )
+        return
+    context.request.set_cookies(cookies)
+    context.logger.info(
+        f'{len(cookies)} cookie(s) do navegador copiado(s) para a sessão '
+        f'HTTP.'
+    )
+
+
+def initialization_error(context: SimpleNamespace, error: Exception):
+    """
+    Registra no log o erro ocorrido durante a inicialização.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+        error (Exception): A exceção gerada no estado.
+    """
+    context.logger.error('Erro durante a inicialização do processo:')
+    context.logger.error(f'{error}')
+
+
+def open_site(context: SimpleNamespace) -> bool:
+    """
+    Abre o site da atividade, verifica a tabela e aplica o filtro
+    de datas na própria tabela, quando configurado.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+
+    Returns:
+        bool: True se a tabela foi encontrada no site.
+    """
+    logger = context.logger
+    page_main = context.page_main
+
+    page_main.open_site(config.URL_SITE)
+
+    logger.info(f'Inicializou o site: {config.URL_SITE}')
+
+    table_exists = page_main.check_table()
+    if not table_exists:
+        logger.error(
+            'Erro: Tabela não foi encontrada ao inicializar o site.'
+        )
+        return False
+
+    if config.FILTER_DATES_IN_TABLE:
+        context.total_rows = page_main.apply_date_filter()
+        if context.total_rows is None:
+            logger.alert(
+                'Filtro de data indisponível na tabela, '
+                'todas as páginas serão percorridas.'
+            )
+        else:
+            logger.info(
+                f'Filtro de data aplicado na tabela: '
+                f'{context.total_rows} faturas elegíveis.'
+            )
+    return True
+
+
+def build_ocr_manager(logger: Logger) -> 'OcrManager | None':
+    """
+    Cria o gerenciador da etapa de OCR, caso esteja habilitada e o
+    Tesseract esteja instalado.
+
+    Args:
+        logger (Logger): Logger para registrar a configuração do OCR.
+
+    Returns:
+        OcrManager | None: O gerenciador de OCR ou None se a etapa
+        estiver desabilitada ou indisponível.
+    """
+    if not config.OCR_ENABLED:
+        return None
+    from src.managers.ocr_cache import OcrCache
+    from src.managers.ocr_manager import OcrManager, TesseractEngine
+
+    engine = TesseractEngine(
+        language=config.OCR_LANGUAGE, preprocess=config.OCR_PREPROCESSING
+    )
+    if not engine.is_available():
+        logger.alert(
+            'Tesseract não encontrado, a etapa de OCR foi desabilitada.'
+        )
+        return None
+    cache = None
+    if config.OCR_CACHE_ENABLED:
+        cache = OcrCache(
+            config.FILE_OCR_CACHE,
+            engine.version(),
+            config.OCR_CACHE_MAX_ENTRIES
+        )
+    ocr = OcrManager(engine, config.OCR_WORKERS, cache)
+    logger.info(f'Etapa de OCR habilitada com {ocr.workers} processo(s).')
+    return ocr
+
+
+def get_invoice_image_path(id_fatura: str) -> str:
+    """
+    Retorna o caminho da imagem de uma fatura no diretório das faturas
+    da execução atual.
+
+    Args:
+        id_fatura (str): Número da fatura.
+
+    Returns:
+        str: O caminho completo da imagem.
+    """
+    return os.path.join(config.DIRECTORY_IMGS, f'{id_fatura}.png')
+
+
+def get_invoice_image(
+        context: SimpleNamespace, id_fatura: str
+    ) -> str | bytes:
+    """
+    Retorna a imagem de uma fatura da execução atual para o OCR.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+        id_fatura (str): Número da fatura.
+
+    Returns:
+        str | bytes: O caminho da imagem ou, com o armazenamento em
+        pacote, o seu conteúdo.
+    """
+    if context.image_storage is None:
+        return get_invoice_image_path(id_fatura)
+    image = context.image_storage.get(id_fatura)
+    return image if isinstance(image, str) else bytes(image)
+
+
+def build_image_storage() -> 'ImagePack | ImageStore | None':
+    """
+    Cria o armazenamento das imagens da execução conforme
+    `IMAGE_STORAGE`: um pacote por execução ('pack'), o armazenamento
+    deduplicado entre as execuções ('store') ou None para gravar um
+    arquivo por fatura no diretório da execução ('files').
+
+    Returns:
+        ImagePack | ImageStore | None: O armazenamento das imagens.
+    """
+    if config.IMAGE_STORAGE == 'pack':
+        from src.managers.image_pack import ImagePack
+        return ImagePack(config.FILE_IMAGE_PACK)
+    if config.IMAGE_STORAGE == 'store':
+        return ImageStore(config.DIRECTORY_IMAGE_STORE, config.DIRECTORY_IMGS)
+    return None
+
+
+def download_invoice(
+        request: RequestManager,
+        row_data: dict,
+        image_storage: 'ImagePack | ImageStore' = None,
+        page: int = None
+    ) -> str:
+    """
+    Realiza o download da imagem de uma fatura para o diretório das
+    faturas da execução atual, ou para o armazenamento de imagens da
+    execução quando informado.
+
+    Args:
+        request (RequestManager): Gerenciador das requisições HTTP.
+        row_data (dict): Dados da linha da fatura.
+        image_storage (ImagePack | ImageStore, opcional): Armazenamento
+        das imagens da execução.
+        page (int, opcional): Página da tabela da fatura, registrada no
+        rastreamento.
+
+    Returns:
+        str: O caminho completo da imagem salva, ou sua localização no
+        pacote ('<pacote>#<fatura>').
+    """
+    id_fatura = row_data['NUMERO_DA_FATURA']
+    with TRACER.span(
+            'download_invoice', 'download', fatura=id_fatura, page=page):
+        response = request.get(row_data['URL_DA_FATURA'])
+        REGISTRY.increment('invoices_downloaded_total')
+        with TRACER.span('write_image', 'storage', fatura=id_fatura):
+            if image_storage is not None:
+                return image_storage.put(id_fatura, response.content)
+            path_img = get_invoice_image_path(id_fatura)
+            return request.convert_response_to_file_img(
+                response, os.path.dirname(path_img),
+                os.path.basename(path_img)
+            )
+
+
+def prefetch_invoices(context: SimpleNamespace, rows: List[dict]) -> int:
+    """
+    Inicia no navegador o download das faturas da página que o estado
+    PROCESS vai baixar: novas ou alteradas (no modo incremental), sem
+    falha registrada e ainda não emitidas. As respostas são reaproveitadas
+    pelo RequestManager.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+        rows (List[dict]): Linhas elegíveis da página.
+
+    Returns:
+        int: Quantidade de downloads iniciados.
+    """
+    page_main = context.page_main
+    if not getattr(page_main, 'prefetch', False):
+        return 0
+    urls = [
+        row_data['URL_DA_FATURA'] for row_data in rows
+        if row_data['NUMERO_DA_FATURA'] not in context.failed_ids
+        and row_data['NUMERO_DA_FATURA'] not in context.emitted_ids
+        and (
+            not config.INCREMENTAL_MODE
+            or context.fingerprints.is_new_or_changed(row_data)
+        )
+    ]
+    return page_main.prefetch_files(urls)
+
+
+def log_image_store(logger: Logger, image_store: ImageStore):
+    """
+    Registra no log a deduplicação das imagens da execução e, com
+    `IMAGE_STORE_KEEP_RUNS` definido, remove as execuções mais antigas
+    do armazenamento deduplicado e as imagens sem referências.
+
+    Args:
+        logger (Logger): Logger da execução.
+        image_store (ImageStore): Armazenamento deduplicado das imagens.
+    """
+    stats = image_store.stats()
+    logger.info(
+        f'Armazenamento de imagens: {stats["written"]} imagem(ns) nova(s) e '
+        f'{stats["deduplicated"]} já armazenada(s) '
+        f'({stats["bytes_saved"] / 2 ** 20:.2f} MiB não gravados).'
+    )
+    if config.IMAGE_STORE_KEEP_RUNS is None:
+        return
+    runs = [
+        run for run in utils.get_run_directories(
+            os.path.dirname(config.DIRECTORY_IMGS)
+        )
+        if image_store.owns_run(run)
+    ]
+    keep = max(1, config.IMAGE_STORE_KEEP_RUNS)
+    old_runs = [run for run in runs[:-keep] if run != config.DIRECTORY_IMGS]
+    if not old_runs:
+        return
+    result = image_store.prune_runs(old_runs)
+    logger.info(
+        f'{result["runs"]} execução(ões) antiga(s) removida(s), '
+        f'{result["objects"]} imagem(ns) sem referência apagada(s) '
+        f'({result["bytes"] / 2 ** 20:.2f} MiB liberados).'
+    )
+
+
+def build_retry_worker(
+        dead_letter_queue: DeadLetterQueue,
+        run: str = None,
+        image_storage: 'ImagePack | ImageStore' = None,
+        replay: CaptureArchive = None
+    ) -> RetryWorker:
+    """
+    Cria a thread que refaz, em segundo plano, os downloads das faturas
+    que estão na fila de falhas. A thread utiliza sua própria sessão
+    HTTP, separada da sessão da thread principal.
+
+    Args:
+        dead_letter_queue (DeadLetterQueue): A fila de faturas com falha.
+        run (str, opcional): Processa apenas as faturas da execução
+        informada.
+        image_storage (ImagePack | ImageStore, opcional): Armazenamento
+        onde as imagens são gravadas, no lugar do diretório das faturas.
+        replay (CaptureArchive, opcional): Gravação reproduzida no lugar
+        do site.
+
+    Returns:
+        RetryWorker: A thread de novas tentativas, ainda não iniciada.
+    """
+    request = build_request_manager(replay)
+
+    def retry_download(row_data: dict) -> dict:
+        REGISTRY.increment('dlq_retries_total')
+        download_invoice(request, row_data, image_storage)
+        return row_data
+
+    return RetryWorker(
+        dead_letter_queue,
+        retry_download,
+        run=run,
+        max_attempts=config.DLQ_MAX_ATTEMPTS,
+        backoff_base=config.DLQ_BACKOFF_BASE,
+        backoff_max=config.DLQ_BACKOFF_MAX
+    )
+
+
+def add_row_to_csv(
+        context: SimpleNamespace, row_data: dict, delta: bool = False
+    ):
+    """
+    Adiciona a linha de uma fatura no arquivo CSV, ignorando faturas
+    já adicionadas na execução atual (por exemplo, ao repetir uma
+    página após uma falha).
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+        row_data (dict): Dados da linha da fatura.
+        delta (bool): Adiciona a linha também no arquivo CSV delta, com
+        as faturas novas ou alteradas.
+    """
+    id_fatura = row_data['NUMERO_DA_FATURA']
+    if id_fatura in context.emitted_ids:
+        return
+    columns = context.csv_manager.df.columns
+    row_data = {key: value for key, value in row_data.items() if key in columns}
+    context.csv_manager.add_data(row_data)
+    if delta:
+        context.delta_csv_manager.add_data(row_data)
+        context.delta_csv_manager.save_file()
+    context.emitted_ids.add(id_fatura)
+
+
+def collect_retried_rows(context: SimpleNamespace):
+    """
+    Adiciona no arquivo CSV as faturas cujo download foi concluído pela
+    thread de novas tentativas.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+    """
+    if not context.retry_worker:
+        return
+    rows = context.retry_worker.get_completed()
+    for row_data in rows:
+        add_row_to_csv(context, row_data, delta=True)
+        id_fatura = row_data['NUMERO_DA_FATURA']
+        context.failed_ids.discard(id_fatura)
+        if context.ocr:
+            context.ocr.submit(id_fatura, get_invoice_image(context, id_fatura))
+        context.logger.info(
+            f'Fatura {row_data["NUMERO_DA_FATURA"]} recuperada da fila de '
+            f'falhas e adicionada no arquivo CSV.'
+        )
+    if rows:
+        context.csv_manager.save_file()
+
+
+def process(context: SimpleNamespace) -> str:
+    """
+    Estado para processamento de faturas.
+
+    Neste estado, a aplicação coleta e processa faturas a partir do
+    site, utilizando o item capturado anteriormente. A lógica de
+    processamento é projetada para operar de maneira sequencial,
+    garantindo que cada fatura seja tratada adequadamente
+    antes de passar para a próxima.
+
+    Cada execução do estado processa a página atual da tabela e retorna
+    'PROCESS' para seguir para a próxima página. Em caso de falha, a
+    máquina de estados executa o estado novamente a partir da mesma
+    página e com o mesmo navegador, e as faturas que já foram
+    adicionadas no arquivo CSV são ignoradas.
+
+    Este estado também combina o
+    uso de Selenium para automação de navegador e Requests para
+    manipulação de requisições HTTP.
+
+    A comunicação entre as classes `PageMain`, `RequestManager`
+    e `CsvManager` é crucial, permitindo que a aplicação mantenha
+    o controle do estado dos dados enquanto interage com a interface
+    do usuário. Os logs são utilizados para registrar informações
+    importantes sobre o fluxo e facilitar a depuração
+    em caso de falhas.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+
+    Returns:
+        str: O próximo estado.
+    """
+    logger = context.logger
+    page_main = context.page_main
+    request = context.request
+    csv_manager = context.csv_manager
+    fingerprints = context.fingerprints
+
+    if context.first_execution:
+        site_opened = context.site_opened
+        context.site_opened = None
+        if site_opened is None:
+            site_opened = open_site(context)
+        if not site_opened:
+            return 'END'
+        context.first_execution = False
+
+    page_number = page_main.current_page
+    if (
+        config.INCREMENTAL_MODE
+        and page_number == 1
+        and context.total_rows is not None
+        and fingerprints.table_unchanged(page_main.get_table_data())
+    ):
+        previous_rows = fingerprints.get_emitted_rows()
+        for row_data in previous_rows:
+            add_row_to_csv(context, row_data)
+        csv_manager.save_file()
+        fingerprints.carry_over_all()
+        logger.info(
+            f'Tabela sem alterações desde a última execução, '
+            f'{len(previous_rows)} faturas reaproveitadas.'
+        )
+        context.success = True
+        return 'END'
+
+    rows = list(page_main.get_rows())
+    if context.first_row_seconds is None and rows:
+        context.first_row_seconds = time.perf_counter() - context.start
+        REGISTRY.set_gauge('time_to_first_row_seconds',
+                           context.first_row_seconds)
+        logger.info(
+            f'Primeira linha da tabela lida em '
+            f'{context.first_row_seconds:.2f}s.'
+        )
+
+    # Apenas as linhas elegíveis entram na impressão digital da página,
+    # para que uma fatura que passa a ser elegível altere o hash da página.
+    rows = [
+        row_data for row_data in rows
+        if utils.check_date_before_or_today(row_data['DATA_DA_FATURA'])
+    ]
+
+    if (
+        config.INCREMENTAL_MODE
+        and fingerprints.page_unchanged(page_number, rows)
+    ):
+        for row_data in fingerprints.get_emitted_rows(page_number):
+            add_row_to_csv(context, row_data)
+        csv_manager.save_file()
+        fingerprints.carry_over_page(page_number)
+        logger.info(
+            f'Página {page_number} sem alterações desde a '
+            f'última execução, faturas reaproveitadas.'
+        )
+        rows = []
+
+    prefetch_invoices(context, rows)
+
+    emitted_rows = []
+    emitted_hashes = {}
+    page_has_failures = False
+    raw_rows = [dict(row_data) for row_data in rows]
+
+    for row_data in rows:
+
+        row_hash = fingerprints.hash_row(row_data)
+        is_new_or_changed = fingerprints.is_new_or_changed(row_data)
+
+        date = row_data['DATA_DA_FATURA']
+        row_data['DATA_DA_FATURA'] = utils.format_date(date)
+        id_fatura = row_data['NUMERO_DA_FATURA']
+        emitted_rows.append(row_data)
+        emitted_hashes[id_fatura] = row_hash
+
+        if id_fatura in context.failed_ids:
+            page_has_failures = True
+            continue
+
+        if id_fatura in context.emitted_ids:
+            continue
 
+        REGISTRY.increment('rows_accepted_total')
+        logger.info(
+            'Data: %s é menor ou igual a data de hoje.', date,
+            row=True, fatura=id_fatura
+        )
+
+        is_delta = not config.INCREMENTAL_MODE or is_new_or_changed
+        if not is_delta:
+            # Mantém os campos gravados na execução anterior (como os
+            # do OCR), que não vêm da tabela do site.
+            previous_row = fingerprints.get_emitted_row(id_fatura)
+            if previous_row is not None:
+                for key, value in previous_row.items():
+                    row_data.setdefault(key, value)
+            REGISTRY.increment('invoices_skipped_total')
+            logger.info(
+                'Fatura %s já emitida anteriormente, download ignorado.',
+                id_fatura, row=True, fatura=id_fatura
+            )
+        else:
+            try:
+                path_img = download_invoice(
+                    request, row_data, context.image_storage,
+                    page=page_number
+                )
             except Exception as error:
-                name_img = utils.get_img_name(
-                    DIRECTORY_IMGS_ERRORS, 'erro.png'
+                context.dead_letter_queue.add(
+                    id_fatura,
+                    row_data,
+                    error,
+                    run=config.TIME_EXECUTION,
+                    delay=config.DLQ_BACKOFF_BASE
                 )
-                page_main.screenshot_of_screen(name_img)
-                logger.error('Erro durante o processamento dos itens.')
-                logger.error(f'{error}')
-                state = 'END'
-                continue
-
-        case 'END':
-            """
-            Estado para finalização do processo.
-
-            Neste estado, a aplicação encerra o fluxo
-            de trabalho após o processamento das faturas,
-            registrando o resultado final. Dependendo do
-            sucesso ou falha do processo, diferentes ações
-            são realizadas.
-
-            O fluxo de trabalho inclui:
-            1. Verificação do status de sucesso (`success`):
-            - Se `True`, registra o caminho do arquivo CSV e o
-            diretório das faturas, além de informar que o processo
-            foi concluído com sucesso.
-            - Se `False`, gera alertas informando sobre a disponibilidade
-            das imagens de erro e recomenda verificar as falhas
-            durante a execução.
-
-            2. Fechamento do navegador através de
-            `page_main.close_browser()` para liberar recursos.
-
-            3. Atualização do loop para 'OFF', indicando que o
-            processo foi finalizado e não deve haver mais iterações.
-            """
-            if success == True:
-                logger.info(f'Caminho arquivo CSV: {file_csv}')
-                logger.info(
-                    f'Camminho da pasta das faturas: {DIRECTORY_IMGS}'
+                context.failed_ids.add(id_fatura)
+                page_has_failures = True
+                REGISTRY.increment('download_failures_total')
+                logger.error(
+                    f'Erro no download da fatura {id_fatura}, enviada '
+                    f'para a fila de falhas: {error}',
+                    fatura=id_fatura
                 )
-                logger.info('Processo concluído com Sucesso.')
-                print('Processo concluído com Sucesso.')
-            else:
-                logger.alert(
-                    f'Imagens de erros disponíveis em {DIRECTORY_IMGS_ERRORS}'
+                continue
+            logger.info(
+                'Dowload da Fatura com sucesso, disponível em: %s',
+                path_img, row=True, fatura=id_fatura
+            )
+            if context.ocr:
+                context.ocr.submit(
+                    id_fatura, get_invoice_image(context, id_fatura)
                 )
-                logger.alert(
-                    'Processo teve falhas durante a execução. Verificar!'
+
+        add_row_to_csv(context, row_data, delta=is_delta)
+        csv_manager.save_file()
+        logger.info(
+            'Linha da fatura %s adicionada com sucesso no arquivo CSV.',
+            id_fatura, row=True, fatura=id_fatura
+        )
+
+    if raw_rows and not page_has_failures:
+        fingerprints.mark_page(
+            page_number, raw_rows, emitted_rows, emitted_hashes
+        )
+
+    collect_retried_rows(context)
+
+    button_is_disabled = page_main.check_button_next_disabled()
+    if button_is_disabled:
+        logger.info(
+            'Botão Next desabilitado, robô fez toda a paginação.'
+        )
+        context.success = True
+        return 'RETRY'
+    page_main.click_next_button()
+    logger.info('Indo para a próxima página.')
+    return 'PROCESS'
+
+
+def process_error(context: SimpleNamespace, error: Exception):
+    """
+    Registra no log o erro ocorrido durante o processamento e salva
+    um screenshot da tela no diretório de imagens de erro.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+        error (Exception): A exceção gerada no estado.
+    """
+    name_img = utils.get_img_name(config.DIRECTORY_IMGS_ERRORS, 'erro.png')
+    try:
+        context.page_main.screenshot_of_screen(name_img)
+    except Exception as screenshot_error:
+        context.logger.error(
+            f'Erro ao salvar o screenshot da tela: {screenshot_error}'
+        )
+    context.logger.error(
+        f'Erro durante o processamento dos itens da página '
+        f'{context.page_main.current_page}.'
+    )
+    context.logger.error(f'{error}')
+
+
+def retry(context: SimpleNamespace) -> str:
+    """
+    Estado para as novas tentativas das faturas com falha.
+
+    Ao final da paginação, aguarda a thread de novas tentativas
+    esvaziar a fila de falhas da execução atual (respeitando o tempo de
+    espera entre as tentativas), até o limite `DLQ_DRAIN_TIMEOUT`, e
+    adiciona no arquivo CSV as faturas recuperadas. As faturas que não
+    forem recuperadas permanecem no arquivo da fila de falhas e podem
+    ser reprocessadas depois com `python main.py --replay-dlq`.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+
+    Returns:
+        str: O próximo estado.
+    """
+    logger = context.logger
+    dead_letter_queue = context.dead_letter_queue
+
+    pending = dead_letter_queue.pending(config.TIME_EXECUTION)
+    if pending:
+        logger.info(
+            f'Aguardando novas tentativas de {len(pending)} fatura(s) '
+            f'na fila de falhas.'
+        )
+        context.retry_worker.drain(config.DLQ_DRAIN_TIMEOUT)
+
+    collect_retried_rows(context)
+
+    if context.failed_ids:
+        logger.alert(
+            f'{len(context.failed_ids)} fatura(s) não recuperada(s), '
+            f'disponíveis na fila de falhas: {dead_letter_queue.file}'
+        )
+    if context.ocr:
+        return 'OCR'
+    return 'END'
+
+
+def ocr(context: SimpleNamespace) -> str:
+    """
+    Estado para a etapa de OCR das faturas.
+
+    O OCR das faturas é iniciado em um pool de processos assim que cada
+    download termina. Neste estado, a aplicação aguarda os OCRs ainda
+    em andamento e grava os campos extraídos (número da nota, empresa e
+    valor total) nas colunas de OCR dos arquivos CSV. A vazão da etapa,
+    em imagens por segundo, e a taxa de acerto do cache de OCR são
+    registradas no log.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+
+    Returns:
+        str: O próximo estado.
+    """
+    logger = context.logger
+    ocr_manager = context.ocr
+
+    logger.info(
+        f'Aguardando o OCR de {ocr_manager.pending()} fatura(s) '
+        f'em andamento.'
+    )
+    ocr_manager.collect(wait=True)
+
+    for csv_manager in (context.csv_manager, context.delta_csv_manager):
+        csv_manager.add_columns(config.COLUMNS_OCR)
+        for id_fatura, fields in ocr_manager.results.items():
+            for column, value in fields.items():
+                csv_manager.update_cell_by_query(
+                    'NUMERO_DA_FATURA', id_fatura, column, value
                 )
-                print('Processo teve falhas durante a execução. Verificar!')
-            page_main.close_browser()
-            loop = 'OFF'
-            continue
\ No newline at end of file
+        csv_manager.save_file()
+
+    for id_fatura, fields in ocr_manager.results.items():
+        context.fingerprints.update_emitted_row(id_fatura, fields)
+
+    for id_fatura, error in ocr_manager.errors.items():
+        logger.error(f'Erro no OCR da fatura {id_fatura}: {error}')
+
+    if ocr_manager.not_preprocessed:
+        logger.alert(
+            f'{ocr_manager.not_preprocessed} imagem(ns) fora do formato PNG '
+            f'(como as faturas JPEG do site) enviada(s) ao OCR sem o '
+            f'pré-processamento.'
+        )
+
+    throughput = ocr_manager.throughput()
+    logger.info(
+        f'OCR concluído: {throughput["images"]} imagem(ns) em '
+        f'{throughput["seconds"]:.2f}s '
+        f'({throughput["images_per_second"]:.2f} imagens/s, '
+        f'{throughput["seconds_per_image"]:.2f}s por imagem, '
+        f'{throughput["workers"]} processo(s)).'
+    )
+    if ocr_manager.cache is not None:
+        stats = ocr_manager.cache.stats()
+        logger.info(
+            f'Cache de OCR: {stats["hits"]} acerto(s) e '
+            f'{stats["misses"]} falha(s) (taxa de acerto de '
+            f'{stats["hit_ratio"]:.0%}), {stats["seconds_saved"]:.2f}s '
+            f'de reconhecimento economizados.'
+        )
+    return 'END'
+
+
+def end(context: SimpleNamespace) -> None:
+    """
+    Estado para finalização do processo.
+
+    Neste estado, a aplicação encerra o fluxo
+    de trabalho após o processamento das faturas,
+    registrando o resultado final. Dependendo do
+    sucesso ou falha do processo, diferentes ações
+    são realizadas.
+
+    O fluxo de trabalho inclui:
+    1. Verificação do status de sucesso (`success`):
+    - Se `True`, registra o caminho do arquivo CSV e o
+    diretório das faturas, além de informar que o processo
+    foi concluído com sucesso.
+    - Se `False`, gera alertas informando sobre a disponibilidade
+    das imagens de erro e recomenda verificar as falhas
+    durante a execução.
+
+    2. Fechamento do navegador através de
+    `page_main.close_browser()` para liberar recursos. No modo
+    serviço o navegador é mantido aberto para o próximo ciclo,
+    a menos que o ciclo tenha falhado.
+
+    3. Retorno de None, indicando que o processo foi finalizado
+    e não deve haver mais iterações da máquina de estados.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+
+    Returns:
+        None: Encerra a máquina de estados.
+    """
+    logger = context.logger
+
+    if context.retry_worker:
+        context.retry_worker.stop()
+        collect_retried_rows(context)
+
+    if context.ocr:
+        context.ocr.shutdown()
+
+    if context.image_storage is not None:
+        context.image_storage.close()
+        if isinstance(context.image_storage, ImageStore):
+            log_image_store(logger, context.image_storage)
+
+    if context.fingerprints:
+        try:
+            context.fingerprints.save_file(complete=context.success)
+        except Exception as error:
+            logger.error(
+                f'Erro ao salvar as impressões digitais da execução: {error}'
+            )
+
+    if context.success == True:
+        logger.info(f'Caminho arquivo CSV: {context.file_csv}')
+        logger.info(f'Caminho arquivo CSV delta: {context.file_delta_csv}')
+        if config.IMAGE_STORAGE == 'pack' and context.image_storage:
+            logger.info(
+                f'Caminho do pacote das faturas: {context.image_storage.file}'
+            )
+        else:
+            logger.info(
+                f'Camminho da pasta das faturas: {config.DIRECTORY_IMGS}'
+            )
+        logger.info('Processo concluído com Sucesso.')
+        print('Processo concluído com Sucesso.')
+    else:
+        logger.alert(
+            f'Imagens de erros disponíveis em {config.DIRECTORY_IMGS_ERRORS}'
+        )
+        logger.alert(
+            'Processo teve falhas durante a execução. Verificar!'
+        )
+        print('Processo teve falhas durante a execução. Verificar!')
+    if context.page_main and (context.close_browser or not context.success):
+        context.page_main.close_browser()
+    return None
+
+
+def open_replay() -> CaptureArchive | None:
+    """
+    Abre a gravação definida em `REPLAY_FILE`, reproduzida no lugar do
+    site e do navegador.
+
+    Returns:
+        CaptureArchive | None: A gravação, ou None fora do modo de
+        reprodução.
+    """
+    if not config.REPLAY_FILE:
+        return None
+    return CaptureArchive(config.REPLAY_FILE, config.REPLAY_SPEED)
+
+
+def build_page_main(
+        replay: CaptureArchive = None
+    ) -> 'PageMain | ReplayPageMain':
+    """
+    Cria a página principal, ou a sua reprodução a partir da gravação.
+
+    Args:
+        replay (CaptureArchive, opcional): Gravação reproduzida.
+
+    Returns:
+        PageMain | ReplayPageMain: A página principal.
+    """
+    if replay is not None:
+        return ReplayPageMain(replay)
+    from src.pom.pages.page_main import PageMain
+    network_timeout = None
+    if config.BROWSER_NETWORK_CAPTURE:
+        network_timeout = config.BROWSER_NETWORK_TIMEOUT
+    return PageMain(
+        build_browser_recycler(), network_timeout,
+        config.BROWSER_NETWORK_PREFETCH
+    )
+
+
+def build_browser_recycler() -> BrowserRecycler | None:
+    """
+    Cria a política de reciclagem do navegador conforme as
+    configurações `BROWSER_RECYCLE_*`.
+
+    Returns:
+        BrowserRecycler | None: A política, ou None se todos os
+        critérios estiverem desabilitados.
+    """
+    criteria = (
+        config.BROWSER_RECYCLE_PAGES,
+        config.BROWSER_RECYCLE_RSS_MB,
+        config.BROWSER_RECYCLE_LATENCY_FACTOR,
+    )
+    if all(criterion is None for criterion in criteria):
+        return None
+    return BrowserRecycler(*criteria)
+
+
+def build_request_manager(
+        replay: CaptureArchive = None
+    ) -> RequestManager:
+    """
+    Cria o gerenciador das requisições HTTP, ou o que responde com as
+    respostas da gravação.
+
+    Args:
+        replay (CaptureArchive, opcional): Gravação reproduzida.
+
+    Returns:
+        RequestManager: O gerenciador das requisições.
+    """
+    if replay is not None:
+        return ReplayRequestManager(replay)
+    return RequestManager()
+
+
+def build_profiler() -> Profiler | None:
+    """
+    Cria o profiler dos estados definidos em `PROFILE_STAGES`, com os
+    arquivos gravados em LOGS/.
+
+    Returns:
+        Profiler | None: O profiler, ou None se nenhum estado for
+        perfilado.
+    """
+    if not config.PROFILE_STAGES:
+        return None
+    return Profiler(
+        config.DIRECTORY_LOGS,
+        config.TIME_EXECUTION,
+        config.PROFILE_STAGES,
+        mode=config.PROFILE_MODE,
+        memory=config.PROFILE_MEMORY,
+        sample_interval=config.PROFILE_SAMPLE_INTERVAL,
+        top=config.PROFILE_TOP
+    )
+
+
+def log_profiler(logger: Logger, profiler: Profiler):
+    """
+    Grava os arquivos do profiling e registra no log os pontos mais
+    custosos da execução, logo após o END (incluindo o próprio END,
+    quando perfilado).
+
+    Args:
+        logger (Logger): Logger da execução.
+        profiler (Profiler): Profiler da execução.
+    """
+    try:
+        files = profiler.save()
+    except OSError as error:
+        logger.error(f'Erro ao gravar os arquivos do profiling: {error}')
+        files = []
+    for line in profiler.summary():
+        logger.info(line)
+    for file in files:
+        logger.info(f'Arquivo do profiling: {file}')
+    profiler.close()
+
+
+def build_state_machine(
+        logger: Logger, profiler: Profiler = None
+    ) -> StateMachine:
+    """
+    Monta a máquina de estados da automação (INITIALIZATION, PROCESS,
+    RETRY, OCR, END), com a quantidade de novas tentativas de cada
+    estado definida em `config.MAX_RETRIES`.
+
+    Args:
+        logger (Logger): Logger utilizado pela máquina de estados.
+        profiler (Profiler, opcional): Profiler dos estados escolhidos.
+
+    Returns:
+        StateMachine: A máquina de estados configurada.
+    """
+    def stage(name: str, handler):
+        return profiler.wrap(name, handler) if profiler else handler
+
+    machine = StateMachine(
+        'INITIALIZATION', logger, metrics=REGISTRY, tracer=TRACER
+    )
+    machine.register(
+        'INITIALIZATION',
+        stage('INITIALIZATION', initialization),
+        max_retries=config.MAX_RETRIES.get('INITIALIZATION', 0),
+        on_error='END',
+        on_exception=initialization_error
+    )
+    machine.register(
+        'PROCESS',
+        stage('PROCESS', process),
+        max_retries=config.MAX_RETRIES.get('PROCESS', 0),
+        on_error='END',
+        on_exception=process_error
+    )
+    machine.register('RETRY', stage('RETRY', retry), on_error='END')
+    machine.register('OCR', stage('OCR', ocr), on_error='END')
+    machine.register('END', stage('END', end))
+    return machine
+
+
+def run_process(close_browser: bool = True) -> bool:
+    """
+    Executa um ciclo completo da automação através da máquina de
+    estados (INITIALIZATION, PROCESS, RETRY, OCR, END).
+
+    Antes de iniciar, os dados da execução (horário, diretório das
+    faturas e nome do arquivo CSV) são reiniciados, permitindo que a
+    função seja chamada várias vezes no mesmo processo, como no modo
+    serviço. Ao final, o tempo gasto em cada estado é registrado no log.
+
+    Args:
+        close_browser (bool): Fecha o navegador ao final do ciclo. No modo
+        serviço o navegador é mantido aberto entre os ciclos, sendo
+        fechado apenas quando o ciclo termina com falha.
+
+    Returns:
+        bool: True se o processo foi concluído com sucesso.
+    """
+    config.refresh_execution()
+    REGISTRY.reset()
+    if config.TRACE_ENABLED:
+        TRACER.start()
+    start = time.perf_counter()
+
+    logger = create_logger()
+    context = SimpleNamespace(
+        logger=logger,
+        close_browser=close_browser,
+        first_execution=True,
+        site_opened=None,
+        start=start,
+        first_row_seconds=None,
+        success=False,
+        error=None,
+        page_main=None,
+        fingerprints=None,
+        retry_worker=None,
+        ocr=None,
+        image_storage=None,
+        profiler=build_profiler(),
+        replay=open_replay(),
+        total_rows=None,
+        emitted_ids=set(),
+        failed_ids=set(),
+    )
+
+    if config.CAPTURE_ENABLED and context.replay is None:
+        CAPTURE.start(
+            os.path.join(
+                config.DIRECTORY_CAPTURES, f'{config.TIME_EXECUTION}.zip'
+            ),
+            url=config.URL_SITE,
+            run=config.TIME_EXECUTION
+        )
+
+    machine = build_state_machine(logger, context.profiler)
+    try:
+        machine.run(context)
+    finally:
+        if context.profiler:
+            log_profiler(logger, context.profiler)
+        file_capture = CAPTURE.stop()
+        if file_capture:
+            logger.info(f'Gravação da execução: {file_capture}')
+        if context.replay is not None:
+            context.replay.close()
+
+    for state, timing in machine.timings_summary().items():
+        logger.info(
+            f'Estado {state}: {timing["executions"]} execução(ões), '
+            f'{timing["failures"]} falha(s), {timing["seconds"]:.2f}s.'
+        )
+    if config.METRICS_ENABLED:
+        export_metrics(context, machine, time.perf_counter() - start)
+    if TRACER.enabled:
+        TRACER.stop()
+        file_trace = TRACER.write(os.path.join(
+            config.DIRECTORY_TRACES, f'{config.TIME_EXECUTION}.trace.json'
+        ))
+        logger.info(f'Rastreamento da execução: {file_trace}')
+    return context.success
+
+
+def export_metrics(
+        context: SimpleNamespace, machine: StateMachine, seconds: float
+    ):
+    """
+    Registra as métricas do fim da execução (sucesso, duração, vazão e
+    faturas pendentes na fila de falhas) e grava as métricas em
+    METRICS/<execução>.prom, no formato do Prometheus, e
+    METRICS/<execução>.json, com o resumo da execução.
+
+    Args:
+        context (SimpleNamespace): Contexto compartilhado entre os estados.
+        machine (StateMachine): Máquina de estados executada.
+        seconds (float): Duração da execução em segundos.
+    """
+    rows_scanned = REGISTRY.total('rows_scanned_total')
+    rows_per_second = rows_scanned / seconds if seconds else 0.0
+    REGISTRY.set_gauge('run_success', int(bool(context.success)))
+    REGISTRY.set_gauge('run_duration_seconds', seconds)
+    REGISTRY.set_gauge('run_rows_per_second', rows_per_second)
+    REGISTRY.set_gauge('run_timestamp_seconds', time.time())
+    dead_letter_queue = getattr(context, 'dead_letter_queue', None)
+    if dead_letter_queue is not None:
+        pending = dead_letter_queue.pending(config.TIME_EXECUTION)
+        REGISTRY.set_gauge('dlq_pending', len(pending))
+
+    file = os.path.join(config.DIRECTORY_METRICS, config.TIME_EXECUTION)
+    try:
+        REGISTRY.write_files(f'{file}.prom', f'{file}.json', {
+            'run': config.TIME_EXECUTION,
+            'success': bool(context.success),
+            'duration_seconds': seconds,
+            'rows_scanned': rows_scanned,
+            'rows_accepted': REGISTRY.total('rows_accepted_total'),
+            'rows_per_second': rows_per_second,
+            'bytes_downloaded': REGISTRY.total('download_bytes_total'),
+            'bytes_downloaded_by_browser': REGISTRY.value(
+                'download_bytes_total', source='browser'
+            ),
+            'states': machine.timings_summary(),
+        })
+    except OSError as error:
+        context.logger.error(
+            f'Erro ao gravar as métricas da execução: {error}'
+        )
+        return
+    context.logger.info(
+        f'Métricas da execução: {rows_scanned:.0f} linha(s) lida(s), '
+        f'{rows_per_second:.1f} linha(s)/s. Arquivo: {file}.prom'
+    )
+
+
+def run_daemon(
+        interval: float = None, cron: str = None, metrics_port: int = None
+    ):
+    """
+    Executa a automação em modo serviço, mantendo o processo e o
+    navegador ativos e executando um ciclo completo a cada intervalo
+    ou nos horários definidos pela expressão cron.
+
+    Um novo ciclo nunca inicia enquanto o anterior estiver em andamento.
+    Ao receber SIGINT ou SIGTERM, o ciclo atual é finalizado e o
+    navegador é fechado antes do encerramento do processo.
+
+    Com a porta das métricas definida, as métricas do último ciclo ficam
+    disponíveis em http://127.0.0.1:<porta>/metrics durante o serviço.
+
+    Args:
+        interval (float, opcional): Intervalo em segundos entre os ciclos.
+        cron (str, opcional): Expressão cron com os horários dos ciclos.
+        metrics_port (int, opcional): Porta do servidor de métricas. Por
+        padrão `METRICS_PORT`.
+    """
+    logger = create_logger()
+    scheduler = Scheduler(
+        lambda: run_process(close_browser=False),
+        interval=interval,
+        cron=cron,
+        lock_file=config.FILE_DAEMON_LOCK,
+        logger=logger
+    )
+    logger.info('Iniciando a automação em modo serviço.')
+    if metrics_port is None:
+        metrics_port = config.METRICS_PORT
+    metrics_server = None
+    if metrics_port is not None:
+        metrics_server = MetricsServer(REGISTRY, metrics_port)
+        metrics_server.start()
+        logger.info(
+            f'Métricas disponíveis em http://{metrics_server.host}:'
+            f'{metrics_server.port}/metrics'
+        )
+    try:
+        scheduler.run_forever()
+    finally:
+        if metrics_server is not None:
+            metrics_server.stop()
+        from src.managers.web_driver_controller import WebDriverController
+        WebDriverController.close_driver()
+        logger.info('Modo serviço encerrado.')
+
+
+def replay_dead_letter_queue(file: str) -> bool:
+    """
+    Reprocessa as faturas de um arquivo da fila de falhas salvo em uma
+    execução anterior, sem abrir o navegador.
+
+    As faturas recuperadas são salvas em um novo diretório de faturas (ou
+    pacote, conforme `IMAGE_STORAGE`) e adicionadas em um arquivo CSV
+    'FATURAS_REPLAY_<data>.csv'. As que falharem novamente permanecem no
+    arquivo da fila.
+
+    Args:
+        file (str): Caminho do arquivo JSON da fila de falhas.
+
+    Returns:
+        bool: True se todas as faturas da fila foram recuperadas.
+    """
+    config.refresh_execution()
+    logger = create_logger()
+
+    dead_letter_queue = DeadLetterQueue(file)
+    if not len(dead_letter_queue):
+        logger.info(f'Fila de falhas vazia: {file}')
+        return True
+
+    logger.info(
+        f'Reprocessando {len(dead_letter_queue)} fatura(s) da fila de '
+        f'falhas: {file}'
+    )
+    image_storage = build_image_storage()
+    if config.IMAGE_STORAGE == 'files':
+        DirectoryManager(config.DIRECTORY_IMGS)
+    DirectoryManager(config.DIRECTORY_CSVS)
+    name_csv = utils.get_file_csv_name(config.DIRECTORY_CSVS, 'FATURAS_REPLAY')
+    csv_manager = CsvManager.create(name_csv, config.COLUMNS_CSV_FILE)
+
+    dead_letter_queue.reset()
+    retry_worker = build_retry_worker(
+        dead_letter_queue, image_storage=image_storage
+    )
+    retry_worker.start()
+    retry_worker.drain(config.DLQ_DRAIN_TIMEOUT)
+    retry_worker.stop()
+    if image_storage is not None:
+        image_storage.close()
+
+    for row_data in retry_worker.get_completed():
+        csv_manager.add_data(row_data)
+    csv_manager.save_file()
+
+    remaining = len(dead_letter_queue)
+    logger.info(
+        f'Fila de falhas reprocessada: {retry_worker.succeeded} fatura(s) '
+        f'recuperada(s), {remaining} restante(s). CSV: {name_csv}'
+    )
+    return remaining == 0
+
+
+def export_image_pack(file: str, directory: str = None) -> List[str]:
+    """
+    Exporta as imagens de um pacote de faturas como arquivos PNG
+    individuais, no mesmo formato do armazenamento em arquivos.
+
+    Args:
+        file (str): Caminho do arquivo de pacote.
+        directory (str, opcional): Diretório de destino. Por padrão
+        IMGS/<nome do pacote>.
+
+    Returns:
+        List[str]: Caminhos dos arquivos exportados.
+    """
+    logger = create_logger()
+    if directory is None:
+        name = os.path.splitext(os.path.basename(file))[0]
+        directory = os.path.join(config.BASE_DIRECTORY, 'IMGS', name)
+    from src.managers.image_pack import ImagePack
+
+    image_pack = ImagePack(file, readonly=True)
+    try:
+        paths = image_pack.export(directory)
+    finally:
+        image_pack.close()
+    logger.info(
+        f'{len(paths)} fatura(s) exportada(s) do pacote {file} para '
+        f'{directory}'
+    )
+    return paths
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Lê os argumentos da linha de comando.
+
+    Returns:
+        argparse.Namespace: Os argumentos informados.
+    """
+    parser = argparse.ArgumentParser(description='RPA Challenge OCR')
+    parser.add_argument(
+        '--daemon',
+        action='store_true',
+        help='Executa em modo serviço, repetindo o processo agendado.'
+    )
+    parser.add_argument(
+        '--replay-dlq',
+        metavar='ARQUIVO',
+        nargs='?',
+        const=config.FILE_DEAD_LETTER_QUEUE,
+        help='Reprocessa as faturas de um arquivo da fila de falhas.'
+    )
+    parser.add_argument(
+        '--export-pack',
+        metavar='PACOTE',
+        help='Exporta as imagens de um pacote de faturas como arquivos PNG.'
+    )
+    parser.add_argument(
+        '--export-to',
+        metavar='DIRETORIO',
+        help='Diretório de destino da exportação (padrão IMGS/<pacote>).'
+    )
+    parser.add_argument(
+        '--trace',
+        action='store_true',
+        help='Grava o rastreamento da execução em TRACES/.'
+    )
+    parser.add_argument(
+        '--profile',
+        metavar='ESTADOS',
+        nargs='?',
+        const='PROCESS',
+        help='Perfila os estados informados (separados por vírgula, padrão '
+             'PROCESS), com os arquivos em LOGS/.'
+    )
+    parser.add_argument(
+        '--profile-mode',
+        choices=Profiler.MODES,
+        help='Modo do profiling: cprofile ou sampling (amostragem).'
+    )
+    parser.add_argument(
+        '--profile-memory',
+        action='store_true',
+        help='Registra snapshots do tracemalloc a cada página.'
+    )
+    parser.add_argument(
+        '--record',
+        action='store_true',
+        help='Grava as páginas da tabela e as imagens em CAPTURES/.'
+    )
+    parser.add_argument(
+        '--replay',
+        metavar='ARQUIVO',
+        help='Reproduz uma gravação no lugar do site, sem rede.'
+    )
+    parser.add_argument(
+        '--replay-speed',
+        type=float,
+        metavar='VELOCIDADE',
+        help='Velocidade da reprodução (1 tempos gravados, 0 sem espera).'
+    )
+    parser.add_argument(
+        '--metrics-port',
+        type=int,
+        metavar='PORTA',
+        help='Porta local das métricas no modo serviço (/metrics).'
+    )
+    schedule = parser.add_mutually_exclusive_group()
+    schedule.add_argument(
+        '--interval',
+        type=float,
+        help='Intervalo em segundos entre os ciclos do modo serviço.'
+    )
+    schedule.add_argument(
+        '--cron',
+        help='Expressão cron (5 campos) com os horários do modo serviço.'
+    )
+    arguments = parser.parse_args()
+    if arguments.daemon and not (arguments.interval or arguments.cron):
+        arguments.interval = config.DAEMON_INTERVAL
+    return arguments
+
+
+if __name__ == '__main__':
+    arguments = parse_arguments()
+    if arguments.trace:
+        config.TRACE_ENABLED = True
+    if arguments.profile:
+        config.PROFILE_STAGES = arguments.profile.upper().split(',')
+    if arguments.profile_mode:
+        config.PROFILE_MODE = arguments.profile_mode
+    if arguments.profile_memory:
+        config.PROFILE_MEMORY = True
+    if arguments.record:
+        config.CAPTURE_ENABLED = True
+    if arguments.replay:
+        config.REPLAY_FILE = arguments.replay
+    if arguments.replay_speed is not None:
+        config.REPLAY_SPEED = arguments.replay_speed
+    if arguments.export_pack:
+        export_image_pack(arguments.export_pack, arguments.export_to)
+    elif arguments.replay_dlq:
+        replay_dead_letter_queue(arguments.replay_dlq)
+    elif arguments.daemon:
+        run_daemon(arguments.interval, arguments.cron, arguments.metrics_port)
+    else:
+        run_process()
@@ -0,0 +1,151 @@
+import base64
+import json
+import threading
+import time
+
+
+
+class BrowserNetwork:
+    """
+    Acesso às respostas recebidas pelo próprio navegador, através do
+    Chrome DevTools Protocol (CDP), para reaproveitar no RequestManager
+    o conteúdo que o navegador já baixou, sem um segundo download.
+
+    Requer o log de desempenho do chromedriver habilitado
+    (capability 'goog:loggingPrefs' com {'performance': 'ALL'}): os
+    eventos Network.* do log indicam o identificador de cada requisição
+    por URL, e o conteúdo é lido com Network.getResponseBody enquanto
+    estiver no buffer do navegador (até a próxima navegação).
+
+    Attributes:
+        controller: Objeto com o atributo `driver` (por exemplo, a
+        PageMain), lido a cada acesso para acompanhar os reinícios do
+        navegador.
+        timeout (float): Tempo máximo, em segundos, aguardando uma
+        resposta que o navegador ainda está recebendo.
+        buffer_mb (int): Tamanho do buffer de respostas do navegador.
+    """
+
+    def __init__(
+            self, controller, timeout: float = 10.0, buffer_mb: int = 256
+        ):
+        """
+        Inicializa o acesso às respostas do navegador, sem habilitá-lo.
+
+        Args:
+            controller: Objeto com o atributo `driver`.
+            timeout (float): Espera máxima por uma resposta em andamento.
+            buffer_mb (int): Tamanho do buffer de respostas do navegador,
+            em megabytes.
+        """
+        self.controller = controller
+        self.timeout = timeout
+        self.buffer_mb = buffer_mb
+        self._requests = {}
+        self._urls = {}
+        self._lock = threading.Lock()
+
+
+    def enable(self):
+        """
+        Habilita o domínio Network do CDP com o buffer configurado,
+        descartando as respostas conhecidas. Deve ser chamado após a
+        criação (ou o reinício) do navegador.
+        """
+        size = self.buffer_mb * 1024 * 1024
+        with self._lock:
+            self._requests.clear()
+            self._urls.clear()
+            self.controller.driver.execute_cdp_cmd('Network.enable', {
+                'maxTotalBufferSize': size,
+                'maxResourceBufferSize': size,
+            })
+
+
+    def clear(self):
+        """
+        Descarta as respostas conhecidas que não foram reaproveitadas,
+        incluindo os eventos ainda pendentes no log de desempenho.
+        """
+        with self._lock:
+            self._collect()
+            self._requests.clear()
+            self._urls.clear()
+
+
+    def _collect(self):
+        """
+        Lê os eventos de rede pendentes no log de desempenho, registrando
+        o estado de cada requisição ('sent', 'received', 'finished' ou
+        'failed').
+        """
+        for entry in self.controller.driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            method = message.get('method', '')
+            params = message.get('params', {})
+            request_id = params.get('requestId')
+            if method == 'Network.requestWillBeSent':
+                url = params['request']['url']
+                self._requests.pop(self._urls.get(url), None)
+                self._requests[request_id] = {'url': url, 'state': 'sent'}
+                self._urls[url] = request_id
+            elif request_id not in self._requests:
+                continue
+            elif method == 'Network.responseReceived':
+                self._requests[request_id].update({
+                    'state': 'received',
+                    'status': params['response']['status'],
+                    'content_type': params['response'].get('mimeType'),
+                })
+            elif method == 'Network.loadingFinished':
+                self._requests[request_id]['state'] = 'finished'
+            elif method == 'Network.loadingFailed':
+                self._requests[request_id]['state'] = 'failed'
+
+
+    def get(self, url: str) -> dict | None:
+        """
+        Retorna a resposta recebida pelo navegador para a URL. Se o
+        navegador ainda estiver recebendo a resposta, aguarda até
+        `timeout` segundos.
+
+        Args:
+            url (str): URL da requisição.
+
+        Returns:
+            dict | None: O código de status, o tipo e o conteúdo da
+            resposta, ou None se o navegador não requisitou a URL, a
+            requisição falhou ou o conteúdo não está mais no buffer.
+        """
+        deadline = time.perf_counter() + self.timeout
+        with self._lock:
+            while True:
+                self._collect()
+                request_id = self._urls.get(url)
+                if request_id is None:
+                    return None
+                info = self._requests[request_id]
+                if info['state'] in ('finished', 'failed'):
+                    break
+                if time.perf_counter() >= deadline:
+                    return None
+                time.sleep(0.05)
+            del self._urls[url]
+            del self._requests[request_id]
+            if info['state'] == 'failed' or 'status' not in info:
+                return None
+            try:
+                body = self.controller.driver.execute_cdp_cmd(
+                    'Network.getResponseBody', {'requestId': request_id}
+                )
+            except Exception:
+                return None
+        if body.get('base64Encoded'):
+            content = base64.b64decode(body['body'])
+        else:
+            content = body['body'].encode('utf-8')
+        return {
+            'status': info['status'],
+            'content_type': info['content_type'],
+            'content': content,
+        }
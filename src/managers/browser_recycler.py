@@ -0,0 +1,155 @@
+from collections import deque
+import os
+
+
+
+def process_tree_rss(pid: int) -> int:
+    """
+    Soma a memória residente (RSS) de um processo e de todos os seus
+    descendentes, lendo /proc/<pid>/stat. Para o navegador, o processo
+    informado é o do chromedriver, do qual descendem os processos do
+    Chrome (navegador, renderizadores e GPU).
+
+    Args:
+        pid (int): PID do processo raiz.
+
+    Returns:
+        int: A memória residente em bytes, ou 0 se o /proc não estiver
+        disponível (fora do Linux) ou o processo não existir.
+    """
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return 0
+    children = {}
+    rss = {}
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'rb') as file:
+                stat = file.read()
+        except OSError:
+            continue
+        # Os campos após o nome do processo (entre parênteses) começam no
+        # estado (campo 3): o PPID é o campo 4 e o RSS, em páginas, o 24.
+        fields = stat[stat.rindex(b')') + 2:].split()
+        children.setdefault(int(fields[1]), []).append(int(entry))
+        rss[int(entry)] = int(fields[21])
+
+    total = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        total += rss.get(current, 0)
+        pending.extend(children.get(current, ()))
+    return total * os.sysconf('SC_PAGE_SIZE')
+
+
+
+class BrowserRecycler:
+    """
+    Política de reciclagem do navegador em execuções longas.
+
+    Com milhares de páginas, o Chrome acumula memória (elementos
+    removidos do DOM que continuam referenciados, caches e
+    renderizadores) e os comandos do WebDriver ficam mais lentos. A cada
+    página, `page_done` recebe o PID do navegador e a latência da página
+    e indica se o navegador deve ser reiniciado: após `max_pages`
+    páginas, com a memória (RSS) acima de `max_rss_mb` ou com a latência
+    média das últimas páginas `latency_factor` vezes maior que a das
+    primeiras páginas após o último reinício. Cada critério é
+    desabilitado com None.
+
+    Attributes:
+        max_pages (int | None): Páginas entre os reinícios.
+        max_rss (int | None): Memória máxima do navegador, em bytes.
+        latency_factor (float | None): Aumento máximo da latência.
+        window (int): Quantidade de páginas das médias de latência.
+        pages (int): Páginas desde o último reinício.
+        rss (int): Última memória medida do navegador, em bytes.
+        peak_rss (int): Maior memória medida do navegador, em bytes.
+        restarts (int): Quantidade de reinícios.
+    """
+
+    def __init__(
+            self,
+            max_pages: int = None,
+            max_rss_mb: float = None,
+            latency_factor: float = None,
+            window: int = 5
+        ):
+        """
+        Inicializa a política.
+
+        Args:
+            max_pages (int, opcional): Páginas entre os reinícios.
+            max_rss_mb (float, opcional): Memória máxima do navegador em
+            megabytes.
+            latency_factor (float, opcional): Aumento máximo da latência
+            em relação às primeiras páginas.
+            window (int): Quantidade de páginas das médias de latência.
+        """
+        self.max_pages = max_pages
+        self.max_rss = None
+        if max_rss_mb is not None:
+            self.max_rss = int(max_rss_mb * 1024 * 1024)
+        self.latency_factor = latency_factor
+        self.window = max(1, window)
+        self.pages = 0
+        self.rss = 0
+        self.peak_rss = 0
+        self.restarts = 0
+        self._baseline = []
+        self._recent = deque(maxlen=self.window)
+
+
+    def page_done(self, pid: int = None, latency: float = None) -> str | None:
+        """
+        Registra uma página processada e verifica os critérios de
+        reciclagem.
+
+        Args:
+            pid (int, opcional): PID do processo do navegador (ou do
+            chromedriver). Sem o PID, a memória não é medida.
+            latency (float, opcional): Latência da página, em segundos
+            (por exemplo, o tempo de leitura por linha).
+
+        Returns:
+            str | None: O motivo do reinício ('pages', 'rss' ou
+            'latency'), ou None se o navegador pode continuar.
+        """
+        self.pages += 1
+        if pid is not None:
+            self.rss = process_tree_rss(pid)
+            self.peak_rss = max(self.peak_rss, self.rss)
+        if latency is not None:
+            if len(self._baseline) < self.window:
+                self._baseline.append(latency)
+            else:
+                self._recent.append(latency)
+
+        if self.max_pages is not None and self.pages >= self.max_pages:
+            return 'pages'
+        if self.max_rss is not None and self.rss >= self.max_rss:
+            return 'rss'
+        if (
+            self.latency_factor is not None
+            and len(self._recent) == self.window
+        ):
+            baseline = sum(self._baseline) / len(self._baseline)
+            recent = sum(self._recent) / len(self._recent)
+            if baseline > 0 and recent >= baseline * self.latency_factor:
+                return 'latency'
+        return None
+
+
+    def reset(self):
+        """
+        Registra um reinício do navegador, reiniciando a contagem de
+        páginas e as médias de latência.
+        """
+        self.restarts += 1
+        self.pages = 0
+        self._baseline = []
+        self._recent.clear()
@@ -0,0 +1,259 @@
+from datetime import datetime
+import json
+import os
+import threading
+import time
+import zipfile
+from typing import List
+
+
+
+class CaptureRecorder:
+    """
+    Grava o que a automação recebe do site em um arquivo compactado
+    (ZIP), para reprodução posterior sem rede: as linhas de cada página
+    da tabela lidas pela PageMain, o resultado do filtro de data e da
+    paginação, e o conteúdo de cada resposta recebida pelo
+    RequestManager, com a duração de cada operação.
+
+    O arquivo contém o manifest.json, com os eventos na ordem em que
+    ocorreram, e o conteúdo das respostas em responses/<n>.bin, gravado
+    sem compressão (as imagens PNG já são compactadas). Com a gravação
+    desabilitada, `record` e `record_response` não fazem nada.
+
+    Attributes:
+        enabled (bool): Indica se os eventos estão sendo gravados.
+        file (str): Caminho do arquivo da gravação atual.
+    """
+
+    VERSION = 1
+
+    def __init__(self):
+        """
+        Inicializa o gravador, desabilitado.
+        """
+        self.enabled = False
+        self.file = None
+        self._archive = None
+        self._events = []
+        self._responses = 0
+        self._origin = 0.0
+        self._metadata = {}
+        self._lock = threading.Lock()
+
+
+    def start(self, file: str, **metadata):
+        """
+        Inicia a gravação de um novo arquivo.
+
+        Args:
+            file (str): Caminho do arquivo ZIP.
+            **metadata: Informações da execução gravadas no manifest
+            (por exemplo, a URL do site).
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(file)), exist_ok=True)
+        with self._lock:
+            self.file = file
+            self._archive = zipfile.ZipFile(file, 'w')
+            self._events = []
+            self._responses = 0
+            self._origin = time.perf_counter()
+            self._metadata = {
+                'version': self.VERSION,
+                'created': datetime.now().isoformat(timespec='seconds'),
+                **metadata,
+            }
+            self.enabled = True
+
+
+    def record(self, kind: str, duration: float, **data):
+        """
+        Grava um evento da página.
+
+        Args:
+            kind (str): Tipo do evento ('open_site', 'date_filter',
+            'rows', 'next_disabled' ou 'next_page').
+            duration (float): Duração da operação em segundos.
+            **data: Dados do evento (página, linhas, resultado).
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._archive is None:
+                return
+            self._events.append({
+                'type': kind,
+                'time': time.perf_counter() - self._origin - duration,
+                'duration': duration,
+                **data,
+            })
+
+
+    def record_response(
+            self, url: str, status: int, content: bytes, duration: float,
+            content_type: str = None
+        ):
+        """
+        Grava uma resposta HTTP recebida.
+
+        Args:
+            url (str): URL da requisição.
+            status (int): Código de status da resposta.
+            content (bytes): Conteúdo da resposta.
+            duration (float): Duração da requisição em segundos.
+            content_type (str, opcional): Cabeçalho Content-Type.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._archive is None:
+                return
+            self._responses += 1
+            name = f'responses/{self._responses:06d}.bin'
+            self._archive.writestr(name, content, zipfile.ZIP_STORED)
+            self._events.append({
+                'type': 'response',
+                'time': time.perf_counter() - self._origin - duration,
+                'duration': duration,
+                'url': url,
+                'status': status,
+                'content_type': content_type,
+                'file': name,
+            })
+
+
+    def stop(self) -> str | None:
+        """
+        Encerra a gravação, gravando o manifest no arquivo.
+
+        Returns:
+            str | None: Caminho do arquivo gravado, ou None se não havia
+            gravação em andamento.
+        """
+        with self._lock:
+            self.enabled = False
+            if self._archive is None:
+                return None
+            manifest = {**self._metadata, 'events': self._events}
+            self._archive.writestr(
+                'manifest.json',
+                json.dumps(manifest, ensure_ascii=False),
+                zipfile.ZIP_DEFLATED
+            )
+            self._archive.close()
+            self._archive = None
+            return self.file
+
+
+
+class CaptureArchive:
+    """
+    Leitura de um arquivo gravado pelo CaptureRecorder, utilizada pela
+    ReplayPageMain e pelo ReplayRequestManager.
+
+    As páginas são indexadas pelo número (prevalece a primeira leitura
+    de cada página, caso ela tenha sido repetida após uma falha) e as
+    respostas pela URL, na ordem em que foram recebidas.
+
+    Attributes:
+        file (str): Caminho do arquivo.
+        metadata (dict): Informações da execução gravada.
+        events (List[dict]): Eventos na ordem em que ocorreram.
+        pages (dict): Evento 'rows' de cada página.
+        speed (float): Velocidade da reprodução: 1 reproduz a duração
+        gravada de cada operação, 2 a metade, e 0 não espera.
+    """
+
+    def __init__(self, file: str, speed: float = 1.0):
+        """
+        Abre o arquivo e lê o manifest.
+
+        Args:
+            file (str): Caminho do arquivo ZIP.
+            speed (float): Velocidade da reprodução.
+
+        Raises:
+            ValueError: Se o arquivo não for uma gravação válida.
+        """
+        self.file = file
+        self.speed = speed
+        self._lock = threading.Lock()
+        try:
+            self._archive = zipfile.ZipFile(file)
+            manifest = json.loads(self._archive.read('manifest.json'))
+        except (KeyError, zipfile.BadZipFile) as error:
+            raise ValueError(f'Gravação inválida: {file} ({error})')
+        self.events: List[dict] = manifest.pop('events')
+        self.metadata = manifest
+        self.pages = {}
+        self._first = {}
+        self._responses = {}
+        self._cursors = {}
+        for event in self.events:
+            if event['type'] == 'response':
+                self._responses.setdefault(event['url'], []).append(event)
+                continue
+            self._first.setdefault((event['type'], event.get('page')), event)
+            if event['type'] == 'rows':
+                self.pages.setdefault(event['page'], event)
+
+
+    def first(self, kind: str, page: int = None) -> dict | None:
+        """
+        Retorna o primeiro evento gravado de um tipo, na página
+        informada.
+
+        Args:
+            kind (str): Tipo do evento.
+            page (int, opcional): Página da tabela do evento.
+
+        Returns:
+            dict | None: O evento, ou None se não houver.
+        """
+        return self._first.get((kind, page))
+
+
+    def response(self, url: str) -> tuple | None:
+        """
+        Retorna a próxima resposta gravada para a URL. Com mais de uma
+        resposta para a mesma URL (por exemplo, um erro seguido de uma
+        nova tentativa com sucesso), elas são retornadas na ordem
+        gravada, repetindo a última.
+
+        Args:
+            url (str): URL da requisição.
+
+        Returns:
+            tuple | None: O evento da resposta e o seu conteúdo, ou None
+            se a URL não foi gravada.
+        """
+        with self._lock:
+            responses = self._responses.get(url)
+            if not responses:
+                return None
+            index = self._cursors.get(url, 0)
+            self._cursors[url] = index + 1
+            event = responses[min(index, len(responses) - 1)]
+            return event, self._archive.read(event['file'])
+
+
+    def wait(self, event: dict | None):
+        """
+        Aguarda a duração gravada de um evento, conforme a velocidade.
+
+        Args:
+            event (dict | None): O evento reproduzido.
+        """
+        if event and self.speed > 0:
+            time.sleep(event['duration'] / self.speed)
+
+
+    def close(self):
+        """
+        Fecha o arquivo.
+        """
+        self._archive.close()
+
+
+
+CAPTURE = CaptureRecorder()
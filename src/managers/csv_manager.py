@@ -1,6 +1,12 @@
 from typing import List
 
-import pandas as pd
+from src.managers.lazy_module import LazyModule
+from src.managers.metrics import REGISTRY
+from src.managers.tracer import TRACER
+
+
+# O pandas é importado apenas quando o primeiro CsvManager é criado.
+pd = LazyModule('pandas')
 
 
 
@@ -14,17 +20,37 @@ class CsvManager:
         do arquivo Csv.
     """
 
-    def __init__(self, file: str):
+    def __init__(self, file: str, df: 'pd.DataFrame' = None):
         """
         Inicializa a instância do CsvManager e carrega os
         dados do arquivo Csv.
 
         Args:
             file (str): Caminho para o arquivo Csv.
+            df (pandas.DataFrame, opcional): Dados já em memória do
+            arquivo, dispensando a leitura.
         """
         self.file = file
-        self.df = None
-        self._read_file()
+        self.df = df
+        if self.df is None:
+            self._read_file()
+
+
+    @classmethod
+    def create(cls, file: str, columns: List[str]) -> 'CsvManager':
+        """
+        Cria o gerenciador de um novo arquivo Csv, apenas com as colunas
+        informadas. O DataFrame é montado em memória e o arquivo só é
+        gravado ao salvar, sem a releitura do arquivo recém-criado.
+
+        Args:
+            file (str): Caminho do novo arquivo Csv.
+            columns (List[str]): Colunas do arquivo.
+
+        Returns:
+            CsvManager: O gerenciador do novo arquivo.
+        """
+        return cls(file, pd.DataFrame(columns=columns))
 
 
     def _read_file(self):
@@ -151,7 +177,11 @@ class CsvManager:
         """
         if not path_file:
             path_file = self.file
-        self.df.to_csv(path_file, index=False)
+        with (
+            TRACER.span('save_csv', 'csv', file=path_file),
+            REGISTRY.timer('csv_write_seconds'),
+        ):
+            self.df.to_csv(path_file, index=False)
 
 
     def add_data(self, row_data: dict):
@@ -173,6 +203,7 @@ class CsvManager:
                 )
         new_row_df = pd.DataFrame([row_data])
         self.df = pd.concat([self.df, new_row_df], ignore_index=True)
+        REGISTRY.increment('csv_rows_total')
 
 
     def row_exists(self, column_name: str, unique_value: str) -> bool:
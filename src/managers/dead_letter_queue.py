@@ -0,0 +1,409 @@
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, List
+
+
+
+class DeadLetterQueue:
+    """
+    Classe que gerencia uma fila persistente de itens que falharam
+    durante o processamento (dead-letter queue).
+
+    Cada item é identificado por um id e guarda os dados necessários
+    para ser processado novamente, o último erro, a quantidade de
+    tentativas e o horário da próxima tentativa. A fila é salva em um
+    arquivo JSON a cada alteração, permitindo que os itens sejam
+    reprocessados posteriormente, inclusive por outro processo.
+
+    Os métodos são protegidos por uma trava, podendo ser utilizados
+    pela thread principal e pela thread de novas tentativas ao mesmo
+    tempo.
+
+    Attributes:
+        file (str): Caminho do arquivo JSON da fila.
+    """
+
+    PENDING = 'pendente'
+    DEAD = 'falha'
+
+
+    def __init__(self, file: str):
+        """
+        Inicializa a fila e carrega os itens do arquivo, caso exista.
+
+        Args:
+            file (str): Caminho do arquivo JSON da fila.
+        """
+        self.file = file
+        self._items = {}
+        self._lock = threading.RLock()
+        self._read_file()
+
+
+    def _read_file(self):
+        """
+        Lê os itens do arquivo JSON da fila, caso exista.
+        """
+        if not os.path.exists(self.file):
+            return
+        try:
+            with open(self.file, 'r', encoding='utf-8') as file:
+                items = json.load(file)
+        except (OSError, ValueError):
+            return
+        self._items = {item['id']: item for item in items}
+
+
+    def save_file(self):
+        """
+        Salva os itens da fila no arquivo JSON.
+        """
+        with self._lock:
+            items = list(self._items.values())
+            os.makedirs(os.path.dirname(self.file) or '.', exist_ok=True)
+            temporary_file = f'{self.file}.tmp'
+            with open(temporary_file, 'w', encoding='utf-8') as file:
+                json.dump(items, file, ensure_ascii=False, indent=2)
+            os.replace(temporary_file, self.file)
+
+
+    def add(
+            self,
+            item_id: str,
+            data: dict,
+            error: Exception,
+            run: str = None,
+            delay: float = 0.0
+        ) -> dict:
+        """
+        Adiciona um item que falhou na fila, ou registra uma nova falha
+        de um item já existente. Um item de uma execução anterior passa
+        para a nova execução, com os novos dados e as tentativas
+        reiniciadas.
+
+        Args:
+            item_id (str): Identificador único do item.
+            data (dict): Dados necessários para processar o item.
+            error (Exception): O erro gerado no processamento.
+            run (str, opcional): Identificador da execução que gerou
+            o item.
+            delay (float): Tempo em segundos até a primeira nova
+            tentativa do item.
+
+        Returns:
+            dict: O item registrado na fila.
+        """
+        with self._lock:
+            item = self._items.get(item_id)
+            if item is None or item.get('run') != run:
+                item = {
+                    'id': item_id,
+                    'data': data,
+                    'run': run,
+                    'attempts': 0,
+                }
+                self._items[item_id] = item
+            item['attempts'] += 1
+            item['error'] = str(error)
+            item['status'] = self.PENDING
+            item['next_attempt'] = time.time() + delay
+            self.save_file()
+            return dict(item)
+
+
+    def retry_later(
+            self,
+            item_id: str,
+            error: Exception,
+            delay: float,
+            max_attempts: int
+        ) -> dict:
+        """
+        Registra uma nova tentativa que falhou, agendando a próxima
+        tentativa ou marcando o item como falha definitiva.
+
+        Args:
+            item_id (str): Identificador do item.
+            error (Exception): O erro gerado na tentativa.
+            delay (float): Tempo em segundos até a próxima tentativa.
+            max_attempts (int): Quantidade máxima de tentativas do item.
+
+        Returns:
+            dict: O item atualizado.
+        """
+        with self._lock:
+            item = self._items[item_id]
+            item['attempts'] += 1
+            item['error'] = str(error)
+            if item['attempts'] >= max_attempts:
+                item['status'] = self.DEAD
+            else:
+                item['next_attempt'] = time.time() + delay
+            self.save_file()
+            return dict(item)
+
+
+    def resolve(self, item_id: str):
+        """
+        Remove da fila um item processado com sucesso.
+
+        Args:
+            item_id (str): Identificador do item.
+        """
+        with self._lock:
+            if self._items.pop(item_id, None) is not None:
+                self.save_file()
+
+
+    def reset(self, items: List[dict] = None):
+        """
+        Volta os itens para o status pendente, zerando as tentativas,
+        para que possam ser reprocessados.
+
+        Args:
+            items (List[dict], opcional): Itens a serem reiniciados. Se
+            não for fornecido, reinicia todos os itens da fila.
+        """
+        with self._lock:
+            if items:
+                ids = [item['id'] for item in items]
+            else:
+                ids = list(self._items)
+            for item_id in ids:
+                item = self._items[item_id]
+                item['attempts'] = 0
+                item['status'] = self.PENDING
+                item['next_attempt'] = time.time()
+            self.save_file()
+
+
+    def pending(self, run: str = None) -> List[dict]:
+        """
+        Retorna os itens pendentes da fila.
+
+        Args:
+            run (str, opcional): Retorna apenas os itens da execução
+            informada.
+
+        Returns:
+            List[dict]: Cópia dos itens pendentes.
+        """
+        with self._lock:
+            return [
+                dict(item) for item in self._items.values()
+                if item['status'] == self.PENDING
+                and (run is None or item.get('run') == run)
+            ]
+
+
+    def due(self, run: str = None) -> List[dict]:
+        """
+        Retorna os itens pendentes cuja próxima tentativa já pode
+        ser feita.
+
+        Args:
+            run (str, opcional): Retorna apenas os itens da execução
+            informada.
+
+        Returns:
+            List[dict]: Cópia dos itens prontos para nova tentativa.
+        """
+        now = time.time()
+        return [
+            item for item in self.pending(run) if item['next_attempt'] <= now
+        ]
+
+
+    def items(self) -> List[dict]:
+        """
+        Retorna todos os itens da fila.
+
+        Returns:
+            List[dict]: Cópia de todos os itens da fila.
+        """
+        with self._lock:
+            return [dict(item) for item in self._items.values()]
+
+
+    def __len__(self) -> int:
+        """
+        Retorna a quantidade de itens na fila.
+        """
+        with self._lock:
+            return len(self._items)
+
+
+
+class RetryWorker(threading.Thread):
+    """
+    Thread que processa novamente, em segundo plano, os itens pendentes
+    de uma DeadLetterQueue, aguardando um tempo crescente entre as
+    tentativas (backoff exponencial).
+
+    Os resultados dos itens processados com sucesso são colocados na
+    fila `completed`, para que a thread principal os consuma, evitando
+    que a thread de novas tentativas altere diretamente arquivos
+    utilizados pela thread principal, como o CSV.
+
+    Attributes:
+        dead_letter_queue (DeadLetterQueue): A fila de itens que falharam.
+        handler (Callable): Função que processa os dados de um item e
+        retorna o resultado. Deve gerar uma exceção em caso de falha.
+        completed (queue.Queue): Resultados dos itens processados com
+        sucesso.
+    """
+
+    def __init__(
+            self,
+            dead_letter_queue: DeadLetterQueue,
+            handler: Callable[[dict], Any],
+            run: str = None,
+            max_attempts: int = 5,
+            backoff_base: float = 2.0,
+            backoff_max: float = 60.0,
+            poll_interval: float = 0.5
+        ):
+        """
+        Inicializa a thread de novas tentativas.
+
+        Args:
+            dead_letter_queue (DeadLetterQueue): A fila de itens.
+            handler (Callable): Função que processa os dados de um item.
+            run (str, opcional): Processa apenas os itens da execução
+            informada.
+            max_attempts (int): Quantidade máxima de tentativas por item,
+            contando a falha original.
+            backoff_base (float): Tempo em segundos da primeira espera
+            entre tentativas, dobrado a cada nova falha.
+            backoff_max (float): Tempo máximo de espera entre tentativas.
+            poll_interval (float): Intervalo em segundos entre as
+            verificações da fila.
+        """
+        super().__init__(name='RetryWorker', daemon=True)
+        self.dead_letter_queue = dead_letter_queue
+        self.handler = handler
+        self.run_id = run
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+        self.completed = queue.Queue()
+        self.succeeded = 0
+        self.dead = 0
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+
+
+    def backoff(self, attempts: int) -> float:
+        """
+        Calcula o tempo de espera antes da próxima tentativa.
+
+        Args:
+            attempts (int): Quantidade de tentativas já realizadas.
+
+        Returns:
+            float: Tempo de espera em segundos.
+        """
+        delay = self.backoff_base * (2 ** max(0, attempts - 1))
+        return min(self.backoff_max, delay)
+
+
+    def process_due_items(self) -> int:
+        """
+        Processa os itens da fila que já podem ser tentados novamente.
+
+        Returns:
+            int: Quantidade de itens processados nesta chamada.
+        """
+        items = self.dead_letter_queue.due(self.run_id)
+        for item in items:
+            if self._stop_event.is_set():
+                break
+            try:
+                result = self.handler(item['data'])
+            except Exception as error:
+                updated = self.dead_letter_queue.retry_later(
+                    item['id'],
+                    error,
+                    self.backoff(item['attempts'] + 1),
+                    self.max_attempts
+                )
+                if updated['status'] == DeadLetterQueue.DEAD:
+                    self.dead += 1
+                continue
+            self.dead_letter_queue.resolve(item['id'])
+            self.succeeded += 1
+            self.completed.put(result)
+        return len(items)
+
+
+    def notify(self):
+        """
+        Acorda a thread para verificar a fila imediatamente, utilizado
+        quando um novo item é adicionado.
+        """
+        self._wake_event.set()
+
+
+    def run(self):
+        """
+        Verifica a fila periodicamente até a thread ser parada.
+        """
+        while not self._stop_event.is_set():
+            self.process_due_items()
+            self._wake_event.wait(self.poll_interval)
+            self._wake_event.clear()
+
+
+    def drain(self, timeout: float) -> bool:
+        """
+        Aguarda até que não existam itens pendentes da execução na fila
+        ou até o tempo limite.
+
+        Args:
+            timeout (float): Tempo máximo de espera em segundos.
+
+        Returns:
+            bool: True se todos os itens foram resolvidos ou marcados
+            como falha definitiva.
+        """
+        limit = time.monotonic() + timeout
+        while time.monotonic() < limit:
+            if not self.dead_letter_queue.pending(self.run_id):
+                return True
+            self.notify()
+            remaining = max(0.0, limit - time.monotonic())
+            time.sleep(min(self.poll_interval, remaining))
+        return not self.dead_letter_queue.pending(self.run_id)
+
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Para a thread, aguardando a tentativa em andamento terminar.
+
+        Args:
+            timeout (float): Tempo máximo de espera em segundos.
+        """
+        self._stop_event.set()
+        self._wake_event.set()
+        if self.is_alive():
+            self.join(timeout)
+
+
+    def get_completed(self) -> List[Any]:
+        """
+        Retorna e remove os resultados dos itens processados com sucesso
+        desde a última chamada.
+
+        Returns:
+            List[Any]: Resultados retornados pelo handler.
+        """
+        results = []
+        while True:
+            try:
+                results.append(self.completed.get_nowait())
+            except queue.Empty:
+                return results
@@ -1,8 +1,20 @@
-import glob
+from concurrent.futures import ThreadPoolExecutor
+import fnmatch
 import os
 import shutil
+import threading
 import time
-from typing import List
+from typing import Iterator, List
+import uuid
+
+from src.managers.directory_watcher import create_watcher
+
+
+# Intervalo, em nanossegundos, em que uma alteração no diretório pode não
+# mudar sua data de modificação (resolução do relógio do sistema de
+# arquivos). Um índice lido dentro desse intervalo após a última alteração
+# não é reaproveitado.
+_RACY_INTERVAL_NS = 2_000_000_000
 
 
 
@@ -15,6 +27,11 @@ class DirectoryManager:
     bibliotecas padrão do Python para interagir com o sistema de arquivos
     e manipular arquivos de forma eficiente.
 
+    As buscas utilizam um índice em memória com os nomes do diretório,
+    lido com os.scandir e reaproveitado enquanto a data de modificação do
+    diretório não mudar. As operações da própria classe que alteram o
+    diretório invalidam o índice.
+
     Attributes:
         directory (str): Caminho completo do diretório base onde as operações
         com arquivos serão realizadas.
@@ -29,6 +46,8 @@ class DirectoryManager:
             directory (str): Caminho completo do diretório base.
         """
         self.directory = directory
+        self._index = None
+        self._index_mtime = None
         self._check_directory()
 
 
@@ -53,12 +72,52 @@ class DirectoryManager:
             self._create_directory()
 
     
+    def _invalidate_index(self):
+        """
+        Descarta o índice dos nomes do diretório, que será lido novamente
+        na próxima busca.
+        """
+        self._index = None
+
+
+    def _get_index(self) -> List[str]:
+        """
+        Retorna os nomes do diretório, ignorando os ocultos (como o glob).
+
+        O índice é lido novamente apenas quando a data de modificação do
+        diretório mudou, ou quando foi lido logo após uma alteração, dentro
+        da resolução do relógio do sistema de arquivos.
+
+        Returns:
+            List[str]: Os nomes do diretório, na ordem do sistema.
+        """
+        try:
+            mtime = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            self._index = None
+            return []
+        if self._index is not None and mtime == self._index_mtime:
+            return self._index
+        read_at = time.time_ns()
+        with os.scandir(self.directory) as entries:
+            index = [
+                entry.name for entry in entries
+                if not entry.name.startswith('.')
+            ]
+        self._index = None
+        if read_at - mtime > _RACY_INTERVAL_NS:
+            self._index = index
+            self._index_mtime = mtime
+        return index
+
+
     def search_files(self, keyword: str) -> List[str]:
         """
         Procura por arquivos no diretório base.
 
         Se uma palavra-chave for fornecida, busca arquivos que contenham
-        essa palavra no nome. Utiliza glob para realizar a busca.
+        essa palavra no nome, com as mesmas regras do glob
+        ('*<palavra>*'), no índice em memória dos nomes do diretório.
 
         Args:
             keyword (str, optional): Palavra que será buscada no
@@ -68,11 +127,12 @@ class DirectoryManager:
             list: Retorna uma lista com os nomes dos arquivos
             que contêm a palavra-chave encontrados no diretório.
         """
+        index = self._get_index()
+        keyword = str(keyword)
+        if not any(character in keyword for character in '*?['):
+            return [name for name in index if keyword in name]
         pattern_for_search = f'*{keyword}*'
-        file_paths = glob.glob(
-            os.path.join(self.directory, pattern_for_search)
-        )
-        filenames = [os.path.basename(file) for file in file_paths]
+        filenames = fnmatch.filter(index, pattern_for_search)
         return filenames
     
 
@@ -116,20 +176,92 @@ class DirectoryManager:
 
         if os.path.exists(path_file):
             os.remove(path_file)
+            self._invalidate_index()
             
 
-    def delete_files(self):
+    def delete_files(
+            self,
+            background: bool = False,
+            workers: int = 8,
+            batch_size: int = 512
+        ) -> int | threading.Thread:
         """
         Deleta todos os arquivos do diretório instanciado.
 
-        Utiliza glob para buscar todos os arquivos no diretório e
-        os remove um a um.
+        Os arquivos são listados com os.scandir (sem uma chamada de
+        sistema por arquivo para verificar o tipo) e removidos em lotes,
+        em paralelo. Com `background`, o diretório é renomeado e recriado
+        vazio, e os arquivos são removidos por uma thread em segundo
+        plano, sem bloquear o chamador. Subdiretórios e arquivos ocultos
+        são mantidos, como na busca por glob.
+
+        Args:
+            background (bool): Remove os arquivos em segundo plano.
+            workers (int): Quantidade de threads da remoção em paralelo.
+            batch_size (int): Quantidade de arquivos removidos por tarefa.
+
+        Returns:
+            int | threading.Thread: A quantidade de arquivos removidos ou,
+            em segundo plano, a thread da remoção.
         """
-        file_names = glob.glob(os.path.join(self.directory, '*'))
+        self._invalidate_index()
+        if background:
+            return self._delete_files_in_background()
+
+        with os.scandir(self.directory) as entries:
+            paths = [
+                entry.path for entry in entries
+                if not entry.name.startswith('.') and entry.is_file()
+            ]
+        batches = [
+            paths[start:start + batch_size]
+            for start in range(0, len(paths), batch_size)
+        ]
+        if len(batches) <= 1:
+            for batch in batches:
+                _remove_files(batch)
+        else:
+            with ThreadPoolExecutor(min(workers, len(batches))) as executor:
+                list(executor.map(_remove_files, batches))
+        return len(paths)
 
-        for file_name in file_names:
-            if os.path.isfile(file_name):
-                os.remove(file_name)
+
+    def _delete_files_in_background(self) -> threading.Thread:
+        """
+        Renomeia o diretório e o recria vazio, devolvendo a ele os
+        subdiretórios e os arquivos ocultos, e remove o restante em uma
+        thread em segundo plano. Diretórios renomeados em remoções
+        anteriores que não chegaram ao fim (por exemplo, com o processo
+        encerrado antes) também são removidos.
+
+        Returns:
+            threading.Thread: A thread da remoção.
+        """
+        parent, name = os.path.split(os.path.normpath(self.directory))
+        prefix = f'.{name}.deleting-'
+        with os.scandir(parent) as entries:
+            asides = [
+                entry.path for entry in entries
+                if entry.name.startswith(prefix)
+            ]
+        aside = os.path.join(parent, f'{prefix}{uuid.uuid4().hex[:8]}')
+        os.rename(self.directory, aside)
+        asides.append(aside)
+        self._create_directory()
+        with os.scandir(aside) as entries:
+            for entry in entries:
+                if entry.name.startswith('.') or not entry.is_file():
+                    os.rename(
+                        entry.path, os.path.join(self.directory, entry.name)
+                    )
+        thread = threading.Thread(
+            target=_remove_directories,
+            args=(asides,),
+            name='delete-files',
+            daemon=True
+        )
+        thread.start()
+        return thread
     
 
     def monitor_directory(
@@ -142,8 +274,11 @@ class DirectoryManager:
         Monitora o diretório por um tempo determinado, aguardando um arquivo
         ser encontrado.
 
-        Se um arquivo que contenha a palavra-chave for encontrado,
-        retorna o caminho completo. Verifica a pasta a cada intervalo
+        Se um arquivo que contenha a palavra-chave já existir ou for
+        criado no diretório, retorna o seu nome. No Linux a observação é
+        feita pelo inotify, retornando assim que o arquivo termina de ser
+        gravado ou é movido para o diretório, sem consumir CPU durante a
+        espera. Nos demais sistemas a pasta é verificada a cada intervalo
         de segundos.
 
         Args:
@@ -151,24 +286,51 @@ class DirectoryManager:
             procurar no nome dos arquivos no diretório definido.
             timeout (int, optional): Tempo em segundos limite de monitoração
             da pasta.
-            interval (int, optional): Intervalo em segundos a cada iteração
-            do loop.
+            interval (int, optional): Intervalo em segundos entre as
+            verificações da pasta, quando o inotify não está disponível.
 
         Returns:
-            str: Nome do caminho completo do arquivo caso encontrado.
+            str: Nome do arquivo caso encontrado.
             None se não tiver.
         """
-        initial_time = time.time()
-
-        while time.time() - initial_time < timeout:
+        # O observador é criado antes da busca inicial, para que um
+        # arquivo criado entre as duas etapas não seja perdido.
+        with create_watcher(self.directory, interval) as watcher:
             file_names = self.search_files(keyword)
-
             if file_names:
-                file_name = file_names[0]
+                return file_names[0]
+            for file_name in watcher.watch(keyword, timeout):
                 return file_name
-            
-            time.sleep(interval)
         return None
+
+
+    def watch_files(
+            self, keyword: str = None, timeout: float = None
+        ) -> Iterator[str]:
+        """
+        Observa o diretório e retorna, à medida que surgem, os arquivos
+        que contêm a palavra-chave, permitindo processar um fluxo de
+        arquivos (por exemplo, downloads sucessivos).
+
+        Args:
+            keyword (str, optional): Palavra-chave no nome dos arquivos.
+            timeout (float, optional): Tempo máximo em segundos sem novos
+            arquivos. Sem tempo máximo, a observação continua até o
+            iterador ser encerrado.
+
+        Returns:
+            Iterator[str]: Caminhos completos dos arquivos encontrados.
+        """
+        # O observador é criado já na chamada, e não na primeira iteração,
+        # para que nenhum arquivo criado a partir deste ponto seja perdido.
+        watcher = create_watcher(self.directory)
+
+        def files() -> Iterator[str]:
+            with watcher:
+                for file_name in watcher.watch(keyword, timeout):
+                    yield os.path.join(self.directory, file_name)
+
+        return files()
     
 
     def move_file(self, file_origin: str, file_destination: str) -> str:
@@ -191,10 +353,36 @@ class DirectoryManager:
             file_name = os.path.basename(file_origin)
             destination = os.path.join(file_destination, file_name)
             shutil.move(file_origin, destination)
+            self._invalidate_index()
             return (
                 f"Arquivo '{file_origin}' movido para '{destination}' com sucesso!"
             )
         except FileNotFoundError:
             return (f"Arquivo '{file_origin}' não encontrado.")
         except Exception as e:
-            return (f"Erro ao mover o arquivo: {e}")
\ No newline at end of file
+            return (f"Erro ao mover o arquivo: {e}")
+
+
+def _remove_files(paths: List[str]):
+    """
+    Remove um lote de arquivos, ignorando os já removidos.
+
+    Args:
+        paths (List[str]): Caminhos dos arquivos.
+    """
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _remove_directories(paths: List[str]):
+    """
+    Remove diretórios e todo o seu conteúdo, ignorando erros.
+
+    Args:
+        paths (List[str]): Caminhos dos diretórios.
+    """
+    for path in paths:
+        shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,314 @@
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import select
+import struct
+import sys
+import time
+from typing import Iterator
+
+
+
+# Eventos do inotify (linux/inotify.h) utilizados pelo observador.
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Cabeçalho de cada evento lido do inotify: wd, mask, cookie e len, seguido
+# do nome do arquivo com len bytes (completado com zeros).
+_EVENT = struct.Struct('iIII')
+
+_libc = None
+
+
+def _load_libc():
+    """
+    Carrega a libc com as funções do inotify, apenas no Linux.
+
+    Returns:
+        ctypes.CDLL | None: A libc, ou None se o inotify não estiver
+        disponível.
+    """
+    global _libc
+    if _libc is None:
+        _libc = False
+        if sys.platform.startswith('linux'):
+            try:
+                libc = ctypes.CDLL(
+                    ctypes.util.find_library('c') or 'libc.so.6',
+                    use_errno=True
+                )
+                libc.inotify_init1.argtypes = [ctypes.c_int]
+                libc.inotify_add_watch.argtypes = [
+                    ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32
+                ]
+                _libc = libc
+            except (OSError, AttributeError):
+                _libc = False
+    return _libc or None
+
+
+def inotify_available() -> bool:
+    """
+    Verifica se o inotify pode ser utilizado no sistema.
+
+    Returns:
+        bool: True no Linux com a libc disponível.
+    """
+    return _load_libc() is not None
+
+
+def matches(name: str, keyword: str = None) -> bool:
+    """
+    Verifica se um nome de arquivo contém a palavra-chave, com as mesmas
+    regras da busca por glob do DirectoryManager (arquivos ocultos são
+    ignorados).
+
+    Args:
+        name (str): Nome do arquivo.
+        keyword (str, opcional): Palavra-chave. Sem palavra-chave,
+        qualquer arquivo é aceito.
+
+    Returns:
+        bool: True se o nome contém a palavra-chave.
+    """
+    if name.startswith('.'):
+        return False
+    return keyword is None or fnmatch.fnmatchcase(name, f'*{keyword}*')
+
+
+
+class InotifyWatcher:
+    """
+    Observador de diretório baseado no inotify do Linux.
+
+    O processo fica bloqueado, sem consumir CPU, até que um arquivo termine
+    de ser gravado (IN_CLOSE_WRITE) ou seja movido para o diretório
+    (IN_MOVED_TO), sendo acordado imediatamente pelo kernel.
+
+    Attributes:
+        directory (str): Diretório observado.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Inicia a observação do diretório.
+
+        Args:
+            directory (str): Diretório observado.
+
+        Raises:
+            OSError: Se o inotify não estiver disponível ou o limite de
+            observadores do sistema for atingido.
+        """
+        libc = _load_libc()
+        if libc is None:
+            raise OSError('inotify não disponível neste sistema.')
+        self.directory = directory
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        watch = libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), IN_CLOSE_WRITE | IN_MOVED_TO
+        )
+        if watch < 0:
+            error = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(error, os.strerror(error), directory)
+        self._poll = select.poll()
+        self._poll.register(self._fd, select.POLLIN)
+
+
+    def _read_events(self) -> Iterator[str]:
+        """
+        Lê os eventos disponíveis no descritor do inotify.
+
+        Returns:
+            Iterator[str]: Nomes dos arquivos dos eventos. Em caso de
+            estouro da fila de eventos do kernel, todos os arquivos do
+            diretório são retornados.
+        """
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        position = 0
+        while position + _EVENT.size <= len(data):
+            _, mask, _, length = _EVENT.unpack_from(data, position)
+            position += _EVENT.size
+            name = data[position:position + length].rstrip(b'\0')
+            position += length
+            if mask & IN_Q_OVERFLOW:
+                yield from (
+                    entry.name for entry in os.scandir(self.directory)
+                    if entry.is_file()
+                )
+            elif name and not mask & (IN_ISDIR | IN_IGNORED):
+                yield os.fsdecode(name)
+
+
+    def watch(
+            self, keyword: str = None, timeout: float = None
+        ) -> Iterator[str]:
+        """
+        Retorna os arquivos concluídos no diretório, à medida que surgem.
+
+        Args:
+            keyword (str, opcional): Palavra-chave no nome dos arquivos.
+            timeout (float, opcional): Tempo máximo em segundos sem novos
+            arquivos. Sem tempo máximo, a observação continua até o
+            iterador ser encerrado.
+
+        Returns:
+            Iterator[str]: Nomes dos arquivos encontrados.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = None
+            if deadline is not None:
+                wait = deadline - time.monotonic()
+                if wait <= 0:
+                    return
+                wait = int(wait * 1000) + 1
+            if not self._poll.poll(wait):
+                continue
+            for name in self._read_events():
+                if matches(name, keyword):
+                    yield name
+                    if timeout is not None:
+                        deadline = time.monotonic() + timeout
+
+
+    def close(self):
+        """
+        Encerra a observação, liberando o descritor do inotify.
+        """
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+
+class PollingWatcher:
+    """
+    Observador de diretório por consultas periódicas, utilizado quando o
+    inotify não está disponível (por exemplo, fora do Linux).
+
+    A cada intervalo, o diretório é listado e os arquivos novos ou
+    alterados desde a última listagem são retornados.
+
+    Attributes:
+        directory (str): Diretório observado.
+        interval (float): Intervalo em segundos entre as consultas.
+    """
+
+    def __init__(self, directory: str, interval: float = 5):
+        """
+        Inicia a observação do diretório, registrando os arquivos já
+        existentes.
+
+        Args:
+            directory (str): Diretório observado.
+            interval (float): Intervalo em segundos entre as consultas.
+        """
+        self.directory = directory
+        self.interval = interval
+        self._snapshot = self._scan()
+
+
+    def _scan(self) -> dict:
+        """
+        Lista os arquivos do diretório com a data de modificação.
+
+        Returns:
+            dict: Data de modificação (em nanossegundos) por nome.
+        """
+        return {
+            entry.name: entry.stat().st_mtime_ns
+            for entry in os.scandir(self.directory) if entry.is_file()
+        }
+
+
+    def watch(
+            self, keyword: str = None, timeout: float = None
+        ) -> Iterator[str]:
+        """
+        Retorna os arquivos novos ou alterados no diretório, à medida que
+        surgem.
+
+        Args:
+            keyword (str, opcional): Palavra-chave no nome dos arquivos.
+            timeout (float, opcional): Tempo máximo em segundos sem novos
+            arquivos.
+
+        Returns:
+            Iterator[str]: Nomes dos arquivos encontrados.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while deadline is None or time.monotonic() < deadline:
+            wait = self.interval
+            if deadline is not None:
+                wait = min(wait, max(0, deadline - time.monotonic()))
+            time.sleep(wait)
+            snapshot = self._scan()
+            changed = [
+                name for name, modified in snapshot.items()
+                if self._snapshot.get(name) != modified
+            ]
+            self._snapshot = snapshot
+            for name in sorted(changed):
+                if matches(name, keyword):
+                    yield name
+                    if timeout is not None:
+                        deadline = time.monotonic() + timeout
+
+
+    def close(self):
+        """
+        Encerra a observação. Não há recursos a liberar.
+        """
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def create_watcher(
+        directory: str, interval: float = 5
+    ) -> InotifyWatcher | PollingWatcher:
+    """
+    Cria o observador de um diretório: o inotify quando disponível, ou
+    consultas periódicas caso contrário.
+
+    Args:
+        directory (str): Diretório observado.
+        interval (float): Intervalo em segundos entre as consultas do
+        observador por consultas periódicas.
+
+    Returns:
+        InotifyWatcher | PollingWatcher: O observador do diretório.
+    """
+    if inotify_available():
+        try:
+            return InotifyWatcher(directory)
+        except OSError:
+            pass
+    return PollingWatcher(directory, interval)
@@ -0,0 +1,309 @@
+import hashlib
+import json
+import os
+from typing import List
+
+
+
+class FingerprintManager:
+    """
+    Classe que gerencia as impressões digitais (hashes) das páginas da
+    tabela entre execuções do robô.
+
+    Guarda, para cada página processada, o hash das linhas lidas e as
+    linhas que foram emitidas no arquivo CSV, além do hash de cada fatura
+    já emitida. Na execução seguinte, páginas cujo hash não mudou podem
+    ser ignoradas (suas linhas são reaproveitadas sem novos downloads) e
+    apenas faturas novas ou alteradas precisam ser processadas.
+
+    Attributes:
+        file (str): Caminho do arquivo JSON onde as impressões digitais
+        são persistidas.
+    """
+
+    def __init__(self, file: str):
+        """
+        Inicializa a instância e carrega as impressões digitais da
+        execução anterior, caso existam.
+
+        Args:
+            file (str): Caminho do arquivo JSON de impressões digitais.
+        """
+        self.file = file
+        self._previous = self._empty_store()
+        self._current = self._empty_store()
+        self._emitted_index = None
+        self._read_file()
+
+
+    @staticmethod
+    def _empty_store() -> dict:
+        """
+        Retorna a estrutura vazia utilizada para armazenar as
+        impressões digitais.
+
+        Returns:
+            dict: Estrutura com a assinatura da tabela, as páginas e as
+            faturas emitidas.
+        """
+        return {'table': None, 'pages': {}, 'invoices': {}}
+
+
+    def _read_file(self):
+        """
+        Lê o arquivo de impressões digitais da execução anterior.
+
+        Caso o arquivo não exista ou esteja corrompido, a execução é
+        tratada como a primeira, sem nenhuma página conhecida.
+        """
+        if not os.path.exists(self.file):
+            return
+        try:
+            with open(self.file, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        self._previous['table'] = data.get('table')
+        self._previous['pages'] = data.get('pages', {})
+        self._previous['invoices'] = data.get('invoices', {})
+
+
+    @staticmethod
+    def hash_row(row_data: dict) -> str:
+        """
+        Gera o hash de uma linha da tabela.
+
+        Args:
+            row_data (dict): Dados da linha da tabela.
+
+        Returns:
+            str: Hash SHA-256 dos dados da linha.
+        """
+        content = json.dumps(row_data, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+    @classmethod
+    def hash_rows(cls, rows: List[dict]) -> str:
+        """
+        Gera o hash de um conjunto de linhas, respeitando a ordem.
+
+        Args:
+            rows (List[dict]): Linhas da tabela.
+
+        Returns:
+            str: Hash SHA-256 das linhas.
+        """
+        digest = hashlib.sha256()
+        for row in rows:
+            digest.update(cls.hash_row(row).encode('ascii'))
+        return digest.hexdigest()
+
+
+    def table_unchanged(self, table_data: list | None) -> bool:
+        """
+        Verifica se a tabela não mudou desde a última execução completa.
+
+        A assinatura da tabela é o hash dos dados de todas as linhas
+        elegíveis, em todas as páginas. Se a assinatura for igual a da
+        última execução concluída com sucesso, a execução pode
+        reaproveitar todas as páginas anteriores sem percorrer a
+        paginação.
+
+        Args:
+            table_data (list | None): Dados de todas as linhas elegíveis
+            da tabela, ou None se não puderam ser lidos.
+
+        Returns:
+            bool: True se a assinatura da tabela for igual a anterior.
+        """
+        if table_data is None:
+            self._current['table'] = None
+            return False
+        content = json.dumps(table_data, sort_keys=True, ensure_ascii=False)
+        signature = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        self._current['table'] = signature
+        return signature == self._previous['table']
+
+
+    def page_unchanged(self, page: int, rows: List[dict]) -> bool:
+        """
+        Verifica se as linhas de uma página são iguais às da
+        execução anterior.
+
+        Args:
+            page (int): Número da página na tabela.
+            rows (List[dict]): Linhas elegíveis lidas da página.
+
+        Returns:
+            bool: True se o hash da página não mudou.
+        """
+        previous_page = self._previous['pages'].get(str(page))
+        if not previous_page:
+            return False
+        return previous_page['hash'] == self.hash_rows(rows)
+
+
+    def is_new_or_changed(self, row_data: dict) -> bool:
+        """
+        Verifica se uma fatura ainda não foi emitida ou se foi alterada
+        desde a última execução.
+
+        Args:
+            row_data (dict): Dados da linha da fatura.
+
+        Returns:
+            bool: True se a fatura for nova ou tiver sido alterada.
+        """
+        id_fatura = row_data['NUMERO_DA_FATURA']
+        previous_hash = self._previous['invoices'].get(id_fatura)
+        return previous_hash != self.hash_row(row_data)
+
+
+    def get_emitted_rows(self, page: int = None) -> List[dict]:
+        """
+        Retorna as linhas emitidas na execução anterior.
+
+        Args:
+            page (int, opcional): Número da página. Se não for fornecido
+            retorna as linhas de todas as páginas, na ordem das páginas.
+
+        Returns:
+            List[dict]: Linhas emitidas no arquivo CSV.
+        """
+        pages = self._previous['pages']
+        if page is not None:
+            return list(pages.get(str(page), {}).get('rows', []))
+
+        rows = []
+        for page_number in sorted(pages, key=int):
+            rows.extend(pages[page_number].get('rows', []))
+        return rows
+
+
+    def get_emitted_row(self, id_fatura: str) -> dict | None:
+        """
+        Retorna a linha de uma fatura emitida na execução anterior, com
+        todos os campos gravados (por exemplo, os campos do OCR), em
+        qualquer página.
+
+        Args:
+            id_fatura (str): Número da fatura.
+
+        Returns:
+            dict | None: Uma cópia da linha emitida, ou None se a fatura
+            não foi emitida na execução anterior.
+        """
+        if self._emitted_index is None:
+            self._emitted_index = {
+                row['NUMERO_DA_FATURA']: row
+                for row in self.get_emitted_rows()
+            }
+        row = self._emitted_index.get(id_fatura)
+        return dict(row) if row is not None else None
+
+
+    def mark_page(
+            self,
+            page: int,
+            rows: List[dict],
+            emitted_rows: List[dict],
+            emitted_hashes: dict
+        ):
+        """
+        Registra uma página processada na execução atual.
+
+        Args:
+            page (int): Número da página na tabela.
+            rows (List[dict]): Linhas elegíveis lidas da página, como
+            vieram da tabela.
+            emitted_rows (List[dict]): Linhas que foram emitidas no
+            arquivo CSV.
+            emitted_hashes (dict): Hash original (linha lida da tabela)
+            de cada fatura emitida, indexado pelo número da fatura.
+        """
+        self._current['pages'][str(page)] = {
+            'hash': self.hash_rows(rows),
+            'rows': emitted_rows,
+        }
+        self._current['invoices'].update(emitted_hashes)
+
+
+    def update_emitted_row(self, id_fatura: str, values: dict) -> bool:
+        """
+        Atualiza os dados de uma fatura emitida na execução atual, por
+        exemplo com os campos extraídos pelo OCR, para que sejam
+        reaproveitados junto com a página nas próximas execuções.
+
+        Args:
+            id_fatura (str): Número da fatura.
+            values (dict): Valores a serem atualizados na linha.
+
+        Returns:
+            bool: True se a fatura foi encontrada.
+        """
+        for page in self._current['pages'].values():
+            for row in page['rows']:
+                if row['NUMERO_DA_FATURA'] == id_fatura:
+                    row.update(values)
+                    return True
+        return False
+
+
+    def carry_over_page(self, page: int):
+        """
+        Reaproveita na execução atual os dados de uma página que não
+        mudou desde a execução anterior.
+
+        Args:
+            page (int): Número da página na tabela.
+        """
+        previous_page = self._previous['pages'].get(str(page))
+        if not previous_page:
+            return
+        self._current['pages'][str(page)] = previous_page
+        for row in previous_page.get('rows', []):
+            id_fatura = row['NUMERO_DA_FATURA']
+            if id_fatura in self._previous['invoices']:
+                self._current['invoices'][id_fatura] = (
+                    self._previous['invoices'][id_fatura]
+                )
+
+
+    def carry_over_all(self):
+        """
+        Reaproveita na execução atual todas as páginas da execução
+        anterior, utilizado quando a tabela inteira não mudou.
+        """
+        for page in self._previous['pages']:
+            self.carry_over_page(int(page))
+
+
+    def save_file(self, complete: bool = True):
+        """
+        Salva as impressões digitais da execução atual no arquivo JSON.
+
+        Se a execução não foi concluída, as páginas da execução
+        anterior que não foram processadas são mantidas e a assinatura
+        da tabela é descartada, para que a próxima execução não considere
+        a tabela inteira como inalterada.
+
+        Args:
+            complete (bool): Indica se toda a paginação foi percorrida.
+        """
+        if complete:
+            data = self._current
+        else:
+            data = self._empty_store()
+            data['pages'] = {
+                **self._previous['pages'], **self._current['pages']
+            }
+            data['invoices'] = {
+                **self._previous['invoices'], **self._current['invoices']
+            }
+
+        os.makedirs(os.path.dirname(self.file) or '.', exist_ok=True)
+        temporary_file = f'{self.file}.tmp'
+        with open(temporary_file, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False)
+        os.replace(temporary_file, self.file)
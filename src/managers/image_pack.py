@@ -0,0 +1,320 @@
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+
+# Cabeçalho de cada registro do pacote: identificador, tamanho da chave e
+# tamanho da imagem, seguidos da chave (UTF-8) e do conteúdo da imagem.
+_RECORD = struct.Struct('<4sHI')
+_RECORD_MAGIC = b'FIMG'
+
+# Entrada do índice, de tamanho fixo para que o índice seja lido de uma só
+# vez com o NumPy: chave (UTF-8, completada com zeros), posição e tamanho da
+# imagem no pacote.
+KEY_SIZE = 32
+_INDEX = struct.Struct(f'<{KEY_SIZE}sQI')
+_INDEX_DTYPE = np.dtype(
+    [('key', f'S{KEY_SIZE}'), ('offset', '<u8'), ('length', '<u4')]
+)
+
+
+
+class ImagePack:
+    """
+    Classe que armazena as imagens das faturas de uma execução em um único
+    arquivo de pacote, no lugar de um arquivo por fatura.
+
+    As imagens são acrescentadas ao final do pacote e sua posição é
+    registrada em um índice (arquivo '<pacote>.idx'), indexado pelo número
+    da fatura. A leitura é feita por um mapeamento em memória do pacote,
+    sem cópia do conteúdo. Cada registro do pacote também guarda sua chave,
+    permitindo reconstruir o índice caso ele esteja ausente ou incompleto
+    (por exemplo, após uma interrupção durante a gravação).
+
+    A gravação é protegida por um lock, podendo ser feita tanto pela thread
+    principal quanto pela thread de novas tentativas.
+
+    Attributes:
+        file (str): Caminho do arquivo de pacote.
+        file_index (str): Caminho do arquivo de índice.
+        readonly (bool): Abre o pacote apenas para leitura.
+    """
+
+    def __init__(self, file: str, readonly: bool = False):
+        """
+        Abre o pacote, criando-o caso não exista, e carrega o índice.
+
+        Args:
+            file (str): Caminho do arquivo de pacote.
+            readonly (bool): Abre o pacote apenas para leitura.
+
+        Raises:
+            FileNotFoundError: Se o pacote não existir e `readonly` for
+            True.
+        """
+        self.file = file
+        self.file_index = f'{file}.idx'
+        self.readonly = readonly
+        self._keys: List[str] = []
+        self._offsets: List[int] = []
+        self._lengths: List[int] = []
+        self._rows: Dict[str, int] | None = None
+        self._lock = threading.Lock()
+        self._map = None
+        if readonly:
+            self._pack = open(file, 'rb')
+            self._index_file = None
+        else:
+            os.makedirs(os.path.dirname(file) or '.', exist_ok=True)
+            self._pack = open(file, 'a+b')
+            self._index_file = open(self.file_index, 'ab')
+        self._fd = self._pack.fileno()
+        self._load_index()
+
+
+    def _load_index(self):
+        """
+        Carrega o índice e reconstrui, a partir dos registros do pacote,
+        as entradas que não chegaram a ser gravadas no índice.
+        """
+        size = os.fstat(self._fd).st_size
+        end = 0
+        if os.path.exists(self.file_index):
+            with open(self.file_index, 'rb') as file:
+                data = file.read()
+            entries = np.frombuffer(
+                data, _INDEX_DTYPE, len(data) // _INDEX_DTYPE.itemsize
+            )
+            # Entradas que apontam além do final do pacote (gravação
+            # interrompida) são descartadas, junto com as seguintes.
+            valid = (entries['offset'] + entries['length']) <= size
+            if not valid.all():
+                entries = entries[:np.argmin(valid)]
+            if len(entries):
+                # As chaves são decodificadas de uma só vez, separadas por
+                # um byte nulo (que não ocorre nas chaves).
+                keys = b'\0'.join(entries['key'].tolist()).decode(
+                    'utf-8'
+                ).split('\0')
+                self._keys = keys
+                self._offsets = entries['offset'].tolist()
+                self._lengths = entries['length'].tolist()
+                end = self._offsets[-1] + self._lengths[-1]
+        self._scan(end, size)
+
+
+    def _scan(self, position: int, size: int):
+        """
+        Percorre os registros do pacote a partir de uma posição,
+        adicionando-os ao índice. Um registro incompleto no final do
+        pacote é descartado.
+
+        Args:
+            position (int): Posição inicial no pacote.
+            size (int): Tamanho atual do pacote.
+        """
+        recovered = []
+        while position + _RECORD.size <= size:
+            self._pack.seek(position)
+            header = self._pack.read(_RECORD.size)
+            magic, key_size, length = _RECORD.unpack(header)
+            offset = position + _RECORD.size + key_size
+            if magic != _RECORD_MAGIC or offset + length > size:
+                break
+            key = self._pack.read(key_size).decode('utf-8')
+            self._append(key, offset, length)
+            recovered.append((key, offset, length))
+            position = offset + length
+        if self.readonly:
+            return
+        if position < size:
+            self._pack.truncate(position)
+        for key, offset, length in recovered:
+            self._write_index(key, offset, length)
+        self._index_file.flush()
+
+
+    def _append(self, key: str, offset: int, length: int):
+        """
+        Adiciona uma imagem ao índice em memória.
+
+        Args:
+            key (str): Número da fatura.
+            offset (int): Posição da imagem no pacote.
+            length (int): Tamanho da imagem em bytes.
+        """
+        if self._rows is not None:
+            self._rows[key] = len(self._keys)
+        self._keys.append(key)
+        self._offsets.append(offset)
+        self._lengths.append(length)
+
+
+    def _get_rows(self) -> Dict[str, int]:
+        """
+        Monta, na primeira consulta, o dicionário com a entrada mais
+        recente de cada fatura no índice. A listagem das faturas não
+        depende dele, ficando mais rápida a abertura do pacote. Deve ser
+        chamado com o lock, pois o índice pode ser alterado por `put` em
+        outra thread (como a de novas tentativas da fila de falhas).
+
+        Returns:
+            Dict[str, int]: Posição no índice por número da fatura.
+        """
+        if self._rows is None:
+            self._rows = dict(zip(self._keys, range(len(self._keys))))
+        return self._rows
+
+
+    def _write_index(self, key: str, offset: int, length: int):
+        """
+        Acrescenta uma entrada no arquivo de índice.
+
+        Args:
+            key (str): Número da fatura.
+            offset (int): Posição da imagem no pacote.
+            length (int): Tamanho da imagem em bytes.
+        """
+        self._index_file.write(
+            _INDEX.pack(key.encode('utf-8'), offset, length)
+        )
+
+
+    def put(self, key: str, data: bytes) -> str:
+        """
+        Acrescenta uma imagem no pacote. Uma nova imagem com a mesma chave
+        substitui a anterior no índice.
+
+        Args:
+            key (str): Número da fatura.
+            data (bytes): Conteúdo da imagem.
+
+        Returns:
+            str: A localização da imagem, no formato '<pacote>#<chave>'.
+
+        Raises:
+            PermissionError: Se o pacote foi aberto apenas para leitura.
+            ValueError: Se a chave tiver mais de `KEY_SIZE` bytes.
+        """
+        if self.readonly:
+            raise PermissionError(
+                f'Pacote aberto apenas para leitura: {self.file}'
+            )
+        encoded = key.encode('utf-8')
+        if not encoded or len(encoded) > KEY_SIZE:
+            raise ValueError(
+                f'Chave inválida para o pacote de imagens: {key!r}'
+            )
+        header = _RECORD.pack(_RECORD_MAGIC, len(encoded), len(data)) + encoded
+        with self._lock:
+            # O cabeçalho e a imagem são gravados em uma única chamada de
+            # sistema, sem o buffer do arquivo, ficando visíveis de imediato
+            # para o mapeamento em memória. O índice permanece no buffer até
+            # o fechamento do pacote, pois pode ser reconstruído pelo pacote.
+            position = os.lseek(self._fd, 0, os.SEEK_END)
+            os.writev(self._fd, [header, data])
+            offset = position + len(header)
+            self._write_index(key, offset, len(data))
+            self._append(key, offset, len(data))
+        return f'{self.file}#{key}'
+
+
+    def get(self, key: str) -> memoryview:
+        """
+        Lê uma imagem do pacote através do mapeamento em memória, sem
+        copiar seu conteúdo.
+
+        Args:
+            key (str): Número da fatura.
+
+        Returns:
+            memoryview: O conteúdo da imagem. Utilize `bytes()` para obter
+            uma cópia independente do pacote.
+
+        Raises:
+            KeyError: Se a fatura não estiver no pacote.
+        """
+        with self._lock:
+            row = self._get_rows()[key]
+            offset, length = self._offsets[row], self._lengths[row]
+            if self._map is None or offset + length > len(self._map):
+                # O mapeamento anterior não é fechado, pois ainda pode
+                # estar em uso por imagens retornadas anteriormente.
+                self._map = mmap.mmap(
+                    self._fd, 0, access=mmap.ACCESS_READ
+                )
+            view = memoryview(self._map)
+        return view[offset:offset + length]
+
+
+    def keys(self) -> List[str]:
+        """
+        Lista as faturas armazenadas no pacote, na ordem de gravação.
+
+        Returns:
+            List[str]: Os números das faturas.
+        """
+        with self._lock:
+            return list(dict.fromkeys(self._keys))
+
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._get_rows()
+
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._get_rows())
+
+
+    def export(
+            self,
+            directory: str,
+            keys: Iterable[str] = None,
+            extension: str = '.png'
+        ) -> List[str]:
+        """
+        Exporta as imagens do pacote como arquivos individuais,
+        no mesmo formato do armazenamento em arquivos ('<fatura>.png').
+
+        Args:
+            directory (str): Diretório de destino.
+            keys (Iterable[str], opcional): Faturas exportadas. Por padrão
+            todas as faturas do pacote.
+            extension (str): Extensão dos arquivos gerados.
+
+        Returns:
+            List[str]: Caminhos dos arquivos gerados.
+        """
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for key in (self.keys() if keys is None else keys):
+            path = os.path.join(directory, f'{key}{extension}')
+            with open(path, 'wb') as file:
+                file.write(self.get(key))
+            paths.append(path)
+        return paths
+
+
+    def flush(self):
+        """
+        Grava no disco as entradas do índice ainda no buffer.
+        """
+        if self._index_file is not None:
+            with self._lock:
+                self._index_file.flush()
+
+
+    def close(self):
+        """
+        Fecha os arquivos do pacote e do índice.
+        """
+        self._map = None
+        self._pack.close()
+        if self._index_file is not None:
+            self._index_file.close()
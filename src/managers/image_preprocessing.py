@@ -0,0 +1,595 @@
+from typing import List, Tuple
+
+import numpy as np
+
+
+
+def integral_image(image: np.ndarray) -> np.ndarray:
+    """
+    Calcula a imagem integral (tabela de somas acumuladas), com uma
+    linha e uma coluna de zeros no início.
+
+    A tabela utiliza inteiros de 32 bits sem sinal. Mesmo que as somas
+    acumuladas ultrapassem esse limite, a soma de uma janela calculada
+    por `box_sum` continua exata, pois a aritmética é modular e a soma de
+    uma janela é sempre muito menor que 2 ** 32.
+
+    Args:
+        image (np.ndarray): Imagem (altura, largura) ou lote de imagens
+        (imagens, altura, largura).
+
+    Returns:
+        np.ndarray: Tabela (..., altura + 1, largura + 1), onde cada
+        posição contém a soma dos pixels acima e à esquerda.
+    """
+    height, width = image.shape[-2:]
+    table = np.zeros(
+        image.shape[:-2] + (height + 1, width + 1), dtype=np.uint32
+    )
+    np.cumsum(image, axis=-2, dtype=np.uint32, out=table[..., 1:, 1:])
+    np.cumsum(table[..., 1:, 1:], axis=-1, out=table[..., 1:, 1:])
+    return table
+
+
+def box_sum(table: np.ndarray, radius_y: int,
+            radius_x: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Soma os pixels da janela centrada em cada posição, a partir da
+    imagem integral. Nas bordas, a janela é reduzida à parte que está
+    dentro da imagem.
+
+    A tabela é estendida repetindo suas bordas, de forma que os cantos
+    de todas as janelas sejam obtidos por fatias, sem indexação por
+    arrays de índices.
+
+    Args:
+        table (np.ndarray): Imagem integral gerada por `integral_image`.
+        radius_y (int): Raio vertical da janela.
+        radius_x (int): Raio horizontal da janela.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: A soma de cada janela (`uint32`) e
+        a quantidade de pixels de cada janela (altura, largura).
+    """
+    height, width = table.shape[-2] - 1, table.shape[-1] - 1
+    padding = [(0, 0)] * (table.ndim - 2)
+    padding += [(radius_y, radius_y), (radius_x, radius_x)]
+    padded = np.pad(table, padding, mode='edge')
+
+    bottom = slice(2 * radius_y + 1, 2 * radius_y + 1 + height)
+    top = slice(0, height)
+    right = slice(2 * radius_x + 1, 2 * radius_x + 1 + width)
+    left = slice(0, width)
+    sums = padded[..., bottom, right] - padded[..., bottom, left]
+    sums -= padded[..., top, right]
+    sums += padded[..., top, left]
+
+    rows = np.arange(height)
+    columns = np.arange(width)
+    window_height = (
+        np.minimum(rows + radius_y + 1, height) - np.maximum(rows - radius_y, 0)
+    )
+    window_width = (
+        np.minimum(columns + radius_x + 1, width)
+        - np.maximum(columns - radius_x, 0)
+    )
+    area = np.outer(window_height, window_width).astype(np.uint32)
+    return sums, area
+
+
+def adaptive_threshold(image: np.ndarray, block_size: int = 31,
+                       offset: int = 10) -> np.ndarray:
+    """
+    Binariza a imagem comparando cada pixel com a média da sua
+    vizinhança, o que tolera variações de iluminação e fundo.
+
+    Args:
+        image (np.ndarray): Imagem ou lote de imagens em tons de cinza.
+        block_size (int): Lado da janela utilizada no cálculo da média.
+        offset (int): Quanto o pixel deve ser mais escuro que a média
+        para ser considerado tinta.
+
+    Returns:
+        np.ndarray: Máscara booleana, True nos pixels de tinta.
+    """
+    radius = block_size // 2
+    sums, area = box_sum(integral_image(image), radius, radius)
+    # Compara pixel + offset < média, multiplicando ambos os lados pela área.
+    scaled = image * area
+    scaled += np.uint32(offset) * area
+    return scaled < sums
+
+
+def dilate(binary: np.ndarray, radius_y: int, radius_x: int) -> np.ndarray:
+    """
+    Dilata uma máscara com uma janela retangular, unindo pixels de tinta
+    próximos (por exemplo, as letras de uma mesma palavra ou linha).
+
+    Args:
+        binary (np.ndarray): Máscara ou lote de máscaras.
+        radius_y (int): Raio vertical da janela.
+        radius_x (int): Raio horizontal da janela.
+
+    Returns:
+        np.ndarray: Máscara dilatada.
+    """
+    sums, _ = box_sum(integral_image(binary), radius_y, radius_x)
+    return sums > 0
+
+
+def _find_runs(binary: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    Encontra as sequências horizontais de pixels de tinta (runs).
+
+    Args:
+        binary (np.ndarray): Máscara (altura, largura).
+
+    Returns:
+        Tuple[np.ndarray, ...]: Linha, início e fim (exclusivo) de cada
+        sequência, ordenadas por linha e coluna.
+    """
+    height, width = binary.shape
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = binary
+    changes = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(changes == 1)
+    _, ends = np.nonzero(changes == -1)
+    return rows, starts, ends
+
+
+def _connect_runs(rows: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                  width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encontra os pares de sequências em linhas vizinhas que se tocam,
+    considerando vizinhança-8.
+
+    Como as sequências estão ordenadas, as sequências da linha anterior
+    que tocam uma sequência formam um intervalo contínuo, encontrado por
+    busca binária.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Índices das sequências de cada par.
+    """
+    stride = width + 2
+    keys_start = rows * stride + starts
+    keys_end = rows * stride + ends
+    previous = (rows - 1) * stride
+    low = np.searchsorted(keys_end, previous + starts, side='left')
+    high = np.searchsorted(keys_start, previous + ends, side='right')
+    counts = np.clip(high - low, 0, None)
+
+    total = int(counts.sum())
+    current = np.repeat(np.arange(rows.size), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    above = np.repeat(low, counts) + offsets
+    return above, current
+
+
+def _union_find(size: int, first: np.ndarray,
+                second: np.ndarray) -> np.ndarray:
+    """
+    Une os elementos ligados pelos pares fornecidos, de forma vetorizada:
+    a cada rodada, a raiz de maior índice de cada par é ligada à menor
+    e os caminhos são comprimidos por saltos de ponteiros.
+
+    Args:
+        size (int): Quantidade de elementos.
+        first (np.ndarray): Primeiro elemento de cada par.
+        second (np.ndarray): Segundo elemento de cada par.
+
+    Returns:
+        np.ndarray: A raiz (menor índice) do conjunto de cada elemento.
+    """
+    parents = np.arange(size)
+    while True:
+        root_first = parents[first]
+        root_second = parents[second]
+        different = root_first != root_second
+        if not different.any():
+            return parents
+        root_first = root_first[different]
+        root_second = root_second[different]
+        smallest = np.minimum(root_first, root_second)
+        np.minimum.at(parents, root_first, smallest)
+        np.minimum.at(parents, root_second, smallest)
+        while True:
+            jumped = parents[parents]
+            if np.array_equal(jumped, parents):
+                break
+            parents = jumped
+
+
+def connected_components(binary: np.ndarray) -> dict:
+    """
+    Rotula os componentes conexos (vizinhança-8) de uma máscara,
+    trabalhando sobre as sequências horizontais de tinta em vez de
+    pixel a pixel.
+
+    Em um lote de máscaras, as imagens são empilhadas com uma linha vazia
+    entre elas e rotuladas de uma só vez.
+
+    Args:
+        binary (np.ndarray): Máscara (altura, largura) ou lote de
+        máscaras (imagens, altura, largura).
+
+    Returns:
+        dict: Quantidade de componentes ('count') e, por componente, a
+        área em pixels e a caixa delimitadora ('top', 'left', 'bottom' e
+        'right', com fim exclusivo) e, em lotes, o índice da imagem
+        ('image'). Também inclui as sequências ('rows', 'starts', 'ends')
+        e o componente de cada uma ('labels').
+    """
+    height, width = binary.shape[-2:]
+    if binary.ndim == 3:
+        stacked = np.zeros((binary.shape[0], height + 1, width), dtype=bool)
+        stacked[:, :height] = binary
+        flat = stacked.reshape(-1, width)
+    else:
+        flat = binary
+
+    rows, starts, ends = _find_runs(flat)
+    above, current = _connect_runs(rows, starts, ends, width)
+    roots = _union_find(rows.size, above, current)
+    _, labels = np.unique(roots, return_inverse=True)
+    count = int(labels.max(initial=-1)) + 1
+
+    top = np.full(count, flat.shape[0], dtype=np.int64)
+    bottom = np.zeros(count, dtype=np.int64)
+    left = np.full(count, width, dtype=np.int64)
+    right = np.zeros(count, dtype=np.int64)
+    np.minimum.at(top, labels, rows)
+    np.maximum.at(bottom, labels, rows + 1)
+    np.minimum.at(left, labels, starts)
+    np.maximum.at(right, labels, ends)
+
+    components = {
+        'count': count,
+        'area': np.bincount(labels, ends - starts, count).astype(np.int64),
+        'top': top,
+        'left': left,
+        'bottom': bottom,
+        'right': right,
+        'rows': rows,
+        'starts': starts,
+        'ends': ends,
+        'labels': labels,
+    }
+    if binary.ndim == 3:
+        image = top // (height + 1)
+        components['image'] = image
+        components['top'] = top - image * (height + 1)
+        components['bottom'] = bottom - image * (height + 1)
+    return components
+
+
+def paint_components(shape: Tuple[int, ...], components: dict,
+                     keep: np.ndarray) -> np.ndarray:
+    """
+    Gera a máscara apenas com os componentes selecionados.
+
+    Args:
+        shape (Tuple[int, ...]): Formato da máscara original.
+        components (dict): Componentes gerados por `connected_components`.
+        keep (np.ndarray): Máscara booleana dos componentes mantidos.
+
+    Returns:
+        np.ndarray: Máscara com o formato original.
+    """
+    height, width = shape[-2:]
+    total_rows = shape[0] * (height + 1) if len(shape) == 3 else height
+    selected = keep[components['labels']]
+    rows = components['rows'][selected]
+
+    changes = np.zeros((total_rows, width + 1), dtype=np.int8)
+    changes[rows, components['starts'][selected]] += 1
+    changes[rows, components['ends'][selected]] -= 1
+    mask = np.cumsum(changes[:, :width], axis=1, dtype=np.int8) > 0
+    if len(shape) == 3:
+        mask = mask.reshape(shape[0], height + 1, width)[:, :height]
+    return mask
+
+
+def remove_noise(binary: np.ndarray, min_area: int = 4) -> np.ndarray:
+    """
+    Remove componentes com menos pixels que o mínimo (manchas e ruído
+    de digitalização).
+
+    Args:
+        binary (np.ndarray): Máscara ou lote de máscaras.
+        min_area (int): Área mínima, em pixels, dos componentes mantidos.
+
+    Returns:
+        np.ndarray: Máscara sem os componentes pequenos.
+    """
+    components = connected_components(binary)
+    return paint_components(
+        binary.shape, components, components['area'] >= min_area
+    )
+
+
+def find_regions(binary: np.ndarray, gap_y: int = 3, gap_x: int = 12,
+                 min_area: int = 20) -> dict:
+    """
+    Segmenta as regiões de texto, unindo os componentes separados por
+    espaços menores que os informados (letras de uma palavra e palavras
+    de uma linha).
+
+    Args:
+        binary (np.ndarray): Máscara ou lote de máscaras.
+        gap_y (int): Espaço vertical máximo entre componentes unidos.
+        gap_x (int): Espaço horizontal máximo entre componentes unidos.
+        min_area (int): Área mínima de tinta de uma região.
+
+    Returns:
+        dict: Componentes das regiões, no formato de
+        `connected_components`, com as caixas ajustadas à tinta.
+    """
+    radius_y = (gap_y + 1) // 2
+    radius_x = (gap_x + 1) // 2
+    regions = connected_components(dilate(binary, radius_y, radius_x))
+
+    height, width = binary.shape[-2:]
+    regions['top'] = np.minimum(regions['top'] + radius_y, height)
+    regions['bottom'] = np.maximum(regions['bottom'] - radius_y, 0)
+    regions['left'] = np.minimum(regions['left'] + radius_x, width)
+    regions['right'] = np.maximum(regions['right'] - radius_x, 0)
+
+    ink = binary
+    if binary.ndim == 3:
+        ink = np.zeros((binary.shape[0], height + 1, width), dtype=bool)
+        ink[:, :height] = binary
+        ink = ink.reshape(-1, width)
+    table = integral_image(ink).astype(np.int64)
+    row_offset = regions.get('image', 0) * (height + 1)
+    top = regions['top'] + row_offset
+    bottom = regions['bottom'] + row_offset
+    regions['area'] = (
+        table[bottom, regions['right']] - table[top, regions['right']]
+        - table[bottom, regions['left']] + table[top, regions['left']]
+    )
+
+    keep = regions['area'] >= min_area
+    for key in ('area', 'top', 'left', 'bottom', 'right', 'image'):
+        if key in regions:
+            regions[key] = regions[key][keep]
+    regions['count'] = int(keep.sum())
+    return regions
+
+
+def find_lines(binary: np.ndarray, min_pixels: int = 2,
+               min_height: int = 4) -> np.ndarray:
+    """
+    Segmenta as linhas de texto pelo perfil de projeção horizontal.
+
+    Args:
+        binary (np.ndarray): Máscara (altura, largura).
+        min_pixels (int): Quantidade mínima de pixels de tinta para uma
+        linha da imagem fazer parte de uma linha de texto.
+        min_height (int): Altura mínima de uma linha de texto.
+
+    Returns:
+        np.ndarray: Início e fim (exclusivo) de cada linha de texto,
+        com formato (linhas, 2).
+    """
+    profile = binary.sum(axis=-1) >= min_pixels
+    changes = np.diff(np.concatenate(([0], profile.astype(np.int8), [0])))
+    starts = np.flatnonzero(changes == 1)
+    ends = np.flatnonzero(changes == -1)
+    keep = ends - starts >= min_height
+    return np.stack([starts[keep], ends[keep]], axis=1)
+
+
+def _profile_scores(images: np.ndarray, ys: np.ndarray, xs: np.ndarray,
+                    tangents: np.ndarray, height: int, width: int,
+                    image_count: int) -> np.ndarray:
+    """
+    Calcula a nitidez do perfil de projeção horizontal de cada imagem
+    após o cisalhamento pela tangente do ângulo de cada imagem.
+
+    Returns:
+        np.ndarray: A soma dos quadrados das diferenças entre linhas
+        consecutivas do perfil de cada imagem.
+    """
+    margin = int(np.ceil(width * np.abs(tangents).max(initial=0))) + 1
+    length = height + 2 * margin
+    shifted = ys + np.rint(
+        (xs - width / 2) * tangents[images]
+    ).astype(np.int64) + margin
+    profile = np.bincount(
+        images * length + shifted, minlength=image_count * length
+    ).reshape(image_count, length)
+    return (np.diff(profile, axis=1).astype(np.int64) ** 2).sum(axis=1)
+
+
+def estimate_skew(binary: np.ndarray, max_angle: float = 5.0,
+                  step: float = 0.5, precision: float = 0.1,
+                  max_points: int = 30000) -> float | np.ndarray:
+    """
+    Estima a inclinação do texto pelo perfil de projeção: o ângulo em
+    que as linhas de texto ficam alinhadas é o que gera o perfil
+    horizontal mais nítido. A busca é feita em passos grossos e depois
+    refinada ao redor do melhor ângulo.
+
+    Args:
+        binary (np.ndarray): Máscara ou lote de máscaras.
+        max_angle (float): Maior inclinação, em graus, avaliada.
+        step (float): Passo da busca inicial, em graus.
+        precision (float): Passo da busca refinada, em graus.
+        max_points (int): Quantidade máxima de pixels de tinta por imagem
+        utilizados na estimativa.
+
+    Returns:
+        float | np.ndarray: O ângulo, em graus, a ser corrigido por
+        `deskew`. Em lotes, um ângulo por imagem.
+    """
+    batch = binary if binary.ndim == 3 else binary[np.newaxis]
+    image_count, height, width = batch.shape
+    images, ys, xs = np.nonzero(batch)
+    sample = max(1, images.size // (max_points * image_count or 1))
+    images, ys, xs = images[::sample], ys[::sample], xs[::sample]
+
+    best = np.zeros(image_count)
+    for search_step, limit in ((step, max_angle), (precision, step)):
+        offsets = np.arange(-limit, limit + search_step / 2, search_step)
+        # Em caso de empate, prevalece o menor deslocamento.
+        offsets = offsets[np.argsort(np.abs(offsets), kind='stable')]
+        scores = np.stack([
+            _profile_scores(
+                images, ys, xs, np.tan(np.radians(best + offset)),
+                height, width, image_count
+            )
+            for offset in offsets
+        ])
+        best = best + offsets[scores.argmax(axis=0)]
+        best = np.clip(best, -max_angle, max_angle)
+
+    best = np.round(best, 3)
+    best[np.abs(best) < precision / 2] = 0.0
+    return float(best[0]) if binary.ndim == 2 else best
+
+
+def deskew(image: np.ndarray, angle: float | np.ndarray,
+           fill: int | bool = 255) -> np.ndarray:
+    """
+    Corrige a inclinação por cisalhamento vertical, deslocando cada
+    coluna proporcionalmente à sua distância do centro. Para as pequenas
+    inclinações de documentos digitalizados, equivale a uma rotação.
+
+    As colunas com o mesmo deslocamento formam faixas contínuas, copiadas
+    por fatias.
+
+    Args:
+        image (np.ndarray): Imagem, máscara ou lote.
+        angle (float | np.ndarray): Ângulo estimado por `estimate_skew`.
+        fill: Valor das áreas que ficam fora da imagem original.
+
+    Returns:
+        np.ndarray: Imagem corrigida, com o mesmo formato.
+    """
+    batch = image if image.ndim == 3 else image[np.newaxis]
+    height, width = batch.shape[1:]
+    angles = np.broadcast_to(np.atleast_1d(angle), (batch.shape[0],))
+    result = np.full_like(batch, fill)
+    columns = np.arange(width) - width / 2
+
+    for index, current in enumerate(angles):
+        shifts = np.rint(columns * np.tan(np.radians(current))).astype(int)
+        bands = np.flatnonzero(np.diff(shifts)) + 1
+        for start, end in zip(
+                np.concatenate(([0], bands)), np.concatenate((bands, [width]))):
+            shift = shifts[start]
+            if abs(shift) >= height:
+                continue
+            rows = slice(max(shift, 0), height + min(shift, 0))
+            source = slice(max(-shift, 0), height - max(shift, 0))
+            result[index, rows, start:end] = batch[index, source, start:end]
+    return result if image.ndim == 3 else result[0]
+
+
+def content_box(regions: dict, index: int, shape: Tuple[int, int],
+                margin: int = 10) -> Tuple[int, int, int, int]:
+    """
+    Calcula a caixa que contém todas as regiões de texto de uma imagem.
+
+    Args:
+        regions (dict): Regiões geradas por `find_regions`.
+        index (int): Índice da imagem no lote.
+        shape (Tuple[int, int]): Altura e largura da imagem.
+        margin (int): Margem, em pixels, ao redor do texto.
+
+    Returns:
+        Tuple[int, int, int, int]: Topo, esquerda, base e direita (fim
+        exclusivo). A imagem inteira se não houver texto.
+    """
+    height, width = shape
+    selected = regions.get('image', np.zeros(regions['count'], int)) == index
+    if not selected.any():
+        return 0, 0, height, width
+    return (
+        max(0, int(regions['top'][selected].min()) - margin),
+        max(0, int(regions['left'][selected].min()) - margin),
+        min(height, int(regions['bottom'][selected].max()) + margin),
+        min(width, int(regions['right'][selected].max()) + margin),
+    )
+
+
+def preprocess_batch(
+        images: np.ndarray,
+        shapes: List[Tuple[int, int]] = None,
+        block_size: int = 31,
+        offset: int = 10,
+        min_noise_area: int = 4,
+        max_angle: float = 5.0,
+        margin: int = 10
+    ) -> List[dict]:
+    """
+    Prepara um lote de imagens de faturas para o OCR: binarização
+    adaptativa, remoção de ruído, correção da inclinação e recorte nas
+    regiões de texto. Cada etapa é executada de uma só vez para todas as
+    imagens do lote.
+
+    Args:
+        images (np.ndarray): Lote em tons de cinza (imagens, altura,
+        largura), como o gerado por `PngDecoder.decode_batch`, ou uma
+        única imagem (altura, largura).
+        shapes (List[Tuple[int, int]], opcional): Altura e largura
+        original de cada imagem do lote, antes do preenchimento.
+        block_size (int): Janela da binarização adaptativa.
+        offset (int): Sensibilidade da binarização adaptativa.
+        min_noise_area (int): Área mínima dos componentes mantidos.
+        max_angle (float): Maior inclinação corrigida, em graus.
+        margin (int): Margem ao redor do texto no recorte.
+
+    Returns:
+        List[dict]: Para cada imagem, a imagem binarizada para o OCR
+        ('image', tinta preta em fundo branco), a imagem em tons de cinza
+        corrigida ('gray'), ambas recortadas, a inclinação corrigida
+        ('angle'), a caixa do recorte ('box'), as regiões de texto
+        ('regions', relativas ao recorte) e as linhas de texto ('lines').
+    """
+    batch = images if images.ndim == 3 else images[np.newaxis]
+    if shapes is None:
+        shapes = [batch.shape[1:]] * batch.shape[0]
+
+    binary = remove_noise(adaptive_threshold(batch, block_size, offset),
+                          min_noise_area)
+    angles = estimate_skew(binary, max_angle)
+    if np.any(angles):
+        batch = deskew(batch, angles)
+        binary = deskew(binary, angles, fill=False)
+    regions = find_regions(binary)
+
+    results = []
+    for index, shape in enumerate(shapes):
+        top, left, bottom, right = content_box(regions, index, shape, margin)
+        cropped = binary[index, top:bottom, left:right]
+        selected = regions['image'] == index
+        boxes = np.stack([
+            regions['top'][selected] - top,
+            regions['left'][selected] - left,
+            regions['bottom'][selected] - top,
+            regions['right'][selected] - left,
+        ], axis=1)
+        results.append({
+            'image': np.where(cropped, 0, 255).astype(np.uint8),
+            'gray': batch[index, top:bottom, left:right],
+            'angle': float(angles[index]),
+            'box': (top, left, bottom, right),
+            'regions': boxes,
+            'lines': find_lines(cropped),
+        })
+    return results
+
+
+def preprocess(image: np.ndarray, **options) -> dict:
+    """
+    Prepara uma única imagem de fatura para o OCR.
+
+    Args:
+        image (np.ndarray): Imagem em tons de cinza (altura, largura).
+        **options: Opções de `preprocess_batch`.
+
+    Returns:
+        dict: O resultado de `preprocess_batch` para a imagem.
+    """
+    return preprocess_batch(image[np.newaxis], **options)[0]
@@ -0,0 +1,309 @@
+import hashlib
+import os
+import shutil
+import threading
+from typing import Dict, List
+
+
+
+class ImageStore:
+    """
+    Classe que armazena as imagens das faturas endereçadas pelo conteúdo,
+    compartilhadas entre as execuções.
+
+    Cada imagem é gravada uma única vez em 'objects/<hash[:2]>/<hash>',
+    indexada pelo hash SHA-256 do conteúdo. O diretório da execução recebe
+    um hardlink para a imagem armazenada ('<fatura>.png'), de modo que
+    gravar uma imagem já existente altera apenas os metadados do sistema de
+    arquivos. Quando o hardlink não é suportado (por exemplo, em outro
+    sistema de arquivos), a fatura é registrada no manifesto da execução
+    ('manifests/<execução>.txt') e lida diretamente do armazenamento. O
+    manifesto é criado, vazio, na inicialização de cada execução e
+    identifica os diretórios de execução que pertencem ao armazenamento:
+    apenas esses diretórios são removidos com as execuções antigas.
+
+    A contagem de referências de cada imagem é a quantidade de hardlinks
+    do arquivo (st_nlink) somada às referências nos manifestos. Ao remover
+    execuções antigas, as imagens sem nenhuma referência são apagadas.
+
+    Attributes:
+        directory (str): Diretório do armazenamento.
+        directory_run (str): Diretório das faturas da execução atual.
+        hardlinks (bool): Utiliza hardlinks no diretório da execução.
+        written (int): Imagens novas gravadas pela execução.
+        deduplicated (int): Imagens já existentes no armazenamento.
+        bytes_saved (int): Bytes que deixaram de ser gravados.
+    """
+
+    def __init__(
+            self, directory: str, directory_run: str, hardlinks: bool = True
+        ):
+        """
+        Inicializa o armazenamento, criando seus diretórios caso não
+        existam.
+
+        Args:
+            directory (str): Diretório do armazenamento.
+            directory_run (str): Diretório das faturas da execução atual.
+            hardlinks (bool): Utiliza hardlinks no diretório da execução.
+        """
+        self.directory = directory
+        self.directory_run = directory_run
+        self.hardlinks = hardlinks
+        self.written = 0
+        self.deduplicated = 0
+        self.bytes_saved = 0
+        self._directory_objects = os.path.join(directory, 'objects')
+        self._directory_manifests = os.path.join(directory, 'manifests')
+        self._manifest: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        os.makedirs(self._directory_objects, exist_ok=True)
+        os.makedirs(self._directory_manifests, exist_ok=True)
+        os.makedirs(directory_run, exist_ok=True)
+        self._load_manifest()
+        open(self._manifest_file(directory_run), 'a', encoding='utf-8').close()
+
+
+    def _manifest_file(self, directory_run: str) -> str:
+        """
+        Retorna o caminho do manifesto de uma execução.
+
+        Args:
+            directory_run (str): Diretório das faturas da execução.
+
+        Returns:
+            str: Caminho do arquivo de manifesto.
+        """
+        name = os.path.basename(os.path.normpath(directory_run))
+        return os.path.join(self._directory_manifests, f'{name}.txt')
+
+
+    def _read_manifest(self, file: str) -> Dict[str, str]:
+        """
+        Lê um manifesto, com uma linha '<fatura>\\t<hash>' por imagem.
+
+        Args:
+            file (str): Caminho do arquivo de manifesto.
+
+        Returns:
+            Dict[str, str]: Hash da imagem por número da fatura.
+        """
+        manifest = {}
+        with open(file, encoding='utf-8') as lines:
+            for line in lines:
+                key, _, digest = line.rstrip('\n').partition('\t')
+                if digest:
+                    manifest[key] = digest
+        return manifest
+
+
+    def _load_manifest(self):
+        """
+        Carrega o manifesto da execução atual, caso exista.
+        """
+        file = self._manifest_file(self.directory_run)
+        if os.path.exists(file):
+            self._manifest = self._read_manifest(file)
+
+
+    def owns_run(self, directory_run: str) -> bool:
+        """
+        Verifica se um diretório de execução pertence ao armazenamento,
+        ou seja, se possui um manifesto.
+
+        Args:
+            directory_run (str): Diretório das faturas da execução.
+
+        Returns:
+            bool: True se a execução foi gravada pelo armazenamento.
+        """
+        return os.path.exists(self._manifest_file(directory_run))
+
+
+    def object_path(self, digest: str) -> str:
+        """
+        Retorna o caminho de uma imagem armazenada.
+
+        Args:
+            digest (str): Hash SHA-256 do conteúdo da imagem.
+
+        Returns:
+            str: Caminho do arquivo no armazenamento.
+        """
+        return os.path.join(self._directory_objects, digest[:2], digest)
+
+
+    def store(self, data: bytes) -> str:
+        """
+        Grava o conteúdo de uma imagem no armazenamento, caso ainda não
+        exista. A gravação é feita em um arquivo temporário, renomeado ao
+        final, evitando imagens incompletas no armazenamento.
+
+        Args:
+            data (bytes): Conteúdo da imagem.
+
+        Returns:
+            str: Hash SHA-256 do conteúdo.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        if os.path.exists(path):
+            with self._lock:
+                self.deduplicated += 1
+                self.bytes_saved += len(data)
+            return digest
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = os.path.join(
+            os.path.dirname(path),
+            f'.tmp-{os.getpid()}-{threading.get_ident()}-{digest}'
+        )
+        descriptor = os.open(
+            temporary,
+            os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0),
+            0o666
+        )
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        with self._lock:
+            self.written += 1
+        return digest
+
+
+    def put(self, key: str, data: bytes) -> str:
+        """
+        Armazena a imagem de uma fatura e a disponibiliza no diretório
+        da execução.
+
+        Args:
+            key (str): Número da fatura.
+            data (bytes): Conteúdo da imagem.
+
+        Returns:
+            str: O caminho da imagem da fatura: o hardlink no diretório da
+            execução ou, sem hardlinks, o arquivo no armazenamento.
+        """
+        digest = self.store(data)
+        source = self.object_path(digest)
+        path = os.path.join(self.directory_run, f'{key}.png')
+        if self.hardlinks:
+            try:
+                if os.path.lexists(path):
+                    os.remove(path)
+                os.link(source, path)
+                return path
+            except OSError:
+                self.hardlinks = False
+        with self._lock:
+            with open(
+                self._manifest_file(self.directory_run), 'a', encoding='utf-8'
+            ) as file:
+                file.write(f'{key}\t{digest}\n')
+            self._manifest[key] = digest
+        return source
+
+
+    def get(self, key: str) -> str:
+        """
+        Retorna o caminho da imagem de uma fatura da execução atual.
+
+        Args:
+            key (str): Número da fatura.
+
+        Returns:
+            str: Caminho da imagem.
+
+        Raises:
+            KeyError: Se a fatura não estiver na execução atual.
+        """
+        if key in self._manifest:
+            return self.object_path(self._manifest[key])
+        path = os.path.join(self.directory_run, f'{key}.png')
+        if os.path.exists(path):
+            return path
+        raise KeyError(key)
+
+
+    def collect_garbage(self) -> dict:
+        """
+        Remove as imagens sem referências: sem hardlinks em diretórios de
+        execução (st_nlink igual a 1) e fora de todos os manifestos.
+
+        Returns:
+            dict: Quantidade de imagens removidas ('objects') e bytes
+            liberados ('bytes').
+        """
+        referenced = set()
+        for entry in os.scandir(self._directory_manifests):
+            if entry.name.endswith('.txt'):
+                referenced.update(self._read_manifest(entry.path).values())
+
+        removed = 0
+        freed = 0
+        for prefix in os.scandir(self._directory_objects):
+            if not prefix.is_dir():
+                continue
+            for entry in os.scandir(prefix.path):
+                if entry.name.startswith('.tmp-'):
+                    continue
+                status = entry.stat()
+                if status.st_nlink > 1 or entry.name in referenced:
+                    continue
+                os.remove(entry.path)
+                removed += 1
+                freed += status.st_size
+        return {'objects': removed, 'bytes': freed}
+
+
+    def prune_runs(self, directories: List[str]) -> dict:
+        """
+        Remove diretórios de execuções antigas, junto com seus manifestos,
+        e apaga as imagens que ficaram sem referências. Diretórios que não
+        pertencem ao armazenamento (sem manifesto, como as execuções
+        gravadas com IMAGE_STORAGE = 'files') são mantidos.
+
+        Args:
+            directories (List[str]): Diretórios das execuções removidas.
+
+        Returns:
+            dict: Quantidade de execuções removidas ('runs'), de imagens
+            removidas ('objects') e bytes liberados ('bytes').
+        """
+        removed = 0
+        for directory in directories:
+            if not self.owns_run(directory):
+                continue
+            shutil.rmtree(directory, ignore_errors=True)
+            os.remove(self._manifest_file(directory))
+            removed += 1
+        result = self.collect_garbage()
+        result['runs'] = removed
+        return result
+
+
+    def stats(self) -> dict:
+        """
+        Retorna as estatísticas de deduplicação da execução.
+
+        Returns:
+            dict: Imagens novas ('written'), imagens já existentes
+            ('deduplicated') e bytes não gravados ('bytes_saved').
+        """
+        return {
+            'written': self.written,
+            'deduplicated': self.deduplicated,
+            'bytes_saved': self.bytes_saved,
+        }
+
+
+    def close(self):
+        """
+        Encerra o armazenamento. Nenhum arquivo é mantido aberto entre as
+        gravações; o método permite utilizar o armazenamento da mesma
+        forma que o ImagePack.
+        """
@@ -0,0 +1,61 @@
+import importlib
+import threading
+from types import ModuleType
+
+
+
+class LazyModule:
+    """
+    Referência a um módulo que só é importado no primeiro acesso a um dos
+    seus atributos, retirando a importação de dependências pesadas (como
+    o pandas) da inicialização do processo.
+
+    A importação é protegida por um lock, podendo o primeiro acesso
+    ocorrer em qualquer thread (por exemplo, nas etapas paralelas do
+    estado INITIALIZATION).
+
+    Attributes:
+        name (str): Nome do módulo.
+    """
+
+    def __init__(self, name: str):
+        """
+        Inicializa a referência, sem importar o módulo.
+
+        Args:
+            name (str): Nome do módulo, como em `import`.
+        """
+        self.name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+
+    @property
+    def loaded(self) -> bool:
+        """
+        Indica se o módulo já foi importado.
+        """
+        return self._module is not None
+
+
+    def load(self) -> ModuleType:
+        """
+        Importa o módulo, caso ainda não tenha sido importado.
+
+        Returns:
+            ModuleType: O módulo.
+        """
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self.name)
+        return self._module
+
+
+    def __getattr__(self, attribute: str):
+        """
+        Retorna o atributo do módulo, importando-o no primeiro acesso.
+        """
+        if attribute.startswith('_'):
+            raise AttributeError(attribute)
+        return getattr(self.load(), attribute)
@@ -1,12 +1,285 @@
-from datetime import datetime
+import atexit
+from datetime import datetime, timedelta
+import json
+import logging
+import logging.handlers
 import os
+import queue
+import threading
+import time
+
+
+# Listeners das filas de log e filtros de amostragem, por nome do logger.
+# A configuração é feita uma única vez por processo, na primeira instância.
+_listeners = {}
+_samplers = {}
+
+
+
+class DailyFileHandler(logging.FileHandler):
+    """
+    Handler que grava os logs em um arquivo por dia ('dd-mm-aaaa.txt').
+
+    O arquivo é escolhido pela data de cada mensagem, de modo que um
+    processo executado após a meia-noite (como o modo serviço) passa a
+    gravar no arquivo do novo dia.
+
+    Attributes:
+        directory (str): Diretório dos arquivos de log.
+        extension (str): Extensão dos arquivos de log.
+        buffered (bool): Mantém as mensagens no buffer do arquivo até a
+        chamada de flush, em vez de gravá-las a cada mensagem.
+    """
+
+    def __init__(
+            self, directory: str, extension: str = '.txt',
+            buffered: bool = False
+        ):
+        """
+        Inicializa o handler. O arquivo é aberto apenas na primeira
+        mensagem.
+
+        Args:
+            directory (str): Diretório dos arquivos de log.
+            extension (str): Extensão dos arquivos de log.
+            buffered (bool): Grava o buffer do arquivo apenas na chamada
+            de flush.
+        """
+        self.directory = directory
+        self.extension = extension
+        self.buffered = buffered
+        self._day_start = self._rollover_at = 0.0
+        super().__init__(
+            self._file_for(time.time()), mode='a', encoding='utf-8',
+            delay=True
+        )
+
+
+    def _file_for(self, timestamp: float) -> str:
+        """
+        Retorna o arquivo de log do dia de um horário e atualiza o
+        intervalo do dia atual (da meia-noite até a meia-noite seguinte).
+
+        Args:
+            timestamp (float): Horário da mensagem.
+
+        Returns:
+            str: Caminho do arquivo de log.
+        """
+        date = datetime.fromtimestamp(timestamp)
+        midnight = datetime(date.year, date.month, date.day)
+        self._day_start = midnight.timestamp()
+        self._rollover_at = (midnight + timedelta(days=1)).timestamp()
+        return os.path.join(
+            self.directory, date.strftime('%d-%m-%Y') + self.extension
+        )
+
+
+    def emit(self, record: logging.LogRecord):
+        """
+        Grava a mensagem, trocando de arquivo quando o dia mudou.
+
+        Args:
+            record (logging.LogRecord): A mensagem de log.
+        """
+        if not self._day_start <= record.created < self._rollover_at:
+            file_log = os.path.abspath(self._file_for(record.created))
+            if file_log != self.baseFilename:
+                if self.stream:
+                    self.stream.close()
+                    self.stream = None
+                self.baseFilename = file_log
+        if not self.buffered:
+            super().emit(record)
+            return
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Formata as mensagens de log como uma linha JSON, com o horário, o
+    nível, a thread, a mensagem e os campos adicionais informados na
+    chamada (por exemplo, o número da fatura).
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        """
+        Formata uma mensagem de log.
+
+        Args:
+            record (logging.LogRecord): A mensagem de log.
+
+        Returns:
+            str: A mensagem como um objeto JSON em uma linha.
+        """
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(
+                timespec='milliseconds'
+            ),
+            'level': record.levelname,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        entry.update(getattr(record, 'fields', None) or {})
+        if getattr(record, 'row', False):
+            entry['row'] = True
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que enfileira a própria mensagem de log, sem formatá-la
+    nem copiá-la na thread que registra a mensagem. A formatação é feita
+    pelos handlers do QueueListener, na thread em segundo plano.
+    """
+
+    def emit(self, record: logging.LogRecord):
+        """
+        Enfileira a mensagem de log.
+
+        Args:
+            record (logging.LogRecord): A mensagem de log.
+        """
+        self.queue.put_nowait(record)
+
+
+
+class BatchQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener que grava o buffer dos arquivos de log apenas quando a
+    fila fica vazia, agrupando em uma única escrita as mensagens
+    registradas em sequência.
+    """
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        """
+        Retira a próxima mensagem da fila, gravando o buffer dos handlers
+        antes de aguardar novas mensagens.
+
+        Args:
+            block (bool): Aguarda uma mensagem se a fila estiver vazia.
+
+        Returns:
+            logging.LogRecord: A próxima mensagem da fila.
+        """
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            for handler in self.handlers:
+                handler.flush()
+            return self.queue.get(block)
+
+
+
+class RowSampler(logging.Filter):
+    """
+    Filtro das mensagens por fatura (marcadas com `row=True`), que são
+    geradas várias vezes por fatura no processamento das páginas.
+
+    Mantém uma a cada `sample_every` mensagens e, com `max_per_second`,
+    limita a quantidade de mensagens por segundo (token bucket). O Logger
+    consulta o filtro antes de criar a mensagem, de modo que as mensagens
+    descartadas não são enfileiradas e, quando os valores são informados
+    como argumentos (`logger.info('Fatura %s', id_fatura, row=True)`), não
+    são formatadas. Mensagens que não são por fatura nunca são
+    descartadas.
+
+    Attributes:
+        sample_every (int): Mantém uma a cada N mensagens por fatura.
+        max_per_second (float | None): Limite de mensagens por segundo.
+        suppressed (int): Quantidade de mensagens descartadas.
+    """
+
+    def __init__(self, sample_every: int = 1, max_per_second: float = None):
+        """
+        Inicializa o filtro.
+
+        Args:
+            sample_every (int): Mantém uma a cada N mensagens por fatura.
+            max_per_second (float, opcional): Limite de mensagens por
+            fatura por segundo.
+        """
+        super().__init__()
+        self.sample_every = max(1, int(sample_every))
+        self.max_per_second = max_per_second
+        self.suppressed = 0
+        self._count = 0
+        self._tokens = max_per_second or 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """
+        Decide se uma mensagem deve ser registrada.
+
+        Args:
+            record (logging.LogRecord): A mensagem de log.
+
+        Returns:
+            bool: True se a mensagem deve ser registrada.
+        """
+        return not getattr(record, 'row', False) or self.allow()
+
+
+    def allow(self) -> bool:
+        """
+        Decide se a próxima mensagem por fatura deve ser registrada.
+
+        Returns:
+            bool: True se a mensagem deve ser registrada.
+        """
+        with self._lock:
+            self._count += 1
+            keep = (self._count - 1) % self.sample_every == 0
+            if keep and self.max_per_second:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.max_per_second,
+                    self._tokens + (now - self._updated) * self.max_per_second
+                )
+                self._updated = now
+                keep = self._tokens >= 1
+                if keep:
+                    self._tokens -= 1
+            if not keep:
+                self.suppressed += 1
+            return keep
 
-import logging
 
 
 class Logger:
+    """
+    Classe que gerencia os logs da aplicação em LOGS/<dd-mm-aaaa>.txt.
 
-    def __init__(self, directory_log=os.getcwd(), level_log=logging.INFO):
+    No modo assíncrono, as mensagens são colocadas em uma fila
+    (QueueHandler) e gravadas nos arquivos por uma thread em segundo
+    plano (QueueListener), retirando a escrita em disco das threads que
+    registram as mensagens. Opcionalmente, as mensagens também são
+    gravadas em JSON Lines (LOGS/<dd-mm-aaaa>.jsonl), e as mensagens por
+    fatura podem ser amostradas ou limitadas por segundo.
+
+    A configuração é feita na primeira instância de cada logger do
+    processo; as instâncias seguintes reaproveitam os mesmos handlers.
+    """
+
+    def __init__(
+            self,
+            directory_log=os.getcwd(),
+            level_log=logging.INFO,
+            asynchronous: bool = False,
+            json_lines: bool = False,
+            sample_every: int = 1,
+            max_rows_per_second: float = None,
+            name: str = 'AppLogger'
+        ):
         """
         Inicializador da classe de Log.
 
@@ -14,11 +287,22 @@ class Logger:
             _directory_log (str): Caminho onde será criado a pasta de logs.
             Por padrão será salvo na pasta do projeto.
             _level_log (Logging): Nível de log padrão. Será INFO.
+            asynchronous (bool): Grava os logs em uma thread em segundo
+            plano, através de uma fila.
+            json_lines (bool): Grava também os logs em JSON Lines.
+            sample_every (int): Mantém uma a cada N mensagens por fatura.
+            max_rows_per_second (float, opcional): Limite de mensagens por
+            fatura por segundo.
+            name (str): Nome do logger.
         """
         self._date = datetime.now().strftime('%d-%m-%Y')
         self._directory_log = directory_log
         self._level_log = level_log
-        self.logger = logging.getLogger('AppLogger')
+        self._asynchronous = asynchronous
+        self._json_lines = json_lines
+        self._sample_every = sample_every
+        self._max_rows_per_second = max_rows_per_second
+        self.logger = logging.getLogger(name)
         self._log_initializer()
 
 
@@ -30,8 +314,9 @@ class Logger:
         os handlers para o arquivo.
         """
         file_log = self._get_log_file()
-        if not self.logger.hasHandlers():
+        if not self.logger.handlers:
             self._configure_handlers(file_log)
+        self._sampler = _samplers.get(self.logger.name)
 
 
     def _makedir_directory_log(self) -> str:
@@ -46,7 +331,7 @@ class Logger:
         dir_log = os.path.join(self._directory_log, 'LOGS')
         os.makedirs(dir_log, exist_ok=True)
         return dir_log
-    
+
 
     def _get_log_file(self) -> str:
         """
@@ -58,15 +343,16 @@ class Logger:
         path_name = self._makedir_directory_log()
         file_name = os.path.join(path_name, self._date + '.txt')
         return file_name
-    
+
 
     def _configure_handlers(self, file_log: str):
         """
-        Configura o logger para gravar logs em um arquivo e define o 
-        formato do log. 
-        Define um FileHandler para o arquivo de log e aplica o formato das
-        mensagens, que inclui a data, nível e mensagem de log. Também define o
-        nível de log para o handler.
+        Configura o logger para gravar logs em um arquivo e define o
+        formato do log.
+        Define um DailyFileHandler para o arquivo de log do dia e aplica o
+        formato das mensagens, que inclui a data, nível e mensagem de log.
+        Também define o nível de log para o handler. No modo assíncrono,
+        os handlers são executados por um QueueListener.
 
         Args:
             file_log (str): o nome do arquivo de log.
@@ -75,39 +361,132 @@ class Logger:
             '[%(asctime)s] %(levelname)s - %(message)s',
             datefmt='%d/%m/%Y %H:%M:%S'
         )
-    
-        file = logging.FileHandler(file_log, mode='a')
+
+        handlers = []
+        directory = os.path.dirname(file_log)
+        file = DailyFileHandler(directory, buffered=self._asynchronous)
         file.setLevel(self._level_log)
         file.setFormatter(format_log)
-        self.logger.addHandler(file)
+        handlers.append(file)
+        if self._json_lines:
+            json_file = DailyFileHandler(
+                directory, '.jsonl', buffered=self._asynchronous
+            )
+            json_file.setLevel(self._level_log)
+            json_file.setFormatter(JsonLinesFormatter())
+            handlers.append(json_file)
+
+        if self._sample_every > 1 or self._max_rows_per_second:
+            _samplers[self.logger.name] = RowSampler(
+                self._sample_every, self._max_rows_per_second
+            )
+
+        if self._asynchronous:
+            log_queue = queue.SimpleQueue()
+            listener = BatchQueueListener(
+                log_queue, *handlers, respect_handler_level=True
+            )
+            listener.start()
+            _listeners[self.logger.name] = listener
+            atexit.register(self.shutdown)
+            handlers = [RecordQueueHandler(log_queue)]
+
+        for handler in handlers:
+            self.logger.addHandler(handler)
         self.logger.setLevel(self._level_log)
 
 
-    def info(self, message: str):
+    def _log(
+            self, level: int, message: str, args: tuple, row: bool,
+            fields: dict
+        ):
+        """
+        Registra uma mensagem, com a marcação de mensagem por fatura e os
+        campos adicionais da saída em JSON Lines. As mensagens por fatura
+        descartadas pela amostragem não chegam a ser criadas, e os
+        argumentos são aplicados à mensagem (formatação com '%') apenas
+        quando ela é gravada.
+        """
+        if row and self._sampler is not None and not self._sampler.allow():
+            return
+        if self.logger.isEnabledFor(level):
+            self.logger.log(
+                level, message, *args, extra={'row': row, 'fields': fields}
+            )
+
+
+    def info(self, message: str, *args, row: bool = False, **fields):
         """
         Escreve uma mensagem de nível info no arquivo de log.
 
         Args:
             message (str): Mensagem a ser escrita no arquivo.
+            *args: Valores da mensagem (formatação com '%'), aplicados
+            apenas se a mensagem for gravada.
+            row (bool): Indica uma mensagem por fatura, sujeita à
+            amostragem e ao limite por segundo.
+            **fields: Campos adicionais da saída em JSON Lines.
         """
-        self.logger.info(message)
-    
+        self._log(logging.INFO, message, args, row, fields)
+
 
-    def alert(self, message: str):
+    def alert(self, message: str, *args, row: bool = False, **fields):
         """
         Escreve uma mensagem de nível warning no arquivo de log.
 
         Args:
             message (str): Mensagem a ser escrita no arquivo.
+            *args: Valores da mensagem (formatação com '%').
+            row (bool): Indica uma mensagem por fatura.
+            **fields: Campos adicionais da saída em JSON Lines.
         """
-        self.logger.warning(message)
-    
+        self._log(logging.WARNING, message, args, row, fields)
 
-    def error(self, message: str):
+
+    def error(self, message: str, *args, row: bool = False, **fields):
         """
         Escreve uma mensagem de nível erro no arquivo de log.
 
         Args:
             message (str): Mensagem a ser escrita no arquivo.
+            *args: Valores da mensagem (formatação com '%').
+            row (bool): Indica uma mensagem por fatura.
+            **fields: Campos adicionais da saída em JSON Lines.
+        """
+        self._log(logging.ERROR, message, args, row, fields)
+
+
+    def flush(self):
+        """
+        Aguarda a gravação das mensagens já enfileiradas, no modo
+        assíncrono, e grava o buffer dos arquivos de log.
+        """
+        handlers = self.logger.handlers
+        listener = _listeners.get(self.logger.name)
+        if listener is not None:
+            if listener._thread is not None:
+                listener.stop()
+                listener.start()
+            handlers = listener.handlers
+        for handler in handlers:
+            handler.flush()
+
+
+    def shutdown(self):
+        """
+        Registra a quantidade de mensagens por fatura descartadas pela
+        amostragem e encerra a thread de gravação do modo assíncrono,
+        gravando as mensagens pendentes.
         """
-        self.logger.error(message)
\ No newline at end of file
+        sampler = self._sampler
+        if sampler is not None and sampler.suppressed:
+            self.info(
+                f'{sampler.suppressed} mensagem(ns) por fatura não '
+                f'registrada(s) pela amostragem dos logs.'
+            )
+            sampler.suppressed = 0
+        listener = _listeners.get(self.logger.name)
+        if listener is not None and listener._thread is not None:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.flush()
@@ -0,0 +1,516 @@
+import bisect
+from contextlib import contextmanager
+import json
+import math
+import os
+import threading
+import time
+from typing import Dict, Iterator, Tuple
+
+
+# Limites (em segundos) dos intervalos dos histogramas de latência.
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+# Métricas da automação: tipo e descrição de cada uma.
+DEFINITIONS = {
+    'rows_scanned_total': (
+        'counter', 'Linhas lidas da tabela do site.'
+    ),
+    'rows_accepted_total': (
+        'counter', 'Linhas com data menor ou igual a data de hoje.'
+    ),
+    'invoices_downloaded_total': (
+        'counter', 'Faturas baixadas.'
+    ),
+    'invoices_skipped_total': (
+        'counter', 'Faturas já emitidas anteriormente, sem novo download.'
+    ),
+    'download_failures_total': (
+        'counter', 'Downloads de faturas enviados para a fila de falhas.'
+    ),
+    'dlq_retries_total': (
+        'counter', 'Novas tentativas de download da fila de falhas.'
+    ),
+    'http_requests_total': (
+        'counter', 'Requisições HTTP por código de status.'
+    ),
+    'download_bytes_total': (
+        'counter',
+        'Bytes baixados, pelo requests (http) ou pelo navegador (browser).'
+    ),
+    'browser_responses_total': (
+        'counter',
+        'Respostas já recebidas pelo navegador, sem nova requisição HTTP.'
+    ),
+    'csv_rows_total': (
+        'counter', 'Linhas adicionadas nos arquivos CSV.'
+    ),
+    'browser_restarts_total': (
+        'counter', 'Reinícios do navegador pela política de reciclagem.'
+    ),
+    'state_retries_total': (
+        'counter', 'Novas tentativas dos estados após uma falha.'
+    ),
+    'http_request_seconds': (
+        'histogram', 'Duração das requisições HTTP.'
+    ),
+    'browser_seconds': (
+        'histogram', 'Duração das operações no navegador.'
+    ),
+    'csv_write_seconds': (
+        'histogram', 'Duração da gravação dos arquivos CSV.'
+    ),
+    'state_seconds': (
+        'histogram',
+        'Duração de cada execução dos estados (no PROCESS, uma página).'
+    ),
+    'init_task_seconds': (
+        'histogram', 'Duração de cada etapa do estado INITIALIZATION.'
+    ),
+    'browser_rss_bytes': (
+        'gauge', 'Memória residente do navegador na última página.'
+    ),
+    'browser_rss_peak_bytes': (
+        'gauge', 'Maior memória residente do navegador na execução.'
+    ),
+    'dlq_pending': (
+        'gauge', 'Faturas pendentes na fila de falhas ao final da execução.'
+    ),
+    'run_success': (
+        'gauge', '1 se a última execução foi concluída com sucesso.'
+    ),
+    'run_duration_seconds': (
+        'gauge', 'Duração da última execução.'
+    ),
+    'run_rows_per_second': (
+        'gauge', 'Linhas lidas por segundo na última execução.'
+    ),
+    'run_timestamp_seconds': (
+        'gauge', 'Horário (epoch) do fim da última execução.'
+    ),
+    'time_to_first_row_seconds': (
+        'gauge', 'Tempo do início da execução até a primeira linha lida.'
+    ),
+}
+
+
+
+class MetricsRegistry:
+    """
+    Registro das métricas da automação: contadores, medidores (gauges) e
+    histogramas de latência, com rótulos opcionais.
+
+    As métricas podem ser exportadas no formato texto do Prometheus ou
+    como um resumo em JSON, com a quantidade, a soma e os percentis
+    aproximados de cada histograma. As operações são protegidas por um
+    lock, permitindo o registro a partir de várias threads (como a
+    thread de novas tentativas da fila de falhas).
+
+    Attributes:
+        prefix (str): Prefixo dos nomes das métricas no Prometheus.
+        buckets (Tuple[float]): Limites dos intervalos dos histogramas.
+    """
+
+    def __init__(
+            self,
+            prefix: str = 'rpa',
+            definitions: dict = None,
+            buckets: Tuple[float] = DEFAULT_BUCKETS
+        ):
+        """
+        Inicializa o registro das métricas.
+
+        Args:
+            prefix (str): Prefixo dos nomes das métricas.
+            definitions (dict, opcional): Tipo e descrição por métrica.
+            buckets (Tuple[float]): Limites dos intervalos dos histogramas.
+        """
+        self.prefix = prefix
+        self.buckets = tuple(buckets)
+        self._definitions = dict(definitions or {})
+        self._values: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+
+    def reset(self):
+        """
+        Remove os valores registrados, mantendo as definições. É chamado
+        no início de cada execução.
+        """
+        with self._lock:
+            self._values = {}
+
+
+    def _series(self, name: str, kind: str, labels: dict) -> Tuple:
+        """
+        Retorna a chave da série de uma métrica, validando o tipo.
+
+        Args:
+            name (str): Nome da métrica.
+            kind (str): Tipo esperado (counter, gauge ou histogram).
+            labels (dict): Rótulos da série.
+
+        Returns:
+            Tuple: Rótulos ordenados, utilizados como chave da série.
+
+        Raises:
+            ValueError: Se a métrica estiver definida com outro tipo.
+        """
+        defined = self._definitions.setdefault(name, (kind, ''))[0]
+        if defined != kind:
+            raise ValueError(f'A métrica {name} é do tipo {defined}.')
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+    def increment(self, name: str, value: float = 1, **labels):
+        """
+        Incrementa um contador.
+
+        Args:
+            name (str): Nome da métrica.
+            value (float): Valor a ser somado.
+            **labels: Rótulos da série.
+        """
+        with self._lock:
+            series = self._series(name, 'counter', labels)
+            values = self._values.setdefault(name, {})
+            values[series] = values.get(series, 0) + value
+
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """
+        Define o valor de um medidor.
+
+        Args:
+            name (str): Nome da métrica.
+            value (float): Valor atual.
+            **labels: Rótulos da série.
+        """
+        with self._lock:
+            series = self._series(name, 'gauge', labels)
+            self._values.setdefault(name, {})[series] = value
+
+
+    def observe(self, name: str, value: float, **labels):
+        """
+        Registra uma medida (por exemplo, uma duração em segundos) em um
+        histograma.
+
+        Args:
+            name (str): Nome da métrica.
+            value (float): Valor medido.
+            **labels: Rótulos da série.
+        """
+        with self._lock:
+            series = self._series(name, 'histogram', labels)
+            histogram = self._values.setdefault(name, {}).get(series)
+            if histogram is None:
+                histogram = {
+                    'counts': [0] * (len(self.buckets) + 1),
+                    'sum': 0.0,
+                    'count': 0,
+                }
+                self._values[name][series] = histogram
+            histogram['counts'][bisect.bisect_left(self.buckets, value)] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[None]:
+        """
+        Mede a duração de um bloco e a registra em um histograma, mesmo
+        que o bloco gere uma exceção.
+
+        Args:
+            name (str): Nome da métrica.
+            **labels: Rótulos da série.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+
+    def value(self, name: str, **labels) -> float:
+        """
+        Retorna o valor de um contador ou medidor, ou a quantidade de
+        medidas de um histograma.
+
+        Args:
+            name (str): Nome da métrica.
+            **labels: Rótulos da série.
+
+        Returns:
+            float: O valor da série, ou 0 se não houver registros.
+        """
+        series = tuple(sorted((key, str(value)) for key, value in labels.items()))
+        with self._lock:
+            current = self._values.get(name, {}).get(series, 0)
+        return current['count'] if isinstance(current, dict) else current
+
+
+    def total(self, name: str) -> float:
+        """
+        Soma os valores de todas as séries de um contador.
+
+        Args:
+            name (str): Nome da métrica.
+
+        Returns:
+            float: A soma das séries.
+        """
+        with self._lock:
+            return sum(self._values.get(name, {}).values())
+
+
+    def _quantile(self, histogram: dict, quantile: float) -> float | None:
+        """
+        Estima um percentil de um histograma por interpolação linear
+        dentro do intervalo em que ele se encontra.
+
+        Args:
+            histogram (dict): Contagens, soma e quantidade do histograma.
+            quantile (float): Percentil entre 0 e 1.
+
+        Returns:
+            float | None: O percentil estimado, ou None sem medidas.
+        """
+        if not histogram['count']:
+            return None
+        rank = quantile * histogram['count']
+        cumulative = 0
+        for index, count in enumerate(histogram['counts']):
+            if count and cumulative + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+
+    def to_dict(self) -> dict:
+        """
+        Gera o resumo das métricas registradas.
+
+        Returns:
+            dict: Para cada métrica, o tipo, a descrição e as séries com
+            os rótulos e o valor; nos histogramas, a quantidade, a soma, a
+            média e os percentis 50, 95 e 99 aproximados.
+        """
+        summary = {}
+        with self._lock:
+            for name, values in sorted(self._values.items()):
+                kind, description = self._definitions[name]
+                series = []
+                for labels, value in values.items():
+                    item = {'labels': dict(labels)}
+                    if kind == 'histogram':
+                        item.update({
+                            'count': value['count'],
+                            'sum': value['sum'],
+                            'mean': value['sum'] / value['count'],
+                            'p50': self._quantile(value, 0.50),
+                            'p95': self._quantile(value, 0.95),
+                            'p99': self._quantile(value, 0.99),
+                        })
+                    else:
+                        item['value'] = value
+                    series.append(item)
+                summary[name] = {
+                    'type': kind, 'help': description, 'series': series
+                }
+        return summary
+
+
+    def to_prometheus(self) -> str:
+        """
+        Gera as métricas no formato texto do Prometheus (versão 0.0.4).
+
+        Returns:
+            str: As métricas com as linhas HELP e TYPE de cada uma.
+        """
+        lines = []
+        with self._lock:
+            for name, values in sorted(self._values.items()):
+                kind, description = self._definitions[name]
+                full_name = f'{self.prefix}_{name}' if self.prefix else name
+                lines.append(f'# HELP {full_name} {_escape(description)}')
+                lines.append(f'# TYPE {full_name} {kind}')
+                for labels, value in sorted(values.items()):
+                    if kind != 'histogram':
+                        lines.append(
+                            f'{full_name}{_labels(labels)} {_number(value)}'
+                        )
+                        continue
+                    cumulative = 0
+                    bounds = [*map(_number, self.buckets), '+Inf']
+                    for bound, count in zip(bounds, value['counts']):
+                        cumulative += count
+                        lines.append(
+                            f'{full_name}_bucket'
+                            f'{_labels(labels + (("le", bound),))} '
+                            f'{cumulative}'
+                        )
+                    lines.append(
+                        f'{full_name}_sum{_labels(labels)} '
+                        f'{_number(value["sum"])}'
+                    )
+                    lines.append(
+                        f'{full_name}_count{_labels(labels)} {value["count"]}'
+                    )
+        return '\n'.join(lines) + '\n'
+
+
+    def write_files(
+            self, file_prometheus: str, file_json: str, summary: dict = None
+        ):
+        """
+        Grava as métricas no formato do Prometheus e em JSON.
+
+        Args:
+            file_prometheus (str): Caminho do arquivo no formato texto
+            do Prometheus.
+            file_json (str): Caminho do resumo em JSON.
+            summary (dict, opcional): Dados adicionais do resumo, como a
+            vazão da execução.
+        """
+        for file in (file_prometheus, file_json):
+            os.makedirs(os.path.dirname(file) or '.', exist_ok=True)
+        with open(file_prometheus, 'w', encoding='utf-8') as file:
+            file.write(self.to_prometheus())
+        content = dict(summary or {})
+        content['metrics'] = self.to_dict()
+        with open(file_json, 'w', encoding='utf-8') as file:
+            json.dump(content, file, ensure_ascii=False, indent=4)
+
+
+
+def _escape(text: str) -> str:
+    """Escapa um texto para as descrições e rótulos do Prometheus."""
+    return (
+        text.replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+    )
+
+
+def _labels(labels: Tuple) -> str:
+    """Formata os rótulos de uma série no formato do Prometheus."""
+    if not labels:
+        return ''
+    return '{' + ','.join(
+        f'{key}="{_escape(value)}"' for key, value in labels
+    ) + '}'
+
+
+def _number(value: float) -> str:
+    """Formata um valor no formato do Prometheus."""
+    if not isinstance(value, float):
+        return str(value)
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+
+class MetricsServer:
+    """
+    Servidor HTTP local que expõe as métricas de um registro, utilizado
+    no modo serviço: '/metrics' no formato do Prometheus e
+    '/metrics.json' com o resumo em JSON.
+
+    Attributes:
+        registry (MetricsRegistry): Registro das métricas expostas.
+        host (str): Endereço do servidor.
+        port (int): Porta do servidor (definida pelo sistema se for 0).
+    """
+
+    def __init__(
+            self, registry: MetricsRegistry, port: int,
+            host: str = '127.0.0.1'
+        ):
+        """
+        Cria o servidor, sem iniciá-lo.
+
+        Args:
+            registry (MetricsRegistry): Registro das métricas expostas.
+            port (int): Porta do servidor. Com 0, uma porta livre é
+            escolhida pelo sistema.
+            host (str): Endereço do servidor. Por padrão, apenas a
+            máquina local.
+        """
+        from http.server import ThreadingHTTPServer
+
+        self.registry = registry
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = None
+
+
+    def _handler(self) -> type:
+        """
+        Cria a classe que responde às requisições do servidor.
+
+        Returns:
+            type: Subclasse de BaseHTTPRequestHandler.
+        """
+        from http.server import BaseHTTPRequestHandler
+
+        registry = self.registry
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                if path == '/metrics':
+                    body = registry.to_prometheus().encode('utf-8')
+                    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+                elif path == '/metrics.json':
+                    body = json.dumps(
+                        registry.to_dict(), ensure_ascii=False
+                    ).encode('utf-8')
+                    content_type = 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return MetricsHandler
+
+
+    def start(self):
+        """
+        Inicia o servidor em uma thread em segundo plano.
+        """
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name='MetricsServer',
+            daemon=True
+        )
+        self._thread.start()
+
+
+    def stop(self):
+        """
+        Encerra o servidor e libera a porta.
+        """
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+
+# Registro das métricas da automação, compartilhado pelos gerenciadores.
+REGISTRY = MetricsRegistry(definitions=DEFINITIONS)
@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+
+class OcrCache:
+    """
+    Classe que gerencia o cache dos resultados de OCR das faturas.
+
+    Os resultados são armazenados em um banco SQLite local, indexados
+    pelo hash SHA-256 do conteúdo da imagem e pela versão do motor de
+    OCR (incluindo sua configuração). Assim, a mesma fatura baixada em
+    execuções diferentes, em diretórios diferentes, não precisa passar
+    novamente pelo reconhecimento, e uma mudança no motor ou na
+    configuração invalida automaticamente os resultados anteriores.
+
+    O cache possui um limite de entradas; ao ultrapassá-lo, as entradas
+    acessadas há mais tempo são removidas.
+
+    A conexão pode ser utilizada por threads diferentes da que criou o
+    cache (por exemplo, quando o cache é criado em uma etapa paralela da
+    inicialização e consultado no processamento), com as operações
+    protegidas por um lock.
+
+    Attributes:
+        file (str): Caminho do arquivo do banco SQLite.
+        engine_version (str): Versão do motor de OCR e de sua
+        configuração.
+        max_entries (int): Quantidade máxima de entradas no cache.
+        hits (int): Quantidade de consultas encontradas no cache.
+        misses (int): Quantidade de consultas não encontradas no cache.
+        seconds_saved (float): Tempo de reconhecimento economizado
+        pelas consultas encontradas no cache.
+    """
+
+    def __init__(
+            self, file: str, engine_version: str, max_entries: int = 50000
+        ):
+        """
+        Inicializa o cache, criando o banco SQLite caso não exista.
+
+        Args:
+            file (str): Caminho do arquivo do banco SQLite.
+            engine_version (str): Versão do motor de OCR e de sua
+            configuração.
+            max_entries (int): Quantidade máxima de entradas no cache.
+        """
+        self.file = file
+        self.engine_version = engine_version
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+        os.makedirs(os.path.dirname(file) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(file, check_same_thread=False)
+        self._create_table()
+
+
+    def _create_table(self):
+        """
+        Cria a tabela do cache e o índice de último acesso.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS ocr_cache ('
+                ' image_hash TEXT NOT NULL,'
+                ' engine TEXT NOT NULL,'
+                ' fields TEXT NOT NULL,'
+                ' seconds REAL NOT NULL,'
+                ' last_access REAL NOT NULL,'
+                ' PRIMARY KEY (image_hash, engine))'
+            )
+            self._connection.execute(
+                'CREATE INDEX IF NOT EXISTS ocr_cache_last_access '
+                'ON ocr_cache (last_access)'
+            )
+
+
+    @staticmethod
+    def hash_file(path_file: str, chunk_size: int = 1024 * 1024) -> str:
+        """
+        Gera o hash SHA-256 do conteúdo de um arquivo.
+
+        Args:
+            path_file (str): Caminho do arquivo.
+            chunk_size (int): Tamanho dos blocos lidos do arquivo.
+
+        Returns:
+            str: Hash SHA-256 do conteúdo.
+        """
+        digest = hashlib.sha256()
+        with open(path_file, 'rb') as file:
+            for chunk in iter(lambda: file.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+
+    def get(self, image_hash: str) -> dict | None:
+        """
+        Consulta o resultado de OCR de uma imagem.
+
+        Args:
+            image_hash (str): Hash do conteúdo da imagem.
+
+        Returns:
+            dict | None: Os campos extraídos, ou None se a imagem não
+            estiver no cache.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT fields, seconds FROM ocr_cache '
+                'WHERE image_hash = ? AND engine = ?',
+                (image_hash, self.engine_version)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            with self._connection:
+                self._connection.execute(
+                    'UPDATE ocr_cache SET last_access = ? '
+                    'WHERE image_hash = ? AND engine = ?',
+                    (time.time(), image_hash, self.engine_version)
+                )
+            self.hits += 1
+            self.seconds_saved += row[1]
+        return json.loads(row[0])
+
+
+    def put(self, image_hash: str, fields: dict, seconds: float):
+        """
+        Armazena o resultado de OCR de uma imagem.
+
+        Args:
+            image_hash (str): Hash do conteúdo da imagem.
+            fields (dict): Campos extraídos da imagem.
+            seconds (float): Tempo gasto no reconhecimento da imagem.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO ocr_cache '
+                '(image_hash, engine, fields, seconds, last_access) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (
+                    image_hash,
+                    self.engine_version,
+                    json.dumps(fields, ensure_ascii=False),
+                    seconds,
+                    time.time(),
+                )
+            )
+            self._evict()
+
+
+    def _evict(self):
+        """
+        Remove as entradas acessadas há mais tempo quando o cache
+        ultrapassa a quantidade máxima de entradas.
+        """
+        total = self._connection.execute(
+            'SELECT COUNT(*) FROM ocr_cache'
+        ).fetchone()[0]
+        excess = total - self.max_entries
+        if excess > 0:
+            self._connection.execute(
+                'DELETE FROM ocr_cache WHERE rowid IN ('
+                ' SELECT rowid FROM ocr_cache'
+                ' ORDER BY last_access ASC LIMIT ?)',
+                (excess,)
+            )
+
+
+    def __len__(self) -> int:
+        """
+        Retorna a quantidade de entradas no cache.
+        """
+        with self._lock:
+            return self._connection.execute(
+                'SELECT COUNT(*) FROM ocr_cache'
+            ).fetchone()[0]
+
+
+    def stats(self) -> dict:
+        """
+        Retorna as estatísticas de uso do cache na execução atual.
+
+        Returns:
+            dict: Acertos, falhas, taxa de acerto e tempo economizado
+            em segundos.
+        """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': self.hits / total if total else 0.0,
+            'seconds_saved': self.seconds_saved,
+        }
+
+
+    def close(self):
+        """
+        Fecha a conexão com o banco SQLite.
+        """
+        with self._lock:
+            self._connection.close()
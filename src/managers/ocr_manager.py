@@ -0,0 +1,471 @@
+from concurrent.futures import Future, ProcessPoolExecutor
+import hashlib
+import multiprocessing
+import os
+import re
+import shutil
+import subprocess
+import time
+from typing import Dict, List, Tuple
+
+from src.managers.image_loader import PNG_SIGNATURE, PngDecoder, encode_png
+from src.managers.image_preprocessing import preprocess
+from src.managers.ocr_cache import OcrCache
+
+
+
+# Versão das regras de extração dos campos. Deve ser incrementada sempre que
+# `extract_invoice_fields` mudar, invalidando os resultados em cache.
+FIELDS_VERSION = 1
+
+# Decodificador de PNG de cada processo do pool, reaproveitando seus buffers
+# entre as imagens processadas pelo mesmo processo.
+_png_decoder = PngDecoder()
+
+
+def available_cores() -> int:
+    """
+    Retorna a quantidade de núcleos de CPU disponíveis para o processo.
+
+    Considera a afinidade de CPU do processo quando suportada pelo
+    sistema (por exemplo, em contêineres com CPUs limitadas).
+
+    Returns:
+        int: Quantidade de núcleos disponíveis, no mínimo 1.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+def extract_invoice_fields(text: str) -> Dict[str, str]:
+    """
+    Extrai os campos da fatura do texto reconhecido pelo OCR.
+
+    Os campos extraídos são o número da fatura ('Invoice #'), a empresa
+    emissora (primeira linha do documento) e o valor total (linha
+    'Total', ignorando 'Subtotal').
+
+    Args:
+        text (str): Texto reconhecido na imagem da fatura.
+
+    Returns:
+        Dict[str, str]: Dicionário com as chaves 'NUMERO_NOTA', 'EMPRESA'
+        e 'VALOR_TOTAL'. Campos não encontrados ficam com string vazia.
+    """
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+
+    company = ''
+    if lines:
+        company = re.sub(r'\s*INVOICE\s*$', '', lines[0], flags=re.I)
+
+    number = ''
+    match_number = re.search(r'Invoice\s*#\s*([A-Za-z0-9-]+)', text, re.I)
+    if match_number:
+        number = match_number.group(1)
+
+    total = ''
+    for line in lines:
+        match_total = re.match(
+            r'^Total\b[^0-9\n]*([0-9][0-9.,]*)\s*$', line, re.I
+        )
+        if match_total:
+            total = match_total.group(1).replace(',', '')
+
+    return {'NUMERO_NOTA': number, 'EMPRESA': company, 'VALOR_TOTAL': total}
+
+
+
+class TesseractEngine:
+    """
+    Motor de OCR local que utiliza o executável do Tesseract, sem
+    nenhuma chamada a serviços externos.
+
+    O executável é chamado através de subprocess, não sendo necessária
+    nenhuma biblioteca Python adicional.
+
+    Attributes:
+        executable (str): Nome ou caminho do executável do Tesseract.
+        language (str): Idioma utilizado no reconhecimento.
+        psm (int): Modo de segmentação de página do Tesseract.
+        timeout (int): Tempo máximo em segundos por imagem.
+        preprocess (bool): Aplica o pré-processamento (binarização,
+        remoção de ruído, correção da inclinação e recorte) nas imagens
+        PNG antes do reconhecimento.
+    """
+
+    def __init__(
+            self,
+            executable: str = 'tesseract',
+            language: str = 'eng',
+            psm: int = 6,
+            timeout: int = 60,
+            preprocess: bool = False
+        ):
+        """
+        Inicializa o motor de OCR.
+
+        Args:
+            executable (str): Nome ou caminho do executável do Tesseract.
+            language (str): Idioma utilizado no reconhecimento.
+            psm (int): Modo de segmentação de página do Tesseract.
+            timeout (int): Tempo máximo em segundos por imagem.
+            preprocess (bool): Aplica o pré-processamento nas imagens PNG.
+        """
+        self.executable = executable
+        self.language = language
+        self.psm = psm
+        self.timeout = timeout
+        self.preprocess = preprocess
+        self._version = None
+
+
+    def is_available(self) -> bool:
+        """
+        Verifica se o executável do Tesseract está instalado.
+
+        Returns:
+            bool: True se o executável foi encontrado.
+        """
+        return shutil.which(self.executable) is not None
+
+
+    def version(self) -> str:
+        """
+        Identifica a versão do motor e a configuração utilizada no
+        reconhecimento, utilizada como parte da chave do cache de OCR.
+
+        Returns:
+            str: Versão do Tesseract, idioma, modo de segmentação e versão
+            das regras de extração dos campos.
+        """
+        if self._version is None:
+            try:
+                result = subprocess.run(
+                    [self.executable, '--version'],
+                    capture_output=True,
+                    timeout=self.timeout
+                )
+                output = (result.stdout or result.stderr).decode(
+                    'utf-8', errors='replace'
+                )
+                engine_version = output.strip().splitlines()[0]
+            except (OSError, subprocess.TimeoutExpired, IndexError):
+                engine_version = self.executable
+            self._version = (
+                f'{engine_version}|{self.language}|psm{self.psm}'
+                f'|campos{FIELDS_VERSION}|pre{int(self.preprocess)}'
+            )
+        return self._version
+
+
+    @staticmethod
+    def _preprocessed_image(image: str | bytes) -> bytes | None:
+        """
+        Aplica o pré-processamento em uma imagem PNG.
+
+        Args:
+            image (str | bytes): Caminho ou conteúdo da imagem.
+
+        Returns:
+            bytes | None: A imagem pré-processada em PNG, ou None se a
+            imagem não estiver no formato PNG.
+        """
+        data = image
+        if isinstance(image, str):
+            with open(image, 'rb') as file:
+                data = file.read()
+        if not data.startswith(PNG_SIGNATURE):
+            return None
+        gray = _png_decoder.decode(data, grayscale=True)
+        return encode_png(preprocess(gray)['image'], compress_level=1)
+
+
+    def recognize(self, image: str | bytes) -> str:
+        """
+        Reconhece o texto de uma imagem. Com o pré-processamento
+        habilitado, imagens PNG são pré-processadas e enviadas ao
+        Tesseract pela entrada padrão; as demais são enviadas sem
+        alteração. Imagens informadas pelo conteúdo (por exemplo, lidas
+        de um pacote de imagens) são sempre enviadas pela entrada padrão.
+
+        Args:
+            image (str | bytes): Caminho ou conteúdo da imagem.
+
+        Returns:
+            str: Texto reconhecido na imagem.
+
+        Raises:
+            Exception: Se o Tesseract retornar erro ou exceder o tempo
+            limite.
+        """
+        name = image if isinstance(image, str) else 'em memória'
+        data = None if isinstance(image, str) else bytes(image)
+        if self.preprocess:
+            data = self._preprocessed_image(data or image) or data
+        command = [
+            self.executable, 'stdin' if data else image, 'stdout',
+            '-l', self.language, '--psm', str(self.psm)
+        ]
+        try:
+            result = subprocess.run(
+                command,
+                input=data,
+                capture_output=True,
+                timeout=self.timeout,
+                check=True
+            )
+        except subprocess.CalledProcessError as error:
+            raise Exception(
+                f'Erro no OCR da imagem {name}: '
+                f'{error.stderr.decode(errors="replace").strip()}'
+            )
+        except subprocess.TimeoutExpired:
+            raise Exception(
+                f'Tempo limite excedido no OCR da imagem {name}.'
+            )
+        return result.stdout.decode('utf-8', errors='replace')
+
+
+def _recognize_invoice(engine, key: str, image: str | bytes) -> Tuple:
+    """
+    Executa o OCR de uma fatura em um processo do pool.
+
+    Args:
+        engine: Motor de OCR com o método `recognize`.
+        key (str): Identificador da fatura.
+        image (str | bytes): Caminho ou conteúdo da imagem da fatura.
+
+    Returns:
+        Tuple: O identificador, os campos extraídos e o tempo em
+        segundos gasto no reconhecimento.
+    """
+    start = time.perf_counter()
+    text = engine.recognize(image)
+    fields = extract_invoice_fields(text)
+    return key, fields, time.perf_counter() - start
+
+
+
+class OcrManager:
+    """
+    Classe que gerencia a etapa de OCR das faturas baixadas.
+
+    As imagens são enviadas para um pool de processos, dimensionado pela
+    quantidade de núcleos disponíveis, assim que o download termina,
+    permitindo que o OCR ocorra em paralelo com a navegação e os
+    downloads. Os resultados são coletados pela thread principal.
+
+    Quando um cache é fornecido, imagens com conteúdo já reconhecido
+    anteriormente pelo mesmo motor não são enviadas ao pool.
+
+    Attributes:
+        engine: Motor de OCR com o método `recognize`.
+        workers (int): Quantidade de processos do pool.
+        cache (OcrCache | None): Cache dos resultados de OCR.
+        results (Dict[str, dict]): Campos extraídos por fatura.
+        errors (Dict[str, str]): Erros de OCR por fatura.
+        timings (Dict[str, float]): Tempo de reconhecimento, em segundos,
+        de cada fatura reconhecida pelo pool.
+        not_preprocessed (int): Imagens enviadas ao OCR sem o
+        pré-processamento habilitado no motor, por não estarem no
+        formato PNG.
+    """
+
+    def __init__(
+            self, engine=None, workers: int = None, cache: OcrCache = None
+        ):
+        """
+        Inicializa o gerenciador de OCR.
+
+        Args:
+            engine (opcional): Motor de OCR. Por padrão TesseractEngine.
+            workers (int, opcional): Quantidade de processos do pool.
+            Por padrão utiliza todos os núcleos disponíveis.
+            cache (OcrCache, opcional): Cache dos resultados de OCR.
+        """
+        self.engine = engine or TesseractEngine()
+        self.workers = workers or available_cores()
+        self.cache = cache
+        self.results: Dict[str, dict] = {}
+        self.errors: Dict[str, str] = {}
+        self.timings: Dict[str, float] = {}
+        self.not_preprocessed = 0
+        self._futures: Dict[Future, Tuple[str, str | None]] = {}
+        self._cached: List[Tuple[str, dict]] = []
+        self._executor = None
+        self._start = None
+        self._end = None
+        self._recognized = 0
+        self._recognition_seconds = 0.0
+
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        Cria o pool de processos na primeira utilização.
+
+        Utiliza o método 'forkserver' quando disponível, evitando copiar
+        para os processos do pool as threads e conexões do processo
+        principal.
+
+        Returns:
+            ProcessPoolExecutor: O pool de processos.
+        """
+        if self._executor is None:
+            methods = multiprocessing.get_all_start_methods()
+            method = 'forkserver' if 'forkserver' in methods else 'spawn'
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(method)
+            )
+        return self._executor
+
+
+    @staticmethod
+    def _is_png(image: str | bytes) -> bool:
+        """
+        Verifica se uma imagem está no formato PNG, pela assinatura.
+
+        Args:
+            image (str | bytes): Caminho ou conteúdo da imagem da fatura.
+
+        Returns:
+            bool: True se a imagem for um PNG.
+        """
+        if not isinstance(image, str):
+            return bytes(image[:8]) == PNG_SIGNATURE
+        try:
+            with open(image, 'rb') as file:
+                return file.read(8) == PNG_SIGNATURE
+        except OSError:
+            return False
+
+
+    @staticmethod
+    def _hash_image(image: str | bytes) -> str | None:
+        """
+        Gera o hash do conteúdo de uma imagem para consulta no cache.
+
+        Args:
+            image (str | bytes): Caminho ou conteúdo da imagem da fatura.
+
+        Returns:
+            str | None: O hash do conteúdo, ou None se a imagem não
+            puder ser lida.
+        """
+        if not isinstance(image, str):
+            return hashlib.sha256(image).hexdigest()
+        try:
+            return OcrCache.hash_file(image)
+        except OSError:
+            return None
+
+
+    def submit(self, key: str, image: str | bytes):
+        """
+        Envia uma imagem para o OCR, ou utiliza o resultado do cache
+        quando a imagem já foi reconhecida.
+
+        Args:
+            key (str): Identificador da fatura.
+            image (str | bytes): Caminho ou conteúdo da imagem da fatura.
+        """
+        if self._start is None:
+            self._start = time.perf_counter()
+        image_hash = None
+        if self.cache is not None:
+            image_hash = self._hash_image(image)
+            fields = self.cache.get(image_hash) if image_hash else None
+            if fields is not None:
+                self.results[key] = fields
+                self._cached.append((key, fields))
+                return
+        preprocess = getattr(self.engine, 'preprocess', False)
+        if preprocess and not self._is_png(image):
+            self.not_preprocessed += 1
+        future = self._get_executor().submit(
+            _recognize_invoice, self.engine, key, image
+        )
+        self._futures[future] = (key, image_hash)
+
+
+    def collect(self, wait: bool = False) -> List[Tuple[str, dict]]:
+        """
+        Coleta os resultados dos OCRs concluídos.
+
+        Args:
+            wait (bool): Aguarda a conclusão de todos os OCRs enviados.
+
+        Returns:
+            List[Tuple[str, dict]]: Identificador e campos extraídos de
+            cada fatura concluída desde a última coleta.
+        """
+        collected, self._cached = self._cached, []
+        for future in list(self._futures):
+            if not wait and not future.done():
+                continue
+            key, image_hash = self._futures.pop(future)
+            try:
+                key, fields, seconds = future.result()
+            except Exception as error:
+                self.errors[key] = str(error)
+                continue
+            self._recognized += 1
+            self._recognition_seconds += seconds
+            self.timings[key] = seconds
+            self.results[key] = fields
+            if image_hash is not None:
+                self.cache.put(image_hash, fields, seconds)
+            collected.append((key, fields))
+        if self._start is not None and not self._futures:
+            self._end = time.perf_counter()
+        return collected
+
+
+    def pending(self) -> int:
+        """
+        Retorna a quantidade de OCRs ainda em andamento.
+
+        Returns:
+            int: Quantidade de OCRs enviados e não coletados.
+        """
+        return len(self._futures)
+
+
+    def throughput(self) -> dict:
+        """
+        Calcula a vazão da etapa de OCR.
+
+        Returns:
+            dict: Quantidade de imagens, tempo total em segundos desde o
+            primeiro envio, imagens por segundo, tempo médio de
+            reconhecimento por imagem reconhecida (sem contar as
+            encontradas no cache) e quantidade de processos.
+        """
+        images = len(self.results) + len(self.errors)
+        seconds = 0.0
+        if self._start is not None:
+            seconds = (self._end or time.perf_counter()) - self._start
+        return {
+            'images': images,
+            'errors': len(self.errors),
+            'seconds': seconds,
+            'images_per_second': images / seconds if seconds else 0.0,
+            'seconds_per_image': (
+                self._recognition_seconds / self._recognized
+                if self._recognized else 0.0
+            ),
+            'workers': self.workers,
+        }
+
+
+    def shutdown(self):
+        """
+        Encerra o pool de processos, cancelando OCRs não iniciados, e
+        fecha o cache de OCR.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self.cache is not None:
+            self.cache.close()
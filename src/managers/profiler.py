@@ -0,0 +1,378 @@
+import cProfile
+from collections import Counter
+import functools
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+
+
+class SamplingProfiler:
+    """
+    Profiler por amostragem: uma thread em segundo plano registra, a cada
+    intervalo, a pilha de chamadas da thread observada enquanto ela está
+    em um estágio perfilado.
+
+    O custo é proporcional à quantidade de amostras, e não à quantidade
+    de chamadas de funções, permitindo o uso em execuções reais. As
+    pilhas são agregadas no formato 'folded' (uma linha por pilha com a
+    quantidade de amostras, a partir do nome do estágio), lido por
+    geradores de flame graph.
+
+    Attributes:
+        interval (float): Intervalo em segundos entre as amostras.
+        stacks (Counter): Quantidade de amostras por pilha de chamadas.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        """
+        Inicializa o profiler, sem iniciar a thread de amostragem.
+
+        Args:
+            interval (float): Intervalo em segundos entre as amostras.
+        """
+        self.interval = interval
+        self.stacks = Counter()
+        self._target = None
+        self._label = None
+        self._active = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+
+    def enable(self, label: str = None):
+        """
+        Passa a amostrar a thread atual, iniciando a thread de amostragem
+        na primeira chamada.
+
+        Args:
+            label (str, opcional): Nome do estágio, registrado na base das
+            pilhas amostradas.
+        """
+        self._target = threading.get_ident()
+        self._label = label
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name='SamplingProfiler', daemon=True
+            )
+            self._thread.start()
+        self._active.set()
+
+
+    def disable(self):
+        """
+        Interrompe a amostragem até a próxima chamada de `enable`.
+        """
+        self._active.clear()
+
+
+    def _run(self):
+        """
+        Laço da thread de amostragem.
+        """
+        while not self._stop.is_set():
+            self._active.wait()
+            if self._stop.is_set():
+                return
+            frame = sys._current_frames().get(self._target)
+            if frame is not None and self._active.is_set():
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(
+                        f'{code.co_name} ({os.path.basename(code.co_filename)}'
+                        f':{code.co_firstlineno})'
+                    )
+                    frame = frame.f_back
+                if self._label:
+                    stack.append(self._label)
+                self.stacks[';'.join(reversed(stack))] += 1
+            del frame
+            time.sleep(self.interval)
+
+
+    def close(self):
+        """
+        Encerra a thread de amostragem.
+        """
+        self._stop.set()
+        self._active.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+    def hotspots(self, top: int = 10) -> List[dict]:
+        """
+        Retorna as funções com mais amostras no topo da pilha.
+
+        Args:
+            top (int): Quantidade de funções.
+
+        Returns:
+            List[dict]: Função, amostras no topo da pilha (self), amostras
+            em qualquer posição da pilha (total) e o percentual do total
+            de amostras.
+        """
+        own = Counter()
+        inclusive = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')
+            own[frames[-1]] += count
+            for function in set(frames):
+                inclusive[function] += count
+        total = sum(self.stacks.values()) or 1
+        return [
+            {
+                'function': function,
+                'self': count,
+                'total': inclusive[function],
+                'percent': count / total * 100,
+            }
+            for function, count in own.most_common(top)
+        ]
+
+
+    def write_folded(self, file: str):
+        """
+        Grava as pilhas amostradas no formato 'folded'.
+
+        Args:
+            file (str): Caminho do arquivo.
+        """
+        with open(file, 'w', encoding='utf-8') as folded:
+            for stack, count in self.stacks.most_common():
+                folded.write(f'{stack} {count}\n')
+
+
+
+class Profiler:
+    """
+    Perfila a CPU e a memória dos estágios (estados) escolhidos de uma
+    execução.
+
+    Os estados são envolvidos com `wrap`. No modo 'cprofile', cada estado
+    tem um cProfile acumulado entre as execuções, gravado em
+    LOGS/<execução>_<estado>.pstats. No modo 'sampling', um profiler por
+    amostragem de baixo custo grava as pilhas em
+    LOGS/<execução>_amostras.folded. Com a memória habilitada, o
+    tracemalloc registra um snapshot ao final de cada execução do estado
+    (no PROCESS, a cada página), e as linhas que mais alocaram memória
+    desde o snapshot anterior são gravadas em LOGS/<execução>_memoria.txt.
+
+    Attributes:
+        directory (str): Diretório dos arquivos gerados (LOGS).
+        run (str): Identificação da execução, usada nos nomes dos
+        arquivos.
+        stages (List[str]): Estados perfilados.
+        mode (str): 'cprofile' ou 'sampling'.
+        memory (bool): Registra os snapshots do tracemalloc.
+        top (int): Quantidade de funções e linhas nos relatórios.
+    """
+
+    MODES = ('cprofile', 'sampling')
+
+    def __init__(
+            self,
+            directory: str,
+            run: str,
+            stages: List[str],
+            mode: str = 'cprofile',
+            memory: bool = False,
+            sample_interval: float = 0.005,
+            top: int = 10
+        ):
+        """
+        Inicializa o profiler.
+
+        Args:
+            directory (str): Diretório dos arquivos gerados.
+            run (str): Identificação da execução.
+            stages (List[str]): Estados perfilados.
+            mode (str): 'cprofile' ou 'sampling'.
+            memory (bool): Registra os snapshots do tracemalloc.
+            sample_interval (float): Intervalo entre as amostras do modo
+            'sampling'.
+            top (int): Quantidade de funções e linhas nos relatórios.
+
+        Raises:
+            ValueError: Se o modo não for suportado.
+        """
+        if mode not in self.MODES:
+            raise ValueError(
+                f'Modo de profiling inválido: {mode}. Utilize {self.MODES}.'
+            )
+        self.directory = directory
+        self.run = run
+        self.stages = list(stages)
+        self.mode = mode
+        self.memory = memory
+        self.top = top
+        self._cpu: Dict[str, Any] = {}
+        self._sampling = (
+            SamplingProfiler(sample_interval) if mode == 'sampling' else None
+        )
+        self._snapshot = None
+        self._memory_report = []
+        self._executions = Counter()
+        self._started_tracemalloc = False
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+
+    def wrap(self, stage: str, handler: Callable) -> Callable:
+        """
+        Envolve o handler de um estado com o profiler, se o estado
+        estiver entre os perfilados.
+
+        Args:
+            stage (str): Nome do estado.
+            handler (Callable): Função executada no estado.
+
+        Returns:
+            Callable: O handler perfilado, ou o próprio handler.
+        """
+        if stage not in self.stages:
+            return handler
+
+        @functools.wraps(handler)
+        def profiled(context):
+            self._executions[stage] += 1
+            if self._sampling is not None:
+                self._sampling.enable(stage)
+            else:
+                self._cpu.setdefault(stage, cProfile.Profile()).enable()
+            try:
+                return handler(context)
+            finally:
+                if self._sampling is not None:
+                    self._sampling.disable()
+                else:
+                    self._cpu[stage].disable()
+                if self.memory:
+                    self._take_snapshot(stage, context)
+
+        return profiled
+
+
+    def _take_snapshot(self, stage: str, context: Any):
+        """
+        Registra um snapshot do tracemalloc e as linhas que mais
+        alocaram memória desde o snapshot anterior.
+
+        Args:
+            stage (str): Estado executado.
+            context (Any): Contexto da execução, de onde é lida a página
+            atual da tabela, se houver.
+        """
+        if not tracemalloc.is_tracing():
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+        page_main = getattr(context, 'page_main', None)
+        page = getattr(page_main, 'current_page', None)
+        current, peak = tracemalloc.get_traced_memory()
+        title = f'{stage} #{self._executions[stage]}'
+        if page is not None:
+            title += f' (página {page})'
+        lines = [
+            f'== {title}: {current / 2 ** 20:.2f} MiB em uso, pico de '
+            f'{peak / 2 ** 20:.2f} MiB'
+        ]
+        if self._snapshot is not None:
+            statistics = snapshot.compare_to(self._snapshot, 'lineno')
+        else:
+            statistics = snapshot.statistics('lineno')
+        for statistic in statistics[:self.top]:
+            lines.append(f'   {statistic}')
+        self._memory_report.extend(lines)
+        self._snapshot = snapshot
+
+
+    def save(self) -> List[str]:
+        """
+        Grava os arquivos do profiling em `directory`.
+
+        Returns:
+            List[str]: Caminhos dos arquivos gravados.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        prefix = os.path.join(self.directory, self.run)
+        files = []
+        for stage, profile in self._cpu.items():
+            file = f'{prefix}_{stage}.pstats'
+            profile.dump_stats(file)
+            files.append(file)
+        if self._sampling is not None and self._sampling.stacks:
+            file = f'{prefix}_amostras.folded'
+            self._sampling.write_folded(file)
+            files.append(file)
+        if self._memory_report:
+            file = f'{prefix}_memoria.txt'
+            with open(file, 'w', encoding='utf-8') as report:
+                report.write('\n'.join(self._memory_report) + '\n')
+            files.append(file)
+        return files
+
+
+    def summary(self) -> List[str]:
+        """
+        Gera o resumo dos pontos mais custosos, para o log do END.
+
+        Returns:
+            List[str]: Uma linha por função (ou linha de código, na
+            memória) entre as mais custosas.
+        """
+        lines = []
+        for stage, profile in self._cpu.items():
+            stats = pstats.Stats(profile).stats
+            hotspots = sorted(
+                stats.items(), key=lambda item: item[1][2], reverse=True
+            )[:self.top]
+            lines.append(
+                f'Profiling do estado {stage} '
+                f'({self._executions[stage]} execução(ões)), maior tempo '
+                f'próprio:'
+            )
+            for (file, line, function), (_, calls, own, total, _) in hotspots:
+                lines.append(
+                    f'  {function} ({os.path.basename(file)}:{line}): '
+                    f'{own:.3f}s próprio, {total:.3f}s total, '
+                    f'{calls} chamada(s)'
+                )
+        if self._sampling is not None:
+            samples = sum(self._sampling.stacks.values())
+            lines.append(
+                f'Profiling por amostragem de {", ".join(self._executions)} '
+                f'({samples} amostra(s)), maior quantidade de amostras:'
+            )
+            for hotspot in self._sampling.hotspots(self.top):
+                lines.append(
+                    f'  {hotspot["function"]}: {hotspot["percent"]:.1f}% '
+                    f'próprio, {hotspot["total"]} amostra(s) no total'
+                )
+        if self.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            lines.append(
+                f'Memória rastreada: {current / 2 ** 20:.2f} MiB em uso, '
+                f'pico de {peak / 2 ** 20:.2f} MiB.'
+            )
+        return lines
+
+
+    def close(self):
+        """
+        Encerra a amostragem e o tracemalloc iniciado pelo profiler.
+        """
+        if self._sampling is not None:
+            self._sampling.close()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
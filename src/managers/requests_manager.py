@@ -1,5 +1,15 @@
 import os
-import requests
+import time
+from typing import List
+
+from src.managers.capture import CAPTURE, CaptureArchive
+from src.managers.lazy_module import LazyModule
+from src.managers.metrics import REGISTRY
+from src.managers.tracer import TRACER
+
+
+# O requests é importado apenas quando o primeiro RequestManager é criado.
+requests = LazyModule('requests')
 
 
 class RequestManager:
@@ -9,11 +19,15 @@ class RequestManager:
     Essa classe permite realizar requisições GET para URLs, facilitando o
     scraping de dados e a conversão de respostas em arquivos, como CSV.
     
-    Utiliza sessões para otimizar múltiplas requisições.
+    Utiliza sessões para otimizar múltiplas requisições. Com o acesso às
+    respostas do navegador (BrowserNetwork), o conteúdo que o navegador
+    já recebeu é reaproveitado, e a requisição HTTP fica como alternativa.
 
     Attributes:
         session (requests.Session): A sessão HTTP que mantém conexões
         persistentes.
+        browser_network (BrowserNetwork | None): Acesso às respostas
+        recebidas pelo navegador.
     """
 
     def __init__(self):
@@ -23,11 +37,18 @@ class RequestManager:
         Cria uma nova sessão requests para gerenciar as requisições HTTP.
         """
         self.session = requests.Session()
+        self.browser_network = None
 
     
-    def get(self, url: str) -> requests.Response:
+    def get(self, url: str) -> 'requests.Response':
         """
-        Realiza uma requisição GET para a URL especificada.
+        Realiza uma requisição GET para a URL especificada, registrando
+        nas métricas a duração, o código de status e os bytes recebidos.
+        Com a gravação habilitada, a resposta é gravada com a sua duração.
+
+        Se o navegador já recebeu a resposta da URL, ela é reaproveitada
+        sem uma nova requisição. Os seus bytes continuam nos bytes
+        baixados, com a origem 'browser' em vez de 'http'.
 
         Args:
             url (str): A URL para a qual a requisição será feita.
@@ -39,14 +60,121 @@ class RequestManager:
             Exception: Se a resposta não for bem-sucedida
             (código de status diferente de 200).
         """
-        response = self.session.get(url)
+        with (
+            TRACER.span('http_get', 'download', url=url),
+            REGISTRY.timer('http_request_seconds'),
+        ):
+            start = time.perf_counter()
+            response = self._fetch_from_browser(url)
+            from_browser = response is not None
+            if not from_browser:
+                response = self._fetch(url)
+            CAPTURE.record_response(
+                url, response.status_code, response.content,
+                time.perf_counter() - start,
+                response.headers.get('Content-Type')
+            )
+        if from_browser:
+            REGISTRY.increment(
+                'browser_responses_total', status=response.status_code
+            )
+        else:
+            REGISTRY.increment(
+                'http_requests_total', status=response.status_code
+            )
+        REGISTRY.increment(
+            'download_bytes_total', len(response.content),
+            source='browser' if from_browser else 'http'
+        )
         if response.status_code == 200:
             return response
         raise Exception(f'Erro: {response.status_code}')
 
 
+    def warm_up(self, url: str, timeout: float = 5.0) -> bool:
+        """
+        Abre antecipadamente uma conexão com o servidor da URL (DNS, TCP e
+        TLS), com uma requisição HEAD, mantendo-a no pool da sessão para o
+        primeiro download. Falhas são ignoradas: sem a conexão aquecida, o
+        primeiro download apenas abre a sua própria conexão.
+
+        Args:
+            url (str): URL do servidor das imagens.
+            timeout (float): Tempo máximo da requisição em segundos.
+
+        Returns:
+            bool: True se a conexão foi aberta.
+        """
+        with TRACER.span('warm_up', 'download', url=url):
+            try:
+                self.session.head(url, timeout=timeout)
+            except requests.RequestException:
+                return False
+        return True
+
+
+    def set_cookies(self, cookies: List[dict]):
+        """
+        Copia cookies (por exemplo, os do navegador, no formato do
+        Selenium) para a sessão HTTP, para que as requisições feitas fora
+        do navegador utilizem a mesma sessão do site.
+
+        Args:
+            cookies (List[dict]): Cookies com as chaves 'name' e 'value' e,
+            opcionalmente, 'domain', 'path', 'secure' e 'expiry'.
+        """
+        for cookie in cookies:
+            self.session.cookies.set(
+                cookie['name'], cookie['value'],
+                domain=cookie.get('domain', ''),
+                path=cookie.get('path', '/'),
+                secure=cookie.get('secure', False),
+                expires=cookie.get('expiry'),
+            )
+
+
+    def _fetch_from_browser(self, url: str) -> 'requests.Response | None':
+        """
+        Monta a resposta a partir do conteúdo já recebido pelo navegador.
+
+        Args:
+            url (str): A URL da requisição.
+
+        Returns:
+            requests.Response | None: A resposta do navegador, ou None se
+            o acesso às respostas do navegador não estiver habilitado ou o
+            navegador não tiver a resposta da URL.
+        """
+        if self.browser_network is None:
+            return None
+        with TRACER.span('browser_response', 'download', url=url):
+            captured = self.browser_network.get(url)
+        if captured is None:
+            return None
+        response = requests.Response()
+        response.url = url
+        response.status_code = captured['status']
+        response._content = captured['content']
+        if captured.get('content_type'):
+            response.headers['Content-Type'] = captured['content_type']
+        return response
+
+
+    def _fetch(self, url: str) -> 'requests.Response':
+        """
+        Executa a requisição GET na sessão HTTP.
+
+        Args:
+            url (str): A URL da requisição.
+
+        Returns:
+            requests.Response: A resposta recebida.
+        """
+        return self.session.get(url)
+
+
     def convert_response_to_file_img(
-            self, response: requests.Response, directory: str, file_name: str
+            self, response: 'requests.Response', directory: str, file_name: str
         ) -> str:
         """
         Converte a resposta de uma requisição em um arquivo de imagem.
@@ -63,4 +191,69 @@ class RequestManager:
         file_path = os.path.join(directory, file_name)
         with open(file_path, "wb") as file:
             file.write(response.content)
-        return file_path
\ No newline at end of file
+        return file_path
+
+
+class ReplayRequestManager(RequestManager):
+    """
+    RequestManager que responde às requisições com as respostas de uma
+    gravação (CaptureArchive), sem acesso à rede.
+
+    As métricas, o rastreamento e o tratamento dos códigos de status são
+    os mesmos do RequestManager. URLs que não foram gravadas recebem o
+    código 404.
+
+    Attributes:
+        archive (CaptureArchive): A gravação reproduzida.
+    """
+
+    def __init__(self, archive: CaptureArchive):
+        """
+        Inicializa o RequestManager da reprodução.
+
+        Args:
+            archive (CaptureArchive): A gravação reproduzida.
+        """
+        super().__init__()
+        self.archive = archive
+
+
+    def warm_up(self, url: str, timeout: float = 5.0) -> bool:
+        """
+        Não há conexão para abrir na reprodução.
+
+        Args:
+            url (str): URL do servidor das imagens.
+            timeout (float): Ignorado na reprodução.
+
+        Returns:
+            bool: Sempre False.
+        """
+        return False
+
+
+    def _fetch(self, url: str) -> 'requests.Response':
+        """
+        Retorna a próxima resposta gravada para a URL, aguardando a
+        duração gravada conforme a velocidade da reprodução.
+
+        Args:
+            url (str): A URL da requisição.
+
+        Returns:
+            requests.Response: A resposta gravada.
+        """
+        response = requests.Response()
+        response.url = url
+        recorded = self.archive.response(url)
+        if recorded is None:
+            response.status_code = 404
+            response._content = b''
+            return response
+        event, content = recorded
+        self.archive.wait(event)
+        response.status_code = event['status']
+        response._content = content
+        if event.get('content_type'):
+            response.headers['Content-Type'] = event['content_type']
+        return response
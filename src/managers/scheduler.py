@@ -0,0 +1,407 @@
+from collections import deque
+from datetime import datetime, timedelta
+import os
+import signal
+import threading
+from typing import Callable, Deque
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+
+class CronExpression:
+    """
+    Representa uma expressão no formato cron com cinco campos:
+    minuto, hora, dia do mês, mês e dia da semana.
+
+    Cada campo aceita '*', números, intervalos ('1-5'), listas ('1,15')
+    e passos ('*/10' ou '0-30/5'). O dia da semana vai de 0 (domingo)
+    a 6 (sábado), aceitando 7 como domingo.
+
+    Attributes:
+        expression (str): A expressão cron original.
+    """
+
+    _LIMITS = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+
+    def __init__(self, expression: str):
+        """
+        Inicializa a expressão cron, validando cada campo.
+
+        Args:
+            expression (str): Expressão cron com cinco campos.
+
+        Raises:
+            ValueError: Se a expressão não possuir cinco campos ou algum
+            campo for inválido.
+        """
+        self.expression = expression
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(
+                f'A expressão cron "{expression}" deve possuir 5 campos.'
+            )
+        parsed = [
+            self._parse_field(field, minimum, maximum)
+            for field, (minimum, maximum) in zip(fields, self._LIMITS)
+        ]
+        self._minutes, self._hours, self._days, self._months = parsed[:4]
+        self._weekdays = {day % 7 for day in parsed[4]}
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+
+
+    @staticmethod
+    def _parse_field(field: str, minimum: int, maximum: int) -> set:
+        """
+        Converte um campo da expressão cron no conjunto de valores
+        aceitos.
+
+        Args:
+            field (str): O campo da expressão.
+            minimum (int): Menor valor aceito pelo campo.
+            maximum (int): Maior valor aceito pelo campo.
+
+        Returns:
+            set: Conjunto de valores aceitos pelo campo.
+
+        Raises:
+            ValueError: Se o campo for inválido.
+        """
+        values = set()
+        for part in field.split(','):
+            step = 1
+            if '/' in part:
+                part, step_text = part.split('/', 1)
+                step = int(step_text)
+                if step <= 0:
+                    raise ValueError(f'Passo inválido no campo "{field}".')
+
+            if part == '*':
+                start, end = minimum, maximum
+            elif '-' in part:
+                start_text, end_text = part.split('-', 1)
+                start, end = int(start_text), int(end_text)
+            else:
+                start = int(part)
+                end = maximum if step > 1 else start
+
+            if start < minimum or end > maximum or start > end:
+                raise ValueError(
+                    f'Valor fora do intervalo permitido no campo "{field}".'
+                )
+            values.update(range(start, end + 1, step))
+        return values
+
+
+    def _day_matches(self, moment: datetime) -> bool:
+        """
+        Verifica se o dia da data fornecida é aceito pela expressão.
+
+        Segue a regra do cron: se os campos de dia do mês e dia da
+        semana forem ambos restritos, basta um deles corresponder.
+
+        Args:
+            moment (datetime): A data a ser verificada.
+
+        Returns:
+            bool: True se o dia for aceito.
+        """
+        weekday = (moment.weekday() + 1) % 7
+        day_ok = moment.day in self._days
+        weekday_ok = weekday in self._weekdays
+        if self._any_day and self._any_weekday:
+            return True
+        if self._any_day:
+            return weekday_ok
+        if self._any_weekday:
+            return day_ok
+        return day_ok or weekday_ok
+
+
+    def next_after(self, moment: datetime) -> datetime:
+        """
+        Calcula o próximo horário, após a data fornecida, aceito pela
+        expressão.
+
+        Args:
+            moment (datetime): Data de referência.
+
+        Returns:
+            datetime: O próximo horário aceito pela expressão.
+
+        Raises:
+            ValueError: Se nenhum horário for encontrado nos próximos
+            cinco anos.
+        """
+        candidate = moment.replace(second=0, microsecond=0)
+        candidate += timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 5)
+
+        while candidate <= limit:
+            if candidate.month not in self._months:
+                month = candidate.month + 1
+                year = candidate.year + (month > 12)
+                candidate = candidate.replace(
+                    year=year, month=(month - 1) % 12 + 1, day=1,
+                    hour=0, minute=0
+                )
+                continue
+            if not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0)
+                candidate += timedelta(days=1)
+                continue
+            if candidate.hour not in self._hours:
+                candidate = candidate.replace(minute=0)
+                candidate += timedelta(hours=1)
+                continue
+            if candidate.minute not in self._minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+
+        raise ValueError(
+            f'A expressão cron "{self.expression}" não possui próxima execução.'
+        )
+
+
+
+class Scheduler:
+    """
+    Classe que executa uma tarefa de forma recorrente, por intervalo
+    em segundos ou por uma expressão cron, mantendo o processo ativo
+    entre as execuções.
+
+    Garante que uma execução não inicie enquanto a anterior ainda estiver
+    em andamento (inclusive entre processos, através de um arquivo de
+    trava quando suportado pelo sistema) e trata os sinais SIGINT e
+    SIGTERM para encerrar de forma segura, aguardando o ciclo atual
+    terminar.
+
+    Attributes:
+        job (Callable): Tarefa executada a cada ciclo.
+        interval (float | None): Intervalo em segundos entre os inícios
+        de cada ciclo.
+        cron (CronExpression | None): Expressão cron que define os
+        horários dos ciclos.
+        lock_file (str | None): Caminho do arquivo de trava entre
+        processos.
+        logger: Objeto com os métodos info, alert e error para registrar
+        o andamento do agendador.
+        cycles (int): Quantidade de ciclos executados.
+        skipped (Deque[datetime]): Últimos horários ignorados por um
+        ciclo em andamento, limitados a `MAX_SKIPPED`.
+    """
+    MAX_SKIPPED = 1000
+
+
+    def __init__(
+            self,
+            job: Callable[[], object],
+            interval: float = None,
+            cron: str = None,
+            lock_file: str = None,
+            logger=None
+        ):
+        """
+        Inicializa o agendador.
+
+        Args:
+            job (Callable): Tarefa executada a cada ciclo.
+            interval (float, opcional): Intervalo em segundos entre
+            os ciclos.
+            cron (str, opcional): Expressão cron com os horários
+            dos ciclos.
+            lock_file (str, opcional): Caminho do arquivo de trava
+            entre processos.
+            logger (opcional): Logger para registrar o andamento.
+
+        Raises:
+            ValueError: Se não for informado exatamente um entre
+            intervalo e expressão cron.
+        """
+        if (interval is None) == (cron is None):
+            raise ValueError(
+                'Informe um intervalo ou uma expressão cron para o agendador.'
+            )
+        if interval is not None and interval <= 0:
+            raise ValueError('O intervalo do agendador deve ser positivo.')
+
+        self.job = job
+        self.interval = interval
+        self.cron = CronExpression(cron) if cron else None
+        self.lock_file = lock_file
+        self.logger = logger
+        self.cycles = 0
+        self.skipped: Deque[datetime] = deque(maxlen=self.MAX_SKIPPED)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+
+    def _log(self, level: str, message: str):
+        """
+        Registra uma mensagem no logger, caso exista.
+
+        Args:
+            level (str): Nome do método do logger (info, alert ou error).
+            message (str): Mensagem a ser registrada.
+        """
+        if self.logger:
+            getattr(self.logger, level)(message)
+
+
+    def next_run(self, moment: datetime) -> datetime:
+        """
+        Calcula o horário do próximo ciclo a partir de uma data.
+
+        Args:
+            moment (datetime): Data de referência.
+
+        Returns:
+            datetime: Horário do próximo ciclo.
+        """
+        if self.cron:
+            return self.cron.next_after(moment)
+        return moment + timedelta(seconds=self.interval)
+
+
+    def _acquire_file_lock(self):
+        """
+        Obtém a trava exclusiva do arquivo de trava entre processos.
+
+        Returns:
+            file | None: O arquivo aberto com a trava, None se não houver
+            arquivo de trava configurado ou False se outro processo já
+            estiver executando um ciclo.
+        """
+        if not self.lock_file or fcntl is None:
+            return None
+        os.makedirs(os.path.dirname(self.lock_file) or '.', exist_ok=True)
+        file = open(self.lock_file, 'a')
+        try:
+            fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            file.close()
+            return False
+        return file
+
+
+    def run_once(self) -> bool:
+        """
+        Executa um ciclo da tarefa, caso nenhum outro esteja em andamento.
+
+        Returns:
+            bool: True se o ciclo foi executado, False se foi ignorado
+            por já existir um ciclo em andamento.
+        """
+        if not self._lock.acquire(blocking=False):
+            self._log(
+                'alert',
+                'Ciclo ignorado: o ciclo anterior ainda está em execução.'
+            )
+            return False
+        try:
+            file_lock = self._acquire_file_lock()
+            if file_lock is False:
+                self._log(
+                    'alert',
+                    'Ciclo ignorado: outro processo está executando um ciclo.'
+                )
+                return False
+            try:
+                self.cycles += 1
+                self._log(
+                    'info', f'Iniciando o ciclo {self.cycles} do agendador.'
+                )
+                self.job()
+            except Exception as error:
+                self._log(
+                    'error', f'Erro durante o ciclo do agendador: {error}'
+                )
+            finally:
+                if file_lock:
+                    fcntl.flock(file_lock, fcntl.LOCK_UN)
+                    file_lock.close()
+            return True
+        finally:
+            self._lock.release()
+
+
+    def _handle_signal(self, signum, frame):
+        """
+        Trata os sinais de encerramento, solicitando a parada do
+        agendador após o ciclo atual.
+        """
+        self._log('alert', f'Sinal {signum} recebido, encerrando o agendador.')
+        self.stop()
+
+
+    def _install_signal_handlers(self) -> dict:
+        """
+        Instala os tratadores de SIGINT e SIGTERM, quando executado
+        na thread principal.
+
+        Returns:
+            dict: Os tratadores anteriores, para serem restaurados.
+        """
+        previous = {}
+        if threading.current_thread() is not threading.main_thread():
+            return previous
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            previous[signum] = signal.signal(signum, self._handle_signal)
+        return previous
+
+
+    def run_forever(self, run_immediately: bool = True):
+        """
+        Executa a tarefa de forma recorrente até o agendador ser parado.
+
+        Horários que passaram enquanto um ciclo estava em andamento são
+        ignorados e registrados em `skipped`, em vez de gerarem ciclos
+        acumulados.
+
+        Args:
+            run_immediately (bool): Executa um ciclo assim que o
+            agendador é iniciado.
+        """
+        previous_handlers = self._install_signal_handlers()
+        try:
+            next_time = datetime.now()
+            if not run_immediately:
+                next_time = self.next_run(next_time)
+
+            while not self._stop_event.is_set():
+                wait = (next_time - datetime.now()).total_seconds()
+                if wait > 0 and self._stop_event.wait(wait):
+                    break
+
+                scheduled_time = next_time
+                self.run_once()
+
+                next_time = self.next_run(scheduled_time)
+                now = datetime.now()
+                while next_time <= now:
+                    self.skipped.append(next_time)
+                    self._log(
+                        'alert',
+                        f'Ciclo agendado para {next_time:%d/%m/%Y %H:%M:%S} '
+                        f'ignorado por sobreposição.'
+                    )
+                    next_time = self.next_run(next_time)
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+            self._log('info', 'Agendador encerrado.')
+
+
+    def stop(self):
+        """
+        Solicita a parada do agendador. O ciclo em andamento é
+        finalizado antes do encerramento.
+        """
+        self._stop_event.set()
+
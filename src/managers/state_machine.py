@@ -0,0 +1,227 @@
+from contextlib import nullcontext
+import time
+from typing import Any, Callable, Dict, List
+
+
+
+class StateMachine:
+    """
+    Classe que executa uma máquina de estados genérica, emulando o
+    ReFramework do UiPath.
+
+    Cada estado é registrado com uma função (handler) que recebe o
+    contexto da execução e retorna o nome do próximo estado, ou None
+    para encerrar a máquina. Caso o handler gere uma exceção, o estado
+    pode ser executado novamente até o limite de tentativas configurado,
+    mantendo o mesmo contexto (e, portanto, o mesmo navegador e a mesma
+    página). Esgotadas as tentativas, a máquina segue para o estado de
+    erro configurado.
+
+    O tempo de cada execução de estado é registrado em `transitions` e,
+    quando informado um registro de métricas, no histograma
+    'state_seconds' (com as novas tentativas em 'state_retries_total').
+
+    Attributes:
+        initial_state (str): Nome do estado inicial.
+        logger: Objeto com os métodos info, alert e error para registrar
+        o andamento da máquina de estados.
+        metrics: Registro de métricas (MetricsRegistry), opcional.
+        tracer: Rastreador (Tracer) que registra um intervalo por
+        execução de estado, opcional.
+        transitions (List[dict]): Registro de cada execução de estado,
+        com o estado, o próximo estado, a tentativa, a duração em
+        segundos e o erro, se houver.
+    """
+
+    def __init__(
+            self, initial_state: str, logger=None, metrics=None, tracer=None
+        ):
+        """
+        Inicializa a máquina de estados.
+
+        Args:
+            initial_state (str): Nome do estado inicial.
+            logger (opcional): Logger para registrar o andamento.
+            metrics (opcional): Registro de métricas da duração dos
+            estados.
+            tracer (opcional): Rastreador das execuções dos estados.
+        """
+        self.initial_state = initial_state
+        self.logger = logger
+        self.metrics = metrics
+        self.tracer = tracer
+        self.transitions: List[dict] = []
+        self._states: Dict[str, dict] = {}
+
+
+    def register(
+            self,
+            name: str,
+            handler: Callable[[Any], str | None],
+            max_retries: int = 0,
+            on_error: str = None,
+            on_exception: Callable[[Any, Exception], None] = None
+        ):
+        """
+        Registra um estado na máquina.
+
+        Args:
+            name (str): Nome do estado.
+            handler (Callable): Função executada no estado. Recebe o
+            contexto e retorna o nome do próximo estado ou None para
+            encerrar a máquina.
+            max_retries (int): Quantidade máxima de novas tentativas do
+            estado após uma exceção.
+            on_error (str, opcional): Estado para onde a máquina segue
+            quando as tentativas se esgotam. Se não for fornecido, a
+            exceção é propagada.
+            on_exception (Callable, opcional): Função chamada sempre que
+            o estado gerar uma exceção, antes de uma nova tentativa ou da
+            ida para o estado de erro, recebendo o contexto e a exceção.
+        """
+        self._states[name] = {
+            'handler': handler,
+            'max_retries': max_retries,
+            'on_error': on_error,
+            'on_exception': on_exception,
+        }
+
+
+    def _log(self, level: str, message: str):
+        """
+        Registra uma mensagem no logger, caso exista.
+
+        Args:
+            level (str): Nome do método do logger (info, alert ou error).
+            message (str): Mensagem a ser registrada.
+        """
+        if self.logger:
+            getattr(self.logger, level)(message)
+
+
+    def _span(self, state: str, attempt: int):
+        """
+        Cria o intervalo do rastreamento de uma execução de estado.
+
+        Args:
+            state (str): Estado executado.
+            attempt (int): Número da tentativa.
+
+        Returns:
+            Context manager do intervalo, ou vazio sem rastreador.
+        """
+        if self.tracer is None:
+            return nullcontext()
+        return self.tracer.span(state, 'state', attempt=attempt)
+
+
+    def run(self, context: Any) -> Any:
+        """
+        Executa a máquina de estados a partir do estado inicial até que
+        um estado retorne None.
+
+        Args:
+            context (Any): Objeto compartilhado entre os estados.
+
+        Returns:
+            Any: O contexto ao final da execução.
+
+        Raises:
+            ValueError: Se um estado não registrado for solicitado.
+            Exception: A exceção do estado, caso as tentativas se
+            esgotem e não exista estado de erro configurado.
+        """
+        state = self.initial_state
+        attempts = 0
+
+        while state is not None:
+            if state not in self._states:
+                raise ValueError(f'O estado {state} não foi registrado.')
+            config_state = self._states[state]
+
+            start = time.perf_counter()
+            error = None
+            try:
+                with self._span(state, attempts + 1):
+                    next_state = config_state['handler'](context)
+                attempts = 0
+            except Exception as exception:
+                error = exception
+                attempts += 1
+                if config_state['on_exception']:
+                    config_state['on_exception'](context, error)
+                if attempts <= config_state['max_retries']:
+                    if self.metrics:
+                        self.metrics.increment(
+                            'state_retries_total', state=state
+                        )
+                    self._log(
+                        'alert',
+                        f'Erro no estado {state}, nova tentativa '
+                        f'{attempts}/{config_state["max_retries"]}: {error}'
+                    )
+                    next_state = state
+                elif config_state['on_error']:
+                    self._log('error', f'Erro no estado {state}: {error}')
+                    context.error = error
+                    next_state = config_state['on_error']
+                else:
+                    self._record(state, None, start, attempts, error)
+                    raise
+
+            self._record(state, next_state, start, attempts, error)
+            if next_state != state:
+                attempts = 0
+            state = next_state
+
+        return context
+
+
+    def _record(
+            self,
+            state: str,
+            next_state: str | None,
+            start: float,
+            attempt: int,
+            error: Exception | None
+        ):
+        """
+        Registra a execução de um estado.
+
+        Args:
+            state (str): Estado executado.
+            next_state (str | None): Próximo estado.
+            start (float): Instante de início em `time.perf_counter`.
+            attempt (int): Número da tentativa atual do estado.
+            error (Exception | None): Exceção gerada pelo estado.
+        """
+        duration = time.perf_counter() - start
+        self.transitions.append({
+            'state': state,
+            'next_state': next_state,
+            'attempt': attempt,
+            'duration': duration,
+            'error': str(error) if error else None,
+        })
+        if self.metrics:
+            self.metrics.observe('state_seconds', duration, state=state)
+
+
+    def timings_summary(self) -> Dict[str, dict]:
+        """
+        Agrupa o tempo gasto por estado.
+
+        Returns:
+            Dict[str, dict]: Para cada estado, a quantidade de execuções,
+            a quantidade de falhas e o tempo total em segundos.
+        """
+        summary = {}
+        for transition in self.transitions:
+            item = summary.setdefault(
+                transition['state'],
+                {'executions': 0, 'failures': 0, 'seconds': 0.0}
+            )
+            item['executions'] += 1
+            item['failures'] += transition['error'] is not None
+            item['seconds'] += transition['duration']
+        return summary
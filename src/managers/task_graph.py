@@ -0,0 +1,192 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import time
+from typing import Any, Callable, Dict, List
+
+from src.managers.tracer import TRACER
+
+
+
+class TaskGraph:
+    """
+    Executa um conjunto de tarefas com dependências entre si (um grafo
+    acíclico), em paralelo sempre que as dependências permitirem.
+
+    Cada tarefa é registrada com uma função que recebe o contexto da
+    execução e com os nomes das tarefas das quais depende; ela inicia
+    assim que todas as dependências terminam. Se uma tarefa gerar uma
+    exceção, nenhuma tarefa nova é iniciada, as que estão em andamento
+    terminam e a primeira exceção é propagada.
+
+    O início e o fim de cada tarefa são registrados em `timings` (e no
+    rastreamento, na categoria 'init'), a partir dos quais
+    `critical_path` calcula a sequência de tarefas dependentes que
+    determinou a duração total.
+
+    Attributes:
+        max_workers (int): Quantidade máxima de tarefas simultâneas. Com
+        1, as tarefas são executadas em sequência, na ordem de registro
+        respeitando as dependências.
+        timings (Dict[str, dict]): Início e fim de cada tarefa executada,
+        em segundos desde o início da execução do grafo.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        """
+        Inicializa o grafo, sem tarefas.
+
+        Args:
+            max_workers (int): Quantidade máxima de tarefas simultâneas.
+        """
+        self.max_workers = max(1, max_workers)
+        self.timings: Dict[str, dict] = {}
+        self._tasks: Dict[str, dict] = {}
+
+
+    def add(
+            self,
+            name: str,
+            function: Callable[[Any], Any],
+            requires: List[str] = ()
+        ):
+        """
+        Registra uma tarefa no grafo.
+
+        Args:
+            name (str): Nome da tarefa.
+            function (Callable): Função executada na tarefa, que recebe o
+            contexto.
+            requires (List[str]): Tarefas que precisam terminar antes.
+
+        Raises:
+            ValueError: Se a tarefa já existir ou depender de uma tarefa
+            ainda não registrada.
+        """
+        if name in self._tasks:
+            raise ValueError(f'Tarefa já registrada: {name}')
+        missing = [task for task in requires if task not in self._tasks]
+        if missing:
+            raise ValueError(
+                f'A tarefa {name} depende de tarefas não registradas: '
+                f'{", ".join(missing)}'
+            )
+        self._tasks[name] = {'function': function, 'requires': list(requires)}
+
+
+    def _execute(self, name: str, context: Any, origin: float):
+        """
+        Executa uma tarefa, registrando o seu início e fim.
+        """
+        start = time.perf_counter() - origin
+        try:
+            with TRACER.span(name, 'init'):
+                self._tasks[name]['function'](context)
+        finally:
+            self.timings[name] = {
+                'start': start, 'end': time.perf_counter() - origin
+            }
+
+
+    def run(self, context: Any):
+        """
+        Executa as tarefas do grafo.
+
+        Args:
+            context (Any): Contexto repassado a cada tarefa.
+
+        Raises:
+            Exception: A primeira exceção gerada por uma tarefa.
+        """
+        self.timings = {}
+        origin = time.perf_counter()
+        pending = list(self._tasks)
+        done = set()
+        error = None
+        with ThreadPoolExecutor(
+                self.max_workers, thread_name_prefix='Init') as executor:
+            running = {}
+            while pending or running:
+                if error is None:
+                    for name in list(pending):
+                        if len(running) >= self.max_workers:
+                            break
+                        if all(task in done for task in
+                               self._tasks[name]['requires']):
+                            pending.remove(name)
+                            future = executor.submit(
+                                self._execute, name, context, origin
+                            )
+                            running[future] = name
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    if future.exception() is not None:
+                        error = error or future.exception()
+                    else:
+                        done.add(name)
+        if error is not None:
+            raise error
+
+
+    def duration(self, name: str) -> float:
+        """
+        Retorna a duração de uma tarefa na última execução.
+
+        Args:
+            name (str): Nome da tarefa.
+
+        Returns:
+            float: A duração em segundos.
+        """
+        timing = self.timings[name]
+        return timing['end'] - timing['start']
+
+
+    def critical_path(self) -> List[str]:
+        """
+        Retorna o caminho crítico da última execução: partindo da tarefa
+        que terminou por último, segue a dependência que terminou por
+        último até uma tarefa sem dependências.
+
+        Returns:
+            List[str]: Os nomes das tarefas do caminho, na ordem de
+            execução.
+        """
+        if not self.timings:
+            return []
+        name = max(self.timings, key=lambda task: self.timings[task]['end'])
+        path = [name]
+        while True:
+            requires = [task for task in self._tasks[name]['requires']
+                        if task in self.timings]
+            if not requires:
+                break
+            name = max(requires, key=lambda task: self.timings[task]['end'])
+            path.append(name)
+        return list(reversed(path))
+
+
+    def report(self) -> List[str]:
+        """
+        Gera o relatório de tempos da última execução, para o log.
+
+        Returns:
+            List[str]: Uma linha por tarefa, na ordem de início, e uma
+            linha com o caminho crítico.
+        """
+        lines = []
+        for name, timing in sorted(
+                self.timings.items(), key=lambda item: item[1]['start']):
+            lines.append(
+                f'  {name}: início {timing["start"]:.3f}s, '
+                f'{self.duration(name):.3f}s'
+            )
+        path = self.critical_path()
+        if path:
+            total = max(timing['end'] for timing in self.timings.values())
+            steps = ' -> '.join(
+                f'{name} ({self.duration(name):.3f}s)' for name in path
+            )
+            lines.append(f'  Caminho crítico ({total:.3f}s): {steps}')
+        return lines
@@ -0,0 +1,192 @@
+import json
+import os
+import threading
+import time
+from typing import List
+
+
+
+class _NoopSpan:
+    """
+    Intervalo vazio, retornado quando o rastreamento está desabilitado.
+    Uma única instância é compartilhada, sem registrar nada.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+
+class _Span:
+    """
+    Intervalo de tempo de uma operação, registrado no rastreador como um
+    evento completo ('X') do formato de eventos de rastreamento do Chrome.
+    """
+
+    __slots__ = ('_tracer', '_name', '_category', '_args', '_start')
+
+    def __init__(self, tracer, name: str, category: str, args: dict):
+        self._tracer = tracer
+        self._name = name
+        self._category = category
+        self._args = args
+        self._start = 0
+
+
+    def __enter__(self):
+        self._start = time.perf_counter_ns()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self._args['error'] = f'{exc_type.__name__}: {exc_value}'
+        self._tracer._add(
+            self._name, self._category, self._start, end, self._args
+        )
+        return False
+
+
+
+class Tracer:
+    """
+    Rastreador de intervalos (spans) das operações de uma execução, que
+    gera um arquivo JSON no formato de eventos de rastreamento do Chrome,
+    aberto em visualizadores como chrome://tracing ou ui.perfetto.dev.
+
+    Cada thread aparece em uma linha do tempo própria, permitindo ver a
+    sobreposição (ou a falta dela) entre o navegador, os downloads e a
+    gravação dos arquivos. Com o rastreamento desabilitado, `span`
+    retorna um intervalo vazio compartilhado, sem registrar nada.
+
+    Attributes:
+        enabled (bool): Indica se os intervalos estão sendo registrados.
+    """
+
+    def __init__(self):
+        """
+        Inicializa o rastreador, desabilitado.
+        """
+        self.enabled = False
+        self._events: List[dict] = []
+        self._threads = {}
+        self._origin = time.perf_counter_ns()
+
+
+    def start(self):
+        """
+        Habilita o rastreamento, descartando os eventos anteriores.
+        """
+        self._events = []
+        self._threads = {}
+        self._origin = time.perf_counter_ns()
+        self.enabled = True
+
+
+    def stop(self):
+        """
+        Desabilita o rastreamento, mantendo os eventos registrados.
+        """
+        self.enabled = False
+
+
+    def span(self, name: str, category: str = '', **args):
+        """
+        Cria o intervalo de uma operação, utilizado com `with`.
+
+        Args:
+            name (str): Nome da operação.
+            category (str): Categoria da operação (por exemplo, 'browser'
+            ou 'download').
+            **args: Dados da operação, como o número da fatura e a página.
+
+        Returns:
+            Context manager que registra o intervalo ao final do bloco.
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, name, category, args)
+
+
+    def _add(
+            self, name: str, category: str, start: int, end: int,
+            args: dict
+        ):
+        """
+        Registra um intervalo concluído.
+
+        Args:
+            name (str): Nome da operação.
+            category (str): Categoria da operação.
+            start (int): Início em `time.perf_counter_ns`.
+            end (int): Fim em `time.perf_counter_ns`.
+            args (dict): Dados da operação.
+        """
+        if not self.enabled:
+            return
+        thread_id = threading.get_native_id()
+        if thread_id not in self._threads:
+            self._threads[thread_id] = threading.current_thread().name
+        self._events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': (start - self._origin) / 1000,
+            'dur': (end - start) / 1000,
+            'pid': os.getpid(),
+            'tid': thread_id,
+            'args': args,
+        })
+
+
+    def events(self) -> List[dict]:
+        """
+        Retorna os eventos registrados, com os nomes das threads.
+
+        Returns:
+            List[dict]: Eventos de metadados com os nomes das threads,
+            seguidos dos intervalos em ordem de início.
+        """
+        pid = os.getpid()
+        metadata = [
+            {
+                'name': 'thread_name', 'ph': 'M', 'pid': pid,
+                'tid': thread_id, 'args': {'name': name},
+            }
+            for thread_id, name in list(self._threads.items())
+        ]
+        return metadata + sorted(list(self._events), key=lambda e: e['ts'])
+
+
+    def write(self, file: str) -> str:
+        """
+        Grava os eventos registrados em um arquivo JSON no formato de
+        eventos de rastreamento do Chrome.
+
+        Args:
+            file (str): Caminho do arquivo.
+
+        Returns:
+            str: O caminho do arquivo gravado.
+        """
+        os.makedirs(os.path.dirname(file) or '.', exist_ok=True)
+        with open(file, 'w', encoding='utf-8') as trace_file:
+            json.dump(
+                {'traceEvents': self.events(), 'displayTimeUnit': 'ms'},
+                trace_file, ensure_ascii=False, default=str
+            )
+        return file
+
+
+# Rastreador da automação, compartilhado pelos gerenciadores.
+TRACER = Tracer()
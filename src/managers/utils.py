@@ -1,11 +1,10 @@
+import csv
 from datetime import datetime
 import os
 from typing import List
 
-import pandas as pd
 
-
-def get_file_csv_name(directory: str) -> str:
+def get_file_csv_name(directory: str, prefix: str = 'FATURAS') -> str:
     """
     Gera um nome de arquivo CSV baseado na data e hora atuais.
 
@@ -13,11 +12,15 @@ def get_file_csv_name(directory: str) -> str:
     'FATURAS_DD-MM-YYYY_HH.MM.SS.csv', onde 'DD-MM-YYYY'
     é a data atual e 'HH.MM.SS' é a hora atual.
 
+    Args:
+        directory (str): O diretório onde o arquivo será salvo.
+        prefix (str): O prefixo do nome do arquivo (padrão: 'FATURAS').
+
     Returns:
         str: O nome do arquivo gerado.
     """
     date = datetime.now().strftime('%d-%m-%Y_%H.%M.%S')
-    file_name = f'FATURAS_{date}.csv'
+    file_name = f'{prefix}_{date}.csv'
     full_path = os.path.join(directory, file_name)
     return full_path
 
@@ -45,6 +48,34 @@ def get_img_name(directory: str, name: str) -> str:
     return path_img
 
 
+def get_run_directories(
+        directory: str, date_format: str = '%d.%m.%Y_%H.%M.%S'
+    ) -> List[str]:
+    """
+    Lista os diretórios de execução (nomeados pelo horário da execução)
+    de um diretório, do mais antigo para o mais recente.
+
+    Diretórios com nomes fora do formato, como IMGS/ERRORS, são
+    ignorados.
+
+    Args:
+        directory (str): O diretório com os diretórios de execução.
+        date_format (str): O formato do horário no nome dos diretórios.
+
+    Returns:
+        List[str]: Os caminhos completos dos diretórios de execução.
+    """
+    runs = []
+    for entry in os.scandir(directory):
+        if not entry.is_dir():
+            continue
+        try:
+            runs.append((datetime.strptime(entry.name, date_format), entry.path))
+        except ValueError:
+            continue
+    return [path for _, path in sorted(runs)]
+
+
 def check_date_before_or_today(
         date_str: str, date_format: str = '%d-%m-%Y'
     ) -> bool:
@@ -100,16 +131,17 @@ def format_date(
 
 def create_csv_file(file: str, columns: List[str]) -> str:
     """
-    Cria um arquivo CSV com as colunas especificadas.
+    Cria um arquivo CSV com as colunas especificadas. Apenas o
+    cabeçalho é gravado, com o módulo csv, sem carregar o pandas.
 
     Args:
         file (str): O caminho do arquivo CSV a ser criado.
         columns (List[str]): Uma lista de nomes de colunas
-        para o DataFrame.
+        do cabeçalho.
 
     Returns:
         str: O caminho do arquivo CSV criado.
     """
-    df = pd.DataFrame(columns=columns)
-    df.to_csv(file, index=False)
+    with open(file, 'w', newline='', encoding='utf-8') as csv_file:
+        csv.writer(csv_file, lineterminator='\n').writerow(columns)
     return file
@@ -76,6 +76,20 @@ class WebDriverController:
             WebDriverController._instancia_driver = None
 
 
+    @classmethod
+    def close_driver(cls):
+        """
+        Fecha a instância do Selenium WebDriver, caso exista, sem
+        criar uma nova instância da classe.
+
+        Args:
+            cls: A própria classe.
+        """
+        if cls._instancia_driver:
+            cls._instancia_driver.quit()
+            cls._instancia_driver = None
+
+
     def screenshot_of_screen(self, path_image: str = 'erro.png'):
         """
         Faz um screenshot da tela e salva na pasta especificada.
@@ -29,13 +29,17 @@ class WebDriverOptions:
 
     def add_argument(self, argument: str):
         """
-        Adiciona um argumento as opções do WebDriver.
+        Adiciona um argumento as opções do WebDriver, caso ainda não
+        exista. As opções são compartilhadas entre as instâncias, e cada
+        ciclo do modo serviço (ou reinício do navegador) configura as
+        mesmas opções novamente.
 
         Args:
             argument (str): o argumento a ser adicionado as opções
             do WebDriver.
         """
-        self.options.add_argument(argument)
+        if argument not in self.options.arguments:
+            self.options.add_argument(argument)
 
 
     def add_experimental_option(self, option_name: str, option_value):
@@ -49,6 +53,17 @@ class WebDriverOptions:
             de tipo dependendo da opção adicionada.
         """
         self.options.add_experimental_option(option_name, option_value)
+
+
+    def set_capability(self, name: str, value):
+        """
+        Define uma capability do WebDriver, como 'goog:loggingPrefs'.
+
+        Args:
+            name (str): O nome da capability.
+            value: O valor da capability.
+        """
+        self.options.set_capability(name, value)
         
 
     def get_options(self) -> Options:
@@ -1,11 +1,19 @@
-from typing import Any, Generator, Dict
+from datetime import date, datetime
+import time
+from typing import Any, Generator, Dict, List
 
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.remote.webelement import WebElement
 from selenium.webdriver.support.ui import WebDriverWait
 
+from src.managers.browser_network import BrowserNetwork
+from src.managers.browser_recycler import BrowserRecycler
+from src.managers.capture import CAPTURE
+from src.managers.metrics import REGISTRY
+from src.managers.tracer import TRACER
 from src.pom.web_driver_base_actions import WebDriverBaseActions
 from src.pom.locators.page_main_locators import PageMainLocators
+from src.pom.scripts.page_main_scripts import PageMainScripts
 
 
 
@@ -18,19 +26,84 @@ class PageMain(WebDriverBaseActions):
     O POM facilita a manutenção do código, permitindo uma separação clara
     entre a lógica de teste e a estrutura da página.
 
+    Com uma política de reciclagem (BrowserRecycler), o navegador é
+    reiniciado entre as páginas quando a política indicar, e o site, o
+    filtro de data e a página atual da tabela são restaurados, sem que a
+    máquina de estados perceba o reinício.
+
+    Com o acesso às respostas do navegador (BrowserNetwork) habilitado, o
+    download dos arquivos de cada página pode ser iniciado no próprio
+    navegador, antes da leitura das linhas, para que o RequestManager
+    reaproveite as respostas sem baixá-las novamente.
+
     Attributes:
         driver (WebDriver): A instância do Selenium WebDriver, herdada
         da classe base.
+        current_page (int): Número da página atual da tabela.
+        recycler (BrowserRecycler | None): Política de reciclagem do
+        navegador.
+        network (BrowserNetwork | None): Acesso às respostas recebidas
+        pelo navegador.
+        prefetch (bool): Se o download dos arquivos informados em
+        `prefetch_files` é iniciado no navegador.
     """
 
-    def __init__(self):
+    def __init__(
+            self,
+            recycler: BrowserRecycler = None,
+            network_timeout: float = None,
+            prefetch: bool = False
+        ):
         """
         Inicializa a página principal chamando o construtor da classe base.
 
         A classe base WebDriverBaseActions fornece métodos comuns para
         interações com o WebDriver, como clicar em elementos e digitar texto.
+
+        O atributo `current_page` guarda o número da página atual da
+        tabela, começando em 1.
+
+        Args:
+            recycler (BrowserRecycler, opcional): Política de reciclagem
+            do navegador.
+            network_timeout (float, opcional): Com um valor, habilita o
+            acesso às respostas do navegador, aguardando até esse tempo,
+            em segundos, por uma resposta em andamento. Requer o log de
+            desempenho habilitado nas opções do WebDriver.
+            prefetch (bool): Habilita o início do download de arquivos
+            no navegador em `prefetch_files` (apenas com o acesso às
+            respostas habilitado).
         """
         super().__init__()
+        self.current_page = 1
+        self.recycler = recycler
+        self.network = None
+        if network_timeout is not None:
+            self.network = BrowserNetwork(self, network_timeout)
+            self.network.enable()
+        self.prefetch = prefetch and self.network is not None
+        self._url = None
+        self._date_filter = None
+        self._latency = None
+
+
+    def open_site(self, url: str):
+        """
+        Abre o site especificado e reinicia o contador de páginas.
+
+        Args:
+            url (str): URL do site a ser aberto.
+        """
+        start = time.perf_counter()
+        with (
+            TRACER.span('open_site', 'browser', url=url),
+            REGISTRY.timer('browser_seconds', operation='open_site'),
+        ):
+            super().open_site(url)
+        self.current_page = 1
+        self._url = url
+        self._date_filter = None
+        CAPTURE.record('open_site', time.perf_counter() - start, url=url)
 
 
     def get_url_file(self, element: WebElement, selector: tuple) -> str:
@@ -76,16 +149,22 @@ class PageMain(WebDriverBaseActions):
             bool | None: Retorna True se o botão estiver desabilitado,
             caso contrário None.
         """
+        start = time.perf_counter()
+        disabled = None
         try:
             self.wdw = WebDriverWait(self.driver, 1)
             element = self._find_element_in_page(
                 PageMainLocators.BUTTON_NEXT_PAGE_DISABLED
             )
             if element:
-                return True
-            return None
+                disabled = True
         except (NoSuchElementException, TimeoutException) as error:
-            return None
+            pass
+        CAPTURE.record(
+            'next_disabled', time.perf_counter() - start,
+            page=self.current_page, disabled=disabled
+        )
+        return disabled
         
     
     def click_next_button(self):
@@ -93,14 +172,130 @@ class PageMain(WebDriverBaseActions):
         Clica no botão "Next" para avançar para a próxima página.
 
         Este método chama o método `_click` para clicar no botão de
-        navegação para a próxima página da tabela.
+        navegação para a próxima página da tabela. Em seguida, verifica
+        a política de reciclagem do navegador.
         """
         try:
-            self._click(PageMainLocators.BUTTON_NEXT_PAGE)
+            start = time.perf_counter()
+            with (
+                TRACER.span('click_next', 'browser', page=self.current_page),
+                REGISTRY.timer('browser_seconds', operation='next_page'),
+            ):
+                self._click(PageMainLocators.BUTTON_NEXT_PAGE)
+            CAPTURE.record(
+                'next_page', time.perf_counter() - start,
+                page=self.current_page
+            )
+            self.current_page += 1
         except Exception as error:
             raise Exception(
                 f'Erro ao clicar no botão Next no site: {error}'
             )
+        self._recycle_browser()
+
+
+    def _recycle_browser(self):
+        """
+        Registra a página na política de reciclagem, com a memória do
+        navegador e a latência de leitura por linha, e reinicia o
+        navegador quando a política indicar.
+        """
+        if self.recycler is None:
+            return
+        reason = self.recycler.page_done(self._driver_pid(), self._latency)
+        if self.recycler.rss:
+            REGISTRY.set_gauge('browser_rss_bytes', self.recycler.rss)
+            REGISTRY.set_gauge(
+                'browser_rss_peak_bytes', self.recycler.peak_rss
+            )
+        if reason:
+            self.restart_browser(reason)
+
+
+    def restart_browser(self, reason: str = 'manual'):
+        """
+        Reinicia o navegador e restaura a posição da tabela: abre o site
+        novamente, reaplica o filtro de data e exibe a página atual. A
+        restauração não é gravada na captura, pois não altera o que a
+        automação lê do site.
+
+        Args:
+            reason (str): Motivo do reinício, registrado nas métricas.
+
+        Raises:
+            Exception: Se não for possível restaurar a página atual.
+        """
+        page = self.current_page
+        with (
+            TRACER.span(
+                'restart_browser', 'browser', page=page, reason=reason
+            ),
+            REGISTRY.timer('browser_seconds', operation='restart'),
+        ):
+            self._restart_driver()
+            if self.network is not None:
+                self.network.enable()
+            super().open_site(self._url)
+            self._find_element_in_page(PageMainLocators.TABLE)
+            if self._date_filter is not None:
+                self._execute_script(
+                    PageMainScripts.APPLY_DATE_FILTER, self._date_filter
+                )
+            if page > 1:
+                self._go_to_page(page)
+        self.current_page = page
+        if self.recycler is not None:
+            self.recycler.reset()
+        REGISTRY.increment('browser_restarts_total', reason=reason)
+
+
+    def _go_to_page(self, page: int):
+        """
+        Exibe a página informada da tabela, através da API do DataTables
+        ou, sem ela, clicando no botão "Next".
+
+        Args:
+            page (int): Número da página, começando em 1.
+
+        Raises:
+            Exception: Se a página exibida não for a página informada.
+        """
+        shown = self._execute_script(PageMainScripts.GO_TO_PAGE, page)
+        if shown is None:
+            for _ in range(page - 1):
+                self._click(PageMainLocators.BUTTON_NEXT_PAGE)
+        elif int(shown) != page:
+            raise Exception(
+                f'Erro ao restaurar a página {page} da tabela após o '
+                f'reinício do navegador: página {shown} exibida.'
+            )
+
+
+    def prefetch_files(self, urls: List[str]) -> int:
+        """
+        Inicia no navegador o download dos arquivos informados, sem
+        aguardar as respostas, descartando antes as respostas anteriores
+        que não foram reaproveitadas. Uma falha apenas desabilita o
+        reaproveitamento desses arquivos: eles são baixados pelo
+        RequestManager.
+
+        Args:
+            urls (List[str]): URLs dos arquivos que serão baixados.
+
+        Returns:
+            int: Quantidade de downloads iniciados.
+        """
+        if not self.prefetch or not urls:
+            return 0
+        try:
+            self.network.clear()
+            with TRACER.span('prefetch_files', 'browser',
+                             page=self.current_page, files=len(urls)):
+                return int(self._execute_script(
+                    PageMainScripts.PREFETCH_FILES, urls
+                ) or 0)
+        except Exception:
+            return 0
 
 
     def check_table(self) -> bool|None:
@@ -128,8 +323,79 @@ class PageMain(WebDriverBaseActions):
             raise Exception(
                 f'Erro ao encontrar a tabela inicial no site: {error}'
             )
-        
-            
+
+
+    def apply_date_filter(self, max_date: date = None) -> int | None:
+        """
+        Aplica o filtro de data diretamente na tabela do site.
+
+        Registra um filtro na API de busca do DataTables que mantém
+        apenas as linhas com data menor ou igual a data limite. Dessa
+        forma a paginação da tabela passa a conter somente linhas
+        elegíveis, e o botão "Next" fica desabilitado assim que não
+        houver mais linhas válidas, evitando que o robô navegue por
+        páginas que não gerariam nenhum resultado.
+
+        Args:
+            max_date (date, opcional): Data limite para as linhas da
+            tabela. Se não for fornecida, utiliza a data de hoje.
+
+        Returns:
+            int | None: Quantidade de linhas que passaram no filtro, ou
+            None caso a API do DataTables não esteja disponível na
+            página. Nesse caso a tabela permanece sem filtro.
+
+        Raises:
+            Exception: Se ocorrer um erro ao executar o script na página.
+        """
+        if max_date is None:
+            max_date = datetime.today().date()
+        max_date_number = int(max_date.strftime('%Y%m%d'))
+        try:
+            start = time.perf_counter()
+            with (
+                TRACER.span('apply_date_filter', 'browser'),
+                REGISTRY.timer('browser_seconds', operation='date_filter'),
+            ):
+                total_rows = self._execute_script(
+                    PageMainScripts.APPLY_DATE_FILTER, max_date_number
+                )
+        except Exception as error:
+            raise Exception(
+                f'Erro ao aplicar o filtro de data na tabela do site: {error}'
+            )
+        CAPTURE.record(
+            'date_filter', time.perf_counter() - start,
+            max_date=max_date_number, total_rows=total_rows
+        )
+        if total_rows is None:
+            return None
+        self.current_page = 1
+        self._date_filter = max_date_number
+        return int(total_rows)
+
+
+    def get_table_data(self) -> list | None:
+        """
+        Lê de uma vez, pela API do DataTables, os dados de todas as
+        linhas que passaram no filtro da tabela, em todas as páginas,
+        sem navegar pela paginação.
+
+        Returns:
+            list | None: Os valores das células de cada linha, ou None
+            caso a API do DataTables não esteja disponível na página ou
+            ocorra um erro na leitura.
+        """
+        try:
+            with (
+                TRACER.span('get_table_data', 'browser'),
+                REGISTRY.timer('browser_seconds', operation='table_data'),
+            ):
+                return self._execute_script(PageMainScripts.GET_TABLE_DATA)
+        except Exception:
+            return None
+
+
     def get_rows(self) -> Generator[dict[str, str], Any, None]:
         """
         Este método percorre as linhas da tabela na página atual,
@@ -142,6 +408,13 @@ class PageMain(WebDriverBaseActions):
         o que é útil para economizar memória, especialmente quando
         lidamos com tabelas grandes.
 
+        O tempo gasto na leitura da página (sem o tempo de quem consome
+        as linhas) e a quantidade de linhas lidas são registrados nas
+        métricas ao final da leitura. No rastreamento, o intervalo
+        'get_rows' vai do início ao fim da leitura da página. Com a
+        gravação habilitada, as linhas lidas são gravadas ao final da
+        leitura da página.
+
         Yields:
             dict: Um dicionário contendo os dados de uma linha da tabela
             com as seguintes chaves:
@@ -155,17 +428,35 @@ class PageMain(WebDriverBaseActions):
             Exceções podem ser levantadas em caso de erro durante a captura
             dos dados ou falha ao localizar os elementos da página.
         """
-        rows = self._find_elements_in_page(PageMainLocators.ROWS_OF_TABLE)
-        for row in rows:
-            cells = self._find_elements_in_web_element(
-                row, PageMainLocators.CELLS_OF_ROWS
-            )
-            if len(cells) > 3:
-                element_url_file = self.get_url_file(
-                    cells[3], PageMainLocators.LINK_TO_URL_FILE
+        with TRACER.span('get_rows', 'browser', page=self.current_page):
+            start = time.perf_counter()
+            elapsed = 0.0
+            count = 0
+            captured = []
+            rows = self._find_elements_in_page(PageMainLocators.ROWS_OF_TABLE)
+            for row in rows:
+                cells = self._find_elements_in_web_element(
+                    row, PageMainLocators.CELLS_OF_ROWS
                 )
-                yield {
-                    'NUMERO_DA_FATURA': cells[1].text,
-                    'DATA_DA_FATURA': cells[2].text,
-                    'URL_DA_FATURA': element_url_file
-                }
+                if len(cells) > 3:
+                    element_url_file = self.get_url_file(
+                        cells[3], PageMainLocators.LINK_TO_URL_FILE
+                    )
+                    row_data = {
+                        'NUMERO_DA_FATURA': cells[1].text,
+                        'DATA_DA_FATURA': cells[2].text,
+                        'URL_DA_FATURA': element_url_file
+                    }
+                    elapsed += time.perf_counter() - start
+                    count += 1
+                    REGISTRY.increment('rows_scanned_total')
+                    if CAPTURE.enabled:
+                        captured.append(dict(row_data))
+                    yield row_data
+                    start = time.perf_counter()
+            elapsed += time.perf_counter() - start
+            self._latency = elapsed / count if count else None
+            REGISTRY.observe('browser_seconds', elapsed, operation='read_rows')
+            CAPTURE.record(
+                'rows', elapsed, page=self.current_page, rows=captured
+            )
@@ -0,0 +1,166 @@
+from datetime import date
+from typing import Any, Generator
+
+from src.managers.capture import CaptureArchive
+from src.managers.metrics import REGISTRY
+from src.managers.tracer import TRACER
+
+
+
+class ReplayPageMain:
+    """
+    Reproduz a página principal a partir de uma gravação
+    (CaptureArchive), sem abrir o navegador.
+
+    Possui os mesmos métodos utilizados pela máquina de estados na
+    PageMain: as páginas da tabela retornam as linhas gravadas, o filtro
+    de data retorna a quantidade gravada e o botão "Next" fica
+    desabilitado na última página gravada. Cada operação aguarda a
+    duração gravada, conforme a velocidade da reprodução, e registra as
+    mesmas métricas e intervalos do rastreamento da PageMain.
+
+    Attributes:
+        archive (CaptureArchive): A gravação reproduzida.
+        current_page (int): Número da página atual da tabela.
+    """
+
+    def __init__(self, archive: CaptureArchive):
+        """
+        Inicializa a página da reprodução na primeira página.
+
+        Args:
+            archive (CaptureArchive): A gravação reproduzida.
+        """
+        self.archive = archive
+        self.current_page = 1
+
+
+    def open_site(self, url: str):
+        """
+        Simula a abertura do site e reinicia o contador de páginas.
+
+        Args:
+            url (str): URL do site, apenas registrada no rastreamento.
+        """
+        with (
+            TRACER.span('open_site', 'browser', url=url),
+            REGISTRY.timer('browser_seconds', operation='open_site'),
+        ):
+            self.archive.wait(self.archive.first('open_site'))
+        self.current_page = 1
+
+
+    def check_table(self) -> bool | None:
+        """
+        Verifica se a gravação contém alguma página da tabela.
+
+        Returns:
+            bool | None: True se houver páginas gravadas.
+        """
+        return True if self.archive.pages else None
+
+
+    def apply_date_filter(self, max_date: date = None) -> int | None:
+        """
+        Retorna a quantidade de linhas do filtro de data gravado. As
+        páginas gravadas já contêm apenas as linhas filtradas no site.
+
+        Args:
+            max_date (date, opcional): Ignorada na reprodução.
+
+        Returns:
+            int | None: Quantidade de linhas gravada, ou None se o filtro
+            não foi aplicado na gravação.
+        """
+        event = self.archive.first('date_filter')
+        with (
+            TRACER.span('apply_date_filter', 'browser'),
+            REGISTRY.timer('browser_seconds', operation='date_filter'),
+        ):
+            self.archive.wait(event)
+        if event is None or event['total_rows'] is None:
+            return None
+        self.current_page = 1
+        return int(event['total_rows'])
+
+
+    def get_table_data(self) -> list | None:
+        """
+        A gravação não contém os dados da tabela inteira: a comparação
+        da tabela com a execução anterior fica indisponível na reprodução.
+
+        Returns:
+            list | None: Sempre None.
+        """
+        return None
+
+
+    def get_rows(self) -> Generator[dict[str, str], Any, None]:
+        """
+        Retorna, uma por uma, as linhas gravadas da página atual.
+
+        Yields:
+            dict: Os dados de uma linha da tabela, com as mesmas chaves
+            da PageMain.
+        """
+        event = self.archive.pages.get(self.current_page)
+        with TRACER.span('get_rows', 'browser', page=self.current_page):
+            self.archive.wait(event)
+            if event is not None:
+                REGISTRY.observe(
+                    'browser_seconds', event['duration'],
+                    operation='read_rows'
+                )
+                for row_data in event['rows']:
+                    REGISTRY.increment('rows_scanned_total')
+                    yield dict(row_data)
+
+
+    def check_button_next_disabled(self) -> bool | None:
+        """
+        Verifica se o botão "Next" estava desabilitado na página atual
+        da gravação. Sem o evento gravado, a última página gravada é
+        considerada a última página da tabela.
+
+        Returns:
+            bool | None: True se o botão estiver desabilitado, caso
+            contrário None.
+        """
+        event = self.archive.first('next_disabled', self.current_page)
+        self.archive.wait(event)
+        if event is not None:
+            return event['disabled']
+        if self.current_page >= max(self.archive.pages, default=0):
+            return True
+        return None
+
+
+    def click_next_button(self):
+        """
+        Avança para a próxima página gravada.
+        """
+        event = self.archive.first('next_page', self.current_page)
+        with (
+            TRACER.span('click_next', 'browser', page=self.current_page),
+            REGISTRY.timer('browser_seconds', operation='next_page'),
+        ):
+            self.archive.wait(event)
+        self.current_page += 1
+
+
+    def screenshot_of_screen(self, path_image: str = 'erro.png'):
+        """
+        Não há tela na reprodução: nenhum screenshot é salvo.
+
+        Args:
+            path_image (str): Caminho que o screenshot teria.
+        """
+        return None
+
+
+    def close_browser(self):
+        """
+        Não há navegador na reprodução. O arquivo da gravação é fechado
+        ao final da execução.
+        """
+        return None
@@ -0,0 +1,94 @@
+class PageMainScripts:
+    """
+    Scripts JavaScript executados na página principal do site.
+
+    Assim como os localizadores, os scripts ficam centralizados em uma
+    classe própria para que, caso a página mude, apenas a definição do
+    script precise ser atualizada.
+
+    Os scripts utilizam a API do DataTables (biblioteca que renderiza a
+    tabela 'tableSandbox' no site) para que o filtro e a paginação sejam
+    feitos pela própria tabela, no navegador.
+    """
+
+    # Registra um filtro de busca no DataTables que mantém apenas as linhas
+    # cuja data (terceira coluna, formato DD-MM-YYYY) seja menor ou igual a
+    # data limite recebida em arguments[0] como inteiro YYYYMMDD.
+    # Retorna a quantidade de linhas que passaram no filtro ou null caso a
+    # API do DataTables não esteja disponível na página.
+    APPLY_DATE_FILTER = """
+        var maxDate = arguments[0];
+        var $ = window.jQuery;
+        if (!$ || !$.fn || !$.fn.dataTable) {
+            return null;
+        }
+        var search = $.fn.dataTable.ext.search;
+        for (var i = search.length - 1; i >= 0; i--) {
+            if (search[i]._rpaDateFilter) {
+                search.splice(i, 1);
+            }
+        }
+        var dateFilter = function (settings, data) {
+            if (settings.nTable.id !== 'tableSandbox') {
+                return true;
+            }
+            var parts = (data[2] || '').trim().split('-');
+            if (parts.length !== 3) {
+                return false;
+            }
+            var day = parseInt(parts[0], 10);
+            var month = parseInt(parts[1], 10);
+            var year = parseInt(parts[2], 10);
+            if (isNaN(day) || isNaN(month) || isNaN(year)) {
+                return false;
+            }
+            return (year * 10000 + month * 100 + day) <= maxDate;
+        };
+        dateFilter._rpaDateFilter = true;
+        search.push(dateFilter);
+        var table = $('#tableSandbox').DataTable();
+        table.draw();
+        return table.page.info().recordsDisplay;
+    """
+
+    # Exibe a página da tabela recebida em arguments[0] (começando em 1),
+    # mantendo o filtro aplicado. Retorna o número da página exibida
+    # (começando em 1) ou null caso a API do DataTables não esteja
+    # disponível na página.
+    GO_TO_PAGE = """
+        var $ = window.jQuery;
+        if (!$ || !$.fn || !$.fn.dataTable) {
+            return null;
+        }
+        var table = $('#tableSandbox').DataTable();
+        table.page(arguments[0] - 1).draw('page');
+        return table.page.info().page + 1;
+    """
+
+    # Retorna os dados de todas as linhas que passaram no filtro da tabela,
+    # em todas as páginas, como uma lista de linhas (valores das células)
+    # ou null caso a API do DataTables não esteja disponível na página.
+    GET_TABLE_DATA = """
+        var $ = window.jQuery;
+        if (!$ || !$.fn || !$.fn.dataTable) {
+            return null;
+        }
+        var table = $('#tableSandbox').DataTable();
+        if (!table.rows) {
+            return null;
+        }
+        return table.rows({search: 'applied'}).data().toArray();
+    """
+
+    # Inicia no navegador, sem aguardar as respostas, o download das URLs
+    # recebidas em arguments[0], com os cookies do site. As respostas ficam
+    # disponíveis para o BrowserNetwork.
+    # Retorna a quantidade de downloads iniciados.
+    PREFETCH_FILES = """
+        var urls = arguments[0] || [];
+        for (var i = 0; i < urls.length; i++) {
+            fetch(urls[i], {credentials: 'include', mode: 'no-cors'})
+                .catch(function () {});
+        }
+        return urls.length;
+    """
@@ -173,4 +173,41 @@ class WebDriverBaseActions(WebDriverController):
         )
         element = self.driver.find_element(selector.by, selector.value)
         return element.text
-    
+
+
+    def _execute_script(self, script: str, *args):
+        """
+        Executa um script JavaScript na página atual.
+
+        Args:
+            script (str): Código JavaScript a ser executado.
+            *args: Argumentos repassados ao script, acessíveis através
+            de 'arguments' no JavaScript.
+
+        Returns:
+            Any: O valor retornado pelo script.
+        """
+        return self.driver.execute_script(script, *args)
+
+
+    def _restart_driver(self):
+        """
+        Fecha o navegador e abre uma nova instância do WebDriver, com as
+        mesmas opções, recriando o WebDriverWait e o ActionChains.
+        """
+        self.close_browser()
+        self.driver = self.get_driver()
+        self.wdw = WebDriverWait(self.driver, 60)
+        self.ac = ActionChains(self.driver)
+
+
+    def _driver_pid(self) -> int | None:
+        """
+        Retorna o PID do chromedriver, do qual descendem os processos
+        do navegador.
+
+        Returns:
+            int | None: O PID, ou None se o driver não expuser o processo.
+        """
+        service = getattr(self.driver, 'service', None)
+        return getattr(getattr(service, 'process', None), 'pid', None)
@@ -3,15 +3,24 @@ import shutil
 import pytest
 import requests
 
+from benchmarks.standin_site import StandinSite
 from src.managers.directory_manager import DirectoryManager
 from src.managers.requests_manager import RequestManager
 
 
+@pytest.fixture(scope='session')
+def standin_site():
+    """Fixture com o site local que reproduz a página do desafio."""
+    with StandinSite(rows=25, page_size=10) as site:
+        yield site
+
+
 @pytest.fixture
 def request_manager():
     """Fixture para criar uma instância do RequestManager."""
     return RequestManager()
 
+
 @pytest.fixture
 def mock_response_img():
     """Fixture para criar uma resposta mockada."""
@@ -27,4 +36,27 @@ def directory_manager(tmp_path):
     test_directory = tmp_path / "test_directory"
     manager = DirectoryManager(str(test_directory))
     yield manager
-    shutil.rmtree(test_directory, ignore_errors=True)
\ No newline at end of file
+    shutil.rmtree(test_directory, ignore_errors=True)
+
+
+@pytest.fixture
+def fingerprint_file(tmp_path):
+    """Fixture com o caminho de um arquivo de impressões digitais."""
+    return str(tmp_path / "STATE" / "fingerprints.json")
+
+
+@pytest.fixture
+def table_rows():
+    """Fixture com as linhas de uma página da tabela."""
+    return [
+        {
+            'NUMERO_DA_FATURA': 'abc123',
+            'DATA_DA_FATURA': '24-12-2024',
+            'URL_DA_FATURA': 'https://site/invoices/1.jpg'
+        },
+        {
+            'NUMERO_DA_FATURA': 'def456',
+            'DATA_DA_FATURA': '13-01-2099',
+            'URL_DA_FATURA': 'https://site/invoices/2.jpg'
+        },
+    ]
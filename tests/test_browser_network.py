@@ -0,0 +1,113 @@
+import base64
+import json
+from types import SimpleNamespace
+
+from src.managers.browser_network import BrowserNetwork
+from src.managers.metrics import REGISTRY
+from src.managers.requests_manager import RequestManager
+
+
+URL = 'http://site/invoices/1.png'
+
+
+class FakeDriver:
+    """Driver com o log de desempenho e os comandos CDP do Chrome."""
+
+    def __init__(self):
+        self.log = []
+        self.bodies = {}
+        self.commands = []
+
+    def event(self, method: str, **params):
+        message = {'message': {'method': method, 'params': params}}
+        self.log.append({'message': json.dumps(message)})
+
+    def load(self, request_id: str, url: str, content: bytes, status=200):
+        self.event('Network.requestWillBeSent', requestId=request_id,
+                   request={'url': url})
+        self.event('Network.responseReceived', requestId=request_id,
+                   response={'status': status, 'mimeType': 'image/png'})
+        self.event('Network.loadingFinished', requestId=request_id)
+        self.bodies[request_id] = content
+
+    def get_log(self, log_type: str) -> list:
+        log, self.log = self.log, []
+        return log
+
+    def execute_cdp_cmd(self, command: str, params: dict) -> dict:
+        self.commands.append(command)
+        if command == 'Network.getResponseBody':
+            body = self.bodies[params['requestId']]
+            return {'body': base64.b64encode(body).decode(),
+                    'base64Encoded': True}
+        return {}
+
+
+def build_network(timeout: float = 0.1) -> tuple:
+    driver = FakeDriver()
+    network = BrowserNetwork(SimpleNamespace(driver=driver), timeout)
+    network.enable()
+    return driver, network
+
+
+def test_browser_network_returns_finished_response():
+    driver, network = build_network()
+    driver.load('1', URL, b'png')
+    assert network.get(URL) == {
+        'status': 200, 'content_type': 'image/png', 'content': b'png'
+    }
+    assert driver.commands == ['Network.enable', 'Network.getResponseBody']
+    assert network.get(URL) is None
+
+
+def test_browser_network_ignores_unknown_failed_and_pending():
+    driver, network = build_network()
+    assert network.get(URL) is None
+    driver.event('Network.requestWillBeSent', requestId='2',
+                 request={'url': URL})
+    driver.event('Network.loadingFailed', requestId='2')
+    assert network.get(URL) is None
+    driver.event('Network.requestWillBeSent', requestId='3',
+                 request={'url': URL})
+    assert network.get(URL) is None
+    assert 'Network.getResponseBody' not in driver.commands
+
+
+def test_browser_network_clear_discards_unused_responses():
+    driver, network = build_network()
+    driver.load('1', URL, b'png')
+    network.clear()
+    assert network.get(URL) is None
+    assert 'Network.getResponseBody' not in driver.commands
+
+
+def test_request_manager_reuses_browser_response(standin_site):
+    driver, network = build_network()
+    invoice_id = standin_site.eligible_rows()[0][1]
+    url = f'{standin_site.url}invoices/{invoice_id}.png'
+    driver.load('1', url, b'do navegador')
+    manager = RequestManager()
+    manager.browser_network = network
+    REGISTRY.reset()
+    assert manager.get(url).content == b'do navegador'
+    assert REGISTRY.value('download_bytes_total', source='browser') == 12
+    assert REGISTRY.value('download_bytes_total', source='http') == 0
+
+    response = manager.get(url)
+    assert response.content != b'do navegador'
+    assert REGISTRY.value('download_bytes_total', source='http') == len(
+        response.content
+    )
+    assert REGISTRY.total('download_bytes_total') == 12 + len(
+        response.content
+    )
+
+
+def test_request_manager_set_cookies(request_manager):
+    request_manager.set_cookies([
+        {'name': 'sessao', 'value': 'abc', 'domain': 'site', 'path': '/',
+         'secure': False, 'httpOnly': True},
+        {'name': 'tema', 'value': 'escuro'},
+    ])
+    assert request_manager.session.cookies.get('sessao', domain='site') == 'abc'
+    assert request_manager.session.cookies.get('tema') == 'escuro'
@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+
+from src.managers.browser_recycler import BrowserRecycler, process_tree_rss
+
+
+def test_process_tree_rss_includes_children():
+    own = process_tree_rss(os.getpid())
+    child = subprocess.Popen(
+        [sys.executable, '-c', 'import sys; sys.stdin.read()'],
+        stdin=subprocess.PIPE
+    )
+    try:
+        tree = process_tree_rss(os.getpid())
+        assert own > 0
+        assert tree > own
+        assert process_tree_rss(child.pid) > 0
+    finally:
+        child.stdin.close()
+        child.wait()
+    assert process_tree_rss(2 ** 22 + 1) == 0
+
+
+def test_recycle_after_pages():
+    recycler = BrowserRecycler(max_pages=3)
+    assert [recycler.page_done() for _ in range(3)] == [None, None, 'pages']
+    recycler.reset()
+    assert recycler.pages == 0
+    assert recycler.restarts == 1
+    assert recycler.page_done() is None
+
+
+def test_recycle_on_rss():
+    recycler = BrowserRecycler(max_rss_mb=0.001)
+    assert recycler.page_done(os.getpid()) == 'rss'
+    assert recycler.peak_rss >= recycler.rss > 0
+    assert BrowserRecycler(max_rss_mb=10 ** 6).page_done(os.getpid()) is None
+
+
+def test_recycle_on_latency():
+    recycler = BrowserRecycler(latency_factor=3.0, window=2)
+    assert recycler.page_done(latency=0.01) is None
+    assert recycler.page_done(latency=0.01) is None
+    assert recycler.page_done(latency=0.02) is None
+    assert recycler.page_done(latency=0.02) is None
+    assert recycler.page_done(latency=0.05) == 'latency'
+    recycler.reset()
+    assert recycler.page_done(latency=0.05) is None
@@ -0,0 +1,94 @@
+import time
+
+import pytest
+
+from src.managers.capture import CaptureArchive, CaptureRecorder
+from src.managers.requests_manager import ReplayRequestManager
+from src.pom.pages.replay_page_main import ReplayPageMain
+
+
+PAGES = {
+    1: [{'NUMERO_DA_FATURA': '1', 'DATA_DA_FATURA': '01-01-2024',
+         'URL_DA_FATURA': 'https://site/invoices/1.jpg'}],
+    2: [{'NUMERO_DA_FATURA': '2', 'DATA_DA_FATURA': '02-01-2024',
+         'URL_DA_FATURA': 'https://site/invoices/2.jpg'}],
+}
+
+
+@pytest.fixture
+def capture_file(tmp_path):
+    """Fixture com uma gravação de duas páginas e três respostas."""
+    recorder = CaptureRecorder()
+    recorder.record('open_site', 0.1)
+    recorder.start(str(tmp_path / 'CAPTURES' / 'run.zip'), url='https://site/')
+    recorder.record('open_site', 0.05, url='https://site/')
+    recorder.record('date_filter', 0.01, max_date=20250101, total_rows=2)
+    for page, rows in PAGES.items():
+        recorder.record('rows', 0.02, page=page, rows=rows)
+        recorder.record('next_disabled', 0.0, page=page,
+                        disabled=True if page == 2 else None)
+        if page == 1:
+            recorder.record('next_page', 0.01, page=page)
+    recorder.record_response(
+        'https://site/invoices/1.jpg', 500, b'erro', 0.01, 'text/plain'
+    )
+    recorder.record_response(
+        'https://site/invoices/1.jpg', 200, b'png-1', 0.01, 'image/png'
+    )
+    recorder.record_response(
+        'https://site/invoices/2.jpg', 200, b'png-2', 0.01, 'image/png'
+    )
+    file = recorder.stop()
+    assert recorder.stop() is None
+    return file
+
+
+def test_replay_page_main_serves_recorded_pages(capture_file):
+    archive = CaptureArchive(capture_file, speed=0)
+    assert archive.metadata['url'] == 'https://site/'
+    assert [event['type'] for event in archive.events][:2] == [
+        'open_site', 'date_filter'
+    ]
+
+    page_main = ReplayPageMain(archive)
+    page_main.open_site('https://site/')
+    assert page_main.check_table()
+    assert page_main.apply_date_filter() == 2
+    pages = []
+    while True:
+        pages.append(list(page_main.get_rows()))
+        if page_main.check_button_next_disabled():
+            break
+        page_main.click_next_button()
+    archive.close()
+    assert pages == [PAGES[1], PAGES[2]]
+
+
+def test_replay_request_manager_returns_recorded_responses(capture_file):
+    archive = CaptureArchive(capture_file, speed=0)
+    request = ReplayRequestManager(archive)
+    with pytest.raises(Exception, match='Erro: 500'):
+        request.get('https://site/invoices/1.jpg')
+    response = request.get('https://site/invoices/1.jpg')
+    assert response.content == b'png-1'
+    assert response.headers['Content-Type'] == 'image/png'
+    assert request.get('https://site/invoices/1.jpg').content == b'png-1'
+    with pytest.raises(Exception, match='Erro: 404'):
+        request.get('https://site/invoices/3.jpg')
+    archive.close()
+
+
+def test_replay_waits_recorded_durations(capture_file):
+    archive = CaptureArchive(capture_file, speed=0.5)
+    page_main = ReplayPageMain(archive)
+    start = time.perf_counter()
+    page_main.open_site('https://site/')
+    assert time.perf_counter() - start >= 0.1
+    archive.close()
+
+
+def test_invalid_capture_file(tmp_path):
+    file = tmp_path / 'vazio.zip'
+    file.write_bytes(b'nada')
+    with pytest.raises(ValueError):
+        CaptureArchive(str(file))
@@ -0,0 +1,91 @@
+import pytest
+
+from src.managers.dead_letter_queue import DeadLetterQueue, RetryWorker
+
+
+@pytest.fixture
+def dead_letter_queue(tmp_path):
+    """Fixture para criar uma fila de falhas em um diretório temporário."""
+    return DeadLetterQueue(str(tmp_path / 'STATE' / 'dead_letter.json'))
+
+
+def test_add_persists_item(dead_letter_queue):
+    dead_letter_queue.add('id1', {'valor': 1}, Exception('Erro: 500'), 'run')
+
+    reloaded = DeadLetterQueue(dead_letter_queue.file)
+    items = reloaded.items()
+    assert len(items) == 1
+    assert items[0]['attempts'] == 1
+    assert items[0]['error'] == 'Erro: 500'
+    assert reloaded.pending('run')
+    assert not reloaded.pending('outra')
+
+
+def test_add_moves_item_to_new_run(dead_letter_queue):
+    error = Exception('Erro: 500')
+    dead_letter_queue.add('id1', {'valor': 1}, error, 'run1')
+    dead_letter_queue.retry_later('id1', error, 0, 2)
+
+    dead_letter_queue.add('id1', {'valor': 2}, Exception('Erro: 503'), 'run2')
+
+    assert not dead_letter_queue.pending('run1')
+    pending = dead_letter_queue.pending('run2')
+    assert len(pending) == 1
+    assert pending[0]['data'] == {'valor': 2}
+    assert pending[0]['attempts'] == 1
+    assert pending[0]['status'] == DeadLetterQueue.PENDING
+
+
+def test_retry_worker_recovers_item(dead_letter_queue):
+    calls = []
+
+    def handler(data):
+        calls.append(data)
+        if len(calls) < 2:
+            raise Exception('Erro: 503')
+        return data
+
+    dead_letter_queue.add('id1', {'valor': 1}, Exception('Erro: 503'))
+    worker = RetryWorker(
+        dead_letter_queue,
+        handler,
+        backoff_base=0.01,
+        backoff_max=0.01,
+        poll_interval=0.01
+    )
+    worker.start()
+    assert worker.drain(timeout=5)
+    worker.stop()
+
+    assert worker.get_completed() == [{'valor': 1}]
+    assert len(dead_letter_queue) == 0
+
+
+def test_retry_worker_marks_item_as_dead(dead_letter_queue):
+    def handler(data):
+        raise Exception('Erro: 503')
+
+    dead_letter_queue.add('id1', {'valor': 1}, Exception('Erro: 503'))
+    worker = RetryWorker(
+        dead_letter_queue,
+        handler,
+        max_attempts=3,
+        backoff_base=0.01,
+        backoff_max=0.01,
+        poll_interval=0.01
+    )
+    worker.start()
+    assert worker.drain(timeout=5)
+    worker.stop()
+
+    items = dead_letter_queue.items()
+    assert items[0]['status'] == DeadLetterQueue.DEAD
+    assert items[0]['attempts'] == 3
+    assert worker.dead == 1
+
+
+def test_backoff_is_exponential_and_limited(dead_letter_queue):
+    worker = RetryWorker(
+        dead_letter_queue, lambda data: data, backoff_base=2, backoff_max=10
+    )
+    assert [worker.backoff(n) for n in range(1, 5)] == [2, 4, 8, 10]
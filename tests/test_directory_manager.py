@@ -1,4 +1,5 @@
 import os
+import time
 
 
 def test_create_directory(directory_manager):
@@ -71,4 +72,56 @@ def test_monitor_directory_returns_none(directory_manager):
     assert found_file == None
 
 
-
+def test_search_files_sees_external_files_after_directory_changes(
+        directory_manager
+    ):
+    directory = directory_manager.directory
+    for name in ("fatura1.png", "fatura2.png", ".oculto_fatura.png"):
+        with open(os.path.join(directory, name), 'w') as f:
+            f.write(name)
+    old = time.time() - 10
+    os.utime(directory, (old, old))
+
+    assert sorted(directory_manager.search_files("fatura")) == [
+        "fatura1.png", "fatura2.png"
+    ]
+
+    # Arquivo criado por outro processo, sem alterar a data do diretório.
+    with open(os.path.join(directory, "fatura3.png"), 'w') as f:
+        f.write("fatura3.png")
+    os.utime(directory, (old, old))
+    assert directory_manager.search_files("fatura3") == []
+
+    newer = old + 5
+    os.utime(directory, (newer, newer))
+    assert directory_manager.search_files("fatura3") == ["fatura3.png"]
+
+    directory_manager.delete_file("fatura1.png")
+    assert sorted(directory_manager.search_files("fatura")) == [
+        "fatura2.png", "fatura3.png"
+    ]
+
+
+def test_delete_files_in_parallel_batches(directory_manager):
+    directory = directory_manager.directory
+    for index in range(50):
+        with open(os.path.join(directory, f"file{index}.txt"), 'w') as f:
+            f.write("File")
+    os.makedirs(os.path.join(directory, "subdirectory"))
+
+    deleted = directory_manager.delete_files(workers=4, batch_size=8)
+    assert deleted == 50
+    assert os.listdir(directory) == ["subdirectory"]
+
+
+def test_delete_files_in_background(directory_manager):
+    directory = directory_manager.directory
+    for name in ("file1.txt", "file2.txt", ".hidden"):
+        with open(os.path.join(directory, name), 'w') as f:
+            f.write(name)
+
+    thread = directory_manager.delete_files(background=True)
+    assert sorted(os.listdir(directory)) == [".hidden"]
+    thread.join()
+    parent = os.path.dirname(directory)
+    assert not [name for name in os.listdir(parent) if "deleting" in name]
@@ -0,0 +1,85 @@
+import os
+import threading
+import time
+
+import pytest
+
+from src.managers.directory_watcher import (
+    PollingWatcher, create_watcher, inotify_available
+)
+
+
+requires_inotify = pytest.mark.skipif(
+    not inotify_available(), reason='inotify disponível apenas no Linux'
+)
+
+
+def write_later(path, delay=0.2, content='fatura'):
+    """Grava um arquivo em segundo plano após um intervalo."""
+    def write():
+        time.sleep(delay)
+        with open(path, 'w') as file:
+            file.write(content)
+    thread = threading.Thread(target=write)
+    thread.start()
+    return thread
+
+
+@requires_inotify
+def test_monitor_directory_wakes_up_on_new_file(directory_manager):
+    path = os.path.join(directory_manager.directory, 'fatura.png')
+    thread = write_later(path)
+    start = time.monotonic()
+    found = directory_manager.monitor_directory('fatura', 10, interval=5)
+    thread.join()
+
+    assert found == 'fatura.png'
+    assert time.monotonic() - start < 2
+
+
+def test_monitor_directory_returns_existing_file(directory_manager):
+    path = os.path.join(directory_manager.directory, 'fatura.png')
+    with open(path, 'w') as file:
+        file.write('fatura')
+    assert directory_manager.monitor_directory('fatura', timeout=1) == (
+        'fatura.png'
+    )
+
+
+@requires_inotify
+def test_watch_files_streams_completed_and_moved_files(directory_manager):
+    directory = directory_manager.directory
+    files = directory_manager.watch_files('fatura', timeout=2)
+
+    def produce():
+        for name in ('fatura1.png', 'outro.txt', 'fatura2.png'):
+            with open(os.path.join(directory, name), 'w') as file:
+                file.write(name)
+        temporary = os.path.join(directory, '.fatura3.png.part')
+        with open(temporary, 'w') as file:
+            file.write('fatura3')
+        os.rename(temporary, os.path.join(directory, 'fatura3.png'))
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    found = [os.path.basename(next(files)) for _ in range(3)]
+    files.close()
+    thread.join()
+
+    assert found == ['fatura1.png', 'fatura2.png', 'fatura3.png']
+
+
+def test_polling_watcher_fallback(tmp_path):
+    (tmp_path / 'existente.png').write_text('fatura')
+    with PollingWatcher(str(tmp_path), interval=0.05) as watcher:
+        thread = write_later(str(tmp_path / 'fatura.png'), delay=0.1)
+        found = next(watcher.watch('fatura', timeout=2))
+        thread.join()
+    assert found == 'fatura.png'
+
+
+def test_watcher_times_out_without_files(tmp_path):
+    with create_watcher(str(tmp_path), interval=0.05) as watcher:
+        start = time.monotonic()
+        assert list(watcher.watch('fatura', timeout=0.3)) == []
+    assert time.monotonic() - start < 1
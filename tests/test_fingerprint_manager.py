@@ -0,0 +1,99 @@
+from src.managers.fingerprint_manager import FingerprintManager
+
+
+def _run_page(manager, rows):
+    emitted = [dict(rows[0], DATA_DA_FATURA='24/12/2024')]
+    hashes = {rows[0]['NUMERO_DA_FATURA']: manager.hash_row(rows[0])}
+    manager.mark_page(1, rows, emitted, hashes)
+    return emitted
+
+
+def test_first_execution_has_no_previous_pages(fingerprint_file, table_rows):
+    manager = FingerprintManager(fingerprint_file)
+    assert not manager.page_unchanged(1, table_rows)
+    assert manager.is_new_or_changed(table_rows[0])
+    assert manager.get_emitted_rows() == []
+
+
+def test_unchanged_page_is_detected(fingerprint_file, table_rows):
+    manager = FingerprintManager(fingerprint_file)
+    emitted = _run_page(manager, table_rows)
+    manager.save_file()
+
+    next_run = FingerprintManager(fingerprint_file)
+    assert next_run.page_unchanged(1, table_rows)
+    assert next_run.get_emitted_rows(1) == emitted
+    assert not next_run.is_new_or_changed(table_rows[0])
+
+
+def test_changed_row_is_detected(fingerprint_file, table_rows):
+    manager = FingerprintManager(fingerprint_file)
+    _run_page(manager, table_rows)
+    manager.save_file()
+
+    changed_rows = [dict(row) for row in table_rows]
+    changed_rows[0]['URL_DA_FATURA'] = 'https://site/invoices/3.jpg'
+
+    next_run = FingerprintManager(fingerprint_file)
+    assert not next_run.page_unchanged(1, changed_rows)
+    assert next_run.is_new_or_changed(changed_rows[0])
+
+
+def test_newly_eligible_row_changes_page(fingerprint_file, table_rows):
+    manager = FingerprintManager(fingerprint_file)
+    _run_page(manager, table_rows[:1])
+    manager.save_file()
+
+    next_run = FingerprintManager(fingerprint_file)
+    assert next_run.page_unchanged(1, table_rows[:1])
+    assert not next_run.page_unchanged(1, table_rows)
+
+
+def test_table_signature_only_saved_on_complete_run(
+        fingerprint_file, table_rows
+    ):
+    table_data = [list(row.values()) for row in table_rows]
+    manager = FingerprintManager(fingerprint_file)
+    manager.table_unchanged(table_data)
+    _run_page(manager, table_rows)
+    manager.save_file(complete=False)
+
+    next_run = FingerprintManager(fingerprint_file)
+    assert not next_run.table_unchanged(table_data)
+    assert next_run.page_unchanged(1, table_rows)
+    next_run.carry_over_all()
+    next_run.save_file(complete=True)
+
+    last_run = FingerprintManager(fingerprint_file)
+    assert last_run.table_unchanged(table_data)
+    assert not last_run.table_unchanged(table_data[:-1])
+    assert not last_run.table_unchanged(None)
+
+
+def test_table_signature_detects_change_after_first_page(
+        fingerprint_file, table_rows
+    ):
+    table_data = [list(row.values()) for row in table_rows] * 3
+    manager = FingerprintManager(fingerprint_file)
+    manager.table_unchanged(table_data)
+    manager.save_file()
+
+    changed_data = [list(row) for row in table_data]
+    changed_data[-1][1] = '01-01-2000'
+    next_run = FingerprintManager(fingerprint_file)
+    assert not next_run.table_unchanged(changed_data)
+
+
+def test_emitted_row_keeps_ocr_fields(fingerprint_file, table_rows):
+    manager = FingerprintManager(fingerprint_file)
+    _run_page(manager, table_rows)
+    id_fatura = table_rows[0]['NUMERO_DA_FATURA']
+    manager.update_emitted_row(id_fatura, {'VALOR_TOTAL': '3000.00'})
+    manager.save_file()
+
+    next_run = FingerprintManager(fingerprint_file)
+    row = next_run.get_emitted_row(id_fatura)
+    assert row['VALOR_TOTAL'] == '3000.00'
+    row['VALOR_TOTAL'] = None
+    assert next_run.get_emitted_row(id_fatura)['VALOR_TOTAL'] == '3000.00'
+    assert next_run.get_emitted_row('outra') is None
@@ -0,0 +1,118 @@
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from src.managers.image_loader import (
+    PNG_SIGNATURE, PngDecoder, encode_png, read_png_header, to_grayscale
+)
+
+
+def random_pixels(shape, seed=0):
+    """Gera pixels aleatórios com regiões repetidas, como em uma fatura."""
+    generator = np.random.default_rng(seed)
+    pixels = generator.integers(0, 256, size=shape, dtype=np.uint8)
+    pixels[: shape[0] // 2] = 255
+    return pixels
+
+
+def build_png(header, rows, palette=None):
+    """Monta uma imagem PNG a partir de linhas já filtradas."""
+    def chunk(kind, data):
+        return (
+            struct.pack('>I', len(data)) + kind + data
+            + struct.pack('>I', zlib.crc32(kind + data))
+        )
+
+    chunks = [PNG_SIGNATURE, chunk(b'IHDR', struct.pack('>IIBBBBB', *header))]
+    if palette is not None:
+        chunks.append(chunk(b'PLTE', palette))
+    chunks.append(chunk(b'IDAT', zlib.compress(rows)))
+    chunks.append(chunk(b'IEND', b''))
+    return b''.join(chunks)
+
+
+@pytest.mark.parametrize('filter_type', [0, 1, 2, 3, 4, None])
+@pytest.mark.parametrize('channels', [1, 2, 3, 4])
+def test_decode_round_trip(filter_type, channels):
+    pixels = random_pixels((12, 9, channels))
+    data = encode_png(pixels, filter_type=filter_type)
+
+    decoded = PngDecoder().decode(data)
+    assert decoded.dtype == np.uint8
+    assert np.array_equal(decoded, pixels)
+
+
+def test_decode_grayscale_and_file(tmp_path):
+    pixels = random_pixels((7, 5, 3))
+    path = tmp_path / 'fatura.png'
+    path.write_bytes(encode_png(pixels))
+
+    gray = PngDecoder().decode(str(path), grayscale=True)
+    red, green, blue = pixels.astype(np.uint32).transpose(2, 0, 1)
+    expected = (red * 77 + green * 150 + blue * 29 + 128) >> 8
+    assert gray.shape == (7, 5)
+    assert np.array_equal(gray, expected.astype(np.uint8))
+
+
+def test_to_grayscale_composites_alpha_on_white():
+    pixels = np.array([[[0, 0], [0, 255], [100, 0]]], dtype=np.uint8)
+    assert to_grayscale(pixels).tolist() == [[255, 0, 255]]
+
+
+def test_decode_palette_and_low_bit_depth():
+    palette = bytes([0, 0, 0, 255, 0, 0, 0, 255, 0, 255, 255, 255])
+    # 2 bits por pixel: índices 0, 1, 2, 3 em um byte por linha.
+    rows = bytes([0, 0b00011011, 0, 0b11100100])
+    data = build_png((4, 2, 2, 3, 0, 0, 0), rows, palette)
+
+    decoded = PngDecoder().decode(data)
+    assert decoded.shape == (2, 4, 3)
+    assert decoded[0, 1].tolist() == [255, 0, 0]
+    assert decoded[1, 0].tolist() == [255, 255, 255]
+
+
+def test_decode_16_bit_keeps_high_byte():
+    rows = bytes([0, 0x12, 0x34, 0xAB, 0xCD])
+    data = build_png((2, 1, 16, 0, 0, 0, 0), rows)
+    assert PngDecoder().decode(data).reshape(-1).tolist() == [0x12, 0xAB]
+
+
+def test_decode_rejects_jpeg_and_corrupted_data():
+    decoder = PngDecoder()
+    with pytest.raises(ValueError, match='JPEG'):
+        decoder.decode(b'\xff\xd8\xff\xe0' + b'\x00' * 40)
+
+    data = bytearray(encode_png(random_pixels((4, 4))))
+    data[-20] ^= 0xFF
+    with pytest.raises(ValueError):
+        decoder.decode(bytes(data))
+
+
+def test_decoder_reuses_buffer():
+    decoder = PngDecoder()
+    first = decoder.decode(encode_png(random_pixels((10, 10, 3), seed=1)))
+    buffer = decoder._buffer
+    second = decoder.decode(encode_png(random_pixels((8, 8, 3), seed=2)))
+
+    assert decoder._buffer is buffer
+    assert not np.shares_memory(first, second)
+
+
+def test_decode_batch_to_memmap(tmp_path):
+    paths = []
+    for index, shape in enumerate([(6, 4), (3, 8)]):
+        path = tmp_path / f'fatura{index}.png'
+        path.write_bytes(encode_png(random_pixels(shape, seed=index)))
+        paths.append(str(path))
+
+    memmap_file = str(tmp_path / 'lote.npy')
+    batch, shapes = PngDecoder().decode_batch(paths, memmap_file=memmap_file)
+
+    assert batch.shape == (2, 6, 8)
+    assert shapes == [(6, 4), (3, 8)]
+    assert (batch[1, 3:] == 255).all()
+    stored = np.load(memmap_file, mmap_mode='r')
+    assert np.array_equal(stored[0, :6, :4], random_pixels((6, 4), seed=0))
+    assert read_png_header(paths[1])['width'] == 8
@@ -0,0 +1,116 @@
+import os
+import threading
+
+import pytest
+
+from src.managers.image_pack import ImagePack
+from src.managers.ocr_cache import OcrCache
+from src.managers.ocr_manager import OcrManager
+
+
+def test_image_pack_put_get_and_reopen(tmp_path):
+    file = str(tmp_path / 'execucao.pack')
+    image_pack = ImagePack(file)
+    location = image_pack.put('284210', b'imagem 1')
+    image_pack.put('284212', b'imagem 2')
+    image_pack.put('284210', b'imagem 1 nova')
+
+    assert location == f'{file}#284210'
+    assert bytes(image_pack.get('284210')) == b'imagem 1 nova'
+    assert image_pack.keys() == ['284210', '284212']
+    assert len(image_pack) == 2 and '284212' in image_pack
+    image_pack.close()
+
+    reopened = ImagePack(file, readonly=True)
+    assert bytes(reopened.get('284212')) == b'imagem 2'
+    assert bytes(reopened.get('284210')) == b'imagem 1 nova'
+    with pytest.raises(KeyError):
+        reopened.get('999999')
+    with pytest.raises(PermissionError):
+        reopened.put('284213', b'imagem 3')
+    reopened.close()
+
+
+def test_image_pack_reads_after_growing(tmp_path):
+    image_pack = ImagePack(str(tmp_path / 'execucao.pack'))
+    image_pack.put('1', b'a' * 10)
+    first = image_pack.get('1')
+    image_pack.put('2', b'b' * 100000)
+
+    assert bytes(image_pack.get('2')) == b'b' * 100000
+    assert bytes(first) == b'a' * 10
+    image_pack.close()
+
+
+def test_image_pack_rebuilds_index_and_drops_partial_record(tmp_path):
+    file = str(tmp_path / 'execucao.pack')
+    image_pack = ImagePack(file)
+    image_pack.put('1', b'imagem 1')
+    image_pack.put('2', b'imagem 2')
+    image_pack.close()
+    size = os.path.getsize(file)
+    with open(file, 'ab') as pack:
+        pack.write(b'FIMG\x01\x00')
+    os.remove(f'{file}.idx')
+
+    rebuilt = ImagePack(file)
+    assert rebuilt.keys() == ['1', '2']
+    assert os.path.getsize(file) == size
+    rebuilt.put('3', b'imagem 3')
+    rebuilt.close()
+
+    reopened = ImagePack(file, readonly=True)
+    assert reopened.keys() == ['1', '2', '3']
+    assert bytes(reopened.get('3')) == b'imagem 3'
+    reopened.close()
+
+
+def test_image_pack_get_while_another_thread_writes(tmp_path):
+    image_pack = ImagePack(str(tmp_path / 'execucao.pack'))
+    image_pack.put('0', b'imagem 0')
+    assert '0' in image_pack
+
+    def writer():
+        for number in range(1, 2000):
+            image_pack.put(str(number), f'imagem {number}'.encode())
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    while thread.is_alive():
+        assert bytes(image_pack.get('0')) == b'imagem 0'
+        assert len(image_pack) >= 1
+    thread.join()
+    assert len(image_pack) == 2000
+    assert bytes(image_pack.get('1999')) == b'imagem 1999'
+    image_pack.close()
+
+
+def test_image_pack_rejects_long_keys(tmp_path):
+    image_pack = ImagePack(str(tmp_path / 'execucao.pack'))
+    with pytest.raises(ValueError):
+        image_pack.put('1' * 40, b'imagem')
+    image_pack.close()
+
+
+def test_image_pack_export_to_loose_files(tmp_path):
+    image_pack = ImagePack(str(tmp_path / 'execucao.pack'))
+    image_pack.put('284210', b'imagem 1')
+    image_pack.put('284212', b'imagem 2')
+
+    paths = image_pack.export(str(tmp_path / 'exportadas'))
+    image_pack.close()
+
+    assert [os.path.basename(path) for path in paths] == [
+        '284210.png', '284212.png'
+    ]
+    with open(paths[1], 'rb') as file:
+        assert file.read() == b'imagem 2'
+
+
+def test_ocr_manager_hashes_image_content_like_files(tmp_path):
+    path = tmp_path / 'fatura.png'
+    path.write_bytes(b'imagem da fatura')
+
+    assert OcrManager._hash_image(b'imagem da fatura') == (
+        OcrCache.hash_file(str(path))
+    )
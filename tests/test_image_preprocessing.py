@@ -0,0 +1,113 @@
+from collections import deque
+
+import numpy as np
+import pytest
+
+from src.managers.image_loader import PNG_SIGNATURE, encode_png
+from src.managers.image_preprocessing import (
+    adaptive_threshold, connected_components, deskew, estimate_skew,
+    find_lines, preprocess, preprocess_batch, remove_noise
+)
+from src.managers.ocr_manager import TesseractEngine
+
+
+def text_image(height=200, width=300, lines=5):
+    """Gera uma imagem com linhas de 'palavras' escuras em fundo claro."""
+    image = np.full((height, width), 230, dtype=np.uint8)
+    image += np.linspace(0, 20, width, dtype=np.uint8)[np.newaxis, :]
+    for line in range(lines):
+        top = 20 + line * 35
+        for left in range(20, width - 40, 45):
+            image[top:top + 10, left:left + 30] = 30
+    return image
+
+
+def count_components(binary):
+    """Conta os componentes conexos (vizinhança-8) por busca em largura."""
+    seen = np.zeros_like(binary)
+    count = 0
+    for y, x in zip(*np.nonzero(binary)):
+        if seen[y, x]:
+            continue
+        count += 1
+        queue = deque([(y, x)])
+        seen[y, x] = True
+        while queue:
+            cy, cx = queue.popleft()
+            for ny in range(cy - 1, cy + 2):
+                for nx in range(cx - 1, cx + 2):
+                    if (0 <= ny < binary.shape[0] and 0 <= nx < binary.shape[1]
+                            and binary[ny, nx] and not seen[ny, nx]):
+                        seen[ny, nx] = True
+                        queue.append((ny, nx))
+    return count
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_connected_components_matches_reference(seed):
+    binary = np.random.default_rng(seed).random((40, 50)) < 0.4
+    components = connected_components(binary)
+
+    assert components['count'] == count_components(binary)
+    assert components['area'].sum() == binary.sum()
+
+
+def test_connected_components_batch_keeps_images_apart():
+    binary = np.zeros((2, 5, 5), dtype=bool)
+    binary[0, 4, :] = True
+    binary[1, 0, :] = True
+    components = connected_components(binary)
+
+    assert components['count'] == 2
+    assert components['image'].tolist() == [0, 1]
+    assert components['top'].tolist() == [4, 0]
+    assert components['bottom'].tolist() == [5, 1]
+
+
+def test_adaptive_threshold_and_noise_removal():
+    image = text_image()
+    image[150, 150] = 0
+    binary = adaptive_threshold(image)
+    assert binary[25, 30] and not binary[5, 5]
+
+    cleaned = remove_noise(binary, min_area=4)
+    assert not cleaned[150, 150]
+    assert cleaned[25, 30]
+
+
+@pytest.mark.parametrize('angle', [-3.0, 1.5])
+def test_estimate_skew_and_deskew(angle):
+    binary = adaptive_threshold(text_image())
+    skewed = deskew(binary, -angle, fill=False)
+
+    estimated = estimate_skew(skewed)
+    assert estimated == pytest.approx(angle, abs=0.2)
+    assert len(find_lines(deskew(skewed, estimated, fill=False))) == 5
+
+
+def test_preprocess_batch_crops_and_handles_blank_images():
+    image = text_image()
+    batch = np.stack([image, np.full_like(image, 255)])
+    results = preprocess_batch(batch)
+
+    text, blank = results
+    top, left, bottom, right = text['box']
+    assert (top, left) == (10, 10)
+    assert text['image'].shape == (bottom - top, right - left)
+    assert set(np.unique(text['image'])) == {0, 255}
+    assert len(text['lines']) == 5
+    assert len(text['regions']) >= 5
+    assert blank['box'] == (0, 0, 200, 300)
+    assert blank['angle'] == 0.0
+    assert preprocess(image)['box'] == text['box']
+
+
+def test_tesseract_engine_preprocesses_only_png(tmp_path):
+    png = tmp_path / 'fatura.png'
+    png.write_bytes(encode_png(text_image()))
+    jpeg = tmp_path / 'fatura.jpg'
+    jpeg.write_bytes(b'\xff\xd8\xff\xe0' + b'\x00' * 40)
+
+    preprocessed = TesseractEngine._preprocessed_image(str(png))
+    assert preprocessed.startswith(PNG_SIGNATURE)
+    assert TesseractEngine._preprocessed_image(str(jpeg)) is None
@@ -0,0 +1,86 @@
+import os
+
+from src.managers import utils
+from src.managers.image_store import ImageStore
+
+
+def count_objects(store_directory):
+    """Conta as imagens gravadas no armazenamento."""
+    directory = os.path.join(store_directory, 'objects')
+    return sum(len(files) for _, _, files in os.walk(directory))
+
+
+def test_image_store_deduplicates_across_runs(tmp_path):
+    store = str(tmp_path / 'STORE')
+    first = ImageStore(store, str(tmp_path / '01.01.2025_10.00.00'))
+    path = first.put('284210', b'imagem 1')
+    first.put('284212', b'imagem 2')
+
+    second = ImageStore(store, str(tmp_path / '02.01.2025_10.00.00'))
+    second.put('284210', b'imagem 1')
+    second.put('284212', b'imagem 2')
+    second.put('284213', b'imagem 1')
+
+    assert count_objects(store) == 2
+    assert os.stat(path).st_nlink == 4
+    assert second.stats() == {
+        'written': 0, 'deduplicated': 3, 'bytes_saved': 24
+    }
+    with open(second.get('284213'), 'rb') as file:
+        assert file.read() == b'imagem 1'
+
+
+def test_image_store_manifest_without_hardlinks(tmp_path):
+    store = str(tmp_path / 'STORE')
+    run = str(tmp_path / '01.01.2025_10.00.00')
+    image_store = ImageStore(store, run, hardlinks=False)
+    path = image_store.put('284210', b'imagem 1')
+
+    assert os.listdir(run) == []
+    assert path.startswith(store)
+    assert ImageStore(store, run).get('284210') == path
+
+
+def test_image_store_prune_removes_unreferenced_objects(tmp_path):
+    store = str(tmp_path / 'STORE')
+    old_run = str(tmp_path / '01.01.2025_10.00.00')
+    manifest_run = str(tmp_path / '02.01.2025_10.00.00')
+    current_run = str(tmp_path / '03.01.2025_10.00.00')
+    ImageStore(store, old_run).put('1', b'antiga')
+    ImageStore(store, old_run).put('2', b'compartilhada')
+    ImageStore(store, manifest_run, hardlinks=False).put('3', b'manifesto')
+    current = ImageStore(store, current_run)
+    current.put('2', b'compartilhada')
+
+    result = current.prune_runs([old_run])
+    assert result == {'objects': 1, 'bytes': 6, 'runs': 1}
+    assert not os.path.exists(old_run)
+    assert count_objects(store) == 2
+
+    result = current.prune_runs([manifest_run])
+    assert result['objects'] == 1
+    assert count_objects(store) == 1
+    assert os.path.exists(current.get('2'))
+
+
+def test_image_store_prune_keeps_runs_it_does_not_own(tmp_path):
+    store = str(tmp_path / 'STORE')
+    files_run = tmp_path / '01.01.2025_10.00.00'
+    os.makedirs(files_run)
+    (files_run / '1.png').write_bytes(b'arquivo')
+    current = ImageStore(store, str(tmp_path / '02.01.2025_10.00.00'))
+
+    assert not current.owns_run(str(files_run))
+    assert current.owns_run(current.directory_run)
+    assert current.prune_runs([str(files_run)])['runs'] == 0
+    assert (files_run / '1.png').read_bytes() == b'arquivo'
+
+
+def test_get_run_directories_sorted_by_execution_time(tmp_path):
+    for name in ('02.01.2025_10.00.00', '31.12.2024_09.00.00', 'ERRORS'):
+        os.makedirs(tmp_path / name)
+
+    runs = utils.get_run_directories(str(tmp_path))
+    assert [os.path.basename(run) for run in runs] == [
+        '31.12.2024_09.00.00', '02.01.2025_10.00.00'
+    ]
@@ -0,0 +1,46 @@
+import json
+import os
+import subprocess
+import sys
+
+import config
+from src.managers.lazy_module import LazyModule
+from src.managers.utils import create_csv_file
+
+
+DIRECTORY_PROJECT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_lazy_module_imports_on_first_access():
+    module = LazyModule('colorsys')
+    assert not module.loaded
+    assert module.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert module.loaded
+    assert module.load() is sys.modules['colorsys']
+
+
+def test_import_main_does_not_load_heavy_dependencies(tmp_path):
+    code = (
+        'import json, sys\n'
+        'import main\n'
+        'print(json.dumps([name for name in '
+        '("pandas", "numpy", "selenium", "requests") '
+        'if name in sys.modules]))\n'
+    )
+    process = subprocess.run(
+        [sys.executable, '-c', code], cwd=tmp_path, capture_output=True,
+        text=True, check=True,
+        env=dict(os.environ, PYTHONPATH=DIRECTORY_PROJECT)
+    )
+    assert json.loads(process.stdout) == []
+
+
+def test_config_execution_attributes_are_lazy():
+    assert config.TIME_EXECUTION in config.DIRECTORY_IMGS
+    assert config.FILE_IMAGE_PACK.endswith(f'{config.TIME_EXECUTION}.pack')
+
+
+def test_create_csv_file_writes_header(tmp_path):
+    file = create_csv_file(str(tmp_path / 'FATURAS.csv'), ['A', 'B, C'])
+    with open(file, 'rb') as csv_file:
+        assert csv_file.read() == b'A,"B, C"\n'
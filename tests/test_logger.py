@@ -0,0 +1,112 @@
+from datetime import datetime
+import json
+import logging
+import threading
+import uuid
+
+from src.managers.logger import DailyFileHandler, Logger, RowSampler
+
+
+def create_logger(tmp_path, **options):
+    """Cria um Logger com um nome único, gravando em tmp_path/LOGS."""
+    return Logger(
+        str(tmp_path), name=f'TestLogger-{uuid.uuid4().hex}', **options
+    )
+
+
+def read_log(tmp_path, extension='.txt'):
+    """Lê o arquivo de log do dia."""
+    name = datetime.now().strftime('%d-%m-%Y') + extension
+    return (tmp_path / 'LOGS' / name).read_text(encoding='utf-8')
+
+
+def test_asynchronous_logger_writes_from_background_thread(tmp_path):
+    logger = create_logger(tmp_path, asynchronous=True)
+    threads = []
+    original_emit = DailyFileHandler.emit
+
+    def emit(handler, record):
+        threads.append(threading.current_thread().name)
+        original_emit(handler, record)
+
+    DailyFileHandler.emit = emit
+    try:
+        logger.info('Iniciando o Processo.')
+        logger.error('Erro no download.')
+        logger.shutdown()
+    finally:
+        DailyFileHandler.emit = original_emit
+
+    content = read_log(tmp_path)
+    assert 'INFO - Iniciando o Processo.' in content
+    assert 'ERROR - Erro no download.' in content
+    assert threads and threading.current_thread().name not in threads
+
+
+def test_json_lines_output_with_fields(tmp_path):
+    logger = create_logger(tmp_path, json_lines=True)
+    logger.info('Fatura baixada.', row=True, fatura='284210')
+    logger.flush()
+
+    entry = json.loads(read_log(tmp_path, '.jsonl').splitlines()[0])
+    assert entry['message'] == 'Fatura baixada.'
+    assert entry['level'] == 'INFO'
+    assert entry['fatura'] == '284210'
+    assert entry['row'] is True
+    assert 'Fatura baixada.' in read_log(tmp_path)
+
+
+def test_row_messages_are_sampled(tmp_path):
+    logger = create_logger(tmp_path, sample_every=10)
+    for index in range(100):
+        logger.info(f'Fatura {index}', row=True)
+    logger.info('Mensagem do processo.')
+    logger.shutdown()
+
+    lines = read_log(tmp_path).splitlines()
+    assert len([line for line in lines if 'Fatura ' in line]) == 10
+    assert any('Mensagem do processo.' in line for line in lines)
+    assert any('90 mensagem(ns) por fatura' in line for line in lines)
+
+
+def test_row_message_arguments_formatted_only_when_kept(tmp_path):
+    formatted = set()
+
+    class Value:
+        def __str__(self):
+            formatted.add(id(self))
+            return 'valor'
+
+    values = [Value() for _ in range(20)]
+    logger = create_logger(tmp_path, sample_every=10)
+    for value in values:
+        logger.info('Fatura %s', value, row=True)
+    logger.flush()
+
+    assert formatted == {id(values[0]), id(values[10])}
+    assert read_log(tmp_path).count('Fatura valor') == 2
+
+
+def test_row_sampler_rate_limit():
+    sampler = RowSampler(max_per_second=5)
+    record = logging.LogRecord('x', logging.INFO, '', 0, 'fatura', (), None)
+    record.row = True
+    kept = sum(sampler.filter(record) for _ in range(50))
+    assert kept == 5
+    assert sampler.suppressed == 45
+
+
+def test_daily_file_handler_rolls_over_at_midnight(tmp_path):
+    handler = DailyFileHandler(str(tmp_path))
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    for day, message in ((datetime(2025, 1, 17, 23, 59), 'antes'),
+                         (datetime(2025, 1, 18, 0, 1), 'depois')):
+        record = logging.LogRecord(
+            'x', logging.INFO, '', 0, message, (), None
+        )
+        record.created = day.timestamp()
+        handler.emit(record)
+    handler.close()
+
+    assert (tmp_path / '17-01-2025.txt').read_text() == 'antes\n'
+    assert (tmp_path / '18-01-2025.txt').read_text() == 'depois\n'
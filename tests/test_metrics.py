@@ -0,0 +1,98 @@
+import json
+import urllib.request
+
+import pytest
+
+from src.managers.metrics import MetricsRegistry, MetricsServer
+from src.managers.state_machine import StateMachine
+
+
+@pytest.fixture
+def registry():
+    """Fixture com um registro de métricas com algumas definições."""
+    return MetricsRegistry(definitions={
+        'rows_scanned_total': ('counter', 'Linhas lidas da tabela do site.'),
+        'http_request_seconds': ('histogram', 'Duração das requisições.'),
+    }, buckets=(0.1, 1.0))
+
+
+def test_prometheus_text_format(registry):
+    registry.increment('rows_scanned_total', 10)
+    registry.increment('http_requests_total', status=200)
+    registry.increment('http_requests_total', status=200)
+    registry.set_gauge('run_success', 1)
+    for seconds in (0.05, 0.5, 2.0):
+        registry.observe('http_request_seconds', seconds)
+
+    text = registry.to_prometheus()
+    assert '# HELP rpa_rows_scanned_total Linhas lidas da tabela do site.\n' in text
+    assert '# TYPE rpa_rows_scanned_total counter\nrpa_rows_scanned_total 10\n' in text
+    assert 'rpa_http_requests_total{status="200"} 2\n' in text
+    assert '# TYPE rpa_run_success gauge\nrpa_run_success 1\n' in text
+    assert 'rpa_http_request_seconds_bucket{le="0.1"} 1\n' in text
+    assert 'rpa_http_request_seconds_bucket{le="1"} 2\n' in text
+    assert 'rpa_http_request_seconds_bucket{le="+Inf"} 3\n' in text
+    assert 'rpa_http_request_seconds_sum 2.55\n' in text
+    assert 'rpa_http_request_seconds_count 3\n' in text
+
+
+def test_histogram_summary_and_type_check(registry):
+    for _ in range(100):
+        registry.observe('http_request_seconds', 0.05)
+    series = registry.to_dict()['http_request_seconds']['series'][0]
+    assert series['count'] == 100
+    assert series['p50'] == pytest.approx(0.05)
+    assert series['p99'] <= 0.1
+
+    with pytest.raises(ValueError):
+        registry.increment('http_request_seconds')
+    registry.reset()
+    assert registry.to_dict() == {}
+
+
+def test_write_files(registry, tmp_path):
+    registry.increment('rows_scanned_total', 3)
+    registry.write_files(
+        str(tmp_path / 'run.prom'), str(tmp_path / 'run.json'),
+        {'rows_per_second': 1.5}
+    )
+    summary = json.loads((tmp_path / 'run.json').read_text(encoding='utf-8'))
+    assert summary['rows_per_second'] == 1.5
+    assert summary['metrics']['rows_scanned_total']['series'] == [
+        {'labels': {}, 'value': 3}
+    ]
+    assert 'rpa_rows_scanned_total 3' in (tmp_path / 'run.prom').read_text()
+
+
+def test_metrics_server(registry):
+    registry.increment('rows_scanned_total', 7)
+    server = MetricsServer(registry, 0)
+    server.start()
+    try:
+        base = f'http://{server.host}:{server.port}'
+        with urllib.request.urlopen(f'{base}/metrics', timeout=5) as response:
+            assert response.headers['Content-Type'].startswith('text/plain')
+            assert b'rpa_rows_scanned_total 7' in response.read()
+        with urllib.request.urlopen(
+                f'{base}/metrics.json', timeout=5) as response:
+            summary = json.loads(response.read())
+            assert summary['rows_scanned_total']['series'][0]['value'] == 7
+    finally:
+        server.stop()
+
+
+def test_state_machine_records_state_metrics(registry):
+    calls = []
+
+    def flaky(context):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError('falha')
+        return None
+
+    machine = StateMachine('PROCESS', metrics=registry)
+    machine.register('PROCESS', flaky, max_retries=1)
+    machine.run(object())
+
+    assert registry.value('state_seconds', state='PROCESS') == 2
+    assert registry.value('state_retries_total', state='PROCESS') == 1
@@ -0,0 +1,69 @@
+from src.managers.ocr_cache import OcrCache
+from src.managers.ocr_manager import OcrManager
+from tests.test_ocr_manager import FakeEngine
+
+
+FIELDS = {
+    'NUMERO_NOTA': '284210', 'EMPRESA': 'Aenean LLC', 'VALOR_TOTAL': '3000.00'
+}
+
+
+def test_ocr_cache_hit_and_miss(tmp_path):
+    cache = OcrCache(str(tmp_path / 'ocr_cache.sqlite3'), 'motor-1')
+    assert cache.get('hash1') is None
+    cache.put('hash1', FIELDS, 1.5)
+
+    assert cache.get('hash1') == FIELDS
+    assert cache.stats() == {
+        'hits': 1, 'misses': 1, 'hit_ratio': 0.5, 'seconds_saved': 1.5
+    }
+    cache.close()
+
+
+def test_ocr_cache_persists_and_depends_on_engine_version(tmp_path):
+    file = str(tmp_path / 'ocr_cache.sqlite3')
+    cache = OcrCache(file, 'motor-1')
+    cache.put('hash1', FIELDS, 1.0)
+    cache.close()
+
+    same_engine = OcrCache(file, 'motor-1')
+    other_engine = OcrCache(file, 'motor-2')
+    assert same_engine.get('hash1') == FIELDS
+    assert other_engine.get('hash1') is None
+    same_engine.close()
+    other_engine.close()
+
+
+def test_ocr_cache_evicts_least_recently_used(tmp_path):
+    cache = OcrCache(str(tmp_path / 'ocr_cache.sqlite3'), 'motor-1', 2)
+    cache.put('hash1', FIELDS, 1.0)
+    cache.put('hash2', FIELDS, 1.0)
+    cache.get('hash1')
+    cache.put('hash3', FIELDS, 1.0)
+
+    assert len(cache) == 2
+    assert cache.get('hash2') is None
+    assert cache.get('hash1') == FIELDS
+    cache.close()
+
+
+def test_ocr_manager_skips_recognition_on_cache_hit(tmp_path):
+    first_image = tmp_path / 'fatura1.png'
+    second_image = tmp_path / 'fatura2.png'
+    first_image.write_bytes(b'mesmo conteudo')
+    second_image.write_bytes(b'mesmo conteudo')
+
+    cache = OcrCache(str(tmp_path / 'ocr_cache.sqlite3'), 'motor-1')
+    ocr = OcrManager(FakeEngine(), workers=1, cache=cache)
+    try:
+        ocr.submit('id1', str(first_image))
+        ocr.collect(wait=True)
+        ocr.submit('id2', str(second_image))
+        assert ocr.pending() == 0
+        collected = ocr.collect()
+    finally:
+        ocr.shutdown()
+
+    assert collected == [('id2', ocr.results['id1'])]
+    assert cache.hits == 1
+    assert cache.misses == 1
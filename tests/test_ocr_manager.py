@@ -0,0 +1,78 @@
+from src.managers.ocr_manager import (
+    OcrManager, TesseractEngine, extract_invoice_fields
+)
+
+
+INVOICE_TEXT = """
+Aenean LLC INVOICE
+3217 Nunc St. 2019-06-01
+Buckley, Washington Invoice #284210
+USA PO 456001201
+# Item Description Quantity Unit price (€) Total (€)
+1 Services 20 125.00 2500.00
+Subtotal 2500.00
+Sales Tax (20%) 500.00
+Total 3,000.00
+"""
+
+
+class FakeEngine:
+    """Motor de OCR falso que retorna o texto de uma fatura."""
+
+    def recognize(self, path_image):
+        if 'erro' in path_image:
+            raise Exception('imagem inválida')
+        return INVOICE_TEXT
+
+
+def test_extract_invoice_fields():
+    fields = extract_invoice_fields(INVOICE_TEXT)
+    assert fields == {
+        'NUMERO_NOTA': '284210',
+        'EMPRESA': 'Aenean LLC',
+        'VALOR_TOTAL': '3000.00',
+    }
+
+
+def test_extract_invoice_fields_empty_text():
+    fields = extract_invoice_fields('')
+    assert fields == {'NUMERO_NOTA': '', 'EMPRESA': '', 'VALOR_TOTAL': ''}
+
+
+def test_tesseract_engine_not_available():
+    engine = TesseractEngine(executable='tesseract-inexistente')
+    assert not engine.is_available()
+
+
+def test_ocr_manager_collects_results_and_errors():
+    ocr = OcrManager(FakeEngine(), workers=2)
+    try:
+        ocr.submit('id1', 'fatura1.png')
+        ocr.submit('id2', 'fatura2.png')
+        ocr.submit('id3', 'erro.png')
+        collected = ocr.collect(wait=True)
+    finally:
+        ocr.shutdown()
+
+    assert sorted(key for key, _ in collected) == ['id1', 'id2']
+    assert ocr.results['id1']['NUMERO_NOTA'] == '284210'
+    assert 'imagem inválida' in ocr.errors['id3']
+    assert ocr.pending() == 0
+    assert ocr.throughput()['images'] == 3
+
+
+def test_ocr_manager_counts_images_not_preprocessed(tmp_path):
+    engine = FakeEngine()
+    engine.preprocess = True
+    jpeg = tmp_path / 'fatura1.jpg'
+    jpeg.write_bytes(b'\xff\xd8\xff\xe0' + bytes(8))
+    png = tmp_path / 'fatura2.png'
+    png.write_bytes(b'\x89PNG\r\n\x1a\n' + bytes(8))
+    ocr = OcrManager(engine, workers=1)
+    try:
+        ocr.submit('id1', str(jpeg))
+        ocr.submit('id2', str(png))
+        ocr.collect(wait=True)
+    finally:
+        ocr.shutdown()
+    assert ocr.not_preprocessed == 1
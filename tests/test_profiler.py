@@ -0,0 +1,65 @@
+import os
+import pstats
+import time
+from types import SimpleNamespace
+
+from src.managers.profiler import Profiler
+
+
+def busy_page(context):
+    """Estado de teste que consome CPU e aloca memória."""
+    deadline = time.perf_counter() + 0.05
+    context.data.append([str(index) for index in range(20000)])
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+    return 'PROCESS'
+
+
+def test_cprofile_writes_pstats_for_selected_stages(tmp_path):
+    profiler = Profiler(str(tmp_path), '01.01.2025_10.00.00', ['PROCESS'])
+    other = lambda context: None
+    assert profiler.wrap('END', other) is other
+
+    process = profiler.wrap('PROCESS', busy_page)
+    context = SimpleNamespace(data=[])
+    assert process(context) == 'PROCESS'
+    process(context)
+
+    files = profiler.save()
+    profiler.close()
+    assert files == [str(tmp_path / '01.01.2025_10.00.00_PROCESS.pstats')]
+    functions = {key[2] for key in pstats.Stats(files[0]).stats}
+    assert 'busy_page' in functions
+
+    summary = profiler.summary()
+    assert summary[0].startswith('Profiling do estado PROCESS (2 execução')
+    assert any('busy_page (test_profiler.py' in line for line in summary)
+
+
+def test_sampling_and_memory_reports(tmp_path):
+    profiler = Profiler(
+        str(tmp_path), 'run', ['PROCESS'], mode='sampling', memory=True,
+        sample_interval=0.001
+    )
+    process = profiler.wrap('PROCESS', busy_page)
+    context = SimpleNamespace(
+        data=[], page_main=SimpleNamespace(current_page=1)
+    )
+    for page in (1, 2):
+        context.page_main.current_page = page
+        process(context)
+    files = profiler.save()
+    summary = profiler.summary()
+    profiler.close()
+
+    names = sorted(os.path.basename(file) for file in files)
+    assert names == ['run_amostras.folded', 'run_memoria.txt']
+    with open(tmp_path / 'run_amostras.folded', encoding='utf-8') as folded:
+        stacks = folded.read().splitlines()
+    assert stacks and all(stack.startswith('PROCESS;') for stack in stacks)
+    assert any('busy_page' in stack for stack in stacks)
+
+    report = (tmp_path / 'run_memoria.txt').read_text(encoding='utf-8')
+    assert '== PROCESS #1 (página 1)' in report
+    assert '== PROCESS #2 (página 2)' in report
+    assert any(line.startswith('Memória rastreada') for line in summary)
@@ -7,19 +7,20 @@ from config import *
 
 
 
-def test_request_site_returns_200(request_manager):
+def test_request_site_returns_200(request_manager, standin_site):
     esperado = 200
-    response = request_manager.get(URL_SITE)
+    response = request_manager.get(standin_site.url)
     assert response.status_code == esperado
 
-def test_request_manager_get_returns_response_type(request_manager):
-    response = request_manager.get(URL_SITE)
+def test_request_manager_get_returns_response_type(request_manager,
+                                                   standin_site):
+    response = request_manager.get(standin_site.url)
     assert isinstance(response, requests.Response)
 
-def test_request_manager_not_returns_200(request_manager):
+def test_request_manager_not_returns_200(request_manager, standin_site):
     esperado = 'Erro: 404'
     with pytest.raises(Exception) as exc_info:
-        request_manager.get(f'{URL_SITE}/teste')
+        request_manager.get(f'{standin_site.url}teste')
     
     assert str(exc_info.value) == esperado
 
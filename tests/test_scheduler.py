@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+import threading
+
+import pytest
+
+from src.managers.scheduler import CronExpression, Scheduler
+
+
+def test_cron_expression_every_fifteen_minutes():
+    cron = CronExpression('*/15 * * * *')
+    next_run = cron.next_after(datetime(2025, 1, 17, 10, 7, 30))
+    assert next_run == datetime(2025, 1, 17, 10, 15)
+
+
+def test_cron_expression_daily_rolls_to_next_day():
+    cron = CronExpression('30 8 * * *')
+    next_run = cron.next_after(datetime(2025, 1, 17, 9, 0))
+    assert next_run == datetime(2025, 1, 18, 8, 30)
+
+
+def test_cron_expression_weekdays_only():
+    cron = CronExpression('0 6 * * 1-5')
+    # 17/01/2025 é uma sexta-feira, a próxima execução é na segunda.
+    next_run = cron.next_after(datetime(2025, 1, 17, 7, 0))
+    assert next_run == datetime(2025, 1, 20, 6, 0)
+
+
+def test_cron_expression_rolls_over_year():
+    cron = CronExpression('0 0 1 1 *')
+    next_run = cron.next_after(datetime(2025, 3, 1))
+    assert next_run == datetime(2026, 1, 1)
+
+
+def test_cron_expression_invalid():
+    with pytest.raises(ValueError):
+        CronExpression('* * *')
+    with pytest.raises(ValueError):
+        CronExpression('61 * * * *')
+
+
+def test_scheduler_requires_interval_or_cron():
+    with pytest.raises(ValueError):
+        Scheduler(lambda: None)
+    with pytest.raises(ValueError):
+        Scheduler(lambda: None, interval=10, cron='* * * * *')
+
+
+def test_scheduler_skips_overlapping_cycle(tmp_path):
+    started = threading.Event()
+    release = threading.Event()
+
+    def job():
+        started.set()
+        release.wait(5)
+
+    scheduler = Scheduler(
+        job, interval=60, lock_file=str(tmp_path / 'daemon.lock')
+    )
+    worker = threading.Thread(target=scheduler.run_once)
+    worker.start()
+    started.wait(5)
+
+    assert scheduler.run_once() is False
+
+    release.set()
+    worker.join(5)
+    assert scheduler.cycles == 1
+
+
+def test_scheduler_stops_gracefully():
+    calls = []
+    scheduler = Scheduler(lambda: calls.append(1), interval=0.05)
+
+    def job():
+        calls.append(1)
+        if len(calls) == 3:
+            scheduler.stop()
+
+    scheduler.job = job
+    scheduler.run_forever()
+    assert len(calls) == 3
+
+
+def test_scheduler_skipped_is_bounded():
+    scheduler = Scheduler(lambda: None, interval=60)
+    for minute in range(Scheduler.MAX_SKIPPED + 10):
+        scheduler.skipped.append(
+            datetime(2025, 1, 1) + timedelta(minutes=minute)
+        )
+    assert len(scheduler.skipped) == Scheduler.MAX_SKIPPED
+    assert scheduler.skipped[0] == datetime(2025, 1, 1, 0, 10)
@@ -0,0 +1,64 @@
+import json
+import re
+import urllib.error
+import urllib.request
+from datetime import date
+
+import pytest
+
+from benchmarks.standin_site import StandinSite, build_rows
+from src.managers.image_loader import read_png_header
+
+
+def fetch(url: str) -> bytes:
+    with urllib.request.urlopen(url, timeout=5) as response:
+        return response.read()
+
+
+def test_build_rows_respects_future_share():
+    today = date(2025, 1, 15)
+    rows = build_rows(1000, future_share=0.3, seed=1, today=today)
+    future = [
+        row for row in rows
+        if ''.join(reversed(row[2].split('-'))) > today.strftime('%Y%m%d')
+    ]
+    assert [row[0] for row in rows[:3]] == [1, 2, 3]
+    assert len({row[1] for row in rows}) == 1000
+    assert 250 <= len(future) <= 350
+    assert build_rows(1000, 0.3, 1, today) == rows
+    past = build_rows(50, future_share=0.0, seed=1, today=today)
+    assert all(
+        ''.join(reversed(row[2].split('-'))) <= today.strftime('%Y%m%d')
+        for row in past
+    )
+
+
+def test_page_contains_table_rows_and_next_button(standin_site):
+    html = fetch(standin_site.url).decode('utf-8')
+    assert '<table id="tableSandbox"' in html
+    assert 'id="tableSandbox_next"' in html
+    data = re.search(
+        r'<script id="tableData" type="application/json">(.*?)</script>',
+        html
+    ).group(1)
+    assert json.loads(data) == standin_site.rows
+    assert len(standin_site.rows) == 25
+    assert 'var pageSize = 10;' in html
+
+
+def test_invoices_are_png_and_unknown_paths_return_404(standin_site):
+    invoice_id = standin_site.rows[0][1]
+    image = fetch(f'{standin_site.url}invoices/{invoice_id}.png')
+    assert read_png_header(image)['width'] == 480
+    with pytest.raises(urllib.error.HTTPError) as error:
+        fetch(f'{standin_site.url}invoices/999.png')
+    assert error.value.code == 404
+
+
+def test_error_injection():
+    with StandinSite(rows=3, error_rate=1.0) as site:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            fetch(f'{site.url}invoices/{site.rows[0][1]}.png')
+        assert error.value.code == 500
+        assert site.requests['error'] == 1
+        assert site.requests['invoice'] == 0
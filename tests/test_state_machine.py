@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.managers.state_machine import StateMachine
+
+
+def _build_machine(fail_times, max_retries):
+    context = SimpleNamespace(pages=[], failures=fail_times, errors=[])
+
+    def process(ctx):
+        if ctx.failures:
+            ctx.failures -= 1
+            raise Exception('falha')
+        ctx.pages.append(len(ctx.pages) + 1)
+        return 'END' if len(ctx.pages) == 3 else 'PROCESS'
+
+    machine = StateMachine('PROCESS')
+    machine.register(
+        'PROCESS',
+        process,
+        max_retries=max_retries,
+        on_error='END',
+        on_exception=lambda ctx, error: ctx.errors.append(str(error))
+    )
+    machine.register('END', lambda ctx: None)
+    return machine, context
+
+
+def test_state_machine_runs_until_none():
+    machine, context = _build_machine(fail_times=0, max_retries=0)
+    machine.run(context)
+    assert context.pages == [1, 2, 3]
+    assert [t['state'] for t in machine.transitions] == [
+        'PROCESS', 'PROCESS', 'PROCESS', 'END'
+    ]
+
+
+def test_state_machine_retries_same_state():
+    machine, context = _build_machine(fail_times=2, max_retries=3)
+    machine.run(context)
+    assert context.pages == [1, 2, 3]
+    assert context.errors == ['falha', 'falha']
+    summary = machine.timings_summary()
+    assert summary['PROCESS']['executions'] == 5
+    assert summary['PROCESS']['failures'] == 2
+
+
+def test_state_machine_goes_to_error_state_after_retries():
+    machine, context = _build_machine(fail_times=5, max_retries=1)
+    machine.run(context)
+    assert context.pages == []
+    assert str(context.error) == 'falha'
+    assert machine.transitions[-2]['next_state'] == 'END'
+
+
+def test_state_machine_raises_without_error_state():
+    machine = StateMachine('START')
+
+    def start(ctx):
+        raise ValueError('erro')
+
+    machine.register('START', start)
+    with pytest.raises(ValueError):
+        machine.run(SimpleNamespace())
+
+
+def test_state_machine_unknown_state():
+    machine = StateMachine('START')
+    machine.register('START', lambda ctx: 'UNKNOWN')
+    with pytest.raises(ValueError):
+        machine.run(SimpleNamespace())
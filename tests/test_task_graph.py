@@ -0,0 +1,134 @@
+import hashlib
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import config
+import main
+from src.managers.csv_manager import CsvManager
+from src.managers.ocr_manager import TesseractEngine
+from src.managers.task_graph import TaskGraph
+
+
+def sleeper(name: str, seconds: float):
+    """Cria uma tarefa que aguarda e registra o seu nome no contexto."""
+    def task(context):
+        time.sleep(seconds)
+        with context.lock:
+            context.order.append(name)
+    return task
+
+
+@pytest.fixture
+def context():
+    """Fixture com o contexto repassado às tarefas."""
+    return SimpleNamespace(order=[], lock=threading.Lock())
+
+
+def test_independent_tasks_run_in_parallel(context):
+    graph = TaskGraph()
+    for name in ('a', 'b', 'c'):
+        graph.add(name, sleeper(name, 0.2))
+    start = time.perf_counter()
+    graph.run(context)
+    assert time.perf_counter() - start < 0.5
+    assert sorted(context.order) == ['a', 'b', 'c']
+
+
+def test_dependencies_and_critical_path(context):
+    graph = TaskGraph()
+    graph.add('browser', sleeper('browser', 0.1))
+    graph.add('site', sleeper('site', 0.2), requires=['browser'])
+    graph.add('directories', sleeper('directories', 0.01))
+    graph.add('csv', sleeper('csv', 0.01), requires=['directories'])
+    graph.run(context)
+
+    assert context.order.index('browser') < context.order.index('site')
+    assert context.order.index('directories') < context.order.index('csv')
+    assert graph.timings['site']['start'] >= graph.timings['browser']['end']
+    assert graph.critical_path() == ['browser', 'site']
+    report = graph.report()
+    assert len(report) == 5
+    assert 'Caminho crítico' in report[-1]
+
+
+def test_sequential_keeps_registration_order(context):
+    graph = TaskGraph(max_workers=1)
+    graph.add('a', sleeper('a', 0))
+    graph.add('b', sleeper('b', 0), requires=['a'])
+    graph.add('c', sleeper('c', 0))
+    graph.run(context)
+    assert context.order == ['a', 'b', 'c']
+
+
+def test_error_skips_dependents(context):
+    def fail(context):
+        raise RuntimeError('falhou')
+
+    graph = TaskGraph()
+    graph.add('fail', fail)
+    graph.add('after', sleeper('after', 0), requires=['fail'])
+    graph.add('slow', sleeper('slow', 0.1))
+    with pytest.raises(RuntimeError, match='falhou'):
+        graph.run(context)
+    assert 'after' not in context.order
+    assert 'slow' in context.order
+
+
+def test_invalid_tasks():
+    graph = TaskGraph()
+    graph.add('a', lambda context: None)
+    with pytest.raises(ValueError):
+        graph.add('a', lambda context: None)
+    with pytest.raises(ValueError):
+        graph.add('b', lambda context: None, requires=['c'])
+
+
+def test_csv_manager_create_writes_once(tmp_path):
+    file = str(tmp_path / 'FATURAS.csv')
+    csv_manager = CsvManager.create(file, ['NUMERO', 'STATUS'])
+    assert list(csv_manager.df.columns) == ['NUMERO', 'STATUS']
+    assert not (tmp_path / 'FATURAS.csv').exists()
+    csv_manager.add_data({'NUMERO': '1', 'STATUS': 'pendente'})
+    csv_manager.save_file()
+    assert CsvManager(file).df.to_dict('records') == [
+        {'NUMERO': 1, 'STATUS': 'pendente'}
+    ]
+
+
+def test_initialization_graph_ocr_cache_used_from_main_thread(
+        tmp_path, monkeypatch
+    ):
+    config.DIRECTORY_IMGS
+    base = config.BASE_DIRECTORY
+    for name in dir(config):
+        value = getattr(config, name)
+        if (name.startswith(('DIRECTORY_', 'FILE_'))
+                and isinstance(value, str) and value.startswith(base)):
+            monkeypatch.setattr(
+                config, name, str(tmp_path) + value[len(base):]
+            )
+    monkeypatch.setattr(config, 'OCR_ENABLED', True)
+    monkeypatch.setattr(config, 'OCR_CACHE_ENABLED', True)
+    monkeypatch.setattr(config, 'INIT_WARM_UP', False)
+    monkeypatch.setattr(TesseractEngine, 'is_available', lambda self: True)
+    monkeypatch.setattr(TesseractEngine, 'version', lambda self: 'motor-1')
+    for task in ('init_retry_worker', 'init_browser', 'init_site',
+                 'init_browser_session'):
+        monkeypatch.setattr(main, task, lambda context: None)
+    logger = SimpleNamespace(
+        info=lambda message: None, alert=lambda message: None
+    )
+    context = SimpleNamespace(logger=logger, replay=None)
+
+    main.build_initialization_graph().run(context)
+    try:
+        image = b'fatura'
+        fields = {'NUMERO_NOTA': '1'}
+        context.ocr.cache.put(hashlib.sha256(image).hexdigest(), fields, 0.5)
+        context.ocr.submit('1', image)
+        assert context.ocr.collect() == [('1', fields)]
+    finally:
+        context.ocr.shutdown()
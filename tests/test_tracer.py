@@ -0,0 +1,69 @@
+import json
+import threading
+
+import pytest
+
+from src.managers.state_machine import StateMachine
+from src.managers.tracer import Tracer
+
+
+def test_disabled_tracer_returns_shared_noop_span():
+    tracer = Tracer()
+    first = tracer.span('download_invoice', 'download', fatura='284210')
+    second = tracer.span('get_rows', 'browser', page=1)
+    with first:
+        pass
+    assert first is second
+    assert tracer.events() == []
+
+
+def test_spans_record_args_threads_and_errors(tmp_path):
+    tracer = Tracer()
+    tracer.start()
+    with tracer.span('PROCESS', 'state'):
+        with tracer.span('download_invoice', 'download',
+                         fatura='284210', page=2):
+            pass
+
+    def retry():
+        with pytest.raises(RuntimeError):
+            with tracer.span('download_invoice', 'download', fatura='1'):
+                raise RuntimeError('Erro: 500')
+
+    thread = threading.Thread(target=retry, name='RetryWorker')
+    thread.start()
+    thread.join()
+    tracer.stop()
+    with tracer.span('ignorado'):
+        pass
+
+    file = tracer.write(str(tmp_path / 'TRACES' / 'run.trace.json'))
+    with open(file, encoding='utf-8') as trace_file:
+        events = json.load(trace_file)['traceEvents']
+
+    names = {e['args']['name'] for e in events if e['ph'] == 'M'}
+    assert names == {'MainThread', 'RetryWorker'}
+    spans = [e for e in events if e['ph'] == 'X']
+    assert [e['name'] for e in spans] == [
+        'PROCESS', 'download_invoice', 'download_invoice'
+    ]
+    outer, inner, failed = spans
+    assert inner['args'] == {'fatura': '284210', 'page': 2}
+    assert outer['ts'] <= inner['ts']
+    assert inner['ts'] + inner['dur'] <= outer['ts'] + outer['dur']
+    assert failed['tid'] != outer['tid']
+    assert failed['args']['error'] == 'RuntimeError: Erro: 500'
+
+
+def test_state_machine_spans():
+    tracer = Tracer()
+    tracer.start()
+    machine = StateMachine('INITIALIZATION', tracer=tracer)
+    machine.register('INITIALIZATION', lambda context: 'END')
+    machine.register('END', lambda context: None)
+    machine.run(object())
+
+    spans = [e for e in tracer.events() if e['ph'] == 'X']
+    assert [(e['name'], e['cat']) for e in spans] == [
+        ('INITIALIZATION', 'state'), ('END', 'state')
+    ]
@@ -0,0 +1,12 @@
+from src.managers.web_driver_options import WebDriverOptions
+
+
+def test_add_argument_only_once(monkeypatch):
+    monkeypatch.setattr(WebDriverOptions, '_instance', None)
+    for _ in range(3):
+        options = WebDriverOptions()
+        options.add_argument('--start-maximized')
+        options.add_argument('--disable-notifications')
+    assert options.get_options().arguments == [
+        '--start-maximized', '--disable-notifications'
+    ]